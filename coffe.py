@@ -71,8 +71,67 @@ parser.add_argument('-r',"--parse_pll_hb_flow",help="parses the hardblock flow f
 # quick mode is disabled by default. Try passing -q 0.03 for 3% minimum improvement
 parser.add_argument('-q', '--quick_mode', type=float, default=-1.0, help="minimum cost function improvement for resizing")
 
+# SPICE simulator used to run the decks. ngspice needs no license, so it can run as many parallel processes as there are cores
+parser.add_argument('-b', '--spice_backend', type=str, choices=["hspice", "ngspice"], default="hspice", help="choose the SPICE simulator")
+
+# Large sweeps can be split across several worker processes (each HSPICE process checks out a license)
+parser.add_argument('-j', '--spice_workers', type=int, default=1, help="number of parallel SPICE processes used for large sweeps")
+
+# Simulation cache is disabled by default. Pass a database path (e.g. -c spice_cache.db) to reuse results across runs
+parser.add_argument('-c', '--spice_cache', type=str, default="", help="path to the simulation cache database")
+parser.add_argument('--spice_cache_entries', type=int, default=1000000, help="max number of sweep settings kept in the simulation cache")
+# Coarse transient analysis for the sizing sweeps that only rank combos (e.g. --coarse_tran_step 5e-12). Disabled by default
+parser.add_argument('--coarse_tran_step', type=float, default=0.0, help="transient step (s) of the sizing sweeps that rank combos")
+parser.add_argument('--coarse_tran_stop_scale', type=float, default=1.0, help="scale of the transient stop time of the sizing sweeps that rank combos")
+# Surrogate-model pruning of the sizing combos is disabled by default. Try passing --surrogate_pruning 2 to only
+# simulate the combos whose predicted cost is within 2 standard errors of the model of the predicted best
+parser.add_argument('--surrogate_pruning', type=float, default=0.0, help="confidence band (in standard errors) of the surrogate-model pruning of sizing combos")
+
+# Search the transistor sizes of each group with a grid over the sizing ranges (the default) or with a search
+# strategy that simulates far fewer combos: coordinate descent, compass pattern search or Nelder-Mead
+parser.add_argument('--search_strategy', type=str, choices=["grid", "coordinate", "pattern", "nelder_mead"], default="grid", help="choose the transistor sizing search strategy")
+# ERF all the inverters of a subcircuit at the same time in one sweep instead of one inverter at a time
+parser.add_argument('--joint_erf', help="balance the rise and fall of all inverters of a subcircuit in one sweep", action='store_true', default=False)
+# Keep the ERF ratios of every sizing combo and reuse the nearest ones to skip or warm-start later ERFs
+parser.add_argument('--erf_reuse', help="reuse the inverter P/N ratios of earlier ERFs", action='store_true', default=False)
+
+# Simulation budget of the transistor sizing, e.g. --sim_budget 36000 for 10 hours of simulator time. The budget is spread over 
+# the subcircuits by their share of the critical path delay and sets the number of sizing combos and re-ERFs of every search
+parser.add_argument('--sim_budget', type=float, default=0.0, help="simulation budget of the transistor sizing (0 for no budget)")
+parser.add_argument('--sim_budget_unit', type=str, choices=["seconds", "simulations"], default="seconds", help="unit of the simulation budget")
+
+# Search for the logic tile height with the lowest cost in the floorplan of every sizing iteration. Disabled by default
+parser.add_argument('--optimize_height', help="search for the logic tile height with the lowest cost in every sizing iteration", action='store_true', default=False)
+
+# Size all the subcircuits of a sizing iteration at the same time in this many worker processes (Jacobi-style). Disabled by default
+parser.add_argument('-ps', '--parallel_sizing', type=int, default=0, help="number of worker processes that size subcircuits concurrently")
+# Transistor sizing saves a checkpoint in the architecture folder before every subcircuit it sizes. A run that was
+# killed can continue from its last checkpoint by running COFFE again with the same options and --resume
+parser.add_argument('--resume', help="continue transistor sizing from the checkpoint of a killed run", action='store_true', default=False)
+
+# The simulator listing (.lis) of every run can be compressed or only kept when the run failed, to save disk traffic
+parser.add_argument('--spice_listing', type=str, choices=["keep", "gzip", "failure"], default="keep", help="keep the .lis files, gzip them or only keep those of failed runs")
+parser.add_argument('--write_data_file', help="write the parameters of every sweep to data.txt (for debug)", action='store_true', default=False)
+
 args = parser.parse_args()
 
+# Quick mode decides whether to size a subcircuit again from the cost improvement of sizing it, which
+# the parallel sizing mode only knows at the end of the iteration.
+if args.parallel_sizing > 0 and args.quick_mode >= 0:
+  utils.print_error_not_compatable("quick mode", "parallel sizing")
+
+# The simulation budget of a subcircuit depends on what the subcircuits sized before it used
+if args.parallel_sizing > 0 and args.sim_budget > 0:
+  utils.print_error_not_compatable("simulation budget", "parallel sizing")
+
+# Surrogate pruning picks the combos to simulate out of the grid over the sizing ranges
+if args.surrogate_pruning > 0 and args.search_strategy != "grid":
+  utils.print_error_not_compatable("surrogate pruning", "search strategy " + args.search_strategy)
+
+# The simulation budget sets the number of combos of the grid searches (see SimulationBudget.plan_search)
+if args.sim_budget > 0 and args.search_strategy != "grid":
+  utils.print_error_not_compatable("simulation budget", "search strategy " + args.search_strategy)
+
 # Load the input architecture description file
 coffe_params = utils.load_params(args.arch_description,args)
 
@@ -108,7 +167,8 @@ else:
   default_dir = os.getcwd()
 
   # Create an HSPICE interface
-  spice_interface = spice.SpiceInterface()
+  spice_interface = spice.SpiceInterface(args.spice_workers, os.path.abspath(args.spice_cache) if args.spice_cache else None, args.spice_cache_entries, args.spice_backend, args.write_data_file,
+                                         args.coarse_tran_step, args.coarse_tran_stop_scale, args.spice_listing)
 
   # Record start time
   total_start_time = time.time()
@@ -1,8 +1,6 @@
-def inverter_generate(filename, use_finfet, use_technology):
-	""" Generates the SPICE subcircuit for an inverter. Appends it to file 'filename'. """
+def inverter_generate(spice_file, use_finfet, use_technology):
+	""" Generates the SPICE subcircuit for an inverter. Appends it to 'spice_file'. """
 
-	# Open the file for appending
-	spice_file = open(filename, 'a')  
 
 	if not use_finfet :
 		spice_file.write("******************************************************************************************\n")
@@ -68,13 +66,10 @@ def inverter_generate(filename, use_finfet, use_technology):
 			spice_file.write("ASEO=Wp*min_tran_width*trans_diffusion_length ADEO=Wp*min_tran_width*trans_diffusion_length PSEO='Wp*(min_tran_width+2*trans_diffusion_length)' PDEO='Wp*(min_tran_width+2*trans_diffusion_length)'\n")
 			spice_file.write(".ENDS\n\n\n")
 
-	spice_file.close()
 
-def lvl_shifter_generate(filename, use_finfet):
-	""" Generates the SPICE subcircuit for a single stage of the conventional lvl shifter. Appends it to file 'filename'. """
+def lvl_shifter_generate(spice_file, use_finfet):
+	""" Generates the SPICE subcircuit for a single stage of the conventional lvl shifter. Appends it to 'spice_file'. """
 
-	# Open the file for appending
-	spice_file = open(filename, 'a')
 	spice_file.write("******************************************************************************************\n")
 	spice_file.write("*  lvl shifter\n")
 	spice_file.write("******************************************************************************************\n")
@@ -87,13 +82,11 @@ def lvl_shifter_generate(filename, use_finfet):
 
 
 
-def nand2_generate(filename, use_finfet):
-	""" Generates the SPICE subcircuit for a 2input nand gate. Appends it to file 'filename'. """
+def nand2_generate(spice_file, use_finfet):
+	""" Generates the SPICE subcircuit for a 2input nand gate. Appends it to 'spice_file'. """
 
-	# Open the file for appending
 	# its set up so that the delay of one of the inputs is measured so the other input is set to vdd
 	# simulations should still be fine regardless of these values by using default values
-	spice_file = open(filename, 'a')  
 
 	if not use_finfet :
 		spice_file.write("******************************************************************************************\n")
@@ -153,18 +146,15 @@ def nand2_generate(filename, use_finfet):
 		spice_file.write("ASEO=Wp*min_tran_width*trans_diffusion_length ADEO=Wp*min_tran_width*trans_diffusion_length PSEO='Wp*(min_tran_width+2*trans_diffusion_length)' PDEO='Wp*(min_tran_width+2*trans_diffusion_length)'\n")
 		spice_file.write(".ENDS\n\n\n")
 
-	spice_file.close()
 
 
-def nand2_generate_lp(filename, use_finfet):
-	""" Generates the SPICE subcircuit for a 2input nand gate. Appends it to file 'filename'. """
+def nand2_generate_lp(spice_file, use_finfet):
+	""" Generates the SPICE subcircuit for a 2input nand gate. Appends it to 'spice_file'. """
 
-	# Open the file for appending
 	# its set up so that the delay of one of the inputs is measured so the other input is set to vdd
 	# TODO: obtain precise values for AS, AD, PS, PD
 	# simulations should still be fine regardless of these values by using default values
 	# after adding AS, AD, PS, PD, remove \n from each like and put a space instead
-	spice_file = open(filename, 'a')  
 
 	if not use_finfet :
 		spice_file.write("******************************************************************************************\n")
@@ -195,14 +185,11 @@ def nand2_generate_lp(filename, use_finfet):
 		spice_file.write("ASEO=Wp*min_tran_width*trans_diffusion_length ADEO=Wp*min_tran_width*trans_diffusion_length PSEO='Wp*(min_tran_width+2*trans_diffusion_length)' PDEO='Wp*(min_tran_width+2*trans_diffusion_length)'\n")
 		spice_file.write(".ENDS\n\n\n")
 
-	spice_file.close()
 
-def nand3_generate(filename, use_finfet):
-	""" Generates the SPICE subcircuit for a 3input nand gate. Appends it to file 'filename'. """
+def nand3_generate(spice_file, use_finfet):
+	""" Generates the SPICE subcircuit for a 3input nand gate. Appends it to 'spice_file'. """
 
-	# Open the file for appending
 	# its set up so that the delay of one of the inputs is measured so the other input is set to vdd
-	spice_file = open(filename, 'a')  
 
 	if not use_finfet :
 		spice_file.write("******************************************************************************************\n")
@@ -261,15 +248,12 @@ def nand3_generate(filename, use_finfet):
 		spice_file.write("ASEO=Wp*min_tran_width*trans_diffusion_length ADEO=Wp*min_tran_width*trans_diffusion_length PSEO='Wp*(min_tran_width+2*trans_diffusion_length)' PDEO='Wp*(min_tran_width+2*trans_diffusion_length)'\n")
 		spice_file.write(".ENDS\n\n\n")
 
-	spice_file.close()
 
 
-def nand3_generate_lp(filename, use_finfet):
-	""" Generates the SPICE subcircuit for a 3input nand gate. Appends it to file 'filename'. """
+def nand3_generate_lp(spice_file, use_finfet):
+	""" Generates the SPICE subcircuit for a 3input nand gate. Appends it to 'spice_file'. """
 
-	# Open the file for appending
 	# its set up so that the delay of one of the inputs is measured so the other input is set to vdd
-	spice_file = open(filename, 'a')  
 
 	if not use_finfet :
 		spice_file.write("******************************************************************************************\n")
@@ -308,14 +292,11 @@ def nand3_generate_lp(filename, use_finfet):
 		spice_file.write("ASEO=Wp*min_tran_width*trans_diffusion_length ADEO=Wp*min_tran_width*trans_diffusion_length PSEO='Wp*(min_tran_width+2*trans_diffusion_length)' PDEO='Wp*(min_tran_width+2*trans_diffusion_length)'\n")
 		spice_file.write(".ENDS\n\n\n")
 
-	spice_file.close()
 	
 	
-def rest_generate(filename, use_finfet):
-	""" Generates the SPICE subcircuit for a level-restorer. Appends it to file 'filename'. """
+def rest_generate(spice_file, use_finfet):
+	""" Generates the SPICE subcircuit for a level-restorer. Appends it to 'spice_file'. """
 
-	# Open the file for appending
-	spice_file = open(filename, 'a')  
 
 	if not use_finfet :
 		spice_file.write("******************************************************************************************\n")
@@ -334,14 +315,11 @@ def rest_generate(filename, use_finfet):
 		spice_file.write("ASEO=Wp*min_tran_width*trans_diffusion_length ADEO=Wp*min_tran_width*trans_diffusion_length PSEO='Wp*(min_tran_width+2*trans_diffusion_length)' PDEO='Wp*(min_tran_width+2*trans_diffusion_length)'\n")
 		spice_file.write(".ENDS\n\n\n")   
 		
-	spice_file.close()
 	
 	
-def wire_generate(filename):
-	""" Generates the SPICE subcircuit for a wire. Appends it to file 'filename'. """
+def wire_generate(spice_file):
+	""" Generates the SPICE subcircuit for a wire. Appends it to 'spice_file'. """
 
-	# Open the file for appending
-	spice_file = open(filename, 'a')  
 	spice_file.write("******************************************************************************************\n")
 	spice_file.write("* Interconnect wire\n")
 	spice_file.write("******************************************************************************************\n")
@@ -350,14 +328,11 @@ def wire_generate(filename):
 	spice_file.write("RWIRE_1 n_in n_out Rw\n")
 	spice_file.write("CWIRE_2 n_out gnd Cw\n")
 	spice_file.write(".ENDS\n\n\n")   
-	spice_file.close()
 	
 	
-def ptran_generate(filename, use_finfet):
-	""" Generates the SPICE subcircuit for a pass-transistor. Appends it to file 'filename'. """
+def ptran_generate(spice_file, use_finfet):
+	""" Generates the SPICE subcircuit for a pass-transistor. Appends it to 'spice_file'. """
 
-	# Open the file for appending
-	spice_file = open(filename, 'a')  
 
 	if not use_finfet :
 		spice_file.write("******************************************************************************************\n")
@@ -376,13 +351,10 @@ def ptran_generate(filename, use_finfet):
 		spice_file.write("ASEO=Wn*min_tran_width*trans_diffusion_length ADEO=Wn*min_tran_width*trans_diffusion_length PSEO='Wn*(min_tran_width+2*trans_diffusion_length)' PDEO='Wn*(min_tran_width+2*trans_diffusion_length)'\n")
 		spice_file.write(".ENDS\n\n\n")   
 
-	spice_file.close()
 	
-def ptran_pmos_generate(filename, use_finfet):
-	""" Generates the SPICE subcircuit for a PMOS pass-transistor. Appends it to file 'filename'. """
+def ptran_pmos_generate(spice_file, use_finfet):
+	""" Generates the SPICE subcircuit for a PMOS pass-transistor. Appends it to 'spice_file'. """
 
-	# Open the file for appending
-	spice_file = open(filename, 'a')  
 
 	if not use_finfet :
 		spice_file.write("******************************************************************************************\n")
@@ -401,13 +373,10 @@ def ptran_pmos_generate(filename, use_finfet):
 		spice_file.write("ASEO=Wn*min_tran_width*trans_diffusion_length ADEO=Wn*min_tran_width*trans_diffusion_length PSEO='Wn*(min_tran_width+2*trans_diffusion_length)' PDEO='Wn*(min_tran_width+2*trans_diffusion_length)'\n")
 		spice_file.write(".ENDS\n\n\n")   
 
-	spice_file.close()
 
-def tgate_generate(filename, use_finfet):
-	""" Generates the SPICE subcircuit for a transmission gate. Appends it to file 'filename'. """
+def tgate_generate(spice_file, use_finfet):
+	""" Generates the SPICE subcircuit for a transmission gate. Appends it to 'spice_file'. """
 
-	# Open the file for appending
-	spice_file = open(filename, 'a')  
 
 	if not use_finfet :
 		spice_file.write("******************************************************************************************\n")
@@ -430,14 +399,11 @@ def tgate_generate(filename, use_finfet):
 		spice_file.write("ASEO=Wp*min_tran_width*trans_diffusion_length ADEO=Wp*min_tran_width*trans_diffusion_length PSEO='Wp*(min_tran_width+2*trans_diffusion_length)' PDEO='Wp*(min_tran_width+2*trans_diffusion_length)'\n")
 		spice_file.write(".ENDS\n\n\n")
 
-	spice_file.close()
 
 
-def tgate_generate_lp(filename, use_finfet):
-	""" Generates the SPICE subcircuit for a transmission gate. Appends it to file 'filename'. """
+def tgate_generate_lp(spice_file, use_finfet):
+	""" Generates the SPICE subcircuit for a transmission gate. Appends it to 'spice_file'. """
 
-	# Open the file for appending
-	spice_file = open(filename, 'a')  
 
 	if not use_finfet :
 		spice_file.write("******************************************************************************************\n")
@@ -460,14 +426,11 @@ def tgate_generate_lp(filename, use_finfet):
 		spice_file.write("ASEO=Wp*min_tran_width*trans_diffusion_length ADEO=Wp*min_tran_width*trans_diffusion_length PSEO='Wp*(min_tran_width+2*trans_diffusion_length)' PDEO='Wp*(min_tran_width+2*trans_diffusion_length)'\n")
 		spice_file.write(".ENDS\n\n\n")
 
-	spice_file.close()
 
 
-def RAM_tgate_generate(filename, use_finfet):
-	""" Generates the SPICE subcircuit for a transmission gate used in the RAM cell. Appends it to file 'filename'. """
+def RAM_tgate_generate(spice_file, use_finfet):
+	""" Generates the SPICE subcircuit for a transmission gate used in the RAM cell. Appends it to 'spice_file'. """
 
-	# Open the file for appending
-	spice_file = open(filename, 'a')  
 
 	if not use_finfet :
 		spice_file.write("******************************************************************************************\n")
@@ -490,13 +453,10 @@ def RAM_tgate_generate(filename, use_finfet):
 		spice_file.write("ASEO=Wp*min_tran_width*trans_diffusion_length ADEO=Wp*min_tran_width*trans_diffusion_length PSEO='Wp*(min_tran_width+2*trans_diffusion_length)' PDEO='Wp*(min_tran_width+2*trans_diffusion_length)'\n")
 		spice_file.write(".ENDS\n\n\n")
 
-	spice_file.close()
 
-def RAM_tgate_generate_lp(filename, use_finfet):
-	""" Generates the SPICE subcircuit for a transmission gate used in the RAM cell. Appends it to file 'filename'. """
+def RAM_tgate_generate_lp(spice_file, use_finfet):
+	""" Generates the SPICE subcircuit for a transmission gate used in the RAM cell. Appends it to 'spice_file'. """
 
-	# Open the file for appending
-	spice_file = open(filename, 'a')  
 
 	if not use_finfet :
 		spice_file.write("******************************************************************************************\n")
@@ -519,4 +479,3 @@ def RAM_tgate_generate_lp(filename, use_finfet):
 		spice_file.write("ASEO=Wp*min_tran_width*trans_diffusion_length ADEO=Wp*min_tran_width*trans_diffusion_length PSEO='Wp*(min_tran_width+2*trans_diffusion_length)' PDEO='Wp*(min_tran_width+2*trans_diffusion_length)'\n")
 		spice_file.write(".ENDS\n\n\n")
 
-	spice_file.close()
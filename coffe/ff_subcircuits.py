@@ -1,11 +1,9 @@
-def generate_ptran_2_input_select_d_ff(spice_filename, use_finfet):
+def generate_ptran_2_input_select_d_ff(spice_file, use_finfet):
 	""" Generates a D Flip-Flop SPICE deck """
 	
 	# This script has to create the SPICE subcircuits required.
 	# It has to return a list of the transistor names used as well as a list of the wire names used.
 	
-	# Open SPICE file for appending
-	spice_file = open(spice_filename, 'a')
 	
 	# Create the FF circuit
 	spice_file.write("******************************************************************************************\n")
@@ -87,14 +85,12 @@ def generate_ptran_2_input_select_d_ff(spice_filename, use_finfet):
 	return tran_names_list, wire_names_list
 	
 	
-def generate_ptran_d_ff(spice_filename, use_finfet):
+def generate_ptran_d_ff(spice_file, use_finfet):
 	""" Generates a D Flip-Flop SPICE deck """
 	
 	# This script has to create the SPICE subcircuits required.
 	# It has to return a list of the transistor names used as well as a list of the wire names used.
 	
-	# Open SPICE file for appending
-	spice_file = open(spice_filename, 'a')
 	
 	# Create the FF circuit
 	spice_file.write("******************************************************************************************\n")
@@ -177,14 +173,12 @@ def generate_ptran_d_ff(spice_filename, use_finfet):
 
 
 
-def generate_tgate_2_input_select_d_ff(spice_filename, use_finfet):
+def generate_tgate_2_input_select_d_ff(spice_file, use_finfet):
 	""" Generates a D Flip-Flop SPICE deck """
 	
 	# This script has to create the SPICE subcircuits required.
 	# It has to return a list of the transistor names used as well as a list of the wire names used.
 	
-	# Open SPICE file for appending
-	spice_file = open(spice_filename, 'a')
 	
 	# Create the FF circuit
 	spice_file.write("******************************************************************************************\n")
@@ -271,14 +265,12 @@ def generate_tgate_2_input_select_d_ff(spice_filename, use_finfet):
 	return tran_names_list, wire_names_list
 	
 	
-def generate_tgate_d_ff(spice_filename, use_finfet):
+def generate_tgate_d_ff(spice_file, use_finfet):
 	""" Generates a D Flip-Flop SPICE deck """
 	
 	# This script has to create the SPICE subcircuits required.
 	# It has to return a list of the transistor names used as well as a list of the wire names used.
 	
-	# Open SPICE file for appending
-	spice_file = open(spice_filename, 'a')
 	
 	# Create the FF circuit
 	spice_file.write("******************************************************************************************\n")
@@ -42,6 +42,7 @@
 import os
 import sys
 import math
+import numpy as np
 
 # Subcircuit Modules
 from . import basic_subcircuits
@@ -60,6 +61,13 @@ from . import top_level
 # HSPICE handling module
 from . import spice
 
+# Logic tile height search (see determine_height): the height is first bracketed with steps of this 
+# fraction of the current height, and the search stops when the bracket is narrower than the tolerance.
+HEIGHT_SEARCH_STEP = 0.1
+HEIGHT_SEARCH_TOLERANCE = 0.01
+HEIGHT_SEARCH_MAX_EXPANSIONS = 5
+GOLDEN_RATIO = (1 + math.sqrt(5))/2
+
 # Track-access locality constants
 OUTPUT_TRACK_ACCESS_SPAN = 0.25
 INPUT_TRACK_ACCESS_SPAN = 0.50
@@ -90,10 +98,63 @@ HEIGHT_SPAN = 0.5
 # In that case the user doesn't need to commit any code changes.
 use_lp_transistor = 1
 
+
+def _sqrt(value):
+    """ Square root of an area or width. Areas, widths and floorplan distances are NumPy arrays with a value
+        per transistor sizing combination when the transistor sizing evaluates a batch of combos at once 
+        (see tran_sizing.get_sizing_combo_loads). """
+
+    if isinstance(value, np.ndarray):
+        return np.sqrt(value)
+    return math.sqrt(value)
+
+
+def _round(value):
+    """ Rounds a transistor size (see _sqrt), ties go to the even size. """
+
+    if isinstance(value, np.ndarray):
+        return np.round(value)
+    return round(value)
+
+
+def _maximum(value1, value2):
+    """ The larger of two lengths, element-wise for NumPy arrays (see _sqrt). """
+
+    if isinstance(value1, np.ndarray) or isinstance(value2, np.ndarray):
+        return np.maximum(value1, value2)
+    if value1 < value2:
+        return value2
+    return value1
+
+
+class _DependencyRecorder:
+    """ Stands in for area_dict, width_dict, wire_lengths or wire_layers when a subcircuit updates its area or wires.
+        It records the entries the subcircuit reads (before writing them itself) and the entries it writes, 
+        so that the FPGA can skip the update the next time none of these inputs changed (see FPGA._update_subcircuit). """
+
+    def __init__(self, data):
+
+        self.data = data
+        self.reads = {}
+        self.writes = {}
+
+    def __getitem__(self, key):
+
+        value = self.data[key]
+        if key not in self.writes and key not in self.reads:
+            self.reads[key] = value
+        return value
+
+    def __setitem__(self, key, value):
+
+        self.data[key] = value
+        self.writes[key] = value
+
+
 class _Specs:
     """ General FPGA specs. """
  
-    def __init__(self, arch_params_dict, quick_mode_threshold):
+    def __init__(self, arch_params_dict, quick_mode_threshold, surrogate_band, search_strategy, joint_erf):
         
         # FPGA architecture specs
         self.N                       = arch_params_dict['N']
@@ -124,6 +185,9 @@ class _Specs:
         self.sense_dv             = arch_params_dict['sense_dv']
         self.worst_read_current   = arch_params_dict['worst_read_current']
         self.quick_mode_threshold = quick_mode_threshold
+        self.surrogate_band       = surrogate_band
+        self.search_strategy      = search_strategy
+        self.joint_erf            = joint_erf
         self.vdd_low_power        = arch_params_dict['vdd_low_power']
         self.vref                 = arch_params_dict['vref']
         self.number_of_banks      = arch_params_dict['number_of_banks']
@@ -250,7 +314,7 @@ class _SwitchBlockMUX(_SizableCircuit):
         self.use_tgate = use_tgate
         
         
-    def generate(self, subcircuit_filename, min_tran_width):
+    def generate(self, subcircuit_netlist, min_tran_width):
         """ 
         Generate switch block mux. 
         Calculates implementation specific details and write the SPICE subcircuit. 
@@ -268,7 +332,7 @@ class _SwitchBlockMUX(_SizableCircuit):
         # TODO: wouldn't be better for inv 1 to start with pmos = 8 and nmos = 4
         # Call MUX generation function
         if not self.use_tgate :
-            self.transistor_names, self.wire_names = mux_subcircuits.generate_ptran_2lvl_mux(subcircuit_filename, self.name, self.implemented_size, self.level1_size, self.level2_size)
+            self.transistor_names, self.wire_names = mux_subcircuits.generate_ptran_2lvl_mux(subcircuit_netlist, self.name, self.implemented_size, self.level1_size, self.level2_size)
             # Initialize transistor sizes (to something more reasonable than all min size, but not necessarily a good choice, depends on architecture params)
             self.initial_transistor_sizes["ptran_" + self.name + "_L1_nmos"] = 3
             self.initial_transistor_sizes["ptran_" + self.name + "_L2_nmos"] = 4
@@ -279,7 +343,7 @@ class _SwitchBlockMUX(_SizableCircuit):
             self.initial_transistor_sizes["inv_" + self.name + "_2_pmos"] = 20
 
         else :
-            self.transistor_names, self.wire_names = mux_subcircuits.generate_tgate_2lvl_mux(subcircuit_filename, self.name, self.implemented_size, self.level1_size, self.level2_size)
+            self.transistor_names, self.wire_names = mux_subcircuits.generate_tgate_2lvl_mux(subcircuit_netlist, self.name, self.implemented_size, self.level1_size, self.level2_size)
             # Initialize transistor sizes (to something more reasonable than all min size, but not necessarily a good choice, depends on architecture params)
             self.initial_transistor_sizes["tgate_" + self.name + "_L1_nmos"] = 3
             self.initial_transistor_sizes["tgate_" + self.name + "_L1_pmos"] = 3
@@ -324,8 +388,8 @@ class _SwitchBlockMUX(_SizableCircuit):
         # MUX area including SRAM
         area_with_sram = (area + (self.level1_size + self.level2_size)*area_dict["sram"])
         
-        width = math.sqrt(area)
-        width_with_sram = math.sqrt(area_with_sram)
+        width = _sqrt(area)
+        width_with_sram = _sqrt(area_with_sram)
         area_dict[self.name] = area
         width_dict[self.name] = width
         area_dict[self.name + "_sram"] = area_with_sram
@@ -395,7 +459,7 @@ class _ConnectionBlockMUX(_SizableCircuit):
         self.use_tgate = use_tgate
         
     
-    def generate(self, subcircuit_filename, min_tran_width):
+    def generate(self, subcircuit_netlist, min_tran_width):
         print("Generating connection block mux")
         
         # Calculate level sizes and number of SRAMs per mux
@@ -407,7 +471,7 @@ class _ConnectionBlockMUX(_SizableCircuit):
         
         # Call MUX generation function
         if not self.use_tgate :
-            self.transistor_names, self.wire_names = mux_subcircuits.generate_ptran_2lvl_mux(subcircuit_filename, self.name, self.implemented_size, self.level1_size, self.level2_size)
+            self.transistor_names, self.wire_names = mux_subcircuits.generate_ptran_2lvl_mux(subcircuit_netlist, self.name, self.implemented_size, self.level1_size, self.level2_size)
             # Initialize transistor sizes (to something more reasonable than all min size, but not necessarily a good choice, depends on architecture params)
             self.initial_transistor_sizes["ptran_" + self.name + "_L1_nmos"] = 2
             self.initial_transistor_sizes["ptran_" + self.name + "_L2_nmos"] = 2
@@ -417,7 +481,7 @@ class _ConnectionBlockMUX(_SizableCircuit):
             self.initial_transistor_sizes["inv_" + self.name + "_2_nmos"] = 6
             self.initial_transistor_sizes["inv_" + self.name + "_2_pmos"] = 12
         else :
-            self.transistor_names, self.wire_names = mux_subcircuits.generate_tgate_2lvl_mux(subcircuit_filename, self.name, self.implemented_size, self.level1_size, self.level2_size)
+            self.transistor_names, self.wire_names = mux_subcircuits.generate_tgate_2lvl_mux(subcircuit_netlist, self.name, self.implemented_size, self.level1_size, self.level2_size)
             # Initialize transistor sizes (to something more reasonable than all min size, but not necessarily a good choice, depends on architecture params)
             self.initial_transistor_sizes["tgate_" + self.name + "_L1_nmos"] = 2
             self.initial_transistor_sizes["tgate_" + self.name + "_L1_pmos"] = 2
@@ -465,8 +529,8 @@ class _ConnectionBlockMUX(_SizableCircuit):
         # MUX area including SRAM
         area_with_sram = (area + (self.level1_size + self.level2_size)*area_dict["sram"])
         
-        width = math.sqrt(area)
-        width_with_sram = math.sqrt(area_with_sram)
+        width = _sqrt(area)
+        width_with_sram = _sqrt(area_with_sram)
         area_dict[self.name] = area
         width_dict[self.name] = width
         area_dict[self.name + "_sram"] = area_with_sram
@@ -535,7 +599,7 @@ class _LocalMUX(_SizableCircuit):
         self.use_tgate = use_tgate
     
     
-    def generate(self, subcircuit_filename, min_tran_width):
+    def generate(self, subcircuit_netlist, min_tran_width):
         print("Generating local mux")
         
         # Calculate level sizes and number of SRAMs per mux
@@ -547,7 +611,7 @@ class _LocalMUX(_SizableCircuit):
         
         if not self.use_tgate :
             # Call MUX generation function
-            self.transistor_names, self.wire_names = mux_subcircuits.generate_ptran_2lvl_mux_no_driver(subcircuit_filename, self.name, self.implemented_size, self.level1_size, self.level2_size)
+            self.transistor_names, self.wire_names = mux_subcircuits.generate_ptran_2lvl_mux_no_driver(subcircuit_netlist, self.name, self.implemented_size, self.level1_size, self.level2_size)
             
             # Initialize transistor sizes (to something more reasonable than all min size, but not necessarily a good choice, depends on architecture params)
             self.initial_transistor_sizes["ptran_" + self.name + "_L1_nmos"] = 2
@@ -557,7 +621,7 @@ class _LocalMUX(_SizableCircuit):
             self.initial_transistor_sizes["inv_" + self.name + "_1_pmos"] = 2
         else :
             # Call MUX generation function
-            self.transistor_names, self.wire_names = mux_subcircuits.generate_tgate_2lvl_mux_no_driver(subcircuit_filename, self.name, self.implemented_size, self.level1_size, self.level2_size)
+            self.transistor_names, self.wire_names = mux_subcircuits.generate_tgate_2lvl_mux_no_driver(subcircuit_netlist, self.name, self.implemented_size, self.level1_size, self.level2_size)
             
             # Initialize transistor sizes (to something more reasonable than all min size, but not necessarily a good choice, depends on architecture params)
             self.initial_transistor_sizes["tgate_" + self.name + "_L1_nmos"] = 2
@@ -594,8 +658,8 @@ class _LocalMUX(_SizableCircuit):
         # MUX area including SRAM
         area_with_sram = (area + (self.level1_size + self.level2_size)*area_dict["sram"])
           
-        width = math.sqrt(area)
-        width_with_sram = math.sqrt(area_with_sram)
+        width = _sqrt(area)
+        width_with_sram = _sqrt(area_with_sram)
         area_dict[self.name] = area
         width_dict[self.name] = width
         area_dict[self.name + "_sram"] = area_with_sram
@@ -648,12 +712,12 @@ class _LUTInputDriver(_SizableCircuit):
         self.use_tgate = use_tgate
         self.use_fluts = use_fluts
         
-    def generate(self, subcircuit_filename, min_tran_width):
+    def generate(self, subcircuit_netlist, min_tran_width):
         """ Generate SPICE netlist based on type of LUT input driver. """
         if not self.use_tgate :
-            self.transistor_names, self.wire_names = lut_subcircuits.generate_ptran_lut_driver(subcircuit_filename, self.name, self.type)
+            self.transistor_names, self.wire_names = lut_subcircuits.generate_ptran_lut_driver(subcircuit_netlist, self.name, self.type)
         else :
-            self.transistor_names, self.wire_names = lut_subcircuits.generate_tgate_lut_driver(subcircuit_filename, self.name, self.type)
+            self.transistor_names, self.wire_names = lut_subcircuits.generate_tgate_lut_driver(subcircuit_netlist, self.name, self.type)
         
         # Initialize transistor sizes (to something more reasonable than all min size, but not necessarily a good choice, depends on architecture params)
         if not self.use_tgate :
@@ -727,7 +791,7 @@ class _LUTInputDriver(_SizableCircuit):
             area += area_dict["sram"]
         
         # Calculate layout width
-        width = math.sqrt(area)
+        width = _sqrt(area)
         
         # Add to dictionaries
         area_dict[self.name] = area
@@ -794,12 +858,12 @@ class _LUTInputNotDriver(_SizableCircuit):
         self.use_tgate = use_tgate
    
     
-    def generate(self, subcircuit_filename, min_tran_width):
+    def generate(self, subcircuit_netlist, min_tran_width):
         """ Generate not-driver SPICE netlist """
         if not self.use_tgate :
-            self.transistor_names, self.wire_names = lut_subcircuits.generate_ptran_lut_not_driver(subcircuit_filename, self.name)
+            self.transistor_names, self.wire_names = lut_subcircuits.generate_ptran_lut_not_driver(subcircuit_netlist, self.name)
         else :
-            self.transistor_names, self.wire_names = lut_subcircuits.generate_tgate_lut_not_driver(subcircuit_filename, self.name)
+            self.transistor_names, self.wire_names = lut_subcircuits.generate_tgate_lut_not_driver(subcircuit_netlist, self.name)
         
         # Initialize transistor sizes (to something more reasonable than all min size, but not necessarily a good choice, depends on architecture params)
         self.initial_transistor_sizes["inv_" + self.name + "_1_nmos"] = 1
@@ -824,7 +888,7 @@ class _LUTInputNotDriver(_SizableCircuit):
         
         area = (area_dict["inv_" + self.name + "_1"] +
                 area_dict["inv_" + self.name + "_2"])
-        width = math.sqrt(area)
+        width = _sqrt(area)
         area_dict[self.name] = area
         width_dict[self.name] = width
         
@@ -873,15 +937,15 @@ class _LUTInput(_CompoundCircuit):
         self.delay_weight = delay_weight
         
         
-    def generate(self, subcircuit_filename, min_tran_width):
+    def generate(self, subcircuit_netlist, min_tran_width):
         """ Generate both driver and not-driver SPICE netlists. """
         
         print("Generating lut " + self.name + "-input driver (" + self.type + ")")
 
         # Generate the driver
-        init_tran_sizes = self.driver.generate(subcircuit_filename, min_tran_width)
+        init_tran_sizes = self.driver.generate(subcircuit_netlist, min_tran_width)
         # Generate the not driver
-        init_tran_sizes.update(self.not_driver.generate(subcircuit_filename, min_tran_width))
+        init_tran_sizes.update(self.not_driver.generate(subcircuit_netlist, min_tran_width))
 
         return init_tran_sizes
   
@@ -945,38 +1009,38 @@ class _LUTInputDriverLoad:
         wire_layers["wire_lut_" + self.name + "_driver_load"] = 0
         
         
-    def generate(self, subcircuit_filename, K):
+    def generate(self, subcircuit_netlist, K):
         
         print("Generating LUT " + self.name + "-input driver load")
         
         if not self.use_tgate :
             # Call generation function based on input
             if self.name == "a":
-                self.wire_names = lut_subcircuits.generate_ptran_lut_driver_load(subcircuit_filename, self.name, K, self.use_fluts)
+                self.wire_names = lut_subcircuits.generate_ptran_lut_driver_load(subcircuit_netlist, self.name, K, self.use_fluts)
             elif self.name == "b":
-                self.wire_names = lut_subcircuits.generate_ptran_lut_driver_load(subcircuit_filename, self.name, K, self.use_fluts)
+                self.wire_names = lut_subcircuits.generate_ptran_lut_driver_load(subcircuit_netlist, self.name, K, self.use_fluts)
             elif self.name == "c":
-                self.wire_names = lut_subcircuits.generate_ptran_lut_driver_load(subcircuit_filename, self.name, K, self.use_fluts)
+                self.wire_names = lut_subcircuits.generate_ptran_lut_driver_load(subcircuit_netlist, self.name, K, self.use_fluts)
             elif self.name == "d":
-                self.wire_names = lut_subcircuits.generate_ptran_lut_driver_load(subcircuit_filename, self.name, K, self.use_fluts)
+                self.wire_names = lut_subcircuits.generate_ptran_lut_driver_load(subcircuit_netlist, self.name, K, self.use_fluts)
             elif self.name == "e":
-                self.wire_names = lut_subcircuits.generate_ptran_lut_driver_load(subcircuit_filename, self.name, K, self.use_fluts)
+                self.wire_names = lut_subcircuits.generate_ptran_lut_driver_load(subcircuit_netlist, self.name, K, self.use_fluts)
             elif self.name == "f":
-                self.wire_names = lut_subcircuits.generate_ptran_lut_driver_load(subcircuit_filename, self.name, K, self.use_fluts)
+                self.wire_names = lut_subcircuits.generate_ptran_lut_driver_load(subcircuit_netlist, self.name, K, self.use_fluts)
         else :
             # Call generation function based on input
             if self.name == "a":
-                self.wire_names = lut_subcircuits.generate_tgate_lut_driver_load(subcircuit_filename, self.name, K, self.use_fluts)
+                self.wire_names = lut_subcircuits.generate_tgate_lut_driver_load(subcircuit_netlist, self.name, K, self.use_fluts)
             elif self.name == "b":
-                self.wire_names = lut_subcircuits.generate_tgate_lut_driver_load(subcircuit_filename, self.name, K, self.use_fluts)
+                self.wire_names = lut_subcircuits.generate_tgate_lut_driver_load(subcircuit_netlist, self.name, K, self.use_fluts)
             elif self.name == "c":
-                self.wire_names = lut_subcircuits.generate_tgate_lut_driver_load(subcircuit_filename, self.name, K, self.use_fluts)
+                self.wire_names = lut_subcircuits.generate_tgate_lut_driver_load(subcircuit_netlist, self.name, K, self.use_fluts)
             elif self.name == "d":
-                self.wire_names = lut_subcircuits.generate_tgate_lut_driver_load(subcircuit_filename, self.name, K, self.use_fluts)
+                self.wire_names = lut_subcircuits.generate_tgate_lut_driver_load(subcircuit_netlist, self.name, K, self.use_fluts)
             elif self.name == "e":
-                self.wire_names = lut_subcircuits.generate_tgate_lut_driver_load(subcircuit_filename, self.name, K, self.use_fluts)
+                self.wire_names = lut_subcircuits.generate_tgate_lut_driver_load(subcircuit_netlist, self.name, K, self.use_fluts)
             elif self.name == "f":
-                self.wire_names = lut_subcircuits.generate_tgate_lut_driver_load(subcircuit_filename, self.name, K, self.use_fluts)
+                self.wire_names = lut_subcircuits.generate_tgate_lut_driver_load(subcircuit_netlist, self.name, K, self.use_fluts)
         
         
     def print_details(self):
@@ -1049,7 +1113,7 @@ class _LUT(_SizableCircuit):
         self.use_finfet = use_finfet
         
     
-    def generate(self, subcircuit_filename, min_tran_width):
+    def generate(self, subcircuit_netlist, min_tran_width):
         """ Generate LUT SPICE netlist based on LUT size. """
         
         # Generate LUT differently based on K
@@ -1062,11 +1126,11 @@ class _LUT(_SizableCircuit):
             tempK = self.K - 1
 
         if tempK == 6:
-            init_tran_sizes = self._generate_6lut(subcircuit_filename, min_tran_width, self.use_tgate, self.use_finfet, self.use_fluts)
+            init_tran_sizes = self._generate_6lut(subcircuit_netlist, min_tran_width, self.use_tgate, self.use_finfet, self.use_fluts)
         elif tempK == 5:
-            init_tran_sizes = self._generate_5lut(subcircuit_filename, min_tran_width, self.use_tgate, self.use_finfet, self.use_fluts)
+            init_tran_sizes = self._generate_5lut(subcircuit_netlist, min_tran_width, self.use_tgate, self.use_finfet, self.use_fluts)
         elif tempK == 4:
-            init_tran_sizes = self._generate_4lut(subcircuit_filename, min_tran_width, self.use_tgate, self.use_finfet, self.use_fluts)
+            init_tran_sizes = self._generate_4lut(subcircuit_netlist, min_tran_width, self.use_tgate, self.use_finfet, self.use_fluts)
 
   
         return init_tran_sizes
@@ -1191,7 +1255,7 @@ class _LUT(_SizableCircuit):
             area = 2*area
             area = area + area_dict["flut_mux"]
 
-        width = math.sqrt(area)
+        width = _sqrt(area)
         area_dict["lut"] = area
         width_dict["lut"] = width
         
@@ -1205,7 +1269,7 @@ class _LUT(_SizableCircuit):
         total_lut_area = total_lut_area + area_dict["lut"]
 
         area_dict["lut_and_drivers"] = total_lut_area
-        width_dict["lut_and_drivers"] = math.sqrt(total_lut_area)
+        width_dict["lut_and_drivers"] = _sqrt(total_lut_area)
         
         return total_lut_area
     
@@ -1389,7 +1453,7 @@ class _LUT(_SizableCircuit):
         utils.print_and_write(report_file,"")
         
     
-    def _generate_6lut(self, subcircuit_filename, min_tran_width, use_tgate, use_finfet, use_fluts):
+    def _generate_6lut(self, subcircuit_netlist, min_tran_width, use_tgate, use_finfet, use_fluts):
         """ This function created the lut subcircuit and all the drivers and driver not subcircuits """
         print("Generating 6-LUT")
 
@@ -1400,7 +1464,7 @@ class _LUT(_SizableCircuit):
         # Call the generation function
         if not use_tgate :
             # use pass transistors
-            self.transistor_names, self.wire_names = lut_subcircuits.generate_ptran_lut6(subcircuit_filename, min_tran_width, use_finfet)
+            self.transistor_names, self.wire_names = lut_subcircuits.generate_ptran_lut6(subcircuit_netlist, min_tran_width, use_finfet)
 
             # Give initial transistor sizes
             self.initial_transistor_sizes["inv_lut_0sram_driver_2_nmos"] = 4
@@ -1424,7 +1488,7 @@ class _LUT(_SizableCircuit):
 
         else :
             # use transmission gates
-            self.transistor_names, self.wire_names = lut_subcircuits.generate_tgate_lut6(subcircuit_filename, min_tran_width, use_finfet)
+            self.transistor_names, self.wire_names = lut_subcircuits.generate_tgate_lut6(subcircuit_netlist, min_tran_width, use_finfet)
 
             # Give initial transistor sizes
             self.initial_transistor_sizes["inv_lut_0sram_driver_2_nmos"] = 4
@@ -1452,32 +1516,32 @@ class _LUT(_SizableCircuit):
         
         
         # Generate input drivers (with register feedback if input is in Rfb)
-        self.input_drivers["a"].generate(subcircuit_filename, min_tran_width)
-        self.input_drivers["b"].generate(subcircuit_filename, min_tran_width)
-        self.input_drivers["c"].generate(subcircuit_filename, min_tran_width)
-        self.input_drivers["d"].generate(subcircuit_filename, min_tran_width)
-        self.input_drivers["e"].generate(subcircuit_filename, min_tran_width)
-        self.input_drivers["f"].generate(subcircuit_filename, min_tran_width)
+        self.input_drivers["a"].generate(subcircuit_netlist, min_tran_width)
+        self.input_drivers["b"].generate(subcircuit_netlist, min_tran_width)
+        self.input_drivers["c"].generate(subcircuit_netlist, min_tran_width)
+        self.input_drivers["d"].generate(subcircuit_netlist, min_tran_width)
+        self.input_drivers["e"].generate(subcircuit_netlist, min_tran_width)
+        self.input_drivers["f"].generate(subcircuit_netlist, min_tran_width)
         
         # Generate input driver loads
-        self.input_driver_loads["a"].generate(subcircuit_filename, self.K)
-        self.input_driver_loads["b"].generate(subcircuit_filename, self.K)
-        self.input_driver_loads["c"].generate(subcircuit_filename, self.K)
-        self.input_driver_loads["d"].generate(subcircuit_filename, self.K)
-        self.input_driver_loads["e"].generate(subcircuit_filename, self.K)
-        self.input_driver_loads["f"].generate(subcircuit_filename, self.K)
+        self.input_driver_loads["a"].generate(subcircuit_netlist, self.K)
+        self.input_driver_loads["b"].generate(subcircuit_netlist, self.K)
+        self.input_driver_loads["c"].generate(subcircuit_netlist, self.K)
+        self.input_driver_loads["d"].generate(subcircuit_netlist, self.K)
+        self.input_driver_loads["e"].generate(subcircuit_netlist, self.K)
+        self.input_driver_loads["f"].generate(subcircuit_netlist, self.K)
        
         return self.initial_transistor_sizes
 
         
-    def _generate_5lut(self, subcircuit_filename, min_tran_width, use_tgate, use_finfet, use_fluts):
+    def _generate_5lut(self, subcircuit_netlist, min_tran_width, use_tgate, use_finfet, use_fluts):
         """ This function created the lut subcircuit and all the drivers and driver not subcircuits """
         print("Generating 5-LUT")
         
         # Call the generation function
         if not use_tgate :
             # use pass transistor
-            self.transistor_names, self.wire_names = lut_subcircuits.generate_ptran_lut5(subcircuit_filename, min_tran_width, use_finfet)
+            self.transistor_names, self.wire_names = lut_subcircuits.generate_ptran_lut5(subcircuit_netlist, min_tran_width, use_finfet)
             # Give initial transistor sizes
             self.initial_transistor_sizes["inv_lut_0sram_driver_2_nmos"] = 4
             self.initial_transistor_sizes["inv_lut_0sram_driver_2_pmos"] = 6
@@ -1498,7 +1562,7 @@ class _LUT(_SizableCircuit):
             self.initial_transistor_sizes["inv_lut_out_buffer_2_pmos"] = 6
         else :
             # use transmission gates
-            self.transistor_names, self.wire_names = lut_subcircuits.generate_tgate_lut5(subcircuit_filename, min_tran_width, use_finfet)
+            self.transistor_names, self.wire_names = lut_subcircuits.generate_tgate_lut5(subcircuit_netlist, min_tran_width, use_finfet)
             # Give initial transistor sizes
             self.initial_transistor_sizes["inv_lut_0sram_driver_2_nmos"] = 4
             self.initial_transistor_sizes["inv_lut_0sram_driver_2_pmos"] = 6
@@ -1523,36 +1587,36 @@ class _LUT(_SizableCircuit):
 
        
         # Generate input drivers (with register feedback if input is in Rfb)
-        self.input_drivers["a"].generate(subcircuit_filename, min_tran_width)
-        self.input_drivers["b"].generate(subcircuit_filename, min_tran_width)
-        self.input_drivers["c"].generate(subcircuit_filename, min_tran_width)
-        self.input_drivers["d"].generate(subcircuit_filename, min_tran_width)
-        self.input_drivers["e"].generate(subcircuit_filename, min_tran_width)
+        self.input_drivers["a"].generate(subcircuit_netlist, min_tran_width)
+        self.input_drivers["b"].generate(subcircuit_netlist, min_tran_width)
+        self.input_drivers["c"].generate(subcircuit_netlist, min_tran_width)
+        self.input_drivers["d"].generate(subcircuit_netlist, min_tran_width)
+        self.input_drivers["e"].generate(subcircuit_netlist, min_tran_width)
 
         if use_fluts:
-            self.input_drivers["f"].generate(subcircuit_filename, min_tran_width)
+            self.input_drivers["f"].generate(subcircuit_netlist, min_tran_width)
         
         # Generate input driver loads
-        self.input_driver_loads["a"].generate(subcircuit_filename, self.K)
-        self.input_driver_loads["b"].generate(subcircuit_filename, self.K)
-        self.input_driver_loads["c"].generate(subcircuit_filename, self.K)
-        self.input_driver_loads["d"].generate(subcircuit_filename, self.K)
-        self.input_driver_loads["e"].generate(subcircuit_filename, self.K)
+        self.input_driver_loads["a"].generate(subcircuit_netlist, self.K)
+        self.input_driver_loads["b"].generate(subcircuit_netlist, self.K)
+        self.input_driver_loads["c"].generate(subcircuit_netlist, self.K)
+        self.input_driver_loads["d"].generate(subcircuit_netlist, self.K)
+        self.input_driver_loads["e"].generate(subcircuit_netlist, self.K)
 
         if use_fluts:
-            self.input_driver_loads["f"].generate(subcircuit_filename, self.K)
+            self.input_driver_loads["f"].generate(subcircuit_netlist, self.K)
         
         return self.initial_transistor_sizes
 
   
-    def _generate_4lut(self, subcircuit_filename, min_tran_width, use_tgate, use_finfet, use_fluts):
+    def _generate_4lut(self, subcircuit_netlist, min_tran_width, use_tgate, use_finfet, use_fluts):
         """ This function created the lut subcircuit and all the drivers and driver not subcircuits """
         print("Generating 4-LUT")
         
         # Call the generation function
         if not use_tgate :
             # use pass transistor
-            self.transistor_names, self.wire_names = lut_subcircuits.generate_ptran_lut4(subcircuit_filename, min_tran_width, use_finfet)
+            self.transistor_names, self.wire_names = lut_subcircuits.generate_ptran_lut4(subcircuit_netlist, min_tran_width, use_finfet)
             # Give initial transistor sizes
             self.initial_transistor_sizes["inv_lut_0sram_driver_2_nmos"] = 4
             self.initial_transistor_sizes["inv_lut_0sram_driver_2_pmos"] = 6
@@ -1572,7 +1636,7 @@ class _LUT(_SizableCircuit):
             self.initial_transistor_sizes["inv_lut_out_buffer_2_pmos"] = 6
         else :
             # use transmission gates
-            self.transistor_names, self.wire_names = lut_subcircuits.generate_tgate_lut4(subcircuit_filename, min_tran_width, use_finfet)
+            self.transistor_names, self.wire_names = lut_subcircuits.generate_tgate_lut4(subcircuit_netlist, min_tran_width, use_finfet)
             # Give initial transistor sizes
             self.initial_transistor_sizes["inv_lut_0sram_driver_2_nmos"] = 4
             self.initial_transistor_sizes["inv_lut_0sram_driver_2_pmos"] = 6
@@ -1594,22 +1658,22 @@ class _LUT(_SizableCircuit):
             self.initial_transistor_sizes["inv_lut_out_buffer_2_pmos"] = 6
        
         # Generate input drivers (with register feedback if input is in Rfb)
-        self.input_drivers["a"].generate(subcircuit_filename, min_tran_width)
-        self.input_drivers["b"].generate(subcircuit_filename, min_tran_width)
-        self.input_drivers["c"].generate(subcircuit_filename, min_tran_width)
-        self.input_drivers["d"].generate(subcircuit_filename, min_tran_width)
+        self.input_drivers["a"].generate(subcircuit_netlist, min_tran_width)
+        self.input_drivers["b"].generate(subcircuit_netlist, min_tran_width)
+        self.input_drivers["c"].generate(subcircuit_netlist, min_tran_width)
+        self.input_drivers["d"].generate(subcircuit_netlist, min_tran_width)
         
         # Generate input driver loads
-        self.input_driver_loads["a"].generate(subcircuit_filename, self.K)
-        self.input_driver_loads["b"].generate(subcircuit_filename, self.K)
-        self.input_driver_loads["c"].generate(subcircuit_filename, self.K)
-        self.input_driver_loads["d"].generate(subcircuit_filename, self.K)
+        self.input_driver_loads["a"].generate(subcircuit_netlist, self.K)
+        self.input_driver_loads["b"].generate(subcircuit_netlist, self.K)
+        self.input_driver_loads["c"].generate(subcircuit_netlist, self.K)
+        self.input_driver_loads["d"].generate(subcircuit_netlist, self.K)
 
         # *TODO: Add the second level of fracturability where the input f also will be used
         # If this is one level fracutrable LUT then the e input will still be used
         if use_fluts:
-            self.input_drivers["e"].generate(subcircuit_filename, min_tran_width)
-            self.input_driver_loads["e"].generate(subcircuit_filename, self.K)
+            self.input_drivers["e"].generate(subcircuit_netlist, min_tran_width)
+            self.input_driver_loads["e"].generate(subcircuit_netlist, self.K)
         
         return self.initial_transistor_sizes
 
@@ -1626,11 +1690,11 @@ class _CarryChainMux(_SizableCircuit):
         # assert use_fluts
         
 
-    def generate(self, subcircuit_filename, min_tran_width, use_finfet):
+    def generate(self, subcircuit_netlist, min_tran_width, use_finfet):
         """ Generate the SPICE netlists."""  
 
         if not self.use_tgate :
-            self.transistor_names, self.wire_names = mux_subcircuits.generate_ptran_2_to_1_mux(subcircuit_filename, self.name)
+            self.transistor_names, self.wire_names = mux_subcircuits.generate_ptran_2_to_1_mux(subcircuit_netlist, self.name)
             # Initialize transistor sizes (to something more reasonable than all min size, but not necessarily a good choice, depends on architecture params)
             self.initial_transistor_sizes["ptran_" + self.name + "_nmos"] = 2
             self.initial_transistor_sizes["rest_" + self.name + "_pmos"] = 1
@@ -1639,7 +1703,7 @@ class _CarryChainMux(_SizableCircuit):
             self.initial_transistor_sizes["inv_" + self.name + "_2_nmos"] = 5
             self.initial_transistor_sizes["inv_" + self.name + "_2_pmos"] = 5
         else :
-            self.transistor_names, self.wire_names = mux_subcircuits.generate_tgate_2_to_1_mux(subcircuit_filename, self.name)      
+            self.transistor_names, self.wire_names = mux_subcircuits.generate_tgate_2_to_1_mux(subcircuit_netlist, self.name)      
             # Initialize transistor sizes (to something more reasonable than all min size, but not necessarily a good choice, depends on architecture params)
             self.initial_transistor_sizes["tgate_" + self.name + "_nmos"] = 2
             self.initial_transistor_sizes["tgate_" + self.name + "_pmos"] = 2
@@ -1668,7 +1732,7 @@ class _CarryChainMux(_SizableCircuit):
                     area_dict["inv_" + self.name + "_2"])
 
         area = area + area_dict["sram"]
-        width = math.sqrt(area)
+        width = _sqrt(area)
         area_dict[self.name] = area
         width_dict[self.name] = width
 
@@ -1705,13 +1769,13 @@ class _CarryChainPer(_SizableCircuit):
 
 
 
-    def generate(self, subcircuit_filename, min_tran_width, use_finfet):
+    def generate(self, subcircuit_netlist, min_tran_width, use_finfet):
         """ Generate the SPICE netlists."""  
 
 
         # if type is skip, we need to generate two levels of nand + not for the and tree
         # if type is ripple, we need to add the delay of one inverter for the final sum.
-        self.transistor_names, self.wire_names = lut_subcircuits.generate_carry_chain_perf_ripple(subcircuit_filename, self.name, use_finfet)
+        self.transistor_names, self.wire_names = lut_subcircuits.generate_carry_chain_perf_ripple(subcircuit_netlist, self.name, use_finfet)
         self.initial_transistor_sizes["inv_" + self.name + "_1_nmos"] = 1
         self.initial_transistor_sizes["inv_" + self.name + "_1_pmos"] = 1
 
@@ -1731,7 +1795,7 @@ class _CarryChainPer(_SizableCircuit):
 
         area = area_dict["inv_carry_chain_perf_1"]    
         area_with_sram = area
-        width = math.sqrt(area)
+        width = _sqrt(area)
         area_dict[self.name] = area
         width_dict[self.name] = width
 
@@ -1756,10 +1820,10 @@ class _CarryChain(_SizableCircuit):
         self.N = N
 
 
-    def generate(self, subcircuit_filename, min_tran_width, use_finfet):
+    def generate(self, subcircuit_netlist, min_tran_width, use_finfet):
         """ Generate Carry chain SPICE netlists."""  
 
-        self.transistor_names, self.wire_names = lut_subcircuits.generate_full_adder_simplified(subcircuit_filename, self.name, use_finfet)
+        self.transistor_names, self.wire_names = lut_subcircuits.generate_full_adder_simplified(subcircuit_netlist, self.name, use_finfet)
 
         # if type is skip, we need to generate two levels of nand + not for the and tree
         # if type is ripple, we need to add the delay of one inverter for the final sum.
@@ -1785,7 +1849,7 @@ class _CarryChain(_SizableCircuit):
         area = area_dict["inv_carry_chain_1"] * 2 + area_dict["inv_carry_chain_2"] + area_dict["tgate_carry_chain_1"] * 4 + area_dict["tgate_carry_chain_2"] * 4
         area = area + area_dict["carry_chain_perf"]
         area_with_sram = area
-        width = math.sqrt(area)
+        width = _sqrt(area)
         area_dict[self.name] = area
         width_dict[self.name] = width
 
@@ -1847,10 +1911,10 @@ class _CarryChainSkipAnd(_SizableCircuit):
             self.nand2_size = 3
 
 
-    def generate(self, subcircuit_filename, min_tran_width, use_finfet):
+    def generate(self, subcircuit_netlist, min_tran_width, use_finfet):
         """ Generate Carry chain SPICE netlists."""  
 
-        self.transistor_names, self.wire_names = lut_subcircuits.generate_skip_and_tree(subcircuit_filename, self.name, use_finfet, self.nand1_size, self.nand2_size)
+        self.transistor_names, self.wire_names = lut_subcircuits.generate_skip_and_tree(subcircuit_netlist, self.name, use_finfet, self.nand1_size, self.nand2_size)
 
         self.initial_transistor_sizes["inv_nand"+str(self.nand1_size)+"_xcarry_chain_and_1_nmos"] = 1
         self.initial_transistor_sizes["inv_nand"+str(self.nand1_size)+"_xcarry_chain_and_1_pmos"] = 1
@@ -1874,7 +1938,7 @@ class _CarryChainSkipAnd(_SizableCircuit):
         area_2 = area_dict["inv_nand"+str(self.nand2_size)+"_xcarry_chain_and_3"] + area_dict["inv_xcarry_chain_and_4"]
         area = area_1 + area_2
         area_with_sram = area
-        width = math.sqrt(area)
+        width = _sqrt(area)
         area_dict[self.name] = area
         width_dict[self.name] = width
 
@@ -1902,10 +1966,10 @@ class _CarryChainInterCluster(_SizableCircuit):
         # length of the wire between cout of a cluster to cin of the other
         self.inter_wire_length = inter_wire_length
 
-    def generate(self, subcircuit_filename, min_tran_width, use_finfet):
+    def generate(self, subcircuit_netlist, min_tran_width, use_finfet):
         """ Generate Carry chain SPICE netlists."""  
 
-        self.transistor_names, self.wire_names = lut_subcircuits.generate_carry_inter(subcircuit_filename, self.name, use_finfet)
+        self.transistor_names, self.wire_names = lut_subcircuits.generate_carry_inter(subcircuit_netlist, self.name, use_finfet)
 
         self.initial_transistor_sizes["inv_" + self.name + "_1_nmos"] = 1
         self.initial_transistor_sizes["inv_" + self.name + "_1_pmos"] = 1
@@ -1923,7 +1987,7 @@ class _CarryChainInterCluster(_SizableCircuit):
         """ Calculate Carry Chain area and update dictionaries. """
         area = area_dict["inv_" + self.name + "_1"] + area_dict["inv_" + self.name + "_2"]
         area_with_sram = area
-        width = math.sqrt(area)
+        width = _sqrt(area)
         area_dict[self.name] = area
         width_dict[self.name] = width
 
@@ -1948,11 +2012,11 @@ class _CarryChainSkipMux(_SizableCircuit):
 
 
 
-    def generate(self, subcircuit_filename, min_tran_width, use_finfet):
+    def generate(self, subcircuit_netlist, min_tran_width, use_finfet):
         """ Generate the SPICE netlists."""  
 
         if not self.use_tgate :
-            self.transistor_names, self.wire_names = mux_subcircuits.generate_ptran_2_to_1_mux(subcircuit_filename, self.name)
+            self.transistor_names, self.wire_names = mux_subcircuits.generate_ptran_2_to_1_mux(subcircuit_netlist, self.name)
             # Initialize transistor sizes (to something more reasonable than all min size, but not necessarily a good choice, depends on architecture params)
             self.initial_transistor_sizes["ptran_" + self.name + "_nmos"] = 2
             self.initial_transistor_sizes["rest_" + self.name + "_pmos"] = 1
@@ -1961,7 +2025,7 @@ class _CarryChainSkipMux(_SizableCircuit):
             self.initial_transistor_sizes["inv_" + self.name + "_2_nmos"] = 5
             self.initial_transistor_sizes["inv_" + self.name + "_2_pmos"] = 5
         else :
-            self.transistor_names, self.wire_names = mux_subcircuits.generate_tgate_2_to_1_mux(subcircuit_filename, self.name)      
+            self.transistor_names, self.wire_names = mux_subcircuits.generate_tgate_2_to_1_mux(subcircuit_netlist, self.name)      
             # Initialize transistor sizes (to something more reasonable than all min size, but not necessarily a good choice, depends on architecture params)
             self.initial_transistor_sizes["tgate_" + self.name + "_nmos"] = 2
             self.initial_transistor_sizes["tgate_" + self.name + "_pmos"] = 2
@@ -1990,7 +2054,7 @@ class _CarryChainSkipMux(_SizableCircuit):
                     area_dict["inv_" + self.name + "_2"])
 
         area = area + area_dict["sram"]
-        width = math.sqrt(area)
+        width = _sqrt(area)
         area_dict[self.name] = area
         width_dict[self.name] = width
 
@@ -2044,23 +2108,23 @@ class _FlipFlop:
         self.use_tgate = use_tgate
         
          
-    def generate(self, subcircuit_filename, min_tran_width):
+    def generate(self, subcircuit_netlist, min_tran_width):
         """ Generate FF SPICE netlists. Optionally includes register select. """
         
         # Generate FF with optional register select
         if self.register_select == 'z':
             print("Generating FF")
             if not self.use_tgate :
-                self.transistor_names, self.wire_names = ff_subcircuits.generate_ptran_d_ff(subcircuit_filename, self.use_finfet)
+                self.transistor_names, self.wire_names = ff_subcircuits.generate_ptran_d_ff(subcircuit_netlist, self.use_finfet)
             else :
-                self.transistor_names, self.wire_names = ff_subcircuits.generate_tgate_d_ff(subcircuit_filename, self.use_finfet)
+                self.transistor_names, self.wire_names = ff_subcircuits.generate_tgate_d_ff(subcircuit_netlist, self.use_finfet)
 
         else:
             print("Generating FF with register select on BLE input " + self.register_select)
             if not self.use_tgate :
-                self.transistor_names, self.wire_names = ff_subcircuits.generate_ptran_2_input_select_d_ff(subcircuit_filename, self.use_finfet)
+                self.transistor_names, self.wire_names = ff_subcircuits.generate_ptran_2_input_select_d_ff(subcircuit_netlist, self.use_finfet)
             else :
-                self.transistor_names, self.wire_names = ff_subcircuits.generate_tgate_2_input_select_d_ff(subcircuit_filename, self.use_finfet)
+                self.transistor_names, self.wire_names = ff_subcircuits.generate_tgate_2_input_select_d_ff(subcircuit_netlist, self.use_finfet)
         
         # Give initial transistor sizes
         if self.register_select:
@@ -2161,7 +2225,7 @@ class _FlipFlop:
             area += area_dict["sram"]
         
         # Calculate width and add to dictionaries
-        width = math.sqrt(area)
+        width = _sqrt(area)
         area_dict["ff"] = area
         width_dict["ff"] = width
         
@@ -2214,10 +2278,10 @@ class _LocalBLEOutput(_SizableCircuit):
         self.use_tgate = use_tgate
         
         
-    def generate(self, subcircuit_filename, min_tran_width):
+    def generate(self, subcircuit_netlist, min_tran_width):
         print("Generating local BLE output")
         if not self.use_tgate :
-            self.transistor_names, self.wire_names = mux_subcircuits.generate_ptran_2_to_1_mux(subcircuit_filename, self.name)
+            self.transistor_names, self.wire_names = mux_subcircuits.generate_ptran_2_to_1_mux(subcircuit_netlist, self.name)
             # Initialize transistor sizes (to something more reasonable than all min size, but not necessarily a good choice, depends on architecture params)
             self.initial_transistor_sizes["ptran_" + self.name + "_nmos"] = 2
             self.initial_transistor_sizes["rest_" + self.name + "_pmos"] = 1
@@ -2226,7 +2290,7 @@ class _LocalBLEOutput(_SizableCircuit):
             self.initial_transistor_sizes["inv_" + self.name + "_2_nmos"] = 4
             self.initial_transistor_sizes["inv_" + self.name + "_2_pmos"] = 4
         else :
-            self.transistor_names, self.wire_names = mux_subcircuits.generate_tgate_2_to_1_mux(subcircuit_filename, self.name)
+            self.transistor_names, self.wire_names = mux_subcircuits.generate_tgate_2_to_1_mux(subcircuit_netlist, self.name)
             # Initialize transistor sizes (to something more reasonable than all min size, but not necessarily a good choice, depends on architecture params)
             self.initial_transistor_sizes["tgate_" + self.name + "_nmos"] = 2
             self.initial_transistor_sizes["tgate_" + self.name + "_pmos"] = 2
@@ -2255,7 +2319,7 @@ class _LocalBLEOutput(_SizableCircuit):
                     area_dict["inv_" + self.name + "_2"])
 
         area = area + area_dict["sram"]
-        width = math.sqrt(area)
+        width = _sqrt(area)
         area_dict[self.name] = area
         width_dict[self.name] = width
 
@@ -2291,10 +2355,10 @@ class _GeneralBLEOutput(_SizableCircuit):
         self.use_tgate = use_tgate
         
         
-    def generate(self, subcircuit_filename, min_tran_width):
+    def generate(self, subcircuit_netlist, min_tran_width):
         print("Generating general BLE output")
         if not self.use_tgate :
-            self.transistor_names, self.wire_names = mux_subcircuits.generate_ptran_2_to_1_mux(subcircuit_filename, self.name)
+            self.transistor_names, self.wire_names = mux_subcircuits.generate_ptran_2_to_1_mux(subcircuit_netlist, self.name)
             # Initialize transistor sizes (to something more reasonable than all min size, but not necessarily a good choice, depends on architecture params)
             self.initial_transistor_sizes["ptran_" + self.name + "_nmos"] = 2
             self.initial_transistor_sizes["rest_" + self.name + "_pmos"] = 1
@@ -2303,7 +2367,7 @@ class _GeneralBLEOutput(_SizableCircuit):
             self.initial_transistor_sizes["inv_" + self.name + "_2_nmos"] = 5
             self.initial_transistor_sizes["inv_" + self.name + "_2_pmos"] = 5
         else :
-            self.transistor_names, self.wire_names = mux_subcircuits.generate_tgate_2_to_1_mux(subcircuit_filename, self.name)      
+            self.transistor_names, self.wire_names = mux_subcircuits.generate_tgate_2_to_1_mux(subcircuit_netlist, self.name)      
             # Initialize transistor sizes (to something more reasonable than all min size, but not necessarily a good choice, depends on architecture params)
             self.initial_transistor_sizes["tgate_" + self.name + "_nmos"] = 2
             self.initial_transistor_sizes["tgate_" + self.name + "_pmos"] = 2
@@ -2332,7 +2396,7 @@ class _GeneralBLEOutput(_SizableCircuit):
                     area_dict["inv_" + self.name + "_2"])
 
         area = area + area_dict["sram"]
-        width = math.sqrt(area)
+        width = _sqrt(area)
         area_dict[self.name] = area
         width_dict[self.name] = width
 
@@ -2371,9 +2435,9 @@ class _LUTOutputLoad:
         self.wire_names = []
         
         
-    def generate(self, subcircuit_filename, min_tran_width):
+    def generate(self, subcircuit_netlist, min_tran_width):
         print("Generating LUT output load")
-        self.wire_names = load_subcircuits.generate_lut_output_load(subcircuit_filename, self.num_local_outputs, self.num_general_outputs)
+        self.wire_names = load_subcircuits.generate_lut_output_load(subcircuit_netlist, self.num_local_outputs, self.num_general_outputs)
         
      
     def update_wires(self, width_dict, wire_lengths, wire_layers):
@@ -2406,11 +2470,11 @@ class _flut_mux(_CompoundCircuit):
         # assert use_finfet == False
 
 
-    def generate(self, subcircuit_filename, min_tran_width):
+    def generate(self, subcircuit_netlist, min_tran_width):
         print("Generating flut added mux")   
 
         if not self.use_tgate :
-            self.transistor_names, self.wire_names = mux_subcircuits.generate_ptran_2_to_1_mux(subcircuit_filename, self.name)
+            self.transistor_names, self.wire_names = mux_subcircuits.generate_ptran_2_to_1_mux(subcircuit_netlist, self.name)
             # Initialize transistor sizes (to something more reasonable than all min size, but not necessarily a good choice, depends on architecture params)
             self.initial_transistor_sizes["ptran_" + self.name + "_nmos"] = 2
             self.initial_transistor_sizes["rest_" + self.name + "_pmos"] = 1
@@ -2419,7 +2483,7 @@ class _flut_mux(_CompoundCircuit):
             self.initial_transistor_sizes["inv_" + self.name + "_2_nmos"] = 5
             self.initial_transistor_sizes["inv_" + self.name + "_2_pmos"] = 5
         else :
-            self.transistor_names, self.wire_names = mux_subcircuits.generate_tgate_2_to_1_mux(subcircuit_filename, self.name)      
+            self.transistor_names, self.wire_names = mux_subcircuits.generate_tgate_2_to_1_mux(subcircuit_netlist, self.name)      
             # Initialize transistor sizes (to something more reasonable than all min size, but not necessarily a good choice, depends on architecture params)
             self.initial_transistor_sizes["tgate_" + self.name + "_nmos"] = 2
             self.initial_transistor_sizes["tgate_" + self.name + "_pmos"] = 2
@@ -2449,7 +2513,7 @@ class _flut_mux(_CompoundCircuit):
                     area_dict["inv_" + self.name + "_2"])
 
         area = area #+ area_dict["sram"]
-        width = math.sqrt(area)
+        width = _sqrt(area)
         area_dict[self.name] = area
         width_dict[self.name] = width
 
@@ -2511,26 +2575,26 @@ class _BLE(_CompoundCircuit):
 
         
         
-    def generate(self, subcircuit_filename, min_tran_width):
+    def generate(self, subcircuit_netlist, min_tran_width):
         print("Generating BLE")
         
         # Generate LUT and FF
         init_tran_sizes = {}
-        init_tran_sizes.update(self.lut.generate(subcircuit_filename, min_tran_width))
-        init_tran_sizes.update(self.ff.generate(subcircuit_filename, min_tran_width))
+        init_tran_sizes.update(self.lut.generate(subcircuit_netlist, min_tran_width))
+        init_tran_sizes.update(self.ff.generate(subcircuit_netlist, min_tran_width))
 
         # Generate BLE outputs
-        init_tran_sizes.update(self.local_output.generate(subcircuit_filename, 
+        init_tran_sizes.update(self.local_output.generate(subcircuit_netlist, 
                                                           min_tran_width))
-        init_tran_sizes.update(self.general_output.generate(subcircuit_filename, 
+        init_tran_sizes.update(self.general_output.generate(subcircuit_netlist, 
                                                             min_tran_width))
-        load_subcircuits.generate_ble_outputs(subcircuit_filename, self.num_local_outputs, self.num_general_outputs)
+        load_subcircuits.generate_ble_outputs(subcircuit_netlist, self.num_local_outputs, self.num_general_outputs)
  
         #flut mux
         if self.use_fluts:
-            init_tran_sizes.update(self.fmux.generate(subcircuit_filename, min_tran_width))           
+            init_tran_sizes.update(self.fmux.generate(subcircuit_netlist, min_tran_width))           
         # Generate LUT load
-        self.lut_output_load.generate(subcircuit_filename, min_tran_width)
+        self.lut_output_load.generate(subcircuit_netlist, min_tran_width)
        
         return init_tran_sizes
 
@@ -2551,7 +2615,7 @@ class _BLE(_CompoundCircuit):
 
         if self.use_fluts:
             fmux_area = self.fmux.update_area(area_dict, width_dict) 
-            fmux_width = math.sqrt(fmux_area)
+            fmux_width = _sqrt(fmux_area)
             area_dict["flut_mux"] = fmux_area
             width_dict["flut_mux"] = fmux_width    
 
@@ -2565,7 +2629,7 @@ class _BLE(_CompoundCircuit):
         general_ble_output_area = self.num_general_outputs*self.general_output.update_area(area_dict, width_dict)
         
         ble_output_area = local_ble_output_area + general_ble_output_area
-        ble_output_width = math.sqrt(ble_output_area)
+        ble_output_width = _sqrt(ble_output_area)
         area_dict["ble_output"] = ble_output_area
         width_dict["ble_output"] = ble_output_width
 
@@ -2581,7 +2645,7 @@ class _BLE(_CompoundCircuit):
                 ble_area = ble_area + area_dict["carry_chain"] * self.FAs_per_flut + (self.FAs_per_flut) * area_dict["carry_chain_mux"]
                 ble_area = ble_area + ((area_dict["xcarry_chain_and"] + area_dict["xcarry_chain_mux"]) * self.carry_skip_periphery_count)/self.N
 
-        ble_width = math.sqrt(ble_area)
+        ble_width = _sqrt(ble_area)
         area_dict["ble"] = ble_area
         width_dict["ble"] = ble_width
 
@@ -2622,8 +2686,8 @@ class _LocalBLEOutputLoad:
         self.name = "local_ble_output_load"
         
         
-    def generate(self, subcircuit_filename):
-        load_subcircuits.generate_local_ble_output_load(subcircuit_filename)
+    def generate(self, subcircuit_netlist):
+        load_subcircuits.generate_local_ble_output_load(subcircuit_netlist)
      
      
     def update_wires(self, width_dict, wire_lengths, wire_layers, ble_ic_dis):
@@ -2658,11 +2722,11 @@ class _GeneralBLEOutputLoad:
         self.wire_names = []
         
         
-    def generate(self, subcircuit_filename, specs, sb_mux):
+    def generate(self, subcircuit_netlist, specs, sb_mux):
         """ Compute cluster output load load and generate SPICE netlist. """
         
         self._compute_load(specs, sb_mux, self.channel_usage_assumption, self.num_sb_mux_on_assumption)
-        self.wire_names = load_subcircuits.generate_general_ble_output_load(subcircuit_filename, self.num_sb_mux_off, self.num_sb_mux_partial, self.num_sb_mux_on_assumption)
+        self.wire_names = load_subcircuits.generate_general_ble_output_load(subcircuit_netlist, self.num_sb_mux_off, self.num_sb_mux_partial, self.num_sb_mux_on_assumption)
         
         
     def update_wires(self, width_dict, wire_lengths, wire_layers, h_dist, height):
@@ -2749,13 +2813,13 @@ class _LocalRoutingWireLoad:
         self.wire_names = []
     
 
-    def generate(self, subcircuit_filename, specs, local_mux):
+    def generate(self, subcircuit_netlist, specs, local_mux):
         print("Generating local routing wire load")
         # Compute load (number of on/partial/off per wire)
         self._compute_load(specs, local_mux)
         #print(self.off_inputs_per_wire)
         # Generate SPICE deck
-        self.wire_names = load_subcircuits.local_routing_load_generate(subcircuit_filename, self.on_inputs_per_wire, self.partial_inputs_per_wire, self.off_inputs_per_wire)
+        self.wire_names = load_subcircuits.local_routing_load_generate(subcircuit_netlist, self.on_inputs_per_wire, self.partial_inputs_per_wire, self.off_inputs_per_wire)
     
     
     def update_wires(self, width_dict, wire_lengths, wire_layers, local_routing_wire_load_length):
@@ -2821,13 +2885,13 @@ class _LogicCluster(_CompoundCircuit):
         self.enable_carry_chain = enable_carry_chain
 
         
-    def generate(self, subcircuits_filename, min_tran_width, specs):
+    def generate(self, subcircuits_netlist, min_tran_width, specs):
         print("Generating logic cluster")
         init_tran_sizes = {}
-        init_tran_sizes.update(self.ble.generate(subcircuits_filename, min_tran_width))
-        init_tran_sizes.update(self.local_mux.generate(subcircuits_filename, min_tran_width))
-        self.local_routing_wire_load.generate(subcircuits_filename, specs, self.local_mux)
-        self.local_ble_output_load.generate(subcircuits_filename)
+        init_tran_sizes.update(self.ble.generate(subcircuits_netlist, min_tran_width))
+        init_tran_sizes.update(self.local_mux.generate(subcircuits_netlist, min_tran_width))
+        self.local_routing_wire_load.generate(subcircuits_netlist, specs, self.local_mux)
+        self.local_ble_output_load.generate(subcircuits_netlist)
         
         return init_tran_sizes
 
@@ -2890,14 +2954,14 @@ class _RoutingWireLoad:
         self.wire_names = []
         
         
-    def generate(self, subcircuit_filename, specs, sb_mux, cb_mux):
+    def generate(self, subcircuit_netlist, specs, sb_mux, cb_mux):
         """ Generate the SPICE circuit for general routing wire load
             Need specs object, switch block object and connection block object """
         print("Generating routing wire load")
         # Calculate wire load based on architecture parameters
         self._compute_load(specs, sb_mux, cb_mux, self.channel_usage_assumption, self.cluster_input_usage_assumption)
         # Generate SPICE deck
-        self.wire_names = load_subcircuits.general_routing_load_generate(subcircuit_filename, self.wire_length, self.tile_sb_on, self.tile_sb_partial, self.tile_sb_off, self.tile_cb_on, self.tile_cb_partial, self.tile_cb_off)
+        self.wire_names = load_subcircuits.general_routing_load_generate(subcircuit_netlist, self.wire_length, self.tile_sb_on, self.tile_sb_partial, self.tile_sb_off, self.tile_cb_on, self.tile_cb_partial, self.tile_cb_off)
     
     
     def update_wires(self, width_dict, wire_lengths, wire_layers, height, num_sb_stripes, num_cb_stripes):
@@ -3128,12 +3192,12 @@ class _pgateoutputcrossbar(_SizableCircuit):
         self.maxwidth = maxwidth
         self.def_use_tgate = 0
     
-    def generate(self, subcircuit_filename, min_tran_width):
+    def generate(self, subcircuit_netlist, min_tran_width):
         print("Generating BRAM output crossbar")
         
 
         # Call MUX generation function
-        self.transistor_names, self.wire_names = memory_subcircuits.generate_pgateoutputcrossbar(subcircuit_filename, self.name, self.maxwidth, self.def_use_tgate)
+        self.transistor_names, self.wire_names = memory_subcircuits.generate_pgateoutputcrossbar(subcircuit_netlist, self.name, self.maxwidth, self.def_use_tgate)
 
         # Initialize transistor sizes (to something more reasonable than all min size, but not necessarily a good choice, depends on architecture params)
         self.initial_transistor_sizes["inv_" + self.name + "_1_nmos"] = 3
@@ -3173,10 +3237,10 @@ class _pgateoutputcrossbar(_SizableCircuit):
 
         area = (area_dict["inv_" + self.name + "_1"] + area_dict["inv_" + self.name + "_2"] + area_dict["inv_" + self.name + "_3"] * 2) * self.maxwidth + area_dict["ptran_" + self.name + "_4"]  * ptran_count
         #I'll use half of the area to obtain the width. This makes the process of defining wires easier for this crossbar
-        width = math.sqrt(area)
+        width = _sqrt(area)
         area *= 2
         area_with_sram = area + 2 * (self.maxwidth*2-1) * area_dict["sram"]
-        width_with_sram = math.sqrt(area_with_sram)
+        width_with_sram = _sqrt(area_with_sram)
         area_dict[self.name] = area
         width_dict[self.name] = width
         area_dict[self.name + "_sram"] = area_with_sram
@@ -3207,15 +3271,15 @@ class _configurabledecoderiii(_SizableCircuit):
         self.tgatecount = tgatecount
     
     
-    def generate(self, subcircuit_filename, min_tran_width):
+    def generate(self, subcircuit_netlist, min_tran_width):
         print("Generating stage of the configurable decoder " + self.name)
         
 
         # Call generation function
         if use_lp_transistor == 0:
-            self.transistor_names, self.wire_names = memory_subcircuits.generate_configurabledecoderiii(subcircuit_filename, self.name, self.required_size)
+            self.transistor_names, self.wire_names = memory_subcircuits.generate_configurabledecoderiii(subcircuit_netlist, self.name, self.required_size)
         else:
-            self.transistor_names, self.wire_names = memory_subcircuits.generate_configurabledecoderiii_lp(subcircuit_filename, self.name, self.required_size)
+            self.transistor_names, self.wire_names = memory_subcircuits.generate_configurabledecoderiii_lp(subcircuit_netlist, self.name, self.required_size)
 
             #print(self.transistor_names)
         # Initialize transistor sizes (to something more reasonable than all min size, but not necessarily a good choice, depends on architecture params)
@@ -3246,8 +3310,8 @@ class _configurabledecoderiii(_SizableCircuit):
         area = area_dict["inv_nand"+str(self.required_size)+"_" + self.name + "_1"]*self.required_size + area_dict["inv_" + self.name + "_2"]
         area_with_sram = area
           
-        width = math.sqrt(area)
-        width_with_sram = math.sqrt(area_with_sram)
+        width = _sqrt(area)
+        width_with_sram = _sqrt(area_with_sram)
         area_dict[self.name] = area
         width_dict[self.name] = width
         area_dict[self.name + "_sram"] = area_with_sram
@@ -3276,15 +3340,15 @@ class _configurabledecoder3ii(_SizableCircuit):
         self.areafac = areafac
     
     
-    def generate(self, subcircuit_filename, min_tran_width):
+    def generate(self, subcircuit_netlist, min_tran_width):
         print("Generating second part of the configurable decoder" + self.name)
         
 
         # Call generation function
         if use_lp_transistor == 0:
-            self.transistor_names, self.wire_names = memory_subcircuits.generate_configurabledecoder3ii(subcircuit_filename, self.name)
+            self.transistor_names, self.wire_names = memory_subcircuits.generate_configurabledecoder3ii(subcircuit_netlist, self.name)
         else:
-            self.transistor_names, self.wire_names = memory_subcircuits.generate_configurabledecoder3ii_lp(subcircuit_filename, self.name)
+            self.transistor_names, self.wire_names = memory_subcircuits.generate_configurabledecoder3ii_lp(subcircuit_netlist, self.name)
         # Initialize transistor sizes (to something more reasonable than all min size, but not necessarily a good choice, depends on architecture params)
         self.initial_transistor_sizes["inv_nand3_" + self.name + "_1_nmos"] = 1
         self.initial_transistor_sizes["inv_nand3_" + self.name + "_1_pmos"] = 1
@@ -3310,8 +3374,8 @@ class _configurabledecoder3ii(_SizableCircuit):
         area = (area_dict["inv_nand3_" + self.name + "_1"]*3 + area_dict["inv_" + self.name + "_2"])*self.areafac
         area_with_sram = area
           
-        width = math.sqrt(area)
-        width_with_sram = math.sqrt(area_with_sram)
+        width = _sqrt(area)
+        width_with_sram = _sqrt(area_with_sram)
         area_dict[self.name] = area
         width_dict[self.name] = width
         area_dict[self.name + "_sram"] = area_with_sram
@@ -3333,15 +3397,15 @@ class _configurabledecoder2ii(_SizableCircuit):
         self.areafac = areafac
     
     
-    def generate(self, subcircuit_filename, min_tran_width):
+    def generate(self, subcircuit_netlist, min_tran_width):
         print("Generating the second part of the configurable decoder" + self.name)
         
 
         # Call generation function
         if use_lp_transistor == 0:
-            self.transistor_names, self.wire_names = memory_subcircuits.generate_configurabledecoder2ii(subcircuit_filename, self.name)
+            self.transistor_names, self.wire_names = memory_subcircuits.generate_configurabledecoder2ii(subcircuit_netlist, self.name)
         else:
-            self.transistor_names, self.wire_names = memory_subcircuits.generate_configurabledecoder2ii_lp(subcircuit_filename, self.name)
+            self.transistor_names, self.wire_names = memory_subcircuits.generate_configurabledecoder2ii_lp(subcircuit_netlist, self.name)
 
             #print(self.transistor_names)
         # Initialize transistor sizes (to something more reasonable than all min size, but not necessarily a good choice, depends on architecture params)
@@ -3371,8 +3435,8 @@ class _configurabledecoder2ii(_SizableCircuit):
         area = (area_dict["inv_nand2_" + self.name + "_1"]*2 + area_dict["inv_" + self.name + "_2"])*self.areafac
         area_with_sram = area
           
-        width = math.sqrt(area)
-        width_with_sram = math.sqrt(area_with_sram)
+        width = _sqrt(area)
+        width_with_sram = _sqrt(area_with_sram)
         area_dict[self.name] = area
         width_dict[self.name] = width
         area_dict[self.name + "_sram"] = area_with_sram
@@ -3393,12 +3457,12 @@ class _configurabledecoderinvmux(_SizableCircuit):
         self.numberofgates3 = numberofgates3
 
 
-    def generate(self, subcircuit_filename, min_tran_width):
+    def generate(self, subcircuit_netlist, min_tran_width):
         print("Generating first stage of the configurable decoder") 
         if use_lp_transistor == 0:
-            self.transistor_names, self.wire_names = memory_subcircuits.generate_configurabledecoderi(subcircuit_filename, self.name)
+            self.transistor_names, self.wire_names = memory_subcircuits.generate_configurabledecoderi(subcircuit_netlist, self.name)
         else:
-            self.transistor_names, self.wire_names = memory_subcircuits.generate_configurabledecoderi_lp(subcircuit_filename, self.name)
+            self.transistor_names, self.wire_names = memory_subcircuits.generate_configurabledecoderi_lp(subcircuit_netlist, self.name)
         self.initial_transistor_sizes["inv_xconfigurabledecoderi_1_nmos"] = 1 
         self.initial_transistor_sizes["inv_xconfigurabledecoderi_1_pmos"] = 1
         self.initial_transistor_sizes["tgate_xconfigurabledecoderi_2_nmos"] = 1 
@@ -3420,8 +3484,8 @@ class _configurabledecoderinvmux(_SizableCircuit):
         area = (area_dict["inv_xconfigurabledecoderi_1"] * self.ConfiDecodersize + 2* area_dict["tgate_xconfigurabledecoderi_2"])* self.ConfiDecodersize
         area_with_sram = area + self.ConfiDecodersize * area_dict["sram"] 
 
-        width = math.sqrt(area)
-        width_with_sram = math.sqrt(area_with_sram)
+        width = _sqrt(area)
+        width_with_sram = _sqrt(area_with_sram)
         area_dict[self.name] = area
         width_dict[self.name] = width
         area_dict[self.name + "_sram"] = area_with_sram
@@ -3445,12 +3509,12 @@ class _rowdecoder0(_SizableCircuit):
         self.label2 = valid_label_gates2
 
 
-    def generate(self, subcircuit_filename, min_tran_width):
+    def generate(self, subcircuit_netlist, min_tran_width):
         print("Generating row decoder initial stage") 
         if use_lp_transistor == 0:
-            self.transistor_names, self.wire_names = memory_subcircuits.generate_rowdecoderstage0(subcircuit_filename, self.name)
+            self.transistor_names, self.wire_names = memory_subcircuits.generate_rowdecoderstage0(subcircuit_netlist, self.name)
         else:
-            self.transistor_names, self.wire_names = memory_subcircuits.generate_rowdecoderstage0_lp(subcircuit_filename, self.name)
+            self.transistor_names, self.wire_names = memory_subcircuits.generate_rowdecoderstage0_lp(subcircuit_netlist, self.name)
         self.initial_transistor_sizes["inv_rowdecoderstage0_1_nmos"] = 9
         self.initial_transistor_sizes["inv_rowdecoderstage0_1_pmos"] = 9
      
@@ -3469,8 +3533,8 @@ class _rowdecoder0(_SizableCircuit):
 
         area = area_dict["inv_rowdecoderstage0_1"] * self.decodersize
         area_with_sram = area
-        width = math.sqrt(area)
-        width_with_sram = math.sqrt(area_with_sram)
+        width = _sqrt(area)
+        width_with_sram = _sqrt(area_with_sram)
         area_dict[self.name] = area
         width_dict[self.name] = width
         area_dict[self.name + "_sram"] = area_with_sram
@@ -3496,13 +3560,13 @@ class _rowdecoder1(_SizableCircuit):
         self.areafac = areafac
 
 
-    def generate(self, subcircuit_filename, min_tran_width):
+    def generate(self, subcircuit_netlist, min_tran_width):
         print("Generating row decoder first stage") 
 
         if use_lp_transistor == 0:
-            self.transistor_names, self.wire_names = memory_subcircuits.generate_rowdecoderstage1(subcircuit_filename, self.name, self.nandtype)
+            self.transistor_names, self.wire_names = memory_subcircuits.generate_rowdecoderstage1(subcircuit_netlist, self.name, self.nandtype)
         else:
-            self.transistor_names, self.wire_names = memory_subcircuits.generate_rowdecoderstage1_lp(subcircuit_filename, self.name, self.nandtype)
+            self.transistor_names, self.wire_names = memory_subcircuits.generate_rowdecoderstage1_lp(subcircuit_netlist, self.name, self.nandtype)
 
         self.initial_transistor_sizes["inv_nand" + str(self.nandtype) + "_" + self.name + "_1_nmos"] = 1
         self.initial_transistor_sizes["inv_nand" + str(self.nandtype) + "_" + self.name + "_1_pmos"] = 1
@@ -3526,8 +3590,8 @@ class _rowdecoder1(_SizableCircuit):
 
         area = (area_dict["inv_nand" + str(self.nandtype) + "_" + self.name + "_1"] + area_dict["inv_" + self.name + "_2"]) * self.areafac
         area_with_sram = area
-        width = math.sqrt(area)
-        width_with_sram = math.sqrt(area_with_sram)
+        width = _sqrt(area)
+        width_with_sram = _sqrt(area_with_sram)
         area_dict[self.name] = area
         width_dict[self.name] = width
         area_dict[self.name + "_sram"] = area_with_sram
@@ -3553,14 +3617,14 @@ class _wordlinedriver(_SizableCircuit):
             self.rowsram //= 2
             self.wl_repeater = 1
     
-    def generate(self, subcircuit_filename, min_tran_width):
+    def generate(self, subcircuit_netlist, min_tran_width):
         print("Generating the wordline driver" + self.name)
 
         # Call generation function
         if use_lp_transistor == 0:
-            self.transistor_names, self.wire_names = memory_subcircuits.generate_wordline_driver(subcircuit_filename, self.name, self.number_of_banks + 1, self.wl_repeater)
+            self.transistor_names, self.wire_names = memory_subcircuits.generate_wordline_driver(subcircuit_netlist, self.name, self.number_of_banks + 1, self.wl_repeater)
         else:
-            self.transistor_names, self.wire_names = memory_subcircuits.generate_wordline_driver_lp(subcircuit_filename, self.name, self.number_of_banks + 1, self.wl_repeater)
+            self.transistor_names, self.wire_names = memory_subcircuits.generate_wordline_driver_lp(subcircuit_netlist, self.name, self.number_of_banks + 1, self.wl_repeater)
 
             #print(self.transistor_names)
         # Initialize transistor sizes (to something more reasonable than all min size, but not necessarily a good choice, depends on architecture params)
@@ -3609,8 +3673,8 @@ class _wordlinedriver(_SizableCircuit):
         area = area * self.areafac
 
         area_with_sram = area
-        width = math.sqrt(area)
-        width_with_sram = math.sqrt(area_with_sram)
+        width = _sqrt(area)
+        width_with_sram = _sqrt(area_with_sram)
         area_dict[self.name] = area
         width_dict[self.name] = width
         area_dict[self.name + "_sram"] = area_with_sram
@@ -3644,14 +3708,14 @@ class _rowdecoderstage3(_SizableCircuit):
         self.areafac = areafac
     
     
-    def generate(self, subcircuit_filename, min_tran_width):
+    def generate(self, subcircuit_netlist, min_tran_width):
         print("Generating last stage of the row decoder" + self.name)
 
         # Call generation function
         if use_lp_transistor == 0:
-            self.transistor_names, self.wire_names = memory_subcircuits.generate_rowdecoderstage3(subcircuit_filename, self.name, self.fanout, self.gatesize - 1)
+            self.transistor_names, self.wire_names = memory_subcircuits.generate_rowdecoderstage3(subcircuit_netlist, self.name, self.fanout, self.gatesize - 1)
         else:
-            self.transistor_names, self.wire_names = memory_subcircuits.generate_rowdecoderstage3(subcircuit_filename, self.name, self.fanout, self.gatesize - 1)
+            self.transistor_names, self.wire_names = memory_subcircuits.generate_rowdecoderstage3(subcircuit_netlist, self.name, self.fanout, self.gatesize - 1)
         # Initialize transistor sizes (to something more reasonable than all min size, but not necessarily a good choice, depends on architecture params)
         self.initial_transistor_sizes["inv_nand" + str(self.fanout) + "_" + self.name + "_1_nmos"] = 1
         self.initial_transistor_sizes["inv_nand" + str(self.fanout) + "_" + self.name + "_1_pmos"] = 1
@@ -3698,8 +3762,8 @@ class _rowdecoderstage3(_SizableCircuit):
         area = area * self.areafac
         area_with_sram = area
           
-        width = math.sqrt(area)
-        width_with_sram = math.sqrt(area_with_sram)
+        width = _sqrt(area)
+        width_with_sram = _sqrt(area_with_sram)
         area_dict[self.name] = area
         width_dict[self.name] = width
         area_dict[self.name + "_sram"] = area_with_sram
@@ -3807,12 +3871,12 @@ class _columndecoder(_SizableCircuit):
         self.numberoftgates = numberoftgates
 
 
-    def generate(self, subcircuit_filename, min_tran_width):
+    def generate(self, subcircuit_netlist, min_tran_width):
         print("Generating column decoder ") 
         if use_lp_transistor == 0:
-            self.transistor_names, self.wire_names = memory_subcircuits.generate_columndecoder(subcircuit_filename, self.name, self.col_decoder_bitssize)
+            self.transistor_names, self.wire_names = memory_subcircuits.generate_columndecoder(subcircuit_netlist, self.name, self.col_decoder_bitssize)
         else:
-            self.transistor_names, self.wire_names = memory_subcircuits.generate_columndecoder_lp(subcircuit_filename, self.name, self.col_decoder_bitssize)
+            self.transistor_names, self.wire_names = memory_subcircuits.generate_columndecoder_lp(subcircuit_netlist, self.name, self.col_decoder_bitssize)
         self.initial_transistor_sizes["inv_columndecoder_1_nmos"] = 1 
         self.initial_transistor_sizes["inv_columndecoder_1_pmos"] = 1
         self.initial_transistor_sizes["inv_columndecoder_2_nmos"] = 1 
@@ -3836,8 +3900,8 @@ class _columndecoder(_SizableCircuit):
 
         area = area_dict["inv_columndecoder_1"] * self.col_decoder_bitssize +area_dict["inv_columndecoder_2"]*self.col_decoder_bitssize * 2**self.col_decoder_bitssize + area_dict["inv_columndecoder_3"] * 2**self.col_decoder_bitssize
         area_with_sram = area
-        width = math.sqrt(area)
-        width_with_sram = math.sqrt(area_with_sram)
+        width = _sqrt(area)
+        width_with_sram = _sqrt(area_with_sram)
         area_dict[self.name] = area
         width_dict[self.name] = width
         area_dict[self.name + "_sram"] = area_with_sram
@@ -3857,12 +3921,12 @@ class _writedriver(_SizableCircuit):
         self.numberofsramsincol = numberofsramsincol
 
 
-    def generate(self, subcircuit_filename, min_tran_width):
+    def generate(self, subcircuit_netlist, min_tran_width):
         print("Generating write driver") 
         if use_lp_transistor == 0:
-            self.transistor_names, self.wire_names = memory_subcircuits.generate_writedriver(subcircuit_filename, self.name)
+            self.transistor_names, self.wire_names = memory_subcircuits.generate_writedriver(subcircuit_netlist, self.name)
         else:
-            self.transistor_names, self.wire_names = memory_subcircuits.generate_writedriver_lp(subcircuit_filename, self.name)
+            self.transistor_names, self.wire_names = memory_subcircuits.generate_writedriver_lp(subcircuit_netlist, self.name)
 
         # Sizing according to Kosuke
         self.initial_transistor_sizes["inv_writedriver_1_nmos"] = 1.222 
@@ -3889,8 +3953,8 @@ class _writedriver(_SizableCircuit):
 
         area = area_dict["inv_writedriver_1"] + area_dict["inv_writedriver_2"] + area_dict["tgate_writedriver_3"]* 4
         area_with_sram = area
-        width = math.sqrt(area)
-        width_with_sram = math.sqrt(area_with_sram)
+        width = _sqrt(area)
+        width_with_sram = _sqrt(area_with_sram)
         area_dict[self.name] = area
         width_dict[self.name] = width
         area_dict[self.name + "_sram"] = area_with_sram
@@ -3907,12 +3971,12 @@ class _samp(_SizableCircuit):
         self.mode = mode
         self.difference = difference
 
-    def generate(self, subcircuit_filename, min_tran_width):
+    def generate(self, subcircuit_netlist, min_tran_width):
         print("Generating sense amplifier circuit") 
         if use_lp_transistor == 0:
-            self.transistor_names, self.wire_names = memory_subcircuits.generate_samp(subcircuit_filename, self.name)
+            self.transistor_names, self.wire_names = memory_subcircuits.generate_samp(subcircuit_netlist, self.name)
         else:
-            self.transistor_names, self.wire_names = memory_subcircuits.generate_samp_lp(subcircuit_filename, self.name)
+            self.transistor_names, self.wire_names = memory_subcircuits.generate_samp_lp(subcircuit_netlist, self.name)
         self.initial_transistor_sizes["inv_samp_output_1_nmos"] = 1 
         self.initial_transistor_sizes["inv_samp_output_1_pmos"] = 1
         #its not actually a PTRAN. Doing this only for area calculation:
@@ -3935,8 +3999,8 @@ class _samp(_SizableCircuit):
 
         area = area_dict["inv_samp_output_1"] + area_dict["ptran_samp_output_1"]*2 +  area_dict["ptran_samp_output_2"]*2 + area_dict["ptran_samp_output_3"]*2 +  area_dict["ptran_samp_output_1"]
         area_with_sram = area
-        width = math.sqrt(area)
-        width_with_sram = math.sqrt(area_with_sram)
+        width = _sqrt(area)
+        width_with_sram = _sqrt(area_with_sram)
         area_dict[self.name] = area
         width_dict[self.name] = width
         area_dict[self.name + "_sram"] = area_with_sram
@@ -3972,12 +4036,12 @@ class _prechargeandeq(_SizableCircuit):
         self.numberofsrams = numberofsrams
 
 
-    def generate(self, subcircuit_filename, min_tran_width):
+    def generate(self, subcircuit_netlist, min_tran_width):
         print("Generating precharge and equalization circuit") 
         if use_lp_transistor == 0:
-            self.transistor_names, self.wire_names = memory_subcircuits.generate_precharge(subcircuit_filename, self.name)
+            self.transistor_names, self.wire_names = memory_subcircuits.generate_precharge(subcircuit_netlist, self.name)
         else:
-            self.transistor_names, self.wire_names = memory_subcircuits.generate_precharge_lp(subcircuit_filename, self.name)
+            self.transistor_names, self.wire_names = memory_subcircuits.generate_precharge_lp(subcircuit_netlist, self.name)
 
         self.initial_transistor_sizes["ptran_precharge_side_nmos"] = 15
         self.initial_transistor_sizes["ptran_equalization_nmos"] = 1
@@ -3997,8 +4061,8 @@ class _prechargeandeq(_SizableCircuit):
 
         area = area_dict["ptran_precharge_side"]*2 + area_dict["ptran_equalization"]
         area_with_sram = area
-        width = math.sqrt(area)
-        width_with_sram = math.sqrt(area_with_sram)
+        width = _sqrt(area)
+        width_with_sram = _sqrt(area_with_sram)
         area_dict[self.name] = area
         width_dict[self.name] = width
         area_dict[self.name + "_sram"] = area_with_sram
@@ -4015,11 +4079,11 @@ class _levelshifter(_SizableCircuit):
     def __init__(self):
         self.name = "level_shifter"
 
-    def generate(self, subcircuit_filename):
+    def generate(self, subcircuit_netlist):
         print("Generating the level shifter") 
 
         self.transistor_names = []
-        self.transistor_names.append(memory_subcircuits.generate_level_shifter(subcircuit_filename, self.name))
+        self.transistor_names.append(memory_subcircuits.generate_level_shifter(subcircuit_netlist, self.name))
 
         self.initial_transistor_sizes["inv_level_shifter_1_nmos"] = 1
         self.initial_transistor_sizes["inv_level_shifter_1_pmos"] = 1.6667
@@ -4070,7 +4134,7 @@ class _mtjbldischarging(_SizableCircuit):
         self.colsize = colsize
 
 
-    def generate(self, subcircuit_filename, min_tran_width):
+    def generate(self, subcircuit_netlist, min_tran_width):
         "Bitline discharging in MTJ"
         self.transistor_names = []
         self.transistor_names.append("ptran_mtj_subcircuits_mtjcs_0_nmos")
@@ -4091,13 +4155,13 @@ class _mtjbasiccircuits(_SizableCircuit):
     def __init__(self):
         self.name = "mtj_subcircuits"
 
-    def generate(self, subcircuit_filename):
+    def generate(self, subcircuit_netlist):
         print("Generating MTJ subcircuits") 
 
         self.transistor_names = []
-        self.transistor_names.append(memory_subcircuits.generate_mtj_sa_lp(subcircuit_filename, self.name))
-        self.transistor_names.append(memory_subcircuits.generate_mtj_writedriver_lp(subcircuit_filename, self.name))
-        self.transistor_names.append(memory_subcircuits.generate_mtj_cs_lp(subcircuit_filename, self.name))
+        self.transistor_names.append(memory_subcircuits.generate_mtj_sa_lp(subcircuit_netlist, self.name))
+        self.transistor_names.append(memory_subcircuits.generate_mtj_writedriver_lp(subcircuit_netlist, self.name))
+        self.transistor_names.append(memory_subcircuits.generate_mtj_cs_lp(subcircuit_netlist, self.name))
 
 
         self.initial_transistor_sizes["ptran_mtj_subcircuits_mtjsa_1_pmos"] = 6.6667
@@ -4130,13 +4194,13 @@ class _mtjbasiccircuits(_SizableCircuit):
 
         area_dict[self.name + "_sa"] = 2* (area_dict["ptran_mtj_subcircuits_mtjsa_1"] + area_dict["inv_mtj_subcircuits_mtjsa_2"] + area_dict["ptran_mtj_subcircuits_mtjsa_3"] + area_dict["ptran_mtj_subcircuits_mtjsa_4"] + area_dict["ptran_mtj_subcircuits_mtjsa_3"] * 2)
         area_dict[self.name + "_sa"] += area_dict["inv_mtj_subcircuits_mtjsa_6"] * 2
-        width_dict[self.name + "_sa"] = math.sqrt(area_dict[self.name + "_sa"])
+        width_dict[self.name + "_sa"] = _sqrt(area_dict[self.name + "_sa"])
 
         area_dict[self.name + "_writedriver"] = area_dict["inv_mtj_subcircuits_mtjwd_1"] + area_dict["inv_mtj_subcircuits_mtjwd_2"] + area_dict["inv_mtj_subcircuits_mtjwd_3"]
-        width_dict[self.name + "_writedriver"] = math.sqrt(area_dict[self.name + "_writedriver"])
+        width_dict[self.name + "_writedriver"] = _sqrt(area_dict[self.name + "_writedriver"])
 
         area_dict[self.name + "_cs"] = area_dict["tgate_mtj_subcircuits_mtjcs_1"]  + area_dict["ptran_mtj_subcircuits_mtjcs_0"]
-        width_dict[self.name + "_cs"] = math.sqrt(area_dict[self.name + "_cs"])
+        width_dict[self.name + "_cs"] = _sqrt(area_dict[self.name + "_cs"])
 
         # this is a dummy area for the timing path that I size in transistor sizing stage.
         # the purpose of adding this is to avoid changing the code in transistor sizing stage as this is the only exception.
@@ -4160,20 +4224,20 @@ class _memorycell(_SizableCircuit):
         self.number_of_banks = number_of_banks
         self.memory_technology = memory_technology
 
-    def generate(self, subcircuit_filename, min_tran_width):
+    def generate(self, subcircuit_netlist, min_tran_width):
         print("Generating BRAM memorycell") 
 
         if self.memory_technology == "SRAM":
             if use_lp_transistor == 0:
-                self.transistor_names, self.wire_names = memory_subcircuits.generate_memorycell(subcircuit_filename, self.name)
+                self.transistor_names, self.wire_names = memory_subcircuits.generate_memorycell(subcircuit_netlist, self.name)
             else:
-                self.transistor_names, self.wire_names = memory_subcircuits.generate_memorycell_lp(subcircuit_filename, self.name)
+                self.transistor_names, self.wire_names = memory_subcircuits.generate_memorycell_lp(subcircuit_netlist, self.name)
         else:
-            memory_subcircuits.generate_mtj_memorycell_high_lp(subcircuit_filename, self.name)
-            memory_subcircuits.generate_mtj_memorycell_low_lp(subcircuit_filename, self.name)
-            memory_subcircuits.generate_mtj_memorycell_reference_lp(subcircuit_filename, self.name)
-            memory_subcircuits.generate_mtj_memorycellh_reference_lp(subcircuit_filename, self.name)
-            memory_subcircuits.generate_mtj_memorycell_reference_lp_target(subcircuit_filename, self.name)
+            memory_subcircuits.generate_mtj_memorycell_high_lp(subcircuit_netlist, self.name)
+            memory_subcircuits.generate_mtj_memorycell_low_lp(subcircuit_netlist, self.name)
+            memory_subcircuits.generate_mtj_memorycell_reference_lp(subcircuit_netlist, self.name)
+            memory_subcircuits.generate_mtj_memorycellh_reference_lp(subcircuit_netlist, self.name)
+            memory_subcircuits.generate_mtj_memorycell_reference_lp_target(subcircuit_netlist, self.name)
 
 
     def update_area(self, area_dict, width_dict):
@@ -4185,8 +4249,8 @@ class _memorycell(_SizableCircuit):
         else:
             area = area_dict["rammtj"] * self.RAMheight * self.RAMwidth * self.number_of_banks
         area_with_sram = area
-        width = math.sqrt(area)
-        width_with_sram = math.sqrt(area_with_sram)
+        width = _sqrt(area)
+        width_with_sram = _sqrt(area_with_sram)
         area_dict[self.name] = area
         width_dict[self.name] = width
         area_dict[self.name + "_sram"] = area_with_sram
@@ -4231,7 +4295,7 @@ class _RAMLocalMUX(_SizableCircuit):
         self.use_tgate = use_tgate
     
     
-    def generate(self, subcircuit_filename, min_tran_width):
+    def generate(self, subcircuit_netlist, min_tran_width):
         print("Generating RAM local mux")
         
         # Calculate level sizes and number of SRAMs per mux
@@ -4243,7 +4307,7 @@ class _RAMLocalMUX(_SizableCircuit):
         
         if not self.use_tgate :
             # Call generation function
-            self.transistor_names, self.wire_names = mux_subcircuits.generate_ptran_2lvl_mux_no_driver(subcircuit_filename, self.name, self.implemented_size, self.level1_size, self.level2_size)
+            self.transistor_names, self.wire_names = mux_subcircuits.generate_ptran_2lvl_mux_no_driver(subcircuit_netlist, self.name, self.implemented_size, self.level1_size, self.level2_size)
             
             # Initialize transistor sizes (to something more reasonable than all min size, but not necessarily a good choice, depends on architecture params)
             self.initial_transistor_sizes["ptran_" + self.name + "_L1_nmos"] = 2
@@ -4254,7 +4318,7 @@ class _RAMLocalMUX(_SizableCircuit):
 
         else :
             # Call MUX generation function
-            self.transistor_names, self.wire_names = mux_subcircuits.generate_tgate_2lvl_mux_no_driver(subcircuit_filename, self.name, self.implemented_size, self.level1_size, self.level2_size)
+            self.transistor_names, self.wire_names = mux_subcircuits.generate_tgate_2lvl_mux_no_driver(subcircuit_netlist, self.name, self.implemented_size, self.level1_size, self.level2_size)
             
             # Initialize transistor sizes (to something more reasonable than all min size, but not necessarily a good choice, depends on architecture params)
             self.initial_transistor_sizes["tgate_" + self.name + "_L1_nmos"] = 2
@@ -4293,8 +4357,8 @@ class _RAMLocalMUX(_SizableCircuit):
         # MUX area including SRAM
         area_with_sram = (area + (self.level1_size + self.level2_size)*area_dict["sram"])
           
-        width = math.sqrt(area)
-        width_with_sram = math.sqrt(area_with_sram)
+        width = _sqrt(area)
+        width_with_sram = _sqrt(area_with_sram)
         area_dict[self.name] = area
         width_dict[self.name] = width
         area_dict[self.name + "_sram"] = area_with_sram
@@ -4356,12 +4420,12 @@ class _RAMLocalRoutingWireLoad:
         self.conf_decoder_bits = conf_decoder_bits
 
 
-    def generate(self, subcircuit_filename, specs, RAM_local_mux):
+    def generate(self, subcircuit_netlist, specs, RAM_local_mux):
         print("Generating local routing wire load")
         # Compute load (number of on/partial/off per wire)
         self._compute_load(specs, RAM_local_mux)
         # Generate SPICE deck
-        self.wire_names = load_subcircuits.RAM_local_routing_load_generate(subcircuit_filename, self.on_inputs_per_wire, self.partial_inputs_per_wire, self.off_inputs_per_wire)
+        self.wire_names = load_subcircuits.RAM_local_routing_load_generate(subcircuit_netlist, self.on_inputs_per_wire, self.partial_inputs_per_wire, self.off_inputs_per_wire)
     
     
     def update_wires(self, width_dict, wire_lengths, wire_layers):
@@ -4684,50 +4748,50 @@ class _RAM(_CompoundCircuit):
 
         self.pgateoutputcrossbar = _pgateoutputcrossbar(2**self.conf_decoder_bits)
         
-    def generate(self, subcircuits_filename, min_tran_width, specs):
+    def generate(self, subcircuits_netlist, min_tran_width, specs):
         print("Generating RAM block")
         init_tran_sizes = {}
-        init_tran_sizes.update(self.RAM_local_mux.generate(subcircuits_filename, min_tran_width))
+        init_tran_sizes.update(self.RAM_local_mux.generate(subcircuits_netlist, min_tran_width))
 
         if self.valid_row_dec_size2 == 1:
-            init_tran_sizes.update(self.rowdecoder_stage1_size2.generate(subcircuits_filename, min_tran_width))
+            init_tran_sizes.update(self.rowdecoder_stage1_size2.generate(subcircuits_netlist, min_tran_width))
 
         if self.valid_row_dec_size3 == 1:
-            init_tran_sizes.update(self.rowdecoder_stage1_size3.generate(subcircuits_filename, min_tran_width))
+            init_tran_sizes.update(self.rowdecoder_stage1_size3.generate(subcircuits_netlist, min_tran_width))
 
-        init_tran_sizes.update(self.rowdecoder_stage3.generate(subcircuits_filename, min_tran_width))
+        init_tran_sizes.update(self.rowdecoder_stage3.generate(subcircuits_netlist, min_tran_width))
         
-        init_tran_sizes.update(self.rowdecoder_stage0.generate(subcircuits_filename, min_tran_width))
-        init_tran_sizes.update(self.wordlinedriver.generate(subcircuits_filename, min_tran_width))
-        self.RAM_local_routing_wire_load.generate(subcircuits_filename, specs, self.RAM_local_mux)
+        init_tran_sizes.update(self.rowdecoder_stage0.generate(subcircuits_netlist, min_tran_width))
+        init_tran_sizes.update(self.wordlinedriver.generate(subcircuits_netlist, min_tran_width))
+        self.RAM_local_routing_wire_load.generate(subcircuits_netlist, specs, self.RAM_local_mux)
 
-        self.memorycells.generate(subcircuits_filename, min_tran_width)
+        self.memorycells.generate(subcircuits_netlist, min_tran_width)
 
         if self.memory_technology == "SRAM":
-            init_tran_sizes.update(self.precharge.generate(subcircuits_filename, min_tran_width))
-            self.samp.generate(subcircuits_filename, min_tran_width)
-            init_tran_sizes.update(self.writedriver.generate(subcircuits_filename, min_tran_width))
+            init_tran_sizes.update(self.precharge.generate(subcircuits_netlist, min_tran_width))
+            self.samp.generate(subcircuits_netlist, min_tran_width)
+            init_tran_sizes.update(self.writedriver.generate(subcircuits_netlist, min_tran_width))
         else:
-            init_tran_sizes.update(self.bldischarging.generate(subcircuits_filename, min_tran_width))
-            init_tran_sizes.update(self.mtjbasics.generate(subcircuits_filename))
+            init_tran_sizes.update(self.bldischarging.generate(subcircuits_netlist, min_tran_width))
+            init_tran_sizes.update(self.mtjbasics.generate(subcircuits_netlist))
 
 
-        init_tran_sizes.update(self.levelshift.generate(subcircuits_filename))
+        init_tran_sizes.update(self.levelshift.generate(subcircuits_netlist))
         
-        init_tran_sizes.update(self.columndecoder.generate(subcircuits_filename, min_tran_width))
+        init_tran_sizes.update(self.columndecoder.generate(subcircuits_netlist, min_tran_width))
 
-        init_tran_sizes.update(self.configurabledecoderi.generate(subcircuits_filename, min_tran_width))
+        init_tran_sizes.update(self.configurabledecoderi.generate(subcircuits_netlist, min_tran_width))
 
-        init_tran_sizes.update(self.configurabledecoderiii.generate(subcircuits_filename, min_tran_width))
+        init_tran_sizes.update(self.configurabledecoderiii.generate(subcircuits_netlist, min_tran_width))
 
         
         if self.cvalidobj1 == 1:
-            init_tran_sizes.update(self.configurabledecoder3ii.generate(subcircuits_filename, min_tran_width))
+            init_tran_sizes.update(self.configurabledecoder3ii.generate(subcircuits_netlist, min_tran_width))
         if self.cvalidobj2 == 1:
-            init_tran_sizes.update(self.configurabledecoder2ii.generate(subcircuits_filename, min_tran_width))
+            init_tran_sizes.update(self.configurabledecoder2ii.generate(subcircuits_netlist, min_tran_width))
 
 
-        init_tran_sizes.update(self.pgateoutputcrossbar.generate(subcircuits_filename, min_tran_width))
+        init_tran_sizes.update(self.pgateoutputcrossbar.generate(subcircuits_netlist, min_tran_width))
 
         return init_tran_sizes
 
@@ -4735,7 +4799,7 @@ class _RAM(_CompoundCircuit):
     def _update_process_data(self):
         """ I'm using this file to update several timing variables after measuring them. """
         
-        process_data_file = open(self.process_data_filename, 'w')
+        process_data_file = spice.NetlistBuilder(self.process_data_filename)
         process_data_file.write("*** PROCESS DATA AND VOLTAGE LEVELS\n\n")
         process_data_file.write(".LIB PROCESS_DATA\n\n")
         process_data_file.write("* Voltage levels\n")
@@ -4790,7 +4854,7 @@ class _RAM(_CompoundCircuit):
         process_data_file.write("* Device models\n")
         process_data_file.write(".LIB \"" + self.cspecs.model_path + "\" " + self.cspecs.model_library + "\n\n")
         process_data_file.write(".ENDL PROCESS_DATA")
-        process_data_file.close()
+        process_data_file.write_file()
         
 
     def generate_top(self):
@@ -4924,7 +4988,7 @@ class _HBLocalMUX(_SizableCircuit):
         self.use_tgate = use_tgate
     
     
-    def generate(self, subcircuit_filename, min_tran_width):
+    def generate(self, subcircuit_netlist, min_tran_width):
         print("Generating HB local mux")
         
         # Calculate level sizes and number of SRAMs per mux
@@ -4936,7 +5000,7 @@ class _HBLocalMUX(_SizableCircuit):
         
         if not self.use_tgate :
             # Call generation function
-            self.transistor_names, self.wire_names = mux_subcircuits.generate_ptran_2lvl_mux(subcircuit_filename, self.name, self.implemented_size, self.level1_size, self.level2_size)
+            self.transistor_names, self.wire_names = mux_subcircuits.generate_ptran_2lvl_mux(subcircuit_netlist, self.name, self.implemented_size, self.level1_size, self.level2_size)
             
             # Initialize transistor sizes (to something more reasonable than all min size, but not necessarily a good choice, depends on architecture params)
             self.initial_transistor_sizes["ptran_" + self.name + "_L1_nmos"] = 2
@@ -4948,7 +5012,7 @@ class _HBLocalMUX(_SizableCircuit):
             self.initial_transistor_sizes["inv_" + self.name + "_2_pmos"] = 12
         else :
             # Call MUX generation function
-            self.transistor_names, self.wire_names = mux_subcircuits.generate_tgate_2lvl_mux(subcircuit_filename, self.name, self.implemented_size, self.level1_size, self.level2_size)
+            self.transistor_names, self.wire_names = mux_subcircuits.generate_tgate_2lvl_mux(subcircuit_netlist, self.name, self.implemented_size, self.level1_size, self.level2_size)
             
             # Initialize transistor sizes (to something more reasonable than all min size, but not necessarily a good choice, depends on architecture params)
             self.initial_transistor_sizes["tgate_" + self.name + "_L1_nmos"] = 3
@@ -4986,8 +5050,8 @@ class _HBLocalMUX(_SizableCircuit):
         # MUX area including SRAM
         area_with_sram = (area + (self.level1_size + self.level2_size)*area_dict["sram"])
 
-        width = math.sqrt(area)
-        width_with_sram = math.sqrt(area_with_sram)
+        width = _sqrt(area)
+        width_with_sram = _sqrt(area_with_sram)
         area_dict[self.name] = area
         self.area = area
         width_dict[self.name] = width
@@ -5042,12 +5106,12 @@ class _HBLocalRoutingWireLoad:
         self.wire_names = []
 
 
-    def generate(self, subcircuit_filename, specs, HB_local_mux):
+    def generate(self, subcircuit_netlist, specs, HB_local_mux):
         print("Generating local routing wire load")
         # Compute load (number of on/partial/off per wire)
         self._compute_load(specs, HB_local_mux)
         # Generate SPICE deck
-        self.wire_names = load_subcircuits.hb_local_routing_load_generate(subcircuit_filename, self.on_inputs_per_wire, self.partial_inputs_per_wire, self.off_inputs_per_wire, self.name, HB_local_mux.name)
+        self.wire_names = load_subcircuits.hb_local_routing_load_generate(subcircuit_netlist, self.on_inputs_per_wire, self.partial_inputs_per_wire, self.off_inputs_per_wire, self.name, HB_local_mux.name)
     
     
     def update_wires(self, width_dict, wire_lengths, wire_layers):
@@ -5101,10 +5165,10 @@ class _dedicated_routing_driver(_SizableCircuit):
         self.top_name = top_name
         
         self.num_buffers = num_buffers
-    def generate(self, subcircuit_filename, min_tran_width):
+    def generate(self, subcircuit_netlist, min_tran_width):
         print("Generating hard block " + self.name +" dedicated routing driver")
 
-        self.transistor_names, self.wire_names = mux_subcircuits.generate_dedicated_driver(subcircuit_filename, self.name, self.num_buffers, self.top_name)
+        self.transistor_names, self.wire_names = mux_subcircuits.generate_dedicated_driver(subcircuit_netlist, self.name, self.num_buffers, self.top_name)
             
         for i in range(1, self.num_buffers * 2 + 1):
             self.initial_transistor_sizes["inv_" + self.name + "_"+str(i)+"_nmos"] = 2
@@ -5131,8 +5195,8 @@ class _dedicated_routing_driver(_SizableCircuit):
         area_with_sram = area
         self.area = area
 
-        width = math.sqrt(area)
-        width_with_sram = math.sqrt(area_with_sram)
+        width = _sqrt(area)
+        width_with_sram = _sqrt(area_with_sram)
         area_dict[self.name] = area
         width_dict[self.name] = width
         area_dict[self.name + "_sram"] = area_with_sram
@@ -5157,16 +5221,16 @@ class _hard_block(_CompoundCircuit):
 
         self.flow_results = (-1.0,-1.0,-1.0)
 
-    def generate(self, subcircuit_filename, min_tran_width):
+    def generate(self, subcircuit_netlist, min_tran_width):
         print("Generating hard block " + self.name)
 
         # generate subblocks
         init_tran_sizes = {}
-        init_tran_sizes.update(self.mux.generate(subcircuit_filename, min_tran_width))
+        init_tran_sizes.update(self.mux.generate(subcircuit_netlist, min_tran_width))
         if self.parameters['num_dedicated_outputs'] > 0:
-            init_tran_sizes.update(self.dedicated.generate(subcircuit_filename, min_tran_width))
+            init_tran_sizes.update(self.dedicated.generate(subcircuit_netlist, min_tran_width))
         # wireload
-        self.load.generate(subcircuit_filename, min_tran_width, self.mux)
+        self.load.generate(subcircuit_netlist, min_tran_width, self.mux)
 
         return init_tran_sizes
 
@@ -5246,8 +5310,8 @@ class _hard_block(_CompoundCircuit):
             area = self.parameters['num_gen_inputs'] * area_dict[self.mux.name] + self.area
             area_with_sram = self.parameters['num_gen_inputs'] * area_dict[self.mux.name + "_sram"] + self.area
 
-        width = math.sqrt(area)
-        width_with_sram = math.sqrt(area_with_sram)
+        width = _sqrt(area)
+        width_with_sram = _sqrt(area_with_sram)
         area_dict[self.name] = area
         width_dict[self.name] = width
         area_dict[self.name + "_sram"] = area_with_sram
@@ -5284,7 +5348,7 @@ class FPGA:
     def __init__(self, coffe_params, run_options, spice_interface):
         
         # Initialize the specs
-        self.specs = _Specs(coffe_params["fpga_arch_params"], run_options.quick_mode)
+        self.specs = _Specs(coffe_params["fpga_arch_params"], run_options.quick_mode, run_options.surrogate_pruning, run_options.search_strategy, run_options.joint_erf)
 
         ######################################
         ### INITIALIZE SPICE LIBRARY NAMES ###
@@ -5403,6 +5467,21 @@ class FPGA:
         self.area_opt_weight = run_options.area_opt_weight
         self.delay_opt_weight = run_options.delay_opt_weight
         self.spice_interface = spice_interface        
+        # The ERF ratios found during transistor sizing, reused to skip or warm-start later ERFs 
+        # (see tran_sizing.ErfRatioStore). The transistor sizing sets it up if ERF ratio reuse is on.
+        self.erf_ratio_store = None
+        # The simulation budget of the transistor sizing (see tran_sizing.SimulationBudget), if there is one
+        self.sim_budget = None
+        # The parameters each deck of update_delays depends on (see spice.DeckParameterIndex), made by generate()
+        self.deck_param_index = None
+        # The contents of the subcircuit libraries (see spice.NetlistBuilder), collected by generate()
+        self.basic_subcircuits_netlist = None
+        self.subcircuits_netlist = None
+        # The files the last generate() wrote or left untouched (see spice.NetlistFiles)
+        self.netlist_files = None
+        # Number of files generate() wrote, and left untouched because their contents were unchanged
+        self.num_netlists_written = 0
+        self.num_netlists_unchanged = 0
         # This is a dictionary of all the transistor sizes in the FPGA ('name': 'size')
         # It will contain the data in xMin transistor width, e.g. 'inv_sb_mux_1_nmos': '2'
         # That means inv_sb_mux_1_nmos is a transistor with 2x minimum width
@@ -5410,6 +5489,18 @@ class FPGA:
         # This is a list of tuples containing area information for each transistor in the FPGA
         # Tuple: (tran_name, tran_channel_width_nm, tran_drive_strength, tran_area_min_areas, tran_area_nm, tran_width_nm)
         self.transistor_area_list = []
+        # Transistor sizes and area tuples of the last area update ('name': (size, tuple)), and the NMOS
+        # and PMOS transistors of each inverter and tgate ('name': {'nmos': tran_name, 'pmos': tran_name}).
+        # We only recompute the area of transistors whose size changed, and the area of their components.
+        self._transistor_area_cache = {}
+        self._component_transistors = {}
+        # The transistors whose size is a NumPy array (see update_area). As long as there are any, the areas
+        # and wires that depend on them are arrays too and we update all subcircuits and wires.
+        self._array_transistors = set()
+        # The inputs and outputs of the last area and wire update of each subcircuit (see _update_subcircuit)
+        # and the wire lengths and layers of the last wire RC update ('wire_name': (length, layer)).
+        self._subcircuit_records = {}
+        self._wire_rc_inputs = {}
         
         # A note on the following 5 dictionaries
         # (area_dict, width_dict, wire_lengths, wire_layers, wire_rc_dict)
@@ -5515,6 +5606,10 @@ class FPGA:
         # |                         |                               |                     |
         # ---------------------------------------------------------------------------------
     
+        # Files whose contents are the same as on disk are not rewritten (see spice.NetlistBuilder).
+        # This run's files are collected in self.netlist_files.
+        self.netlist_files = spice.NetlistFiles()
+        self.netlist_files.start()
         
         # Generate basic subcircuit library (pass-transistor, inverter, wire, etc.).
         # This library will be used to build other netlists.
@@ -5523,33 +5618,34 @@ class FPGA:
         # Create 'subcircuits.l' library.
         # The subcircuit generation functions between 'self._create_lib_files()'
         # and 'self._end_lib_files()' will add things to these library files. 
+        # The libraries are collected in memory and written to disk once all of them are complete.
         self._create_lib_files()
         
         # Generate the various subcircuits netlists of the FPGA (call members)
-        self.transistor_sizes.update(self.sb_mux.generate(self.subcircuits_filename, 
+        self.transistor_sizes.update(self.sb_mux.generate(self.subcircuits_netlist, 
                                                           self.specs.min_tran_width))
-        self.transistor_sizes.update(self.cb_mux.generate(self.subcircuits_filename, 
+        self.transistor_sizes.update(self.cb_mux.generate(self.subcircuits_netlist, 
                                                           self.specs.min_tran_width))
-        self.transistor_sizes.update(self.logic_cluster.generate(self.subcircuits_filename, 
+        self.transistor_sizes.update(self.logic_cluster.generate(self.subcircuits_netlist, 
                                                                  self.specs.min_tran_width, 
                                                                  self.specs))
-        self.cluster_output_load.generate(self.subcircuits_filename, self.specs, self.sb_mux)
-        self.routing_wire_load.generate(self.subcircuits_filename, self.specs, self.sb_mux, self.cb_mux)
+        self.cluster_output_load.generate(self.subcircuits_netlist, self.specs, self.sb_mux)
+        self.routing_wire_load.generate(self.subcircuits_netlist, self.specs, self.sb_mux, self.cb_mux)
 
         if self.specs.enable_carry_chain == 1:
-            self.transistor_sizes.update(self.carrychain.generate(self.subcircuits_filename, self.specs.min_tran_width, self.specs.use_finfet))
-            self.transistor_sizes.update(self.carrychainperf.generate(self.subcircuits_filename, self.specs.min_tran_width, self.specs.use_finfet))
-            self.transistor_sizes.update(self.carrychainmux.generate(self.subcircuits_filename, self.specs.min_tran_width, self.specs.use_finfet))
-            self.transistor_sizes.update(self.carrychaininter.generate(self.subcircuits_filename, self.specs.min_tran_width, self.specs.use_finfet))
+            self.transistor_sizes.update(self.carrychain.generate(self.subcircuits_netlist, self.specs.min_tran_width, self.specs.use_finfet))
+            self.transistor_sizes.update(self.carrychainperf.generate(self.subcircuits_netlist, self.specs.min_tran_width, self.specs.use_finfet))
+            self.transistor_sizes.update(self.carrychainmux.generate(self.subcircuits_netlist, self.specs.min_tran_width, self.specs.use_finfet))
+            self.transistor_sizes.update(self.carrychaininter.generate(self.subcircuits_netlist, self.specs.min_tran_width, self.specs.use_finfet))
             if self.specs.carry_chain_type == "skip":
-                self.transistor_sizes.update(self.carrychainand.generate(self.subcircuits_filename, self.specs.min_tran_width, self.specs.use_finfet))
-                self.transistor_sizes.update(self.carrychainskipmux.generate(self.subcircuits_filename, self.specs.min_tran_width, self.specs.use_finfet))
+                self.transistor_sizes.update(self.carrychainand.generate(self.subcircuits_netlist, self.specs.min_tran_width, self.specs.use_finfet))
+                self.transistor_sizes.update(self.carrychainskipmux.generate(self.subcircuits_netlist, self.specs.min_tran_width, self.specs.use_finfet))
 
         if self.specs.enable_bram_block == 1:
-            self.transistor_sizes.update(self.RAM.generate(self.subcircuits_filename, self.specs.min_tran_width, self.specs))
+            self.transistor_sizes.update(self.RAM.generate(self.subcircuits_netlist, self.specs.min_tran_width, self.specs))
 
         for hardblock in self.hardblocklist:
-            self.transistor_sizes.update(hardblock.generate(self.subcircuits_filename, self.specs.min_tran_width))
+            self.transistor_sizes.update(hardblock.generate(self.subcircuits_netlist, self.specs.min_tran_width))
         
         # Add file footers to 'subcircuits.l' and 'transistor_sizes.l' libraries.
         self._end_lib_files()
@@ -5586,6 +5682,20 @@ class FPGA:
         for hardblock in self.hardblocklist:
             hardblock.generate_top(size_hb_interfaces)
 
+        # Write the subcircuit libraries to disk, each one at once.
+        self.basic_subcircuits_netlist.write_file()
+        self.subcircuits_netlist.write_file()
+
+        self.netlist_files.stop()
+        self.num_netlists_written = len(self.netlist_files.written_paths)
+        self.num_netlists_unchanged = len(self.netlist_files.unchanged_paths)
+        print("Wrote " + str(self.num_netlists_written) + " netlist files, " + str(self.num_netlists_unchanged) + " were unchanged and left untouched")
+
+        # Delete the decks of a previous run that this run doesn't have (the current directory is the architecture folder)
+        num_removed = self.netlist_files.remove_stale_decks(os.getcwd())
+        if num_removed > 0:
+            print("Deleted " + str(num_removed) + " netlist files of a previous run")
+
         # Calculate area, and wire data.
         print("Calculating area...")
         # Update area values
@@ -5594,22 +5704,36 @@ class FPGA:
         self.update_wires()
         print("Calculating wire resistance and capacitance...")
         self.update_wire_rc()
+
+        # Index the parameters every deck of update_delays depends on, so that it only simulates 
+        # the decks whose parameters changed.
+        print("Indexing deck parameters...")
+        sp_paths, late_sp_paths = self._get_delay_sp_paths()
+        param_names = list(self.transistor_sizes.keys())
+        for wire_name in self.wire_rc_dict.keys():
+            param_names.extend([wire_name + "_res", wire_name + "_cap"])
+        self.deck_param_index = spice.DeckParameterIndex(sp_paths + late_sp_paths, param_names)
     
         print("")
         
 
     def update_area(self):
         """ This function updates self.area_dict. It passes area_dict to member objects (like sb_mux)
-            to update their area. Then, with an up-to-date area_dict it, calculate total tile area. """
+            to update their area. Then, with an up-to-date area_dict it, calculate total tile area. 
+            Transistor sizes can be NumPy arrays to evaluate several sizing combos at once, then the areas
+            and widths that depend on them are arrays too. So this function must not branch on these values
+            (use _sqrt, _maximum, etc.).
+            The update is incremental: only the transistors whose size changed and the subcircuits whose 
+            inputs changed since the last update are recomputed. The tile-level totals are always recomputed. """
         
         # We use the self.transistor_sizes to compute area. This dictionary has the form 'name': 'size'
         # And it knows the transistor sizes of all transistors in the FPGA
         # We first need to calculate the area for each transistor.
         # This function stores the areas in the transistor_area_list
-        self._update_area_per_transistor()
+        changed_transistors = self._update_area_per_transistor()
         # Now, we have to update area_dict and width_dict with the new transistor area values
         # for the basic subcircuits which are inverteres, ptran, tgate, restorers and transistors
-        self._update_area_and_width_dicts()
+        self._update_area_and_width_dicts(changed_transistors)
         #I found that printing width_dict here and comparing against golden results was helpful
         #self.debug_print("width_dict")
 
@@ -5623,58 +5747,59 @@ class FPGA:
 
 
         # carry chain:
+        area_dicts = (self.area_dict, self.width_dict)
         if self.specs.enable_carry_chain == 1:
-            self.carrychainperf.update_area(self.area_dict, self.width_dict)
-            self.carrychainmux.update_area(self.area_dict, self.width_dict)
-            self.carrychaininter.update_area(self.area_dict, self.width_dict)
-            self.carrychain.update_area(self.area_dict, self.width_dict)
+            self._update_subcircuit(self.carrychainperf.update_area, area_dicts)
+            self._update_subcircuit(self.carrychainmux.update_area, area_dicts)
+            self._update_subcircuit(self.carrychaininter.update_area, area_dicts)
+            self._update_subcircuit(self.carrychain.update_area, area_dicts)
             if self.specs.carry_chain_type == "skip":
-                self.carrychainand.update_area(self.area_dict, self.width_dict)
-                self.carrychainskipmux.update_area(self.area_dict, self.width_dict)
+                self._update_subcircuit(self.carrychainand.update_area, area_dicts)
+                self._update_subcircuit(self.carrychainskipmux.update_area, area_dicts)
 
 
         # Call area calculation functions of sub-blocks
-        self.sb_mux.update_area(self.area_dict, self.width_dict)
-        self.cb_mux.update_area(self.area_dict, self.width_dict)
-        self.logic_cluster.update_area(self.area_dict, self.width_dict)
+        self._update_subcircuit(self.sb_mux.update_area, area_dicts)
+        self._update_subcircuit(self.cb_mux.update_area, area_dicts)
+        self._update_subcircuit(self.logic_cluster.update_area, area_dicts)
         
 
         for hardblock in self.hardblocklist:
-            hardblock.update_area(self.area_dict, self.width_dict)
+            self._update_subcircuit(hardblock.update_area, area_dicts)
         
         if self.specs.enable_bram_block == 1:
-            self.RAM.update_area(self.area_dict, self.width_dict)
+            self._update_subcircuit(self.RAM.update_area, area_dicts)
         
         # Calculate total area of switch block
         switch_block_area = self.sb_mux.num_per_tile*self.area_dict[self.sb_mux.name + "_sram"]
         self.area_dict["sb_total"] = switch_block_area
-        self.width_dict["sb_total"] = math.sqrt(switch_block_area)
+        self.width_dict["sb_total"] = _sqrt(switch_block_area)
         
         # Calculate total area of connection block
         connection_block_area = self.cb_mux.num_per_tile*self.area_dict[self.cb_mux.name + "_sram"]
         self.area_dict["cb_total"] = connection_block_area
-        self.width_dict["cb_total"] = math.sqrt(connection_block_area)
+        self.width_dict["cb_total"] = _sqrt(connection_block_area)
         
         if self.lb_height == 0.0:        
             # Calculate total area of local muxes
             local_mux_area = self.logic_cluster.local_mux.num_per_tile*self.area_dict[self.logic_cluster.local_mux.name + "_sram"]
             self.area_dict["local_mux_total"] = local_mux_area
-            self.width_dict["local_mux_total"] = math.sqrt(local_mux_area)
+            self.width_dict["local_mux_total"] = _sqrt(local_mux_area)
             
             # Calculate total lut area
             lut_area = self.specs.N*self.area_dict["lut_and_drivers"]
             self.area_dict["lut_total"] = lut_area
-            self.width_dict["lut_total"] = math.sqrt(lut_area)
+            self.width_dict["lut_total"] = _sqrt(lut_area)
             
             # Calculate total ff area
             ff_area = self.specs.N*self.area_dict[self.logic_cluster.ble.ff.name]
             self.area_dict["ff_total"] = ff_area
-            self.width_dict["ff_total"] = math.sqrt(ff_area)
+            self.width_dict["ff_total"] = _sqrt(ff_area)
             
             # Calcualte total ble output area
             ble_output_area = self.specs.N*(self.area_dict["ble_output"])
             self.area_dict["ble_output_total"] = ble_output_area
-            self.width_dict["ble_output_total"] = math.sqrt(ble_output_area)
+            self.width_dict["ble_output_total"] = _sqrt(ble_output_area)
             
             # Calculate area of logic cluster
             #if self.specs.use_fluts:
@@ -5716,25 +5841,25 @@ class FPGA:
 
 
             self.area_dict["cc_area_total"] = cc_area_total
-            self.width_dict["cc_area_total"] = math.sqrt(cc_area_total)
+            self.width_dict["cc_area_total"] = _sqrt(cc_area_total)
 
             self.area_dict["local_mux_total"] = local_mux_area + local_mux_sram_area
-            self.width_dict["local_mux_total"] = math.sqrt(local_mux_area + local_mux_sram_area)
+            self.width_dict["local_mux_total"] = _sqrt(local_mux_area + local_mux_sram_area)
 
             self.area_dict["lut_total"] = lut_area + self.specs.N*(2**self.specs.K)*self.area_dict["sram"]
-            self.width_dict["lut_total"] = math.sqrt(lut_area + self.specs.N*(2**self.specs.K)*self.area_dict["sram"])
+            self.width_dict["lut_total"] = _sqrt(lut_area + self.specs.N*(2**self.specs.K)*self.area_dict["sram"])
 
             self.area_dict["ff_total"] = self.specs.N*self.area_dict[self.logic_cluster.ble.ff.name]
-            self.width_dict["ff_total"] = math.sqrt(self.specs.N*self.area_dict[self.logic_cluster.ble.ff.name])
+            self.width_dict["ff_total"] = _sqrt(self.specs.N*self.area_dict[self.logic_cluster.ble.ff.name])
 
             self.area_dict["ffableout_area_total"] = ffableout_area_total
-            self.width_dict["ffableout_area_total"] = math.sqrt(ffableout_area_total)            
+            self.width_dict["ffableout_area_total"] = _sqrt(ffableout_area_total)            
 
             self.area_dict["ble_output_total"] = self.specs.N*(self.area_dict["ble_output"])
-            self.width_dict["ble_output_total"] = math.sqrt(self.specs.N*(self.area_dict["ble_output"]))
+            self.width_dict["ble_output_total"] = _sqrt(self.specs.N*(self.area_dict["ble_output"]))
 
         self.area_dict["logic_cluster"] = cluster_area
-        self.width_dict["logic_cluster"] = math.sqrt(cluster_area)
+        self.width_dict["logic_cluster"] = _sqrt(cluster_area)
 
         if self.specs.enable_carry_chain == 1:
             # Calculate Carry Chain Area
@@ -5749,7 +5874,7 @@ class FPGA:
         tile_area = switch_block_area + connection_block_area + cluster_area 
 
         self.area_dict["tile"] = tile_area
-        self.width_dict["tile"] = math.sqrt(tile_area)
+        self.width_dict["tile"] = _sqrt(tile_area)
 
         
         if self.specs.enable_bram_block == 1:
@@ -5758,7 +5883,7 @@ class FPGA:
             # LOCAL MUX + FF area
             RAM_local_mux_area = self.RAM.RAM_local_mux.num_per_tile * self.area_dict[self.RAM.RAM_local_mux.name + "_sram"] + self.area_dict[self.logic_cluster.ble.ff.name]
             self.area_dict["ram_local_mux_total"] = RAM_local_mux_area
-            self.width_dict["ram_local_mux_total"] = math.sqrt(RAM_local_mux_area)
+            self.width_dict["ram_local_mux_total"] = _sqrt(RAM_local_mux_area)
 
             # SB and CB in the RAM tile:
             RAM_area =(RAM_local_mux_area + self.area_dict[self.cb_mux.name + "_sram"] * self.RAM.ram_inputs + (2** (self.RAM.conf_decoder_bits + 3)) *self.area_dict[self.sb_mux.name + "_sram"]) 
@@ -5819,7 +5944,7 @@ class FPGA:
             if self.RAM.cvalidobj2 == 1:
                 RAM_configurabledecoder_area += self.area_dict[self.RAM.configurabledecoder2ii.name]
             self.area_dict["configurabledecoder_wodriver"] = RAM_configurabledecoder_area
-            self.width_dict["configurabledecoder_wodriver"] = math.sqrt(self.area_dict["configurabledecoder_wodriver"])
+            self.width_dict["configurabledecoder_wodriver"] = _sqrt(self.area_dict["configurabledecoder_wodriver"])
             RAM_configurabledecoder_area += self.area_dict[self.RAM.configurabledecoderiii.name]
             if self.number_of_banks == 2:
                 RAM_configurabledecoder_area = RAM_configurabledecoder_area * 2
@@ -5836,15 +5961,15 @@ class FPGA:
 
             # write into dictionaries:
             self.area_dict["wordline_total"] = RAM_wordlinedriver_area
-            self.width_dict["wordline_total"] = math.sqrt(RAM_wordlinedriver_area)
+            self.width_dict["wordline_total"] = _sqrt(RAM_wordlinedriver_area)
             self.area_dict["configurabledecoder"] = RAM_configurabledecoder_area
-            self.width_dict["configurabledecoder"] = math.sqrt(RAM_configurabledecoder_area)
+            self.width_dict["configurabledecoder"] = _sqrt(RAM_configurabledecoder_area)
             self.area_dict["decoder"] = RAM_decoder_area 
             self.area_dict["decoder_total"] = RAM_decoder_area * 2 
-            self.width_dict["decoder"] = math.sqrt(RAM_decoder_area)
+            self.width_dict["decoder"] = _sqrt(RAM_decoder_area)
             self.area_dict["ram"] = RAM_area
             self.area_dict["ram_core"] = RAM_area - RAM_SB_area - RAM_CB_area
-            self.width_dict["ram"] = math.sqrt(RAM_area) 
+            self.width_dict["ram"] = _sqrt(RAM_area) 
         
         if self.lb_height != 0.0:  
             self.compute_distance()
@@ -5945,8 +6070,7 @@ class FPGA:
                             for i in range(index2 + 1, index1):
                                 distance_temp = distance_temp + self.dict_real_widths[self.stripe_order[i]]/self.span_stripe_fraction
                             distance_temp = distance_temp + self.dict_real_widths[self.stripe_order[index1]]/self.span_stripe_fraction
-                        if self.d_cb_to_ic < distance_temp:
-                            self.d_cb_to_ic = distance_temp
+                        self.d_cb_to_ic = _maximum(self.d_cb_to_ic, distance_temp)
 
                     if (item1 == "lut" and item2 == "ic") or (item1 == "ic" and item2 == "lut"):
                         if index1 < index2:
@@ -5959,8 +6083,7 @@ class FPGA:
                             for i in range(index2 + 1, index1):
                                 distance_temp = distance_temp + self.dict_real_widths[self.stripe_order[i]]/self.span_stripe_fraction
                             distance_temp = distance_temp + self.dict_real_widths[self.stripe_order[index1]]/self.span_stripe_fraction
-                        if self.d_ic_to_lut < distance_temp:
-                            self.d_ic_to_lut = distance_temp
+                        self.d_ic_to_lut = _maximum(self.d_ic_to_lut, distance_temp)
 
                     if (item1 == "lut" and item2 == "cc") or (item1 == "cc" and item2 == "lut"):
                         if index1 < index2:
@@ -5973,8 +6096,7 @@ class FPGA:
                             for i in range(index2 + 1, index1):
                                 distance_temp = distance_temp + self.dict_real_widths[self.stripe_order[i]]/self.span_stripe_fraction
                             distance_temp = distance_temp + self.dict_real_widths[self.stripe_order[index1]]/self.span_stripe_fraction
-                        if self.d_lut_to_cc < distance_temp:
-                            self.d_lut_to_cc = distance_temp
+                        self.d_lut_to_cc = _maximum(self.d_lut_to_cc, distance_temp)
 
                     if (item1 == "ffble" and item2 == "cc") or (item1 == "cc" and item2 == "ffble"):
                         if index1 < index2:
@@ -5987,8 +6109,7 @@ class FPGA:
                             for i in range(index2 + 1, index1):
                                 distance_temp = distance_temp + self.dict_real_widths[self.stripe_order[i]]/self.span_stripe_fraction
                             distance_temp = distance_temp + self.dict_real_widths[self.stripe_order[index1]]/self.span_stripe_fraction
-                        if self.d_cc_to_ffble < distance_temp:
-                            self.d_cc_to_ffble = distance_temp                                                                                    
+                        self.d_cc_to_ffble = _maximum(self.d_cc_to_ffble, distance_temp)                                                                                    
 
                     if (item1 == "ffble" and item2 == "sb") or (item1 == "sb" and item2 == "ffble"):
                         if index1 < index2:
@@ -6001,8 +6122,7 @@ class FPGA:
                             for i in range(index2 + 1, index1):
                                 distance_temp = distance_temp + self.dict_real_widths[self.stripe_order[i]]/self.span_stripe_fraction
                             distance_temp = distance_temp + self.dict_real_widths[self.stripe_order[index1]]/self.span_stripe_fraction
-                        if self.d_ffble_to_sb < distance_temp:
-                            self.d_ffble_to_sb = distance_temp
+                        self.d_ffble_to_sb = _maximum(self.d_ffble_to_sb, distance_temp)
 
                     if (item1 == "ffble" and item2 == "ic") or (item1 == "ic" and item2 == "ffble"):
                         if index1 < index2:
@@ -6015,8 +6135,7 @@ class FPGA:
                             for i in range(index2 + 1, index1):
                                 distance_temp = distance_temp + self.dict_real_widths[self.stripe_order[i]]/self.span_stripe_fraction
                             distance_temp = distance_temp + self.dict_real_widths[self.stripe_order[index1]]/self.span_stripe_fraction
-                        if self.d_ffble_to_ic < distance_temp:
-                            self.d_ffble_to_ic = distance_temp       
+                        self.d_ffble_to_ic = _maximum(self.d_ffble_to_ic, distance_temp)       
         
         #print str(self.dict_real_widths["sb"])
         #print str(self.dict_real_widths["cb"])
@@ -6028,40 +6147,103 @@ class FPGA:
 
 
     def determine_height(self):
+        """
+        Find the logic tile height with the lowest cost. The search starts with a bracket of 
+        HEIGHT_SEARCH_STEP around the current height and moves it until the cheapest height is 
+        inside it. Then the bracket is narrowed down with a parabolic step and a golden-section 
+        step at a time until it is HEIGHT_SEARCH_TOLERANCE of the height wide. All the heights 
+        of a step are evaluated in one batch (see _get_height_costs).
+        """
 
         # if no previous floorplan exists, get an initial height:
         if self.lb_height == 0.0:
             self.lb_height = math.sqrt(self.area_dict["tile"])
 
-        is_done = False
-        current_iteration = 0
-        max_iteration = 10
-        # tweak the current height to find a better one, possibly:
-        while is_done == False and current_iteration < max_iteration:
-            print("searching for a height for the logic tile " + str(self.lb_height))
-            old_height = self.lb_height
-            current_best_index = 0
+        start_height = self.lb_height
+        step = HEIGHT_SEARCH_STEP*start_height
+        tolerance = HEIGHT_SEARCH_TOLERANCE*start_height
+        # Cost of every height we tried, {height: cost}
+        height_costs = {}
+
+        def evaluate(heights):
+            heights = [height for height in heights if height > 0 and all(abs(height - tried) > tolerance/2 for tried in height_costs)]
+            if len(heights) > 0:
+                print("searching for a height for the logic tile " + ", ".join(str(height) for height in heights))
+                costs = self._get_height_costs(heights)
+                for height, cost in zip(heights, costs):
+                    print("cost of the logic tile height " + str(height) + ": " + str(cost))
+                height_costs.update(zip(heights, costs))
+            # The cheapest height and its neighbours
+            tried_heights = sorted(height_costs.keys())
+            best = min(range(len(tried_heights)), key=lambda i: height_costs[tried_heights[i]])
+            return tried_heights[max(best - 1, 0)], tried_heights[best], tried_heights[min(best + 1, len(tried_heights) - 1)]
+
+        # Move the bracket in the direction the cost goes down until it holds the cheapest height
+        low, best, high = evaluate([start_height - step, start_height, start_height + step])
+        num_expansions = 0
+        while (best == low or best == high) and num_expansions < HEIGHT_SEARCH_MAX_EXPANSIONS:
+            if best == high:
+                low, best, high = evaluate([high + step, high + 2*step])
+            else:
+                low, best, high = evaluate([low - step, low - 2*step])
+            step = step*GOLDEN_RATIO
+            num_expansions += 1
+
+        # Narrow the bracket down: the vertex of the parabola through the bracket and the 
+        # golden-section point of its larger half
+        while high - low > tolerance and low < best < high:
+            heights = []
+            low_cost, best_cost, high_cost = height_costs[low], height_costs[best], height_costs[high]
+            denominator = (best - low)*(best_cost - high_cost) - (best - high)*(best_cost - low_cost)
+            if denominator != 0:
+                vertex = best - ((best - low)**2*(best_cost - high_cost) - (best - high)**2*(best_cost - low_cost))/(2*denominator)
+                if low < vertex < high:
+                    heights.append(vertex)
+            if high - best > best - low:
+                heights.append(best + (high - best)*(1 - 1/GOLDEN_RATIO))
+            else:
+                heights.append(best - (best - low)*(1 - 1/GOLDEN_RATIO))
+            bracket = (low, best, high)
+            low, best, high = evaluate(heights)
+            # Every height of this step was already tried
+            if (low, best, high) == bracket:
+                break
+
+        self.lb_height = best
+        print("found the best tile height: " + str(self.lb_height))
+
+
+    def _get_height_costs(self, heights):
+        """
+        Returns the cost of the FPGA with each logic tile height in 'heights'. The area and wires
+        are updated for every height, and then the decks of update_delays are simulated for all
+        of them at once, with a sweep setting per height.
+        """
+
+        # The transistor sizes and wire rc with every height
+        parameter_dict = {}
+        for height in heights:
+            self.lb_height = height
             self.update_area()
             self.update_wires()
             self.update_wire_rc()
-            self.update_delays(self.spice_interface)
-            old_cost = tran_sizing.cost_function(tran_sizing.get_eval_area(self, "global", self.sb_mux, 0, 0), tran_sizing.get_current_delay(self, 0), self.area_opt_weight, self.delay_opt_weight)
-            for i in range (-10,11):
-                self.lb_height = old_height + ((0.01 * (i))* old_height)
-                self.update_area()
-                self.update_wires()
-                self.update_wire_rc()
-                self.update_delays(self.spice_interface)
-                new_cost = tran_sizing.cost_function(tran_sizing.get_eval_area(self, "global", self.sb_mux, 0, 0), tran_sizing.get_current_delay(self, 0), self.area_opt_weight, self.delay_opt_weight)
-                if new_cost < old_cost:
-                    old_cost = new_cost
-                    current_best_index = i
-            self.lb_height = (0.01 * (current_best_index))* old_height + old_height
-            current_iteration = current_iteration + 1
-            if current_best_index == 0:
-                is_done = True
+            for param_name, param_values in self._get_delay_parameter_dict().items():
+                parameter_dict.setdefault(param_name, []).extend(param_values)
 
-        print("found the best tile height: " + str(self.lb_height))
+        sp_paths, late_sp_paths = self._get_delay_sp_paths()
+        batch_meas = self.deck_param_index.run_all(self.spice_interface, sp_paths, parameter_dict, as_array=True)
+
+        costs = []
+        for i, height in enumerate(heights):
+            self.lb_height = height
+            self.update_area()
+            self.update_wires()
+            self.update_wire_rc()
+            delay_meas = dict((sp_path, spice_meas.get_rows(slice(i, i + 1))) for sp_path, spice_meas in zip(sp_paths, batch_meas))
+            self.update_delays(self.spice_interface, delay_meas)
+            costs.append(tran_sizing.cost_function(tran_sizing.get_eval_area(self, "global", self.sb_mux, 0, 0), tran_sizing.get_current_delay(self, 0), self.area_opt_weight, self.delay_opt_weight))
+
+        return costs
 
         
 
@@ -6070,15 +6252,16 @@ class FPGA:
             objects (like sb_mux) to update their wire lengths and layers. """
         
         # Update wire lengths and layers for all subcircuits
+        wire_dicts = (self.width_dict, self.wire_lengths, self.wire_layers)
 
 
 
         if self.lb_height == 0:
-            self.cluster_output_load.update_wires(self.width_dict, self.wire_lengths, self.wire_layers, 0.0, 0.0)
-            self.sb_mux.update_wires(self.width_dict, self.wire_lengths, self.wire_layers, 1.0)
-            self.cb_mux.update_wires(self.width_dict, self.wire_lengths, self.wire_layers, 1.0)
-            self.logic_cluster.update_wires(self.width_dict, self.wire_lengths, self.wire_layers, 1.0, 1.0, 0.0, 0.0)
-            self.routing_wire_load.update_wires(self.width_dict, self.wire_lengths, self.wire_layers, 0.0, 2.0, 2.0)
+            self._update_subcircuit(self.cluster_output_load.update_wires, wire_dicts, 0.0, 0.0)
+            self._update_subcircuit(self.sb_mux.update_wires, wire_dicts, 1.0)
+            self._update_subcircuit(self.cb_mux.update_wires, wire_dicts, 1.0)
+            self._update_subcircuit(self.logic_cluster.update_wires, wire_dicts, 1.0, 1.0, 0.0, 0.0)
+            self._update_subcircuit(self.routing_wire_load.update_wires, wire_dicts, 0.0, 2.0, 2.0)
         else:
             sb_ratio = (self.lb_height/(self.sb_mux.num_per_tile/self.num_sb_stripes)) / self.dict_real_widths["sb"]
             if sb_ratio < 1.0:
@@ -6112,39 +6295,46 @@ class FPGA:
 
             #this was used for debugging so I commented it
             #print "ratios " + str(sb_ratio) +" "+ str(cb_ratio) +" "+ str(ic_ratio) +" "+ str(lut_ratio)
-            self.cluster_output_load.update_wires(self.width_dict, self.wire_lengths, self.wire_layers, self.d_ffble_to_sb, self.lb_height)
-            self.sb_mux.update_wires(self.width_dict, self.wire_lengths, self.wire_layers, sb_ratio)
-            self.cb_mux.update_wires(self.width_dict, self.wire_lengths, self.wire_layers, cb_ratio)
-            self.logic_cluster.update_wires(self.width_dict, self.wire_lengths, self.wire_layers, ic_ratio, lut_ratio, self.d_ffble_to_ic, self.d_cb_to_ic + self.lb_height)
-            self.routing_wire_load.update_wires(self.width_dict, self.wire_lengths, self.wire_layers, self.lb_height, self.num_sb_stripes, self.num_cb_stripes)
+            self._update_subcircuit(self.cluster_output_load.update_wires, wire_dicts, self.d_ffble_to_sb, self.lb_height)
+            self._update_subcircuit(self.sb_mux.update_wires, wire_dicts, sb_ratio)
+            self._update_subcircuit(self.cb_mux.update_wires, wire_dicts, cb_ratio)
+            self._update_subcircuit(self.logic_cluster.update_wires, wire_dicts, ic_ratio, lut_ratio, self.d_ffble_to_ic, self.d_cb_to_ic + self.lb_height)
+            self._update_subcircuit(self.routing_wire_load.update_wires, wire_dicts, self.lb_height, self.num_sb_stripes, self.num_cb_stripes)
 
 
         
         if self.specs.enable_carry_chain == 1:
-            self.carrychain.update_wires(self.width_dict, self.wire_lengths, self.wire_layers)
-            self.carrychainperf.update_wires(self.width_dict, self.wire_lengths, self.wire_layers)
-            self.carrychainmux.update_wires(self.width_dict, self.wire_lengths, self.wire_layers)
-            self.carrychaininter.update_wires(self.width_dict, self.wire_lengths, self.wire_layers)
+            self._update_subcircuit(self.carrychain.update_wires, wire_dicts)
+            self._update_subcircuit(self.carrychainperf.update_wires, wire_dicts)
+            self._update_subcircuit(self.carrychainmux.update_wires, wire_dicts)
+            self._update_subcircuit(self.carrychaininter.update_wires, wire_dicts)
             if self.specs.carry_chain_type == "skip":
-                self.carrychainand.update_wires(self.width_dict, self.wire_lengths, self.wire_layers)
-                self.carrychainskipmux.update_wires(self.width_dict, self.wire_lengths, self.wire_layers)                
+                self._update_subcircuit(self.carrychainand.update_wires, wire_dicts)
+                self._update_subcircuit(self.carrychainskipmux.update_wires, wire_dicts)                
         if self.specs.enable_bram_block == 1:
-            self.RAM.update_wires(self.width_dict, self.wire_lengths, self.wire_layers)
+            self._update_subcircuit(self.RAM.update_wires, wire_dicts)
 
 
         for hardblock in self.hardblocklist:
-            hardblock.update_wires(self.width_dict, self.wire_lengths, self.wire_layers)  
-            hardblock.mux.update_wires(self.width_dict, self.wire_lengths, self.wire_layers)   
+            self._update_subcircuit(hardblock.update_wires, wire_dicts)  
+            self._update_subcircuit(hardblock.mux.update_wires, wire_dicts)   
 
         #self.debug_print("wire_lengths")  
 
     def update_wire_rc(self):
         """ This function updates self.wire_rc_dict based on the FPGA's self.wire_lengths and self.wire_layers."""
             
-        # Calculate R and C for each wire
+        # Calculate R and C for each wire whose length or layer changed since the last update (wire lengths
+        # that are arrays can't be compared, see update_area)
         for wire, length in self.wire_lengths.items():
             # Get wire layer
             layer = self.wire_layers[wire]
+            if not isinstance(length, np.ndarray):
+                if self._wire_rc_inputs.get(wire) == (length, layer):
+                    continue
+                self._wire_rc_inputs[wire] = (length, layer)
+            else:
+                self._wire_rc_inputs.pop(wire, None)
             # Get R and C per unit length for wire layer
             rc = self.metal_stack[layer]
             # Calculate total wire R and C
@@ -6156,17 +6346,79 @@ class FPGA:
 
 
     #TODO: break this into different functions or form a loop out of it; it's too long
-    def update_delays(self, spice_interface):
+    def _get_delay_sp_paths(self):
         """ 
-        Get the HSPICE delays for each subcircuit. 
-        This function returns "False" if any of the HSPICE simulations failed.
+        Returns the top-level decks that update_delays simulates, in the order it uses them. 
+        The second list holds the decks of MTJ BRAMs that are simulated after the process data 
+        is updated with the bitline charging measurements (it is empty otherwise).
         """
-        
-        print("*** UPDATING DELAYS ***")
-        crit_path_delay = 0
-        valid_delay = True
 
-        # Create parameter dict of all current transistor sizes and wire rc
+        sp_paths = [self.sb_mux.top_spice_path, 
+                    self.cb_mux.top_spice_path, 
+                    self.logic_cluster.local_mux.top_spice_path,
+                    self.logic_cluster.ble.local_output.top_spice_path, 
+                    self.logic_cluster.ble.general_output.top_spice_path]
+        if self.specs.use_fluts:
+            sp_paths.append(self.logic_cluster.ble.fmux.top_spice_path)
+        sp_paths.append(self.logic_cluster.ble.lut.top_spice_path)
+
+        for lut_input_name, lut_input in self.logic_cluster.ble.lut.input_drivers.items():
+            # The path through the LUT of the input driven by the fracturable LUT mux isn't simulated
+            if not ((lut_input_name == "f" and self.specs.use_fluts and self.specs.K == 6) or (lut_input_name == "e" and self.specs.use_fluts and self.specs.K == 5)):
+                sp_paths.append(lut_input.driver.top_spice_path.replace(".sp", "_with_lut.sp"))
+            sp_paths.append(lut_input.driver.top_spice_path)
+            sp_paths.append(lut_input.not_driver.top_spice_path)
+
+        if self.specs.enable_carry_chain == 1:
+            sp_paths.extend([self.carrychain.top_spice_path, 
+                             self.carrychainperf.top_spice_path, 
+                             self.carrychainmux.top_spice_path, 
+                             self.carrychaininter.top_spice_path])
+            if self.specs.carry_chain_type == "skip":
+                sp_paths.extend([self.carrychainand.top_spice_path, self.carrychainskipmux.top_spice_path])
+
+        for hardblock in self.hardblocklist:
+            sp_paths.append(hardblock.mux.top_spice_path)
+            if hardblock.parameters['num_dedicated_outputs'] > 0:
+                sp_paths.append(hardblock.dedicated.top_spice_path)
+
+        late_sp_paths = []
+        if self.specs.enable_bram_block == 0:
+            return sp_paths, late_sp_paths
+
+        sp_paths.extend([self.RAM.RAM_local_mux.top_spice_path, self.RAM.rowdecoder_stage0.top_spice_path])
+        if self.RAM.valid_row_dec_size2 == 1:
+            sp_paths.append(self.RAM.rowdecoder_stage1_size2.top_spice_path)
+        if self.RAM.valid_row_dec_size3 == 1:
+            sp_paths.append(self.RAM.rowdecoder_stage1_size3.top_spice_path)
+        sp_paths.append(self.RAM.rowdecoder_stage3.top_spice_path)
+
+        ram_sp_paths = sp_paths
+        if self.RAM.memory_technology == "SRAM":
+            sp_paths.extend([self.RAM.precharge.top_spice_path, 
+                             self.RAM.samp_part2.top_spice_path, 
+                             self.RAM.samp.top_spice_path, 
+                             self.RAM.writedriver.top_spice_path])
+        else:
+            sp_paths.extend([self.RAM.bldischarging.top_spice_path, self.RAM.blcharging.top_spice_path])
+            ram_sp_paths = late_sp_paths
+            ram_sp_paths.append(self.RAM.mtjsamp.top_spice_path)
+
+        ram_sp_paths.extend([self.RAM.columndecoder.top_spice_path, self.RAM.configurabledecoderi.top_spice_path])
+        if self.RAM.cvalidobj1 == 1:
+            ram_sp_paths.append(self.RAM.configurabledecoder3ii.top_spice_path)
+        if self.RAM.cvalidobj2 == 1:
+            ram_sp_paths.append(self.RAM.configurabledecoder2ii.top_spice_path)
+        ram_sp_paths.extend([self.RAM.configurabledecoderiii.top_spice_path, 
+                             self.RAM.pgateoutputcrossbar.top_spice_path, 
+                             self.RAM.wordlinedriver.top_spice_path])
+
+        return sp_paths, late_sp_paths
+
+
+    def _get_delay_parameter_dict(self):
+        """ Returns the parameter dict of all current transistor sizes and wire rc, as update_delays simulates them. """
+
         parameter_dict = {}
         for tran_name, tran_size in self.transistor_sizes.items():
             if not self.specs.use_finfet:
@@ -6178,6 +6430,34 @@ class FPGA:
             parameter_dict[wire_name + "_res"] = [rc_data[0]]
             parameter_dict[wire_name + "_cap"] = [rc_data[1]*1e-15]
 
+        return parameter_dict
+
+
+    def update_delays(self, spice_interface, delay_meas=None):
+        """ 
+        Get the HSPICE delays for each subcircuit. 
+        This function returns "False" if any of the HSPICE simulations failed.
+        'delay_meas' can give the measurements of the decks that were already simulated 
+        with the current sizes and wire rc, {sp_path: measurements} (see _get_height_costs).
+        """
+        
+        print("*** UPDATING DELAYS ***")
+        crit_path_delay = 0
+        valid_delay = True
+
+        # Create parameter dict of all current transistor sizes and wire rc
+        parameter_dict = self._get_delay_parameter_dict()
+
+        # The decks of all subcircuits don't depend on each other, so they are all simulated 
+        # at once and their measurements are looked up by deck below. The decks that MTJ BRAMs 
+        # simulate after the process data is updated are simulated when it is. Decks whose 
+        # parameters didn't change since the last update keep their measurements.
+        sp_paths, late_sp_paths = self._get_delay_sp_paths()
+        if delay_meas is None:
+            num_reused = self.deck_param_index.num_reused
+            delay_meas = dict(zip(sp_paths, self.deck_param_index.run_all(spice_interface, sp_paths, parameter_dict, as_array=True)))
+            print("  Reused the measurements of " + str(self.deck_param_index.num_reused - num_reused) + " of " + str(len(sp_paths)) + " decks (parameters unchanged)")
+
         # Run HSPICE on all subcircuits and collect the total tfall and trise for that 
         # subcircuit. We are only doing a single run on HSPICE so we expect the result
         # to be in [0] of the spice_meas dictionary. We check to make sure that the 
@@ -6187,8 +6467,8 @@ class FPGA:
 
         # Switch Block MUX 
         print("  Updating delay for " + self.sb_mux.name)
-        spice_meas = spice_interface.run(self.sb_mux.top_spice_path, parameter_dict)
-        if spice_meas["meas_total_tfall"][0] == "failed" or spice_meas["meas_total_trise"][0] == "failed" :
+        spice_meas = delay_meas[self.sb_mux.top_spice_path]
+        if spice_meas.is_failed("meas_total_tfall")[0] or spice_meas.is_failed("meas_total_trise")[0] :
             valid_delay = False
             tfall = 1
             trise = 1
@@ -6206,8 +6486,8 @@ class FPGA:
         
         # Connection Block MUX
         print("  Updating delay for " + self.cb_mux.name)
-        spice_meas = spice_interface.run(self.cb_mux.top_spice_path, parameter_dict) 
-        if spice_meas["meas_total_tfall"][0] == "failed" or spice_meas["meas_total_trise"][0] == "failed" :
+        spice_meas = delay_meas[self.cb_mux.top_spice_path] 
+        if spice_meas.is_failed("meas_total_tfall")[0] or spice_meas.is_failed("meas_total_trise")[0] :
             valid_delay = False
             tfall = 1
             trise = 1
@@ -6225,9 +6505,8 @@ class FPGA:
         
         # Local MUX
         print("  Updating delay for " + self.logic_cluster.local_mux.name)
-        spice_meas = spice_interface.run(self.logic_cluster.local_mux.top_spice_path, 
-                                         parameter_dict) 
-        if spice_meas["meas_total_tfall"][0] == "failed" or spice_meas["meas_total_trise"][0] == "failed" :
+        spice_meas = delay_meas[self.logic_cluster.local_mux.top_spice_path] 
+        if spice_meas.is_failed("meas_total_tfall")[0] or spice_meas.is_failed("meas_total_trise")[0] :
             valid_delay = False
             tfall = 1
             trise = 1
@@ -6246,9 +6525,8 @@ class FPGA:
         
         # Local BLE output
         print("  Updating delay for " + self.logic_cluster.ble.local_output.name) 
-        spice_meas = spice_interface.run(self.logic_cluster.ble.local_output.top_spice_path, 
-                                         parameter_dict) 
-        if spice_meas["meas_total_tfall"][0] == "failed" or spice_meas["meas_total_trise"][0] == "failed" :
+        spice_meas = delay_meas[self.logic_cluster.ble.local_output.top_spice_path] 
+        if spice_meas.is_failed("meas_total_tfall")[0] or spice_meas.is_failed("meas_total_trise")[0] :
             valid_delay = False
             tfall = 1
             trise = 1
@@ -6267,9 +6545,8 @@ class FPGA:
         
         # General BLE output
         print("  Updating delay for " + self.logic_cluster.ble.general_output.name)
-        spice_meas = spice_interface.run(self.logic_cluster.ble.general_output.top_spice_path, 
-                                         parameter_dict) 
-        if spice_meas["meas_total_tfall"][0] == "failed" or spice_meas["meas_total_trise"][0] == "failed" :
+        spice_meas = delay_meas[self.logic_cluster.ble.general_output.top_spice_path] 
+        if spice_meas.is_failed("meas_total_tfall")[0] or spice_meas.is_failed("meas_total_trise")[0] :
             valid_delay = False
             tfall = 1
             trise = 1
@@ -6292,9 +6569,8 @@ class FPGA:
         # fracturable lut mux
         if self.specs.use_fluts:
             print("  Updating delay for " + self.logic_cluster.ble.fmux.name)
-            spice_meas = spice_interface.run(self.logic_cluster.ble.fmux.top_spice_path, 
-                                             parameter_dict) 
-            if spice_meas["meas_total_tfall"][0] == "failed" or spice_meas["meas_total_trise"][0] == "failed" :
+            spice_meas = delay_meas[self.logic_cluster.ble.fmux.top_spice_path] 
+            if spice_meas.is_failed("meas_total_tfall")[0] or spice_meas.is_failed("meas_total_trise")[0] :
                 valid_delay = False
                 tfall = 1
                 trise = 1
@@ -6312,9 +6588,8 @@ class FPGA:
 
         # LUT delay
         print("  Updating delay for " + self.logic_cluster.ble.lut.name)
-        spice_meas = spice_interface.run(self.logic_cluster.ble.lut.top_spice_path, 
-                                         parameter_dict) 
-        if spice_meas["meas_total_tfall"][0] == "failed" or spice_meas["meas_total_trise"][0] == "failed" :
+        spice_meas = delay_meas[self.logic_cluster.ble.lut.top_spice_path] 
+        if spice_meas.is_failed("meas_total_tfall")[0] or spice_meas.is_failed("meas_total_trise")[0] :
             valid_delay = False
             tfall = 1
             trise = 1
@@ -6347,8 +6622,8 @@ class FPGA:
             else:
 
             # Get the delay for a path through the LUT (we do it for each input)
-                spice_meas = spice_interface.run(driver_and_lut_sp_path, parameter_dict) 
-                if spice_meas["meas_total_tfall"][0] == "failed" or spice_meas["meas_total_trise"][0] == "failed" :
+                spice_meas = delay_meas[driver_and_lut_sp_path] 
+                if spice_meas.is_failed("meas_total_tfall")[0] or spice_meas.is_failed("meas_total_trise")[0] :
                     valid_delay = False
                     tfall = 1
                     trise = 1
@@ -6373,8 +6648,8 @@ class FPGA:
             
             # Now, we want to get the delay and power for the driver
             print("  Updating delay for " + driver.name) 
-            spice_meas = spice_interface.run(driver.top_spice_path, parameter_dict) 
-            if spice_meas["meas_total_tfall"][0] == "failed" or spice_meas["meas_total_trise"][0] == "failed" :
+            spice_meas = delay_meas[driver.top_spice_path] 
+            if spice_meas.is_failed("meas_total_tfall")[0] or spice_meas.is_failed("meas_total_trise")[0] :
                 valid_delay = False
                 tfall = 1
                 trise = 1
@@ -6395,8 +6670,8 @@ class FPGA:
 
             # ... and the not_driver
             print("  Updating delay for " + not_driver.name)
-            spice_meas = spice_interface.run(not_driver.top_spice_path, parameter_dict) 
-            if spice_meas["meas_total_tfall"][0] == "failed" or spice_meas["meas_total_trise"][0] == "failed" :
+            spice_meas = delay_meas[not_driver.top_spice_path] 
+            if spice_meas.is_failed("meas_total_tfall")[0] or spice_meas.is_failed("meas_total_trise")[0] :
                 valid_delay = False
                 tfall = 1
                 trise = 1
@@ -6434,9 +6709,8 @@ class FPGA:
         
         if self.specs.enable_carry_chain == 1:
             print("  Updating delay for " + self.carrychain.name)
-            spice_meas = spice_interface.run(self.carrychain.top_spice_path, 
-                                             parameter_dict) 
-            if spice_meas["meas_total_tfall"][0] == "failed" or spice_meas["meas_total_trise"][0] == "failed" :
+            spice_meas = delay_meas[self.carrychain.top_spice_path] 
+            if spice_meas.is_failed("meas_total_tfall")[0] or spice_meas.is_failed("meas_total_trise")[0] :
                 valid_delay = False
                 tfall = 1
                 trise = 1
@@ -6454,9 +6728,8 @@ class FPGA:
             self.carrychain.power = float(spice_meas["meas_avg_power"][0])
 
 
-            spice_meas = spice_interface.run(self.carrychainperf.top_spice_path, 
-                                             parameter_dict) 
-            if spice_meas["meas_total_tfall"][0] == "failed" or spice_meas["meas_total_trise"][0] == "failed" :
+            spice_meas = delay_meas[self.carrychainperf.top_spice_path] 
+            if spice_meas.is_failed("meas_total_tfall")[0] or spice_meas.is_failed("meas_total_trise")[0] :
                 valid_delay = False
                 tfall = 1
                 trise = 1
@@ -6473,9 +6746,8 @@ class FPGA:
             self.delay_dict[self.carrychainperf.name] = self.carrychainperf.delay
             self.carrychainperf.power = float(spice_meas["meas_avg_power"][0])
 
-            spice_meas = spice_interface.run(self.carrychainmux.top_spice_path, 
-                                             parameter_dict) 
-            if spice_meas["meas_total_tfall"][0] == "failed" or spice_meas["meas_total_trise"][0] == "failed" :
+            spice_meas = delay_meas[self.carrychainmux.top_spice_path] 
+            if spice_meas.is_failed("meas_total_tfall")[0] or spice_meas.is_failed("meas_total_trise")[0] :
                 valid_delay = False
                 tfall = 1
                 trise = 1
@@ -6493,9 +6765,8 @@ class FPGA:
             self.carrychainmux.power = float(spice_meas["meas_avg_power"][0])
 
 
-            spice_meas = spice_interface.run(self.carrychaininter.top_spice_path, 
-                                             parameter_dict) 
-            if spice_meas["meas_total_tfall"][0] == "failed" or spice_meas["meas_total_trise"][0] == "failed" :
+            spice_meas = delay_meas[self.carrychaininter.top_spice_path] 
+            if spice_meas.is_failed("meas_total_tfall")[0] or spice_meas.is_failed("meas_total_trise")[0] :
                 valid_delay = False
                 tfall = 1
                 trise = 1
@@ -6515,9 +6786,8 @@ class FPGA:
 
             if self.specs.carry_chain_type == "skip":
 
-                spice_meas = spice_interface.run(self.carrychainand.top_spice_path, 
-                                                 parameter_dict) 
-                if spice_meas["meas_total_tfall"][0] == "failed" or spice_meas["meas_total_trise"][0] == "failed" :
+                spice_meas = delay_meas[self.carrychainand.top_spice_path] 
+                if spice_meas.is_failed("meas_total_tfall")[0] or spice_meas.is_failed("meas_total_trise")[0] :
                     valid_delay = False
                     tfall = 1
                     trise = 1
@@ -6534,9 +6804,8 @@ class FPGA:
                 self.delay_dict[self.carrychainand.name] = self.carrychainand.delay
                 self.carrychainand.power = float(spice_meas["meas_avg_power"][0])
 
-                spice_meas = spice_interface.run(self.carrychainskipmux.top_spice_path, 
-                                                 parameter_dict) 
-                if spice_meas["meas_total_tfall"][0] == "failed" or spice_meas["meas_total_trise"][0] == "failed" :
+                spice_meas = delay_meas[self.carrychainskipmux.top_spice_path] 
+                if spice_meas.is_failed("meas_total_tfall")[0] or spice_meas.is_failed("meas_total_trise")[0] :
                     valid_delay = False
                     tfall = 1
                     trise = 1
@@ -6556,9 +6825,8 @@ class FPGA:
 
         for hardblock in self.hardblocklist:
 
-            spice_meas = spice_interface.run(hardblock.mux.top_spice_path, 
-                                             parameter_dict) 
-            if spice_meas["meas_total_tfall"][0] == "failed" or spice_meas["meas_total_trise"][0] == "failed" :
+            spice_meas = delay_meas[hardblock.mux.top_spice_path] 
+            if spice_meas.is_failed("meas_total_tfall")[0] or spice_meas.is_failed("meas_total_trise")[0] :
                 valid_delay = False
                 tfall = 1
                 trise = 1
@@ -6574,8 +6842,8 @@ class FPGA:
             self.delay_dict[hardblock.mux.name] = hardblock.mux.delay
             hardblock.mux.power = float(spice_meas["meas_avg_power"][0])
             if hardblock.parameters['num_dedicated_outputs'] > 0:
-                spice_meas = spice_interface.run(hardblock.dedicated.top_spice_path, parameter_dict) 
-                if spice_meas["meas_total_tfall"][0] == "failed" or spice_meas["meas_total_trise"][0] == "failed" :
+                spice_meas = delay_meas[hardblock.dedicated.top_spice_path] 
+                if spice_meas.is_failed("meas_total_tfall")[0] or spice_meas.is_failed("meas_total_trise")[0] :
                     valid_delay = False
                     tfall = 1
                     trise = 1
@@ -6597,9 +6865,8 @@ class FPGA:
             return valid_delay
         # Local RAM MUX
         print("  Updating delay for " + self.RAM.RAM_local_mux.name)
-        spice_meas = spice_interface.run(self.RAM.RAM_local_mux.top_spice_path, 
-                                         parameter_dict) 
-        if spice_meas["meas_total_tfall"][0] == "failed" or spice_meas["meas_total_trise"][0] == "failed" :
+        spice_meas = delay_meas[self.RAM.RAM_local_mux.top_spice_path] 
+        if spice_meas.is_failed("meas_total_tfall")[0] or spice_meas.is_failed("meas_total_trise")[0] :
             valid_delay = False
             tfall = 1
             trise = 1
@@ -6616,8 +6883,8 @@ class FPGA:
 
         #RAM decoder units
         print("  Updating delay for " + self.RAM.rowdecoder_stage0.name)
-        spice_meas = spice_interface.run(self.RAM.rowdecoder_stage0.top_spice_path, parameter_dict) 
-        if spice_meas["meas_total_tfall"][0] == "failed" or spice_meas["meas_total_trise"][0] == "failed" :
+        spice_meas = delay_meas[self.RAM.rowdecoder_stage0.top_spice_path] 
+        if spice_meas.is_failed("meas_total_tfall")[0] or spice_meas.is_failed("meas_total_trise")[0] :
             valid_delay = False
             tfall = 1
             trise = 1
@@ -6636,8 +6903,8 @@ class FPGA:
 
         if self.RAM.valid_row_dec_size2 == 1:
             print("  Updating delay for " + self.RAM.rowdecoder_stage1_size2.name)
-            spice_meas = spice_interface.run(self.RAM.rowdecoder_stage1_size2.top_spice_path, parameter_dict) 
-            if spice_meas["meas_total_tfall"][0] == "failed" or spice_meas["meas_total_trise"][0] == "failed" :
+            spice_meas = delay_meas[self.RAM.rowdecoder_stage1_size2.top_spice_path] 
+            if spice_meas.is_failed("meas_total_tfall")[0] or spice_meas.is_failed("meas_total_trise")[0] :
                 valid_delay = False
                 tfall = 1
                 trise = 1
@@ -6655,8 +6922,8 @@ class FPGA:
 
         if self.RAM.valid_row_dec_size3 == 1:
             print("  Updating delay for " + self.RAM.rowdecoder_stage1_size3.name)
-            spice_meas = spice_interface.run(self.RAM.rowdecoder_stage1_size3.top_spice_path, parameter_dict) 
-            if spice_meas["meas_total_tfall"][0] == "failed" or spice_meas["meas_total_trise"][0] == "failed" :
+            spice_meas = delay_meas[self.RAM.rowdecoder_stage1_size3.top_spice_path] 
+            if spice_meas.is_failed("meas_total_tfall")[0] or spice_meas.is_failed("meas_total_trise")[0] :
                 valid_delay = False
                 tfall = 1
                 trise = 1
@@ -6674,8 +6941,8 @@ class FPGA:
 
 
         print("  Updating delay for " + self.RAM.rowdecoder_stage3.name)
-        spice_meas = spice_interface.run(self.RAM.rowdecoder_stage3.top_spice_path, parameter_dict) 
-        if spice_meas["meas_total_tfall"][0] == "failed" or spice_meas["meas_total_trise"][0] == "failed" :
+        spice_meas = delay_meas[self.RAM.rowdecoder_stage3.top_spice_path] 
+        if spice_meas.is_failed("meas_total_tfall")[0] or spice_meas.is_failed("meas_total_trise")[0] :
             valid_delay = False
             tfall = 1
             trise = 1
@@ -6693,8 +6960,8 @@ class FPGA:
 
         if self.RAM.memory_technology == "SRAM":
             print("  Updating delay for " + self.RAM.precharge.name)
-            spice_meas = spice_interface.run(self.RAM.precharge.top_spice_path, parameter_dict) 
-            if spice_meas["meas_total_tfall"][0] == "failed" or spice_meas["meas_total_trise"][0] == "failed" :
+            spice_meas = delay_meas[self.RAM.precharge.top_spice_path] 
+            if spice_meas.is_failed("meas_total_tfall")[0] or spice_meas.is_failed("meas_total_trise")[0] :
                 valid_delay = False
                 tfall = 1
                 trise = 1
@@ -6711,8 +6978,8 @@ class FPGA:
             self.RAM.precharge.power = float(spice_meas["meas_avg_power"][0])
 
             print("  Updating delay for " + self.RAM.samp_part2.name)
-            spice_meas = spice_interface.run(self.RAM.samp_part2.top_spice_path, parameter_dict) 
-            if spice_meas["meas_total_tfall"][0] == "failed" or spice_meas["meas_total_trise"][0] == "failed" :
+            spice_meas = delay_meas[self.RAM.samp_part2.top_spice_path] 
+            if spice_meas.is_failed("meas_total_tfall")[0] or spice_meas.is_failed("meas_total_trise")[0] :
                 valid_delay = False
                 tfall = 1
                 trise = 1
@@ -6729,8 +6996,8 @@ class FPGA:
             self.RAM.samp_part2.power = float(spice_meas["meas_avg_power"][0])
 
             print("  Updating delay for " + self.RAM.samp.name)
-            spice_meas = spice_interface.run(self.RAM.samp.top_spice_path, parameter_dict) 
-            if spice_meas["meas_total_tfall"][0] == "failed" or spice_meas["meas_total_trise"][0] == "failed" :
+            spice_meas = delay_meas[self.RAM.samp.top_spice_path] 
+            if spice_meas.is_failed("meas_total_tfall")[0] or spice_meas.is_failed("meas_total_trise")[0] :
                 valid_delay = False
                 tfall = 1
                 trise = 1
@@ -6749,8 +7016,8 @@ class FPGA:
             self.RAM.samp.power = float(spice_meas["meas_avg_power"][0])
 
             print("  Updating delay for " + self.RAM.writedriver.name)
-            spice_meas = spice_interface.run(self.RAM.writedriver.top_spice_path, parameter_dict) 
-            if spice_meas["meas_total_tfall"][0] == "failed" or spice_meas["meas_total_trise"][0] == "failed" :
+            spice_meas = delay_meas[self.RAM.writedriver.top_spice_path] 
+            if spice_meas.is_failed("meas_total_tfall")[0] or spice_meas.is_failed("meas_total_trise")[0] :
                 valid_delay = False
                 tfall = 1
                 trise = 1
@@ -6768,8 +7035,8 @@ class FPGA:
 
         else:
             print("  Updating delay for " + self.RAM.bldischarging.name)
-            spice_meas = spice_interface.run(self.RAM.bldischarging.top_spice_path, parameter_dict) 
-            if spice_meas["meas_total_tfall"][0] == "failed" or spice_meas["meas_total_trise"][0] == "failed" :
+            spice_meas = delay_meas[self.RAM.bldischarging.top_spice_path] 
+            if spice_meas.is_failed("meas_total_tfall")[0] or spice_meas.is_failed("meas_total_trise")[0] :
                 valid_delay = False
                 tfall = 1
                 trise = 1
@@ -6786,8 +7053,8 @@ class FPGA:
             self.RAM.bldischarging.power = float(spice_meas["meas_avg_power"][0])
 
             print("  Updating delay for " + self.RAM.blcharging.name)
-            spice_meas = spice_interface.run(self.RAM.blcharging.top_spice_path, parameter_dict) 
-            if spice_meas["meas_total_tfall"][0] == "failed" or spice_meas["meas_total_trise"][0] == "failed" :
+            spice_meas = delay_meas[self.RAM.blcharging.top_spice_path] 
+            if spice_meas.is_failed("meas_total_tfall")[0] or spice_meas.is_failed("meas_total_trise")[0] :
                 valid_delay = False
                 tfall = 1
                 trise = 1
@@ -6808,8 +7075,8 @@ class FPGA:
             self.RAM._update_process_data()
 
             print("  Updating delay for " + self.RAM.blcharging.name)
-            spice_meas = spice_interface.run(self.RAM.blcharging.top_spice_path, parameter_dict) 
-            if spice_meas["meas_total_tfall"][0] == "failed" or spice_meas["meas_total_trise"][0] == "failed" :
+            spice_meas = spice_interface.run(self.RAM.blcharging.top_spice_path, parameter_dict, as_array=True) 
+            if spice_meas.is_failed("meas_total_tfall")[0] or spice_meas.is_failed("meas_total_trise")[0] :
                 valid_delay = False
                 tfall = 1
                 trise = 1
@@ -6827,10 +7094,13 @@ class FPGA:
             self.RAM.target_bl = 0.99*float(spice_meas["meas_outputtarget"][0])
 
             self.RAM._update_process_data()
+            num_reused = self.deck_param_index.num_reused
+            delay_meas.update(zip(late_sp_paths, self.deck_param_index.run_all(spice_interface, late_sp_paths, parameter_dict, as_array=True)))
+            print("  Reused the measurements of " + str(self.deck_param_index.num_reused - num_reused) + " of " + str(len(late_sp_paths)) + " decks (parameters unchanged)")
 
             print("  Updating delay for " + self.RAM.mtjsamp.name)
-            spice_meas = spice_interface.run(self.RAM.mtjsamp.top_spice_path, parameter_dict) 
-            if spice_meas["meas_total_tfall"][0] == "failed" or spice_meas["meas_total_trise"][0] == "failed" :
+            spice_meas = delay_meas[self.RAM.mtjsamp.top_spice_path] 
+            if spice_meas.is_failed("meas_total_tfall")[0] or spice_meas.is_failed("meas_total_trise")[0] :
                 valid_delay = False
                 tfall = 1
                 trise = 1
@@ -6848,8 +7118,8 @@ class FPGA:
 
     
         print("  Updating delay for " + self.RAM.columndecoder.name)
-        spice_meas = spice_interface.run(self.RAM.columndecoder.top_spice_path, parameter_dict) 
-        if spice_meas["meas_total_tfall"][0] == "failed" or spice_meas["meas_total_trise"][0] == "failed" :
+        spice_meas = delay_meas[self.RAM.columndecoder.top_spice_path] 
+        if spice_meas.is_failed("meas_total_tfall")[0] or spice_meas.is_failed("meas_total_trise")[0] :
             valid_delay = False
             tfall = 1
             trise = 1
@@ -6867,8 +7137,8 @@ class FPGA:
 
 
         print("  Updating delay for " + self.RAM.configurabledecoderi.name)
-        spice_meas = spice_interface.run(self.RAM.configurabledecoderi.top_spice_path, parameter_dict) 
-        if spice_meas["meas_total_tfall"][0] == "failed" or spice_meas["meas_total_trise"][0] == "failed" :
+        spice_meas = delay_meas[self.RAM.configurabledecoderi.top_spice_path] 
+        if spice_meas.is_failed("meas_total_tfall")[0] or spice_meas.is_failed("meas_total_trise")[0] :
             valid_delay = False
             tfall = 1
             trise = 1
@@ -6887,8 +7157,8 @@ class FPGA:
 
         if self.RAM.cvalidobj1 ==1:
             print("  Updating delay for " + self.RAM.configurabledecoder3ii.name)
-            spice_meas = spice_interface.run(self.RAM.configurabledecoder3ii.top_spice_path, parameter_dict) 
-            if spice_meas["meas_total_tfall"][0] == "failed" or spice_meas["meas_total_trise"][0] == "failed" :
+            spice_meas = delay_meas[self.RAM.configurabledecoder3ii.top_spice_path] 
+            if spice_meas.is_failed("meas_total_tfall")[0] or spice_meas.is_failed("meas_total_trise")[0] :
                 valid_delay = False
                 tfall = 1
                 trise = 1
@@ -6907,8 +7177,8 @@ class FPGA:
 
         if self.RAM.cvalidobj2 ==1:
             print("  Updating delay for " + self.RAM.configurabledecoder2ii.name)
-            spice_meas = spice_interface.run(self.RAM.configurabledecoder2ii.top_spice_path, parameter_dict) 
-            if spice_meas["meas_total_tfall"][0] == "failed" or spice_meas["meas_total_trise"][0] == "failed" :
+            spice_meas = delay_meas[self.RAM.configurabledecoder2ii.top_spice_path] 
+            if spice_meas.is_failed("meas_total_tfall")[0] or spice_meas.is_failed("meas_total_trise")[0] :
                 valid_delay = False
                 tfall = 1
                 trise = 1
@@ -6925,8 +7195,8 @@ class FPGA:
             self.RAM.configurabledecoder2ii.power = float(spice_meas["meas_avg_power"][0])
 
         print("  Updating delay for " + self.RAM.configurabledecoderiii.name)
-        spice_meas = spice_interface.run(self.RAM.configurabledecoderiii.top_spice_path, parameter_dict) 
-        if spice_meas["meas_total_tfall"][0] == "failed" or spice_meas["meas_total_trise"][0] == "failed" :
+        spice_meas = delay_meas[self.RAM.configurabledecoderiii.top_spice_path] 
+        if spice_meas.is_failed("meas_total_tfall")[0] or spice_meas.is_failed("meas_total_trise")[0] :
             valid_delay = False
             tfall = 1
             trise = 1
@@ -6944,8 +7214,8 @@ class FPGA:
   
 
         print("  Updating delay for " + self.RAM.pgateoutputcrossbar.name)
-        spice_meas = spice_interface.run(self.RAM.pgateoutputcrossbar.top_spice_path, parameter_dict) 
-        if spice_meas["meas_total_tfall"][0] == "failed" or spice_meas["meas_total_trise"][0] == "failed" :
+        spice_meas = delay_meas[self.RAM.pgateoutputcrossbar.top_spice_path] 
+        if spice_meas.is_failed("meas_total_tfall")[0] or spice_meas.is_failed("meas_total_trise")[0] :
             valid_delay = False
             tfall = 1
             trise = 1
@@ -6963,8 +7233,8 @@ class FPGA:
         self.delay_dict["rep_crit_path"] = crit_path_delay    
 
         print("  Updating delay for " + self.RAM.wordlinedriver.name)
-        spice_meas = spice_interface.run(self.RAM.wordlinedriver.top_spice_path, parameter_dict) 
-        if spice_meas["meas_total_tfall"][0] == "failed" or spice_meas["meas_total_trise"][0] == "failed" :
+        spice_meas = delay_meas[self.RAM.wordlinedriver.top_spice_path] 
+        if spice_meas.is_failed("meas_total_tfall")[0] or spice_meas.is_failed("meas_total_trise")[0] :
             valid_delay = False
             tfall = 1
             trise = 1
@@ -7245,19 +7515,19 @@ class FPGA:
         # If pass-transistor, use regular area because they don't need N-wells.
         if "inv_" in tran_name or "tgate_" in tran_name:
             if not self.specs.use_finfet :
-                area = 0.518 + 0.127*tran_size + 0.428*math.sqrt(tran_size)
+                area = 0.518 + 0.127*tran_size + 0.428*_sqrt(tran_size)
             elif (self.specs.min_tran_width == 7):
-                area = 0.3694 + 0.0978*tran_size + 0.5368*math.sqrt(tran_size)
+                area = 0.3694 + 0.0978*tran_size + 0.5368*_sqrt(tran_size)
             else :
-                area = 0.034 + 0.414*tran_size + 0.735*math.sqrt(tran_size)
+                area = 0.034 + 0.414*tran_size + 0.735*_sqrt(tran_size)
 
         else:
             if not self.specs.use_finfet :
-                area = 0.447 + 0.128*tran_size + 0.391*math.sqrt(tran_size)
+                area = 0.447 + 0.128*tran_size + 0.391*_sqrt(tran_size)
             elif (self.specs.min_tran_width == 7):
-                area = 0.3694 + 0.0978*tran_size + 0.5368*math.sqrt(tran_size)
+                area = 0.3694 + 0.0978*tran_size + 0.5368*_sqrt(tran_size)
             else :
-                area = -0.013 + 0.414*tran_size + 0.665*math.sqrt(tran_size)
+                area = -0.013 + 0.414*tran_size + 0.665*_sqrt(tran_size)
     
         return area    
     
@@ -7266,19 +7536,16 @@ class FPGA:
         """ Create SPICE library files and add headers. """
 
         # Create Subcircuits file
-        sc_file = open(self.subcircuits_filename, 'w')
-        sc_file.write("*** SUBCIRCUITS\n\n")
-        sc_file.write(".LIB SUBCIRCUITS\n\n")
-        sc_file.close()
+        self.subcircuits_netlist = spice.NetlistBuilder(self.subcircuits_filename)
+        self.subcircuits_netlist.write("*** SUBCIRCUITS\n\n")
+        self.subcircuits_netlist.write(".LIB SUBCIRCUITS\n\n")
        
 
     def _end_lib_files(self):
         """ End the SPICE library files. """
 
         # Subcircuits file
-        sc_file = open(self.subcircuits_filename, 'a')
-        sc_file.write(".ENDL SUBCIRCUITS")
-        sc_file.close()
+        self.subcircuits_netlist.write(".ENDL SUBCIRCUITS")
        
 
     def _generate_basic_subcircuits(self):
@@ -7286,38 +7553,35 @@ class FPGA:
         
         print("Generating basic subcircuits")
         
-        # Open basic subcircuits file and write heading
-        basic_sc_file = open(self.basic_subcircuits_filename, 'w')
-        basic_sc_file.write("*** BASIC SUBCIRCUITS\n\n")
-        basic_sc_file.write(".LIB BASIC_SUBCIRCUITS\n\n")
-        basic_sc_file.close()
+        # Create basic subcircuits file and write heading
+        self.basic_subcircuits_netlist = spice.NetlistBuilder(self.basic_subcircuits_filename)
+        self.basic_subcircuits_netlist.write("*** BASIC SUBCIRCUITS\n\n")
+        self.basic_subcircuits_netlist.write(".LIB BASIC_SUBCIRCUITS\n\n")
 
         # Generate wire subcircuit
-        basic_subcircuits.wire_generate(self.basic_subcircuits_filename)
+        basic_subcircuits.wire_generate(self.basic_subcircuits_netlist)
         # Generate pass-transistor subcircuit
-        basic_subcircuits.ptran_generate(self.basic_subcircuits_filename, self.specs.use_finfet)
-        basic_subcircuits.ptran_pmos_generate(self.basic_subcircuits_filename, self.specs.use_finfet)
+        basic_subcircuits.ptran_generate(self.basic_subcircuits_netlist, self.specs.use_finfet)
+        basic_subcircuits.ptran_pmos_generate(self.basic_subcircuits_netlist, self.specs.use_finfet)
         # Generate transmission gate subcircuit
-        basic_subcircuits.tgate_generate(self.basic_subcircuits_filename, self.specs.use_finfet)
-        basic_subcircuits.tgate_generate_lp(self.basic_subcircuits_filename, self.specs.use_finfet)
+        basic_subcircuits.tgate_generate(self.basic_subcircuits_netlist, self.specs.use_finfet)
+        basic_subcircuits.tgate_generate_lp(self.basic_subcircuits_netlist, self.specs.use_finfet)
         # Generate level-restore subcircuit
-        basic_subcircuits.rest_generate(self.basic_subcircuits_filename, self.specs.use_finfet)
+        basic_subcircuits.rest_generate(self.basic_subcircuits_netlist, self.specs.use_finfet)
         # Generate inverter subcircuit
-        basic_subcircuits.inverter_generate(self.basic_subcircuits_filename, self.specs.use_finfet, self.specs.memory_technology)
+        basic_subcircuits.inverter_generate(self.basic_subcircuits_netlist, self.specs.use_finfet, self.specs.memory_technology)
         # Generate nand2
-        basic_subcircuits.nand2_generate(self.basic_subcircuits_filename, self.specs.use_finfet)
-        basic_subcircuits.nand2_generate_lp(self.basic_subcircuits_filename, self.specs.use_finfet)
+        basic_subcircuits.nand2_generate(self.basic_subcircuits_netlist, self.specs.use_finfet)
+        basic_subcircuits.nand2_generate_lp(self.basic_subcircuits_netlist, self.specs.use_finfet)
         # Generate nand3 
-        basic_subcircuits.nand3_generate(self.basic_subcircuits_filename, self.specs.use_finfet)
-        basic_subcircuits.nand3_generate_lp(self.basic_subcircuits_filename, self.specs.use_finfet)
+        basic_subcircuits.nand3_generate(self.basic_subcircuits_netlist, self.specs.use_finfet)
+        basic_subcircuits.nand3_generate_lp(self.basic_subcircuits_netlist, self.specs.use_finfet)
         #generate ram tgate
-        basic_subcircuits.RAM_tgate_generate(self.basic_subcircuits_filename, self.specs.use_finfet)
-        basic_subcircuits.RAM_tgate_generate_lp(self.basic_subcircuits_filename, self.specs.use_finfet)
+        basic_subcircuits.RAM_tgate_generate(self.basic_subcircuits_netlist, self.specs.use_finfet)
+        basic_subcircuits.RAM_tgate_generate_lp(self.basic_subcircuits_netlist, self.specs.use_finfet)
 
         # Write footer
-        basic_sc_file = open(self.basic_subcircuits_filename, 'a')
-        basic_sc_file.write(".ENDL BASIC_SUBCIRCUITS")
-        basic_sc_file.close()
+        self.basic_subcircuits_netlist.write(".ENDL BASIC_SUBCIRCUITS")
         
         
     def _generate_process_data(self):
@@ -7326,7 +7590,7 @@ class FPGA:
         print("Generating process data file")
 
         
-        process_data_file = open(self.process_data_filename, 'w')
+        process_data_file = spice.NetlistBuilder(self.process_data_filename)
         process_data_file.write("*** PROCESS DATA AND VOLTAGE LEVELS\n\n")
         process_data_file.write(".LIB PROCESS_DATA\n\n")
         process_data_file.write("* Voltage levels\n")
@@ -7371,7 +7635,7 @@ class FPGA:
         process_data_file.write("* Device models\n")
         process_data_file.write(".LIB \"" + self.specs.model_path + "\" " + self.specs.model_library + "\n\n")
         process_data_file.write(".ENDL PROCESS_DATA")
-        process_data_file.close()
+        process_data_file.write_file()
         
         
     def _generate_includes(self):
@@ -7379,7 +7643,7 @@ class FPGA:
     
         print("Generating includes file")
     
-        includes_file = open(self.includes_filename, 'w')
+        includes_file = spice.NetlistBuilder(self.includes_filename)
         includes_file.write("*** INCLUDE ALL LIBRARIES\n\n")
         includes_file.write(".LIB INCLUDES\n\n")
         includes_file.write("* Include process data (voltage levels, gate length and device models library)\n")
@@ -7394,15 +7658,15 @@ class FPGA:
         includes_file.write("* Include sweep data file for .DATA sweep analysis\n")
         includes_file.write(".INCLUDE \"sweep_data.l\"\n\n")
         includes_file.write(".ENDL INCLUDES")
-        includes_file.close()
+        includes_file.write_file()
         
         
     def _generate_sweep_data(self):
         """ Create the sweep_data.l file that COFFE uses to perform 
             multi-variable HSPICE parameter sweeping. """
 
-        sweep_data_file = open(self.sweep_data_filename, 'w')
-        sweep_data_file.close()
+        sweep_data_file = spice.NetlistBuilder(self.sweep_data_filename)
+        sweep_data_file.write_file()
         
 
     def _update_transistor_sizes(self, element_names, combo, use_finfet, inv_ratios=None):
@@ -7439,7 +7703,7 @@ class FPGA:
                         if not use_finfet:
                             new_sizes[element_name + "_nmos"] = combo[i]/inv_ratios[element_name]
                         else :
-                            new_sizes[element_name + "_nmos"] = round(combo[i]/inv_ratios[element_name])
+                            new_sizes[element_name + "_nmos"] = _round(combo[i]/inv_ratios[element_name])
                             # new_sizes[element_name + "_nmos"] = combo[i]
                         new_sizes[element_name + "_pmos"] = combo[i]
                     else:
@@ -7448,7 +7712,7 @@ class FPGA:
                         if not use_finfet :
                             new_sizes[element_name + "_pmos"] = combo[i]*inv_ratios[element_name]
                         else :
-                            new_sizes[element_name + "_pmos"] = round(combo[i]*inv_ratios[element_name])
+                            new_sizes[element_name + "_pmos"] = _round(combo[i]*inv_ratios[element_name])
                             # new_sizes[element_name + "_pmos"] = combo[i]
 
         # Now, update self.transistor_sizes with these new sizes
@@ -7460,13 +7724,22 @@ class FPGA:
             Using the area model, we calculate the transistor area in minimum width transistor areas.
             We also calculate area in nm and transistor width in nm. Nanometer values are needed for wire length calculations.
             For each transistor, this data forms a tuple (tran_name, tran_channel_width_nm, tran_drive_strength, tran_area_min_areas, tran_area_nm, tran_width_nm)
-            The FPGAs transistor_area_list is updated once these values are computed."""
+            Only the transistors whose size changed since the last update are recomputed. 
+            The FPGAs transistor_area_list is updated once these values are computed. Returns the names of the changed transistors."""
         
-        # Initialize transistor area list
-        tran_area_list = []
+        changed_transistors = []
         
-        # For each transistor, calculate area
+        # For each transistor whose size changed, calculate area
         for tran_name, tran_size in self.transistor_sizes.items():
+                cached_area = self._transistor_area_cache.get(tran_name)
+                if cached_area is not None and cached_area[0] is tran_size:
+                    continue
+                if isinstance(tran_size, np.ndarray):
+                    self._array_transistors.add(tran_name)
+                else:
+                    self._array_transistors.discard(tran_name)
+                    if cached_area is not None and not isinstance(cached_area[0], np.ndarray) and cached_area[0] == tran_size:
+                        continue
                 # Get transistor drive strength (drive strength is = xMin width)
                 tran_drive = tran_size
                 # Get tran area in min transistor widths
@@ -7474,79 +7747,91 @@ class FPGA:
                 # Get area in nm square
                 tran_area_nm = tran_area*self.specs.min_width_tran_area
                 # Get width of transistor in nm
-                tran_width = math.sqrt(tran_area_nm)
-                # Add this as a tuple to the tran_area_list
+                tran_width = _sqrt(tran_area_nm)
+                # Add this as a tuple to the area cache
                 # TODO: tran_size and tran_drive are the same thing?!
-                tran_area_list.append((tran_name, tran_size, tran_drive, tran_area, 
-                                                tran_area_nm, tran_width))    
+                self._transistor_area_cache[tran_name] = (tran_size, (tran_name, tran_size, tran_drive, tran_area, 
+                                                tran_area_nm, tran_width))
+                changed_transistors.append(tran_name)
                                                                                    
         # Assign list to FPGA object
-        self.transistor_area_list = tran_area_list
+        if len(changed_transistors) > 0:
+            self.transistor_area_list = [cached_area[1] for cached_area in self._transistor_area_cache.values()]
+
+        return changed_transistors
         
 
-    def _update_area_and_width_dicts(self):
+    def _update_area_and_width_dicts(self, changed_transistors):
         """ Calculate area for basic subcircuits like inverters, pass transistor, 
-            transmission gates, etc. Update area_dict and width_dict with this data."""
+            transmission gates, etc. Update area_dict and width_dict with this data.
+            Only the components of the transistors in 'changed_transistors' are updated. """
         
-        # Initialize component area list of tuples (component name, component are, component width)
-        comp_area_list = []
+        # Components with an nmos and a pmos transistor that need their area updated
+        changed_components = {}
         
-        # Create a dictionary to store component sizes for multi-transistor components
-        comp_dict = {}
-        
-        # For each transistor in the transistor_area_list
-        # tran is a tuple having the following formate (tran_name, tran_channel_width_nm, 
-        # tran_drive_strength, tran_area_min_areas, tran_area_nm, tran_width_nm)
-        for tran in self.transistor_area_list:
+        # For each changed transistor, the tuple in the area cache has the following format (tran_name, 
+        # tran_channel_width_nm, tran_drive_strength, tran_area_min_areas, tran_area_nm, tran_width_nm)
+        for tran_name in changed_transistors:
             # those components should have an nmos and a pmos transistors in them
-            if "inv_" in tran[0] or "tgate_" in tran[0]:
+            if "inv_" in tran_name or "tgate_" in tran_name:
                 # Get the component name; transistors full name example: inv_lut_out_buffer_2_nmos.
                 # so the component name after the next two lines will be inv_lut_out_buffe_2.
-                comp_name = tran[0].replace("_nmos", "")
+                comp_name = tran_name.replace("_nmos", "")
                 comp_name = comp_name.replace("_pmos", "")
                 
-                # If the component is already in the dictionary
-                if comp_name in comp_dict:
-                    if "_nmos" in tran[0]:
-                        # tran[4] is tran_area_nm
-                        comp_dict[comp_name]["nmos"] = tran[4]
-                    else:
-                        comp_dict[comp_name]["pmos"] = tran[4]
-                        
-                    # At this point we should have both NMOS and PMOS sizes in the dictionary
-                    # We can calculate the area of the inverter or tgate by doing the sum
-                    comp_area = comp_dict[comp_name]["nmos"] + comp_dict[comp_name]["pmos"]
-                    comp_width = math.sqrt(comp_area)
-                    comp_area_list.append((comp_name, comp_area, comp_width))                 
+                # Remember which transistors make up this component
+                comp_transistors = self._component_transistors.setdefault(comp_name, {})
+                if "_nmos" in tran_name:
+                    comp_transistors["nmos"] = tran_name
                 else:
-                    # Create a dict for this component to store nmos and pmos sizes
-                    comp_area_dict = {}
-                    # Add either the nmos or pmos item
-                    if "_nmos" in tran[0]:
-                        comp_area_dict["nmos"] = tran[4]
-                    else:
-                        comp_area_dict["pmos"] = tran[4]
-                        
-                    # Add this inverter to the inverter dictionary    
-                    comp_dict[comp_name] = comp_area_dict
+                    comp_transistors["pmos"] = tran_name
+                changed_components[comp_name] = comp_transistors
             # those components only have one transistor in them
-            elif "ptran_" in tran[0] or "rest_" in tran[0] or "tran_" in tran[0]:   
+            elif "ptran_" in tran_name or "rest_" in tran_name or "tran_" in tran_name:   
                 # Get the comp name
-                comp_name = tran[0].replace("_nmos", "")
+                comp_name = tran_name.replace("_nmos", "")
                 comp_name = comp_name.replace("_pmos", "")               
-                # Add this to comp_area_list directly
-                comp_area_list.append((comp_name, tran[4], tran[5]))            
-        
-        # Convert comp_area_list to area_dict and width_dict
-        area_dict = {}
-        width_dict = {}
-        for component in comp_area_list:
-            area_dict[component[0]] = component[1]
-            width_dict[component[0]] = component[2]
-        
-        # Set the FPGA object area and width dict
-        self.area_dict = area_dict
-        self.width_dict = width_dict
+                # Add this to area_dict and width_dict directly
+                tran = self._transistor_area_cache[tran_name][1]
+                self.area_dict[comp_name] = tran[4]
+                self.width_dict[comp_name] = tran[5]
+        
+        # We can calculate the area of the inverter or tgate by doing the sum of its NMOS and PMOS areas (tran[4] is tran_area_nm)
+        for comp_name, comp_transistors in changed_components.items():
+            if len(comp_transistors) < 2:
+                continue
+            comp_area = self._transistor_area_cache[comp_transistors["nmos"]][1][4] + self._transistor_area_cache[comp_transistors["pmos"]][1][4]
+            self.area_dict[comp_name] = comp_area
+            self.width_dict[comp_name] = _sqrt(comp_area)
   
         return
 
+
+    def _update_subcircuit(self, update_function, dicts, *args):
+        """ Call 'update_function' (the update_area or update_wires function of a subcircuit) with the dictionaries 
+            in 'dicts' and the other arguments in 'args'. If the arguments and all the dictionary entries that the 
+            function read the last time we called it are unchanged, we skip the call and only write the entries
+            it wrote back into the dictionaries, since they would be the same. """
+
+        # Areas and wire lengths that are arrays can't be compared, so we always update them
+        if len(self._array_transistors) > 0:
+            self._subcircuit_records.pop(update_function, None)
+            update_function(*dicts, *args)
+            return
+
+        record = self._subcircuit_records.get(update_function)
+        if record is not None and record[0] == args:
+            unchanged = True
+            for data, (read_keys, read_values, writes) in zip(dicts, record[1]):
+                if tuple(map(data.__getitem__, read_keys)) != read_values:
+                    unchanged = False
+                    break
+            if unchanged:
+                for data, (read_keys, read_values, writes) in zip(dicts, record[1]):
+                    data.update(writes)
+                return
+
+        recorders = [_DependencyRecorder(data) for data in dicts]
+        update_function(*recorders, *args)
+        self._subcircuit_records[update_function] = (args, [(tuple(recorder.reads.keys()), tuple(recorder.reads.values()), recorder.writes) for recorder in recorders])
+
@@ -1,8 +1,6 @@
-def general_routing_load_generate(spice_filename, wire_length, tile_sb_on, tile_sb_partial, tile_sb_off, tile_cb_on, tile_cb_partial, tile_cb_off):
+def general_routing_load_generate(spice_file, wire_length, tile_sb_on, tile_sb_partial, tile_sb_off, tile_cb_on, tile_cb_partial, tile_cb_off):
     """ Generates a routing wire load SPICE deck  """
     
-    # Open SPICE file for appending
-    spice_file = open(spice_filename, 'a')
     
     ###############################################################
     ## ROUTING WIRE LOAD
@@ -90,7 +88,6 @@ def general_routing_load_generate(spice_filename, wire_length, tile_sb_on, tile_
     spice_file.write("Xrouting_wire_load_tile_1 " + in_node + " n_out n_cb_out n_gate n_gate_n n_vdd n_gnd n_vdd_sb_mux_on n_vdd_cb_mux_on routing_wire_load_tile_1\n")
     spice_file.write(".ENDS\n\n\n")
     
-    spice_file.close()
 
     
     # Create a list of all wires used in this subcircuit
@@ -106,7 +103,7 @@ def general_routing_load_generate(spice_filename, wire_length, tile_sb_on, tile_
     return wire_names_list
     
     
-def local_routing_load_generate(spice_filename, num_on, num_partial, num_off):
+def local_routing_load_generate(spice_file, num_on, num_partial, num_off):
     """ """
     
     # The first thing we want to figure out is the interval between each on load and each partially on load
@@ -115,8 +112,6 @@ def local_routing_load_generate(spice_filename, num_on, num_partial, num_off):
     # Number of off muxes between each partially on mux
     interval_off = int(num_off/num_partial)
 
-    # Open SPICE file for appending
-    spice_file = open(spice_filename, 'a')
     
     spice_file.write("******************************************************************************************\n")
     spice_file.write("* Local routing wire load\n")
@@ -165,7 +160,6 @@ def local_routing_load_generate(spice_filename, num_on, num_partial, num_off):
         next_node = "n_" + str(i+2)
     spice_file.write(".ENDS\n\n\n")
 
-    spice_file.close()
     
     
     # Create a list of all wires used in this subcircuit
@@ -175,7 +169,7 @@ def local_routing_load_generate(spice_filename, num_on, num_partial, num_off):
     return wire_names_list
 
 
-def hb_local_routing_load_generate(spice_filename, num_on, num_partial, num_off, hb_name, mux_name):
+def hb_local_routing_load_generate(spice_file, num_on, num_partial, num_off, hb_name, mux_name):
     """ """
     
     # The first thing we want to figure out is the interval between each on load and each partially on load
@@ -184,8 +178,6 @@ def hb_local_routing_load_generate(spice_filename, num_on, num_partial, num_off,
     # Number of off muxes between each partially on mux
     interval_off = int(num_off/num_partial)
 
-    # Open SPICE file for appending
-    spice_file = open(spice_filename, 'a')
     
     spice_file.write("******************************************************************************************\n")
     spice_file.write("* Local routing wire load\n")
@@ -234,7 +226,6 @@ def hb_local_routing_load_generate(spice_filename, num_on, num_partial, num_off,
         next_node = "n_" + str(i+2)
     spice_file.write(".ENDS\n\n\n")
 
-    spice_file.close()
     
     
     # Create a list of all wires used in this subcircuit
@@ -245,7 +236,7 @@ def hb_local_routing_load_generate(spice_filename, num_on, num_partial, num_off,
 
 
 
-def RAM_local_routing_load_generate(spice_filename, num_on, num_partial, num_off):
+def RAM_local_routing_load_generate(spice_file, num_on, num_partial, num_off):
     """ """
     
     # The first thing we want to figure out is the interval between each on load and each partially on load
@@ -254,8 +245,6 @@ def RAM_local_routing_load_generate(spice_filename, num_on, num_partial, num_off
     # Number of off muxes between each partially on mux
     interval_off = int(num_off/num_partial)
 
-    # Open SPICE file for appending
-    spice_file = open(spice_filename, 'a')
     
     spice_file.write("******************************************************************************************\n")
     spice_file.write("* RAM local routing wire load\n")
@@ -304,7 +293,6 @@ def RAM_local_routing_load_generate(spice_filename, num_on, num_partial, num_off
         next_node = "n_" + str(i+2)
     spice_file.write(".ENDS\n\n\n")
 
-    spice_file.close()
     
     
     # Create a list of all wires used in this subcircuit
@@ -314,15 +302,13 @@ def RAM_local_routing_load_generate(spice_filename, num_on, num_partial, num_off
     return wire_names_list   
  
  
-def generate_ble_outputs(spice_filename, num_local_out, num_gen_out):
+def generate_ble_outputs(spice_file, num_local_out, num_gen_out):
     """ Create the BLE outputs block. Contains 'num_local_out' local outputs and 'num_gen_out' general outputs. """
     
     #TODO: The order of the wires is weird in this netlist, have a look at it later.
     # Total number of BLE outputs
     total_outputs = num_local_out + num_gen_out
     
-    # Open SPICE file for appending
-    spice_file = open(spice_filename, 'a')
     
     spice_file.write("******************************************************************************************\n")
     spice_file.write("* BLE outputs\n")
@@ -350,7 +336,6 @@ def generate_ble_outputs(spice_filename, num_local_out, num_gen_out):
         current_node = current_node + 1
     spice_file.write(".ENDS\n\n\n")
 
-    spice_file.close()
     
     # Create a list of all wires used in this subcircuit
     wire_names_list = []
@@ -359,7 +344,7 @@ def generate_ble_outputs(spice_filename, num_local_out, num_gen_out):
     return wire_names_list
     
     
-def generate_lut_output_load(spice_filename, num_local_out, num_gen_out):
+def generate_lut_output_load(spice_file, num_local_out, num_gen_out):
     """ Create the LUT output load subcircuit. It consists of a FF which 
         has the register select mux at its input and all BLE outputs which 
         include the output routing mux (Or) and the output feedback mux (Ofb) """
@@ -367,8 +352,6 @@ def generate_lut_output_load(spice_filename, num_local_out, num_gen_out):
     # Total number of BLE outputs
     total_outputs = num_local_out + num_gen_out
 
-    # Open SPICE file for appending
-    spice_file = open(spice_filename, 'a')
     
     spice_file.write("******************************************************************************************\n")
     spice_file.write("* LUT output load\n")
@@ -380,7 +363,6 @@ def generate_lut_output_load(spice_filename, num_local_out, num_gen_out):
     spice_file.write("Xble_outputs n_1_2 n_local_out n_general_out n_gate n_gate_n n_vdd n_gnd n_vdd_local_output_on n_vdd_general_output_on ble_outputs\n")
     spice_file.write(".ENDS\n\n\n")
 
-    spice_file.close()
     
     # Create a list of all wires used in this subcircuit
     wire_names_list = []
@@ -390,10 +372,8 @@ def generate_lut_output_load(spice_filename, num_local_out, num_gen_out):
     return wire_names_list
     
 
-def generate_local_ble_output_load(spice_filename):
+def generate_local_ble_output_load(spice_file):
 
-    # Open SPICE file for appending
-    spice_file = open(spice_filename, 'a')
     
     spice_file.write("******************************************************************************************\n")
     spice_file.write("* Local BLE output load\n")
@@ -404,7 +384,6 @@ def generate_local_ble_output_load(spice_filename):
     spice_file.write("Xlut_a_driver_1 n_1_2 n_hang1 vsram vsram_n n_hang2 n_hang3 n_vdd n_gnd lut_a_driver\n\n")
     spice_file.write(".ENDS\n\n\n")
     
-    spice_file.close()
     
     # Create a list of all wires used in this subcircuit
     wire_names_list = []
@@ -413,7 +392,7 @@ def generate_local_ble_output_load(spice_filename):
     return wire_names_list
     
     
-def generate_general_ble_output_load(spice_filename, num_sb_mux_off, num_sb_mux_partial, num_sb_mux_on):
+def generate_general_ble_output_load(spice_file, num_sb_mux_off, num_sb_mux_partial, num_sb_mux_on):
     """ Create the cluster output load SPICE deck. We assume 2-level muxes. The load is distributed as
         off, then partial, then on. 
         Inputs are SPICE file, number of SB muxes that are off, then partially on, then on.
@@ -422,8 +401,6 @@ def generate_general_ble_output_load(spice_filename, num_sb_mux_off, num_sb_mux_
     # Total number of sb muxes connected to this logic cluster output
     sb_mux_total = num_sb_mux_off + num_sb_mux_partial + num_sb_mux_on
     
-    # Open SPICE file for appending
-    spice_file = open(spice_filename, 'a')
     
     spice_file.write("******************************************************************************************\n")
     spice_file.write("* General BLE output load\n")
@@ -457,7 +434,6 @@ def generate_general_ble_output_load(spice_filename, num_sb_mux_off, num_sb_mux_
 
     spice_file.write(".ENDS\n\n\n")
     
-    spice_file.close()
     
     # Create a list of all wires used in this subcircuit
     wire_names_list = []
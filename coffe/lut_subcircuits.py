@@ -12,11 +12,9 @@ import math
 #		size to reduce the amount of code repetition and make differences
 #		between them more obvious
 
-def generate_ptran_lut6(spice_filename, min_tran_width, use_finfet):
+def generate_ptran_lut6(spice_file, min_tran_width, use_finfet):
 	""" Generates a 6LUT SPICE deck """
 	
-	# Open SPICE file for appending
-	spice_file = open(spice_filename, 'a')
 	
 	# Create the 6-LUT circuit
 	spice_file.write("******************************************************************************************\n")
@@ -115,11 +113,9 @@ def generate_ptran_lut6(spice_filename, min_tran_width, use_finfet):
 	return tran_names_list, wire_names_list
 
 
-def generate_ptran_lut5(spice_filename, min_tran_width, use_finfet):
+def generate_ptran_lut5(spice_file, min_tran_width, use_finfet):
 	""" Generates a 5LUT SPICE deck """
 	
-	# Open SPICE file for appending
-	spice_file = open(spice_filename, 'a')
 	
 	# Create the 5-LUT circuit
 	spice_file.write("******************************************************************************************\n")
@@ -213,11 +209,9 @@ def generate_ptran_lut5(spice_filename, min_tran_width, use_finfet):
 	return tran_names_list, wire_names_list
 
 	
-def generate_ptran_lut4(spice_filename, min_tran_width, use_finfet):
+def generate_ptran_lut4(spice_file, min_tran_width, use_finfet):
 	""" Generates a 4LUT SPICE deck """
 	
-	# Open SPICE file for appending
-	spice_file = open(spice_filename, 'a')
 	
 	# Create the 4-LUT circuit
 	spice_file.write("******************************************************************************************\n")
@@ -305,11 +299,9 @@ def generate_ptran_lut4(spice_filename, min_tran_width, use_finfet):
 	return tran_names_list, wire_names_list
 	
 
-def generate_ptran_lut_driver(spice_filename, lut_input_name, lut_input_type):
+def generate_ptran_lut_driver(spice_file, lut_input_name, lut_input_type):
 	""" Generate a pass-transistor LUT driver based on type. """
 	
-	# Open SPICE file for appending
-	spice_file = open(spice_filename, 'a')
 	  
 	# Create the LUT-input circuit header (same interface for all LUT input types)
 	spice_file.write("******************************************************************************************\n")
@@ -381,11 +373,9 @@ def generate_ptran_lut_driver(spice_filename, lut_input_name, lut_input_type):
 	return tran_names_list, wire_names_list
  
 
-def generate_ptran_lut_not_driver(spice_filename, lut_input_name):
+def generate_ptran_lut_not_driver(spice_file, lut_input_name):
 	""" Generate a pass-transistor LUT driver based on type. """
 
-	# Open SPICE file for appending
-	spice_file = open(spice_filename, 'a')
 	  
 	# Create the LUT-input circuit
 	spice_file.write("******************************************************************************************\n")
@@ -413,7 +403,7 @@ def generate_ptran_lut_not_driver(spice_filename, lut_input_name):
 	return tran_names_list, wire_names_list
    
    
-def generate_ptran_lut_driver_load(spice_filename, lut_input_name, K, use_fluts):
+def generate_ptran_lut_driver_load(spice_file, lut_input_name, K, use_fluts):
 	""" Generates LUT input load SPICE deck 
 		Note: the input K incase of fluts is still input comming from the architecure file.
 		For a 5-FLUT K = 5"""
@@ -442,8 +432,6 @@ def generate_ptran_lut_driver_load(spice_filename, lut_input_name, K, use_fluts)
 		num_ptran_load = int(max_num_ptran/64)
 		ptran_level = "L6"
 	
-	# Open SPICE file for appending
-	spice_file = open(spice_filename, 'a')
 	
 	# Create the input load circuit
 	spice_file.write("******************************************************************************************\n")
@@ -466,11 +454,9 @@ def generate_ptran_lut_driver_load(spice_filename, lut_input_name, K, use_fluts)
 	return wire_names_list
 
 
-def generate_tgate_lut6(spice_filename, min_tran_width, use_finfet):
+def generate_tgate_lut6(spice_file, min_tran_width, use_finfet):
 	""" Generates a 6LUT SPICE deck """
 	
-	# Open SPICE file for appending
-	spice_file = open(spice_filename, 'a')
 	
 	# Create the 6-LUT circuit
 	spice_file.write("******************************************************************************************\n")
@@ -576,11 +562,9 @@ def generate_tgate_lut6(spice_filename, min_tran_width, use_finfet):
 	return tran_names_list, wire_names_list
 
 
-def generate_tgate_lut5(spice_filename, min_tran_width, use_finfet):
+def generate_tgate_lut5(spice_file, min_tran_width, use_finfet):
 	""" Generates a 5LUT SPICE deck """
 	
-	# Open SPICE file for appending
-	spice_file = open(spice_filename, 'a')
 	
 	# Create the 5-LUT circuit
 	spice_file.write("******************************************************************************************\n")
@@ -679,11 +663,9 @@ def generate_tgate_lut5(spice_filename, min_tran_width, use_finfet):
 	return tran_names_list, wire_names_list
 
 	
-def generate_tgate_lut4(spice_filename, min_tran_width, use_finfet):
+def generate_tgate_lut4(spice_file, min_tran_width, use_finfet):
 	""" Generates a 4LUT SPICE deck """
 	
-	# Open SPICE file for appending
-	spice_file = open(spice_filename, 'a')
 	
 	# Create the 4-LUT circuit
 	spice_file.write("******************************************************************************************\n")
@@ -776,11 +758,9 @@ def generate_tgate_lut4(spice_filename, min_tran_width, use_finfet):
 
 	
 
-def generate_tgate_lut_driver(spice_filename, lut_input_name, lut_input_type):
+def generate_tgate_lut_driver(spice_file, lut_input_name, lut_input_type):
 	""" Generate a pass-transistor LUT driver based on type. """
 	
-	# Open SPICE file for appending
-	spice_file = open(spice_filename, 'a')
 	  
 	# Create the LUT-input circuit header (same interface for all LUT input types)
 	spice_file.write("******************************************************************************************\n")
@@ -854,11 +834,9 @@ def generate_tgate_lut_driver(spice_filename, lut_input_name, lut_input_type):
  
 
 #samething doesn't change?
-def generate_tgate_lut_not_driver(spice_filename, lut_input_name):
+def generate_tgate_lut_not_driver(spice_file, lut_input_name):
 	""" Generate a pass-transistor LUT driver based on type. """
 
-	# Open SPICE file for appending
-	spice_file = open(spice_filename, 'a')
 	  
 	# Create the LUT-input circuit
 	spice_file.write("******************************************************************************************\n")
@@ -886,7 +864,7 @@ def generate_tgate_lut_not_driver(spice_filename, lut_input_name):
 	return tran_names_list, wire_names_list
 
 
-def generate_tgate_lut_driver_load(spice_filename, lut_input_name, K, use_fluts):
+def generate_tgate_lut_driver_load(spice_file, lut_input_name, K, use_fluts):
 	""" Generates LUT input load SPICE deck """
 	
 	# Calculate number of pass-transistors loading this input
@@ -910,8 +888,6 @@ def generate_tgate_lut_driver_load(spice_filename, lut_input_name, K, use_fluts)
 		num_tgate_load = int(max_num_tgate/64)
 		tgate_level = "L6"
 	
-	# Open SPICE file for appending
-	spice_file = open(spice_filename, 'a')
 	
 	# Create the input load circuit
 	spice_file.write("******************************************************************************************\n")
@@ -936,12 +912,10 @@ def generate_tgate_lut_driver_load(spice_filename, lut_input_name, K, use_fluts)
 
 
 # not used in the code
-def generate_full_adder(spice_filename, circuit_name, use_finfet):
+def generate_full_adder(spice_file, circuit_name, use_finfet):
 	""" Generates full adder SPICE deck """
 
 
-	# Open SPICE file for appending
-	spice_file = open(spice_filename, 'a')
 	
 	# Create the circuit
 	spice_file.write("******************************************************************************************\n")
@@ -1014,7 +988,7 @@ def generate_full_adder(spice_filename, circuit_name, use_finfet):
 	
 
 # Simplified version of the above FA, much faster to size
-def generate_full_adder_simplified(spice_filename, circuit_name, use_finfet):
+def generate_full_adder_simplified(spice_file, circuit_name, use_finfet):
 	""" Generates full adder SPICE deck """
 
 	
@@ -1024,8 +998,6 @@ def generate_full_adder_simplified(spice_filename, circuit_name, use_finfet):
 	#also added to the critical path of the carry chain.
 	
 
-	# Open SPICE file for appending
-	spice_file = open(spice_filename, 'a')
 	
 	# Create the circuit
 	spice_file.write("******************************************************************************************\n")
@@ -1085,12 +1057,10 @@ def generate_full_adder_simplified(spice_filename, circuit_name, use_finfet):
 	return tran_names_list, wire_names_list
 	
 
-def generate_carry_chain_perf_ripple(spice_filename, circuit_name, use_finfet):
+def generate_carry_chain_perf_ripple(spice_file, circuit_name, use_finfet):
 	""" Generates carry chain inverters for sum SPICE deck """
 
 
-	# Open SPICE file for appending
-	spice_file = open(spice_filename, 'a')
 	
 	# Create the circuit
 	spice_file.write("******************************************************************************************\n")
@@ -1107,12 +1077,10 @@ def generate_carry_chain_perf_ripple(spice_filename, circuit_name, use_finfet):
 	return tran_names_list, wire_names_list
 
 
-def generate_skip_and_tree(spice_filename, circuit_name, use_finfet, nand1_size, nand2_size):
+def generate_skip_and_tree(spice_file, circuit_name, use_finfet, nand1_size, nand2_size):
 
 	""" Generates carry chain skip and tree for sum SPICE deck """
 
-	# Open SPICE file for appending
-	spice_file = open(spice_filename, 'a')
 	
 	# Create the circuit
 	spice_file.write("******************************************************************************************\n")
@@ -1146,12 +1114,10 @@ def generate_skip_and_tree(spice_filename, circuit_name, use_finfet, nand1_size,
 	return tran_names_list, wire_names_list
 
 
-def generate_carry_inter(spice_filename, circuit_name, use_finfet):
+def generate_carry_inter(spice_file, circuit_name, use_finfet):
 
 	""" Generates the driver to load "cin" of the next cluster """
 
-	# Open SPICE file for appending
-	spice_file = open(spice_filename, 'a')
 	
 	# Create the circuit
 	spice_file.write("******************************************************************************************\n")
@@ -4,10 +4,8 @@
 import math
 
 # This is the first stage of the row decoder if the decoder bits are less than 8
-def generate_rowdecoderstage1(spice_filename, circuit_name, nandtype):
+def generate_rowdecoderstage1(spice_file, circuit_name, nandtype):
 
-	# Open SPICE file for appending
-	spice_file = open(spice_filename, 'a')
 	
 	# Generate SPICE subcircuits
 	spice_file.write("******************************************************************************************\n")
@@ -19,9 +17,6 @@ def generate_rowdecoderstage1(spice_filename, circuit_name, nandtype):
 
 	spice_file.write(".ENDS\n\n\n")
 	
-	# Close SPICE file
-	spice_file.close()
-	
 	# Create a list of all transistors used in this subcircuit
 	tran_names_list = []
 	tran_names_list.append("inv_nand" + nandtype + "_" + circuit_name + "_1_nmos")
@@ -37,10 +32,8 @@ def generate_rowdecoderstage1(spice_filename, circuit_name, nandtype):
 
 
 # This is the low power version of the first stage of the row decoder if the decoder bits are less than 8
-def generate_rowdecoderstage1_lp(spice_filename, circuit_name, nandtype):
+def generate_rowdecoderstage1_lp(spice_file, circuit_name, nandtype):
 
-	# Open SPICE file for appending
-	spice_file = open(spice_filename, 'a')
 	
 	# Generate SPICE subcircuits
 
@@ -53,9 +46,6 @@ def generate_rowdecoderstage1_lp(spice_filename, circuit_name, nandtype):
 
 	spice_file.write(".ENDS\n\n\n")
 	
-	# Close SPICE file
-	spice_file.close()
-	
 	# Create a list of all transistors used in this subcircuit
 	tran_names_list = []
 	tran_names_list.append("inv_nand" + str(nandtype) + "_" + circuit_name + "_1_nmos")
@@ -69,11 +59,9 @@ def generate_rowdecoderstage1_lp(spice_filename, circuit_name, nandtype):
 	return tran_names_list, wire_names_list
 
 # This is the second stage of the configurable decoder when using 2-input NAND gates
-def generate_configurabledecoder2ii(spice_filename, nand2circuit_name):
+def generate_configurabledecoder2ii(spice_file, nand2circuit_name):
 
    
-	# Open SPICE file for appending
-	spice_file = open(spice_filename, 'a')
 
 	# Create the circuit
 	spice_file.write("******************************************************************************************\n")
@@ -84,9 +72,6 @@ def generate_configurabledecoder2ii(spice_filename, nand2circuit_name):
 	spice_file.write("X_inv" + nand2circuit_name + " n_1_1 n_out n_vdd n_gnd inv Wn=inv_" + nand2circuit_name + "_2_nmos Wp=inv_" + nand2circuit_name + "_2_pmos\n")
 	spice_file.write(".ENDS\n\n\n")
 	
-	# Close SPICE file
-	spice_file.close()
-	
 	# Create a list of all transistors used in this subcircuit
 	tran_names_list = []
 	tran_names_list.append("inv_nand2_" + nand2circuit_name + "_1_nmos")
@@ -102,11 +87,9 @@ def generate_configurabledecoder2ii(spice_filename, nand2circuit_name):
 	return tran_names_list, wire_names_list
 
 # This is the low power version of the second stage of the configurable decoder when using 2-input NAND gates
-def generate_configurabledecoder2ii_lp(spice_filename, nand2circuit_name):
+def generate_configurabledecoder2ii_lp(spice_file, nand2circuit_name):
 
    
-	# Open SPICE file for appending
-	spice_file = open(spice_filename, 'a')
 	
 	
 	# Create the circuit
@@ -118,9 +101,6 @@ def generate_configurabledecoder2ii_lp(spice_filename, nand2circuit_name):
 	spice_file.write("X_inv" + nand2circuit_name + " n_1_1 n_out n_vdd n_gnd inv_lp Wn=inv_" + nand2circuit_name + "_2_nmos Wp=inv_" + nand2circuit_name + "_2_pmos\n")
 	spice_file.write(".ENDS\n\n\n")
 	
-	# Close SPICE file
-	spice_file.close()
-	
 	# Create a list of all transistors used in this subcircuit
 	tran_names_list = []
 	tran_names_list.append("inv_nand2_" + nand2circuit_name + "_1_nmos")
@@ -136,11 +116,9 @@ def generate_configurabledecoder2ii_lp(spice_filename, nand2circuit_name):
 	return tran_names_list, wire_names_list
 
 # This is the second stage of the configurable decoder when using 3-input NAND gates
-def generate_configurabledecoder3ii(spice_filename, nand3circuit_name):
+def generate_configurabledecoder3ii(spice_file, nand3circuit_name):
 
    
-	# Open SPICE file for appending
-	spice_file = open(spice_filename, 'a')
 	
 
 	# Create the circuit
@@ -152,9 +130,6 @@ def generate_configurabledecoder3ii(spice_filename, nand3circuit_name):
 	spice_file.write("X_inv" + nand3circuit_name + " n_1_1 n_out n_vdd n_gnd inv Wn=inv_" + nand3circuit_name + "_2_nmos Wp=inv_" + nand3circuit_name + "_2_pmos\n")
 	spice_file.write(".ENDS\n\n\n")
 	
-	# Close SPICE file
-	spice_file.close()
-	
 	# Create a list of all transistors used in this subcircuit
 	tran_names_list = []
 	tran_names_list.append("inv_nand3_" + nand3circuit_name + "_1_nmos")
@@ -171,11 +146,9 @@ def generate_configurabledecoder3ii(spice_filename, nand3circuit_name):
 
 
 # This is the second stage of the configurable decoder when using 3-input NAND gates
-def generate_configurabledecoder3ii_lp(spice_filename, nand3circuit_name):
+def generate_configurabledecoder3ii_lp(spice_file, nand3circuit_name):
 
    
-	# Open SPICE file for appending
-	spice_file = open(spice_filename, 'a')
 
 	# Create the circuit
 	spice_file.write("******************************************************************************************\n")
@@ -186,9 +159,6 @@ def generate_configurabledecoder3ii_lp(spice_filename, nand3circuit_name):
 	spice_file.write("X_inv" + nand3circuit_name + " n_1_1 n_out n_vdd n_gnd inv_lp Wn=inv_" + nand3circuit_name + "_2_nmos Wp=inv_" + nand3circuit_name + "_2_pmos\n")
 	spice_file.write(".ENDS\n\n\n")
 	
-	# Close SPICE file
-	spice_file.close()
-	
 	# Create a list of all transistors used in this subcircuit
 	tran_names_list = []
 	tran_names_list.append("inv_nand3_" + nand3circuit_name + "_1_nmos")
@@ -204,11 +174,9 @@ def generate_configurabledecoder3ii_lp(spice_filename, nand3circuit_name):
 	return tran_names_list, wire_names_list
 
 #This is the last stage of the configurable decoder
-def generate_configurabledecoderiii(spice_filename, circuit_name, required_size):
+def generate_configurabledecoderiii(spice_file, circuit_name, required_size):
 
    
-	# Open SPICE file for appending
-	spice_file = open(spice_filename, 'a')
 
 	# Create the circuit
 	spice_file.write("******************************************************************************************\n")
@@ -219,9 +187,6 @@ def generate_configurabledecoderiii(spice_filename, circuit_name, required_size)
 	spice_file.write("X_inv" + circuit_name + " n_1_1 n_out n_vdd n_gnd inv Wn=inv_" + circuit_name + "_2_nmos Wp=inv_" + circuit_name + "_2_pmos\n")
 	spice_file.write(".ENDS\n\n\n")
 	
-	# Close SPICE file
-	spice_file.close()
-	
 	# Create a list of all transistors used in this subcircuit
 	tran_names_list = []
 	tran_names_list.append("inv_nand"+str(required_size)+"_" + circuit_name + "_1_nmos")
@@ -237,11 +202,9 @@ def generate_configurabledecoderiii(spice_filename, circuit_name, required_size)
 	return tran_names_list, wire_names_list
 
 #This is the low power version of the last stage of the configurable decoder
-def generate_configurabledecoderiii_lp(spice_filename, circuit_name, required_size):
+def generate_configurabledecoderiii_lp(spice_file, circuit_name, required_size):
 
    
-	# Open SPICE file for appending
-	spice_file = open(spice_filename, 'a')
 	
 	
 	# Create thecircuit
@@ -253,9 +216,6 @@ def generate_configurabledecoderiii_lp(spice_filename, circuit_name, required_si
 	spice_file.write("X_inv" + circuit_name + " n_1_1 n_out n_vdd n_gnd inv_lp Wn=inv_" + circuit_name + "_2_nmos Wp=inv_" + circuit_name + "_2_pmos\n")
 	spice_file.write(".ENDS\n\n\n")
 	
-	# Close SPICE file
-	spice_file.close()
-	
 	# Create a list of all transistors used in this subcircuit
 	tran_names_list = []
 	tran_names_list.append("inv_nand"+str(required_size)+"_" + circuit_name + "_1_nmos")
@@ -271,10 +231,8 @@ def generate_configurabledecoderiii_lp(spice_filename, circuit_name, required_si
 
 
 # This is the last stage of the row decoder is the size is less than 8 bits
-def generate_rowdecoderstage3(spice_filename, circuit_name, fan_out, number_of_banks):
+def generate_rowdecoderstage3(spice_file, circuit_name, fan_out, number_of_banks):
 
-	# Open SPICE file for appending
-	spice_file = open(spice_filename, 'a')
 	
 	# Generate SPICE subcircuits
 	spice_file.write("******************************************************************************************\n")
@@ -287,9 +245,6 @@ def generate_rowdecoderstage3(spice_filename, circuit_name, fan_out, number_of_b
 
 	spice_file.write(".ENDS\n\n\n")
 	
-	# Close SPICE file
-	spice_file.close()
-
 
 	# Create a list of transistors
 	tran_names_list = []
@@ -305,10 +260,8 @@ def generate_rowdecoderstage3(spice_filename, circuit_name, fan_out, number_of_b
 	return tran_names_list, wire_names_list	
 
 # This is the low power version of the last stage of the row decoder is the size is less than 8 bits
-def generate_rowdecoderstage3_lp(spice_filename, circuit_name, fan_out, number_of_banks):
+def generate_rowdecoderstage3_lp(spice_file, circuit_name, fan_out, number_of_banks):
 
-	# Open SPICE file for appending
-	spice_file = open(spice_filename, 'a')
 	
 	# Generate SPICE subcircuits
 	spice_file.write("******************************************************************************************\n")
@@ -323,9 +276,6 @@ def generate_rowdecoderstage3_lp(spice_filename, circuit_name, fan_out, number_o
 
 	spice_file.write(".ENDS\n\n\n")
 	
-	# Close SPICE file
-	spice_file.close()
-
 	# Create a list of transistors
 
 	tran_names_list = []
@@ -341,10 +291,8 @@ def generate_rowdecoderstage3_lp(spice_filename, circuit_name, fan_out, number_o
 
 
 # This is the level shifter circuitry that we assume
-def generate_level_shifter(spice_filename, circuit_name): 
+def generate_level_shifter(spice_file, circuit_name): 
 
-	# Open SPICE file for appending
-	spice_file = open(spice_filename, 'a')
 
 	# Generate the circuit
 	spice_file.write("******************************************************************************************\n")
@@ -365,7 +313,6 @@ def generate_level_shifter(spice_filename, circuit_name):
 
 	spice_file.write(".ENDS\n\n\n")
 
-	spice_file.close()
 
 	# Add transistors to the list
 	tran_names_list = []
@@ -382,10 +329,8 @@ def generate_level_shifter(spice_filename, circuit_name):
 # This is the sense amp design for MTJ memory array by kosuke
 # All of the transistor sizes are fixed.
 # This sense amp is designed for LP transistor. It should be redesigned to work for other technologies.
-def generate_mtj_sa_lp(spice_filename, circuit_name): 
+def generate_mtj_sa_lp(spice_file, circuit_name): 
 
-	# Open SPICE file for appending
-	spice_file = open(spice_filename, 'a')
 
 	# Create the circuit
 	spice_file.write("******************************************************************************************\n")
@@ -431,7 +376,6 @@ def generate_mtj_sa_lp(spice_filename, circuit_name):
 	spice_file.write("AS=200n*trans_diffusion_length AD=200n*trans_diffusion_length PS=200n+2*trans_diffusion_length PD=200n+2*trans_diffusion_length\n")	
 	spice_file.write(".ENDS\n\n\n")
 
-	spice_file.close()
 
 	# There are no sizable transistors or wires in this circuit
 	tran_names_list = []
@@ -452,10 +396,8 @@ def generate_mtj_sa_lp(spice_filename, circuit_name):
 
 
 # This is the MTJ-based memory write driver
-def generate_mtj_writedriver_lp(spice_filename, circuit_name): 
+def generate_mtj_writedriver_lp(spice_file, circuit_name): 
 
-	# Open SPICE file for appending
-	spice_file = open(spice_filename, 'a')
 	# This sense amp is designed for LP transistor. It should be redesigned to work for other technologies.
 	spice_file.write("******************************************************************************************\n")
 	spice_file.write("* " + circuit_name + " subcircuit MTJ write driver \n")
@@ -474,7 +416,6 @@ def generate_mtj_writedriver_lp(spice_filename, circuit_name):
 
 	spice_file.write(".ENDS\n\n\n")
 
-	spice_file.close()
 
 	# Create a list of transistors
 	tran_names_list = []
@@ -493,10 +434,8 @@ def generate_mtj_writedriver_lp(spice_filename, circuit_name):
 
 
 # This is the column selector in MTJ-based BRAMs
-def generate_mtj_cs_lp(spice_filename, circuit_name): 
+def generate_mtj_cs_lp(spice_file, circuit_name): 
 
-	# Open SPICE file for appending
-	spice_file = open(spice_filename, 'a')
 
 	spice_file.write("******************************************************************************************\n")
 	spice_file.write("* " + circuit_name + " subcircuit MTJ coulmn selector and pull down \n")
@@ -511,7 +450,6 @@ def generate_mtj_cs_lp(spice_filename, circuit_name):
 
 	spice_file.write(".ENDS\n\n\n")
 
-	spice_file.close()
 
 	# Create a list of transistors
 	tran_names_list = []
@@ -529,10 +467,8 @@ The following components are MTJ and SRAM-based memory cells
 These cells are not automatically sized and require precise sizing by the user.
 """
 # MTJ cell using the high resistance
-def generate_mtj_memorycell_high_lp(spice_filename, circuit_name): 
+def generate_mtj_memorycell_high_lp(spice_file, circuit_name): 
 
-	# Open SPICE file for appending
-	spice_file = open(spice_filename, 'a')
 	# Generate netlist
 	spice_file.write("******************************************************************************************\n")
 	spice_file.write("* " + circuit_name + " subcircuit MTJ coulmn selector and pull down \n")
@@ -547,7 +483,6 @@ def generate_mtj_memorycell_high_lp(spice_filename, circuit_name):
 
 	spice_file.write(".ENDS\n\n\n")
 
-	spice_file.close()
 
 	tran_names_list = []
 	wire_names_list = []
@@ -555,10 +490,8 @@ def generate_mtj_memorycell_high_lp(spice_filename, circuit_name):
 	return tran_names_list, wire_names_list
 
 # MTJ cell using the low resistance
-def generate_mtj_memorycell_low_lp(spice_filename, circuit_name): 
+def generate_mtj_memorycell_low_lp(spice_file, circuit_name): 
 
-	# Open SPICE file for appending
-	spice_file = open(spice_filename, 'a')
 
 	spice_file.write("******************************************************************************************\n")
 	spice_file.write("* " + circuit_name + " subcircuit MTJ coulmn selector and pull down \n")
@@ -573,7 +506,6 @@ def generate_mtj_memorycell_low_lp(spice_filename, circuit_name):
 
 	spice_file.write(".ENDS\n\n\n")
 
-	spice_file.close()
 
 	tran_names_list = []
 	wire_names_list = []
@@ -581,10 +513,8 @@ def generate_mtj_memorycell_low_lp(spice_filename, circuit_name):
 	return tran_names_list, wire_names_list
 
 # MTJ cell using the refence resistance
-def generate_mtj_memorycell_reference_lp(spice_filename, circuit_name): 
+def generate_mtj_memorycell_reference_lp(spice_file, circuit_name): 
 
-	# Open SPICE file for appending
-	spice_file = open(spice_filename, 'a')
 
 	spice_file.write("******************************************************************************************\n")
 	spice_file.write("* " + circuit_name + " subcircuit MTJ coulmn selector and pull down \n")
@@ -599,7 +529,6 @@ def generate_mtj_memorycell_reference_lp(spice_filename, circuit_name):
 
 	spice_file.write(".ENDS\n\n\n")
 
-	spice_file.close()
 
 	tran_names_list = []
 	wire_names_list = []
@@ -607,10 +536,8 @@ def generate_mtj_memorycell_reference_lp(spice_filename, circuit_name):
 	return tran_names_list, wire_names_list
 
 # MTJ cell using the refence resistance
-def generate_mtj_memorycellh_reference_lp(spice_filename, circuit_name): 
+def generate_mtj_memorycellh_reference_lp(spice_file, circuit_name): 
 
-	# Open SPICE file for appending
-	spice_file = open(spice_filename, 'a')
 
 	spice_file.write("******************************************************************************************\n")
 	spice_file.write("* " + circuit_name + " subcircuit MTJ coulmn selector and pull down \n")
@@ -625,7 +552,6 @@ def generate_mtj_memorycellh_reference_lp(spice_filename, circuit_name):
 
 	spice_file.write(".ENDS\n\n\n")
 
-	spice_file.close()
 
 	tran_names_list = []
 	wire_names_list = []
@@ -633,10 +559,8 @@ def generate_mtj_memorycellh_reference_lp(spice_filename, circuit_name):
 	return tran_names_list, wire_names_list
 
 # MTJ cell using the refence resistance
-def generate_mtj_memorycell_reference_lp_target(spice_filename, circuit_name): 
+def generate_mtj_memorycell_reference_lp_target(spice_file, circuit_name): 
 
-	# Open SPICE file for appending
-	spice_file = open(spice_filename, 'a')
 
 	spice_file.write("******************************************************************************************\n")
 	spice_file.write("* " + circuit_name + " subcircuit MTJ memory cell \n")
@@ -651,7 +575,6 @@ def generate_mtj_memorycell_reference_lp_target(spice_filename, circuit_name):
 
 	spice_file.write(".ENDS\n\n\n")
 
-	spice_file.close()
 
 	tran_names_list = []
 	wire_names_list = []
@@ -660,10 +583,8 @@ def generate_mtj_memorycell_reference_lp_target(spice_filename, circuit_name):
 
 
 # Memory cell:
-def generate_memorycell(spice_filename, circuit_name):
+def generate_memorycell(spice_file, circuit_name):
 
-	# Open SPICE file for appending
-	spice_file = open(spice_filename, 'a')
 	# currently only works for 22nm
 	spice_file.write("******************************************************************************************\n")
 	spice_file.write("* " + circuit_name + " subcircuit memory sram cell \n")
@@ -682,7 +603,6 @@ def generate_memorycell(spice_filename, circuit_name):
 
 	spice_file.write(".ENDS\n\n\n")
 
-	spice_file.close()
 
 	tran_names_list = []
 	wire_names_list = []
@@ -691,10 +611,8 @@ def generate_memorycell(spice_filename, circuit_name):
 
 
 # Memory cell:
-def generate_memorycell_lp(spice_filename, circuit_name):
+def generate_memorycell_lp(spice_file, circuit_name):
 
-	# Open SPICE file for appending
-	spice_file = open(spice_filename, 'a')
 	# currently only works for 22nm
 	spice_file.write("******************************************************************************************\n")
 	spice_file.write("* " + circuit_name + " subcircuit low power memory sram cell \n")
@@ -712,7 +630,6 @@ def generate_memorycell_lp(spice_filename, circuit_name):
 	spice_file.write("M7 n_br2 n_wl2 n_1_2 n_gnd nmos_lp L=22n W=55n AD=2.2f PD=135n AS=1.1f PS=40n\n") #PG
 	spice_file.write(".ENDS\n\n\n")
 
-	spice_file.close()
 
 	tran_names_list = []
 	wire_names_list = []
@@ -721,10 +638,8 @@ def generate_memorycell_lp(spice_filename, circuit_name):
 
 # This is the sense amplifier for SRAM-based memories
 # This circuit is not automatically sized and requires precicse sizing by the user
-def generate_samp(spice_filename, circuit_name):
+def generate_samp(spice_file, circuit_name):
 
-	# Open SPICE file for appending
-	spice_file = open(spice_filename, 'a')
 	# currently only works for 22nm and sizes are pre-determined.
 	spice_file.write("******************************************************************************************\n")
 	spice_file.write("* " + circuit_name + " subcircuit sense amp \n")
@@ -751,7 +666,6 @@ def generate_samp(spice_filename, circuit_name):
 	spice_file.write("X_inv" + circuit_name + "_2 n_1_2 n_out n_vdd n_gnd inv Wn=min_tran_width Wp=min_tran_width\n")
 
 	spice_file.write(".ENDS\n\n\n")
-	spice_file.close()	
 	tran_names_list = []
 	wire_names_list = []
 
@@ -760,10 +674,8 @@ def generate_samp(spice_filename, circuit_name):
 
 # This is the sense amplifier for SRAM-based memories
 # This circuit is not automatically sized and requires precicse sizing by the user
-def generate_samp_lp(spice_filename, circuit_name):
+def generate_samp_lp(spice_file, circuit_name):
 
-	# Open SPICE file for appending
-	spice_file = open(spice_filename, 'a')
 	# currently only works for 22nm
 
 	spice_file.write("******************************************************************************************\n")
@@ -792,17 +704,14 @@ def generate_samp_lp(spice_filename, circuit_name):
 	spice_file.write("X_inv" + circuit_name + "_2 n_1_2 n_out n_vdd n_gnd inv_lp Wn=min_tran_width Wp=min_tran_width\n")
 
 	spice_file.write(".ENDS\n\n\n")
-	spice_file.close()	
 	tran_names_list = []
 	wire_names_list = []
 
 	return tran_names_list, wire_names_list
 
 # This is the column decoder used in memory
-def generate_columndecoder(spice_filename, circuit_name, decsize):
+def generate_columndecoder(spice_file, circuit_name, decsize):
 
-	# Open SPICE file for appending
-	spice_file = open(spice_filename, 'a')
 	# currently only works for 22nm
 
 	spice_file.write("******************************************************************************************\n")
@@ -824,7 +733,6 @@ def generate_columndecoder(spice_filename, circuit_name, decsize):
 		spice_file.write("X_inv_columndecoder_3 n_1_2 n_out n_vdd n_gnd inv Wn=inv_columndecoder_3_nmos Wp=inv_columndecoder_3_pmos\n")
 
 	spice_file.write(".ENDS\n\n\n")
-	spice_file.close()	
 	tran_names_list = []
 	# wont be sizing the inveters, chooising minimum size
 	tran_names_list.append("inv_columndecoder_1_nmos")
@@ -839,10 +747,8 @@ def generate_columndecoder(spice_filename, circuit_name, decsize):
 	return tran_names_list, wire_names_list
 
 # This is the column decoder used in memory
-def generate_columndecoder_lp(spice_filename, circuit_name, decsize):
+def generate_columndecoder_lp(spice_file, circuit_name, decsize):
 
-	# Open SPICE file for appending
-	spice_file = open(spice_filename, 'a')
 	# currently only works for 22nm
 
 	spice_file.write("******************************************************************************************\n")
@@ -864,7 +770,6 @@ def generate_columndecoder_lp(spice_filename, circuit_name, decsize):
 		spice_file.write("X_inv_columndecoder_3 n_1_2 n_out n_vdd n_gnd inv_lp Wn=inv_columndecoder_3_nmos Wp=inv_columndecoder_3_pmos\n")
 
 	spice_file.write(".ENDS\n\n\n")
-	spice_file.close()	
 	tran_names_list = []
 	# wont be sizing the inveters, chooising minimum size
 	tran_names_list.append("inv_columndecoder_1_nmos")
@@ -880,10 +785,8 @@ def generate_columndecoder_lp(spice_filename, circuit_name, decsize):
 
 
 # This is the output crossbar
-def generate_pgateoutputcrossbar(spice_filename, circuit_name, maxwidth, def_use_tgate):
+def generate_pgateoutputcrossbar(spice_file, circuit_name, maxwidth, def_use_tgate):
 
-	# Open SPICE file for appending
-	spice_file = open(spice_filename, 'a')
 	# currently only works for 22nm
 
 	spice_file.write("******************************************************************************************\n")
@@ -948,7 +851,6 @@ def generate_pgateoutputcrossbar(spice_filename, circuit_name, maxwidth, def_use
 	spice_file.write("X_wire2_0_0 n_20_0 n_hang wire Rw=wire_"+circuit_name+"_res Cw=wire_"+circuit_name+"_cap \n")
 
 	spice_file.write(".ENDS\n\n\n")
-	spice_file.close()	
 	tran_names_list = []
 	tran_names_list.append("inv_pgateoutputcrossbar_1_nmos")
 	tran_names_list.append("inv_pgateoutputcrossbar_1_pmos")
@@ -971,10 +873,8 @@ def generate_pgateoutputcrossbar(spice_filename, circuit_name, maxwidth, def_use
 # This is the write driver
 # The part which is commented out can be restored (you need to comment those below it) to enable sizing of this module
 # It is however expected that write driver not be in the critical path of SRAM-based BRAm and therefore sizing it will just increase COFEE's runtime.
-def generate_writedriver(spice_filename, circuit_name):
+def generate_writedriver(spice_file, circuit_name):
 
-	# Open SPICE file for appending
-	spice_file = open(spice_filename, 'a')
 	# currently only works for 22nm
 
 	spice_file.write("******************************************************************************************\n")
@@ -1016,7 +916,6 @@ def generate_writedriver(spice_filename, circuit_name):
 	spice_file.write("X_inv_writedriver_1 n_din n_dinb n_vdd n_gnd inv Wn=55n Wp=110n\n")
 	spice_file.write("X_inv_writedriver_2 n_we n_web n_vdd n_gnd inv Wn=55n Wp=110n\n")
 	spice_file.write(".ENDS\n\n\n")
-	spice_file.close()	
 	tran_names_list = []
 	# wont be sizing the inveters, chooising minimum size
 	tran_names_list.append("inv_writedriver_1_nmos")
@@ -1032,10 +931,8 @@ def generate_writedriver(spice_filename, circuit_name):
 
 #todo: automate sizing in the write driver
 #this is the write driver
-def generate_writedriver_lp(spice_filename, circuit_name):
+def generate_writedriver_lp(spice_file, circuit_name):
 
-	# Open SPICE file for appending
-	spice_file = open(spice_filename, 'a')
 	# currently only works for 22nm
 
 	spice_file.write("******************************************************************************************\n")
@@ -1078,7 +975,6 @@ def generate_writedriver_lp(spice_filename, circuit_name):
 	spice_file.write("X_inv_writedriver_1 n_din n_dinb n_vdd n_gnd inv_lp Wn=55n Wp=110n\n")
 	spice_file.write("X_inv_writedriver_2 n_we n_web n_vdd n_gnd inv_lp Wn=55n Wp=110n\n")
 	spice_file.write(".ENDS\n\n\n")
-	spice_file.close()	
 	tran_names_list = []
 	# wont be sizing the inveters, chooising minimum size
 	tran_names_list.append("inv_writedriver_1_nmos")
@@ -1095,10 +991,8 @@ def generate_writedriver_lp(spice_filename, circuit_name):
 
 
 # This is the precharging circuitry for SRAM-based memory block
-def generate_precharge(spice_filename, circuit_name):
+def generate_precharge(spice_file, circuit_name):
 
-	# Open SPICE file for appending
-	spice_file = open(spice_filename, 'a')
 	# currently only works for 22nm
 	spice_file.write("******************************************************************************************\n")
 	spice_file.write("* " + circuit_name + " subcircuit precharge and equalization \n")
@@ -1111,7 +1005,6 @@ def generate_precharge(spice_filename, circuit_name):
 	spice_file.write("M2 n_bl n_precharge_bar n_blbar n_vdd pmos L=gate_length W=ptran_equalization_nmos ")
 	spice_file.write("AS=ptran_equalization_nmos*trans_diffusion_length AD=ptran_equalization_nmos*trans_diffusion_length PS=ptran_equalization_nmos+2*trans_diffusion_length PD=ptran_equalization_nmos+2*trans_diffusion_length\n")
 	spice_file.write(".ENDS\n\n\n")
-	spice_file.close()
 
 	tran_names_list = []
 	tran_names_list.append("ptran_precharge_side_pmos")
@@ -1121,10 +1014,8 @@ def generate_precharge(spice_filename, circuit_name):
 	return tran_names_list, wire_names_list
 
 # This is the precharging circuitry for SRAM-based memory block
-def generate_precharge_lp(spice_filename, circuit_name):
+def generate_precharge_lp(spice_file, circuit_name):
 
-	# Open SPICE file for appending
-	spice_file = open(spice_filename, 'a')
 
 	# currently only works for 22nm
 	spice_file.write("******************************************************************************************\n")
@@ -1138,7 +1029,6 @@ def generate_precharge_lp(spice_filename, circuit_name):
 	spice_file.write("M2 n_bl n_precharge_bar n_blbar n_vdd pmos_lp L=gate_length W=ptran_precharge_side_nmos ")
 	spice_file.write("AS=ptran_equalization_nmos*trans_diffusion_length AD=ptran_equalization_nmos*trans_diffusion_length PS=ptran_equalization_nmos+2*trans_diffusion_length PD=ptran_equalization_nmos+2*trans_diffusion_length\n")
 	spice_file.write(".ENDS\n\n\n")
-	spice_file.close()
 
 	tran_names_list = []
 	tran_names_list.append("ptran_precharge_side_pmos")
@@ -1149,10 +1039,8 @@ def generate_precharge_lp(spice_filename, circuit_name):
 
 
 # This is the first stage of the configurable decoder
-def generate_configurabledecoderi(spice_filename, circuit_name):
+def generate_configurabledecoderi(spice_file, circuit_name):
 
-	# Open SPICE file for appending
-	spice_file = open(spice_filename, 'a')
 	
 	# Generate SPICE subcircuits
 	spice_file.write("******************************************************************************************\n")
@@ -1165,9 +1053,6 @@ def generate_configurabledecoderi(spice_filename, circuit_name):
 
 	spice_file.write(".ENDS\n\n\n")
 	
-	# Close SPICE file
-	spice_file.close()
-	
 	# Create a list of all transistors used in this subcircuit
 	tran_names_list = []
 	tran_names_list.append("inv_xconfigurabledecoderi_1_nmos")
@@ -1183,10 +1068,8 @@ def generate_configurabledecoderi(spice_filename, circuit_name):
 	return tran_names_list, wire_names_list
 
 # This is the initial stage of the row decoder
-def generate_rowdecoderstage0_lp(spice_filename, circuit_name):
+def generate_rowdecoderstage0_lp(spice_file, circuit_name):
 
-	# Open SPICE file for appending
-	spice_file = open(spice_filename, 'a')
 	
 	# Generate SPICE subcircuits
 
@@ -1198,9 +1081,6 @@ def generate_rowdecoderstage0_lp(spice_filename, circuit_name):
 
 	spice_file.write(".ENDS\n\n\n")
 	
-	# Close SPICE file
-	spice_file.close()
-	
 	# Create a list of all transistors used in this subcircuit
 	tran_names_list = []
 	tran_names_list.append("inv_rowdecoderstage0_1_nmos")
@@ -1214,10 +1094,8 @@ def generate_rowdecoderstage0_lp(spice_filename, circuit_name):
 	return tran_names_list, wire_names_list
 
 # This is the initial stage of the row decoder
-def generate_rowdecoderstage0(spice_filename, circuit_name):
+def generate_rowdecoderstage0(spice_file, circuit_name):
 
-	# Open SPICE file for appending
-	spice_file = open(spice_filename, 'a')
 	
 	# Generate SPICE subcircuits
 
@@ -1229,9 +1107,6 @@ def generate_rowdecoderstage0(spice_filename, circuit_name):
 
 	spice_file.write(".ENDS\n\n\n")
 	
-	# Close SPICE file
-	spice_file.close()
-	
 	# Create a list of all transistors used in this subcircuit
 	tran_names_list = []
 	tran_names_list.append("inv_rowdecoderstage0_1_nmos")
@@ -1246,10 +1121,8 @@ def generate_rowdecoderstage0(spice_filename, circuit_name):
 
 
 # This is the first stage of the configurable decoder
-def generate_configurabledecoderi_lp(spice_filename, circuit_name):
+def generate_configurabledecoderi_lp(spice_file, circuit_name):
 
-	# Open SPICE file for appending
-	spice_file = open(spice_filename, 'a')
 	
 	# Generate SPICE subcircuits
 
@@ -1263,9 +1136,6 @@ def generate_configurabledecoderi_lp(spice_filename, circuit_name):
 
 	spice_file.write(".ENDS\n\n\n")
 	
-	# Close SPICE file
-	spice_file.close()
-	
 	# Create a list of all transistors used in this subcircuit
 	tran_names_list = []
 	tran_names_list.append("inv_xconfigurabledecoderi_1_nmos")
@@ -1282,10 +1152,8 @@ def generate_configurabledecoderi_lp(spice_filename, circuit_name):
 
 
 # This is the wordline driver
-def generate_wordline_driver_lp(spice_filename, circuit_name, nand_size, repeater):
+def generate_wordline_driver_lp(spice_file, circuit_name, nand_size, repeater):
 
-	# Open SPICE file for appending
-	spice_file = open(spice_filename, 'a')
 	
 	# Generate SPICE subcircuits
 
@@ -1305,9 +1173,6 @@ def generate_wordline_driver_lp(spice_filename, circuit_name, nand_size, repeate
 	spice_file.write("X_inv" + circuit_name + "_4 n_1_3 n_out n_vdd n_gnd inv_lp Wn=inv_" + circuit_name + "_4_nmos Wp=inv_" + circuit_name + "_4_pmos\n")
 	spice_file.write(".ENDS\n\n\n")
 	
-	# Close SPICE file
-	spice_file.close()
-	
 	# Create a list of all transistors used in this subcircuit
 	tran_names_list = []
 	tran_names_list.append("inv_nand"+str(nand_size)+"_" + circuit_name + "_1_nmos")
@@ -1325,10 +1190,8 @@ def generate_wordline_driver_lp(spice_filename, circuit_name, nand_size, repeate
 
 
 # This is the wordline driver
-def generate_wordline_driver(spice_filename, circuit_name, nand_size, repeater):
+def generate_wordline_driver(spice_file, circuit_name, nand_size, repeater):
 
-	# Open SPICE file for appending
-	spice_file = open(spice_filename, 'a')
 	
 	# Generate SPICE subcircuits
 
@@ -1348,9 +1211,6 @@ def generate_wordline_driver(spice_filename, circuit_name, nand_size, repeater):
 	spice_file.write("X_inv" + circuit_name + "_4 n_1_3 n_out n_vdd n_gnd inv Wn=inv_" + circuit_name + "_4_nmos Wp=inv_" + circuit_name + "_4_pmos\n")
 	spice_file.write(".ENDS\n\n\n")
 	
-	# Close SPICE file
-	spice_file.close()
-	
 	# Create a list of all transistors used in this subcircuit
 	tran_names_list = []
 	tran_names_list.append("inv_nand"+str(nand_size)+"_" + circuit_name + "_1_nmos")
@@ -147,7 +147,7 @@ def _generate_ptran_2lvl_mux_on(spice_file, mux_name, implemented_mux_size, leve
 	spice_file.write(".ENDS\n\n\n")
 
 
-def generate_ptran_2lvl_mux(spice_filename, mux_name, implemented_mux_size, level1_size, level2_size):
+def generate_ptran_2lvl_mux(spice_file, mux_name, implemented_mux_size, level1_size, level2_size):
 	""" 
 	Creates two-level MUX circuits
 	There are 3 different types of MUX that are generated depending on how 'on' the mux is
@@ -156,8 +156,6 @@ def generate_ptran_2lvl_mux(spice_filename, mux_name, implemented_mux_size, leve
 		3. Off (both levels are off) circuit name: mux_name + "_off"
 	"""
    
-	# Open SPICE file for appending
-	spice_file = open(spice_filename, 'a')
 	
 	# Generate SPICE subcircuits
 	_generate_ptran_driver(spice_file, mux_name, implemented_mux_size)
@@ -174,9 +172,6 @@ def generate_ptran_2lvl_mux(spice_filename, mux_name, implemented_mux_size, leve
 	spice_file.write("X" + mux_name + "_driver n_1_1 n_out n_vdd n_gnd " + mux_name + "_driver\n")
 	spice_file.write(".ENDS\n\n\n")
 	
-	# Close SPICE file
-	spice_file.close()
-	
 	# Create a list of all transistors used in this subcircuit
 	tran_names_list = []
 	tran_names_list.append("ptran_" + mux_name + "_L1_nmos")
@@ -196,7 +191,7 @@ def generate_ptran_2lvl_mux(spice_filename, mux_name, implemented_mux_size, leve
 	return tran_names_list, wire_names_list
 	
 	
-def generate_ptran_2lvl_mux_no_driver(spice_filename, mux_name, implemented_mux_size, level1_size, level2_size):
+def generate_ptran_2lvl_mux_no_driver(spice_file, mux_name, implemented_mux_size, level1_size, level2_size):
 	""" 
 	Creates two-level MUX files
 	There are 3 different types of MUX that are generated depending on how 'on' the mux is
@@ -207,8 +202,6 @@ def generate_ptran_2lvl_mux_no_driver(spice_filename, mux_name, implemented_mux_
 	No driver is attached to the on mux (we need this for the local routing mux)
 	"""
 	
-	# Open SPICE file for appending
-	spice_file = open(spice_filename, 'a')
 	
 	# Generate SPICE subcircuits
 	_generate_ptran_sense_only(spice_file, mux_name, implemented_mux_size)
@@ -225,9 +218,6 @@ def generate_ptran_2lvl_mux_no_driver(spice_filename, mux_name, implemented_mux_
 	spice_file.write("X" + mux_name + "_sense n_1_1 n_out n_vdd n_gnd " + mux_name + "_sense\n")
 	spice_file.write(".ENDS\n\n\n")
 	
-	# Close SPICE file
-	spice_file.close()
-	
 	# Create a list of all transistors used in this subcircuit
 	tran_names_list = []
 	tran_names_list.append("ptran_" + mux_name + "_L1_nmos")
@@ -244,11 +234,9 @@ def generate_ptran_2lvl_mux_no_driver(spice_filename, mux_name, implemented_mux_
 	return tran_names_list, wire_names_list
 	
  
-def generate_ptran_2_to_1_mux(spice_filename, mux_name):
+def generate_ptran_2_to_1_mux(spice_file, mux_name):
 	""" Generate a 2:1 pass-transistor MUX with shared SRAM """
 
-	# Open SPICE file for appending
-	spice_file = open(spice_filename, 'a')
 	
 	# Create the 2:1 MUX circuit
 	spice_file.write("******************************************************************************************\n")
@@ -264,7 +252,6 @@ def generate_ptran_2_to_1_mux(spice_filename, mux_name):
 	spice_file.write("Xwire_" + mux_name + "_driver n_2_1 n_2_2 wire Rw=wire_" + mux_name + "_driver_res Cw=wire_" + mux_name + "_driver_cap\n")
 	spice_file.write("Xinv_" + mux_name + "_2 n_2_2 n_out n_vdd n_gnd inv Wn=inv_" + mux_name + "_2_nmos Wp=inv_" + mux_name + "_2_pmos\n")
 	spice_file.write(".ENDS\n\n\n")
-	spice_file.close()
 	
 	# Create a list of all transistors used in this subcircuit
 	tran_names_list = []
@@ -430,7 +417,7 @@ def _generate_tgate_2lvl_mux_on(spice_file, mux_name, implemented_mux_size, leve
 	spice_file.write(".ENDS\n\n\n")
 
 	
-def generate_tgate_2lvl_mux(spice_filename, mux_name, implemented_mux_size, level1_size, level2_size):
+def generate_tgate_2lvl_mux(spice_file, mux_name, implemented_mux_size, level1_size, level2_size):
 	""" 
 	Creates two-level MUX circuits
 	There are 3 different types of MUX that are generated depending on how 'on' the mux is
@@ -439,8 +426,6 @@ def generate_tgate_2lvl_mux(spice_filename, mux_name, implemented_mux_size, leve
 		3. Off (both levels are off) circuit name: mux_name + "_off"
 	"""
    
-	# Open SPICE file for appending
-	spice_file = open(spice_filename, 'a')
 	
 	# Generate SPICE subcircuits
 	_generate_tgate_driver(spice_file, mux_name, implemented_mux_size)
@@ -457,9 +442,6 @@ def generate_tgate_2lvl_mux(spice_filename, mux_name, implemented_mux_size, leve
 	spice_file.write("X" + mux_name + "_driver n_1_1 n_out n_vdd n_gnd " + mux_name + "_driver\n")
 	spice_file.write(".ENDS\n\n\n")
 	
-	# Close SPICE file
-	spice_file.close()
-	
 	# Create a list of all transistors used in this subcircuit
 	tran_names_list = []
 	tran_names_list.append("tgate_" + mux_name + "_L1_nmos")
@@ -481,7 +463,7 @@ def generate_tgate_2lvl_mux(spice_filename, mux_name, implemented_mux_size, leve
 	return tran_names_list, wire_names_list
 	
 	
-def generate_tgate_2lvl_mux_no_driver(spice_filename, mux_name, implemented_mux_size, level1_size, level2_size):
+def generate_tgate_2lvl_mux_no_driver(spice_file, mux_name, implemented_mux_size, level1_size, level2_size):
 	""" 
 	Creates two-level MUX files
 	There are 3 different types of MUX that are generated depending on how 'on' the mux is
@@ -492,8 +474,6 @@ def generate_tgate_2lvl_mux_no_driver(spice_filename, mux_name, implemented_mux_
 	No driver is attached to the on mux (we need this for the local routing mux)
 	"""
 	
-	# Open SPICE file for appending
-	spice_file = open(spice_filename, 'a')
 	
 	# Generate SPICE subcircuits
 	_generate_tgate_sense_only(spice_file, mux_name, implemented_mux_size)
@@ -510,9 +490,6 @@ def generate_tgate_2lvl_mux_no_driver(spice_filename, mux_name, implemented_mux_
 	spice_file.write("X" + mux_name + "_sense n_1_1 n_out n_vdd n_gnd " + mux_name + "_sense\n")
 	spice_file.write(".ENDS\n\n\n")
 	
-	# Close SPICE file
-	spice_file.close()
-	
 	# Create a list of all transistors used in this subcircuit
 	tran_names_list = []
 	tran_names_list.append("tgate_" + mux_name + "_L1_nmos")
@@ -531,11 +508,9 @@ def generate_tgate_2lvl_mux_no_driver(spice_filename, mux_name, implemented_mux_
 	return tran_names_list, wire_names_list
 	
  
-def generate_tgate_2_to_1_mux(spice_filename, mux_name):
+def generate_tgate_2_to_1_mux(spice_file, mux_name):
 	""" Generate a 2:1 pass-transistor MUX with shared SRAM """
 
-	# Open SPICE file for appending
-	spice_file = open(spice_filename, 'a')
 	
 	# Create the 2:1 MUX circuit
 	spice_file.write("******************************************************************************************\n")
@@ -551,7 +526,6 @@ def generate_tgate_2_to_1_mux(spice_filename, mux_name):
 	spice_file.write("Xwire_" + mux_name + "_driver n_2_1 n_2_2 wire Rw=wire_" + mux_name + "_driver_res Cw=wire_" + mux_name + "_driver_cap\n")
 	spice_file.write("Xinv_" + mux_name + "_2 n_2_2 n_out n_vdd n_gnd inv Wn=inv_" + mux_name + "_2_nmos Wp=inv_" + mux_name + "_2_pmos\n")
 	spice_file.write(".ENDS\n\n\n")
-	spice_file.close()
 	
 	# Create a list of all transistors used in this subcircuit
 	tran_names_list = []
@@ -571,10 +545,8 @@ def generate_tgate_2_to_1_mux(spice_filename, mux_name):
 	return tran_names_list, wire_names_list  
 
 
-def generate_dedicated_driver(spice_filename, driver_name, num_bufs, top_name):
+def generate_dedicated_driver(spice_file, driver_name, num_bufs, top_name):
 	""" Generate a driver for the dedicated routing links """
-	# Open SPICE file for appending
-	spice_file = open(spice_filename, 'a')
 	# Create the driver
 	spice_file.write("******************************************************************************************\n")
 	spice_file.write("* " + driver_name + " subcircuit (2:1)\n")
@@ -593,7 +565,6 @@ def generate_dedicated_driver(spice_filename, driver_name, num_bufs, top_name):
 	spice_file.write("Xwirer_edi_"+str(num_bufs * 2 + 1)+" n_1_"+str(count + 1)+" n_out wire Rw=wire_"+top_name+"_2_res/"+str(num_bufs*2)+" Cw=wire_"+top_name+"_2_cap/"+str(num_bufs*2)+" \n")
 
 	spice_file.write(".ENDS\n\n\n")
-	spice_file.close()
 	
 	# Create a list of all transistors used in this subcircuit
 	tran_names_list = []
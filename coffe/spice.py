@@ -2,15 +2,89 @@
 # run HSPICE jobs and parse the output of those jobs.
 
 import os
+import re
+import gzip
+import random
+import asyncio
+import sys
+import json
+import shutil
+import sqlite3
+import hashlib
+import time
 import subprocess
+import multiprocessing as mp
+import numpy as np
 import coffe.utils as utils
 
 # All .sp files should be created to use sweep_data.l to set parameters.
 HSPICE_DATA_SWEEP_PATH = "sweep_data.l"
 
-# The contents of 
+# The contents of the sweep in an easy to read format (only written for debug)
 DATA_SWEEP_PATH = "data.txt"
 
+# What is kept of the simulator output (the .lis listing) of every run: the whole listing,
+# the listing compressed to a .lis.gz file, or only the listing of runs that failed (the 
+# simulator could not run or a measurement failed).
+LISTING_KEEP = "keep"
+LISTING_GZIP = "gzip"
+LISTING_ON_FAILURE = "failure"
+LISTING_MODES = [LISTING_KEEP, LISTING_GZIP, LISTING_ON_FAILURE]
+
+# Large .DATA sweeps are split into shards that run in parallel. Each shard gets at least
+# this many sweep rows, smaller sweeps are not worth the overhead of copying the netlists.
+MIN_ROWS_PER_SHARD = 50
+
+# Folder (created next to the subcircuit folders) that holds the scratch copies of the 
+# SPICE netlists used by each shard and each concurrent run.
+SCRATCH_DIR_NAME = "spice_scratch"
+
+# Default maximum number of sweep settings kept in the simulation cache. When the cache
+# grows past this, the least recently used settings are evicted.
+DEFAULT_CACHE_MAX_ENTRIES = 1000000
+
+# SQLite limits the number of variables in a statement, so cache lookups are done in chunks.
+CACHE_QUERY_CHUNK_SIZE = 500
+
+# Seconds a connection to the cache waits for the processes that share the database
+# (sharded runs, parallel sizing workers) to release their lock before it gives up.
+CACHE_LOCK_TIMEOUT = 300
+
+# Counting the cache entries takes a scan of the whole table, so the cache only checks
+# if it needs evicting every so many stores (it can hold a few more entries than its max).
+CACHE_EVICTION_INTERVAL = 100
+
+# A simulator run that produces no results is retried (e.g. when no HSPICE license was free) 
+# up to this many times. The wait before each retry doubles from the base delay up to the
+# max delay, with a random jitter so that parallel runs don't all retry at the same time.
+MAX_SIMULATOR_RETRIES = 10
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 60.0
+
+# Files modified less than this many seconds before they were hashed are hashed again on the 
+# next lookup even if their size and time stamp did not change.
+FILE_TIMESTAMP_RESOLUTION = 2.0
+
+# Resolution profiles of the transient analysis. Every top-level deck runs 
+# ".TRAN 'tran_step' '<stop time> * tran_stop_scale'" and SpiceInterface.run sets these two
+# parameters from the profile it is asked to use. The fine profile is what the decks always used.
+TRAN_PROFILE_FINE = "fine"
+TRAN_PROFILE_COARSE = "coarse"
+DEFAULT_TRAN_STEP = 1e-12
+DEFAULT_TRAN_STOP_SCALE = 1.0
+
+# Matches the .LIB and .INCLUDE statements that pull other netlist files into a deck
+LIBRARY_STATEMENT_RE = re.compile(r"^\s*\.(?:lib|include|inc)\s+[\"']([^\"']+)[\"']", re.IGNORECASE)
+
+# Names in netlist statements and the assignments of a .PARAM statement (used to find what a deck depends on)
+NETLIST_NAME_RE = re.compile(r"[a-z_][a-z0-9_]*")
+PARAM_ASSIGNMENT_RE = re.compile(r"([a-z_][a-z0-9_]*)\s*=\s*('[^']*'|\S+)")
+
+# ngspice translation: the .DATA sweep of the .TRAN statement and the measurement results it prints
+TRAN_DATA_SWEEP_RE = re.compile(r"\s+SWEEP\s+DATA\s*=\s*\w+", re.IGNORECASE)
+QUOTED_EXPRESSION_RE = re.compile(r"'([^']*)'")
+NGSPICE_MEASUREMENT_RE = re.compile(r"^\s*(\w+)\s*=\s*([-+]?[0-9.]+(?:[eE][-+]?[0-9]+)?)")
+
 
 class SpiceInterface(object):
     """
@@ -18,14 +92,100 @@ class SpiceInterface(object):
     An object of this class can be used to run HSPICE jobs and parse the output of those jobs.
     """
 
-    def __init__(self):
+    def __init__(self, num_workers=1, cache_path=None, cache_max_entries=DEFAULT_CACHE_MAX_ENTRIES, backend="hspice", write_data_file=False,
+                 coarse_tran_step=None, coarse_tran_stop_scale=DEFAULT_TRAN_STOP_SCALE, listing=LISTING_KEEP):
 
         # This simulation counter keeps track of number of HSPICE sims performed.
         self.simulation_counter = 0
+        # Seconds spent running the simulator (summed over the simulations that ran at the same time)
+        self.simulation_time = 0.0
+
+        # The simulator that runs the decks, see SIMULATOR_BACKENDS.
+        # The parameters of every sweep are only written to data.txt if 'write_data_file' is set.
+        # 'listing' is what is kept of the simulator output, see LISTING_MODES.
+        self.backend = SIMULATOR_BACKENDS[backend](write_data_file, listing)
+
+        # Number of worker processes used to run the shards of a large .DATA sweep.
+        # With a single worker, every sweep runs in one HSPICE process.
+        self.num_workers = num_workers
+
+        # Sweep settings that were already simulated are looked up in this cache
+        # instead of being simulated again. No cache is used if no path is given.
+        self.cache = None
+        if cache_path:
+            self.cache = SimulationCache(cache_path, cache_max_entries)
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+        # Transient step and stop time scale of every resolution profile.
+        # Without a coarse step, the coarse profile is the same as the fine one.
+        self.tran_profiles = {TRAN_PROFILE_FINE: {"tran_step": DEFAULT_TRAN_STEP, "tran_stop_scale": DEFAULT_TRAN_STOP_SCALE},
+                              TRAN_PROFILE_COARSE: {"tran_step": coarse_tran_step or DEFAULT_TRAN_STEP, "tran_stop_scale": coarse_tran_stop_scale}}
+
+        # Rank correlation of the coarse and fine profiles for every sweep that was checked
+        self.rank_correlations = []
+
+        # Concurrency limit and free scratch slots of run_async, created for each event loop
+        self.async_loop = None
+        self.async_semaphore = None
+        self.free_async_slots = []
+
+        # A copy of this object used by a worker process that sizes a subcircuit runs all its 
+        # decks in this scratch folder, so that it doesn't share the sweep file with other workers.
+        self.scratch_name = None
 
         return
 
 
+    def __getstate__(self):
+        """ The asyncio objects of run_async belong to the event loop of this process, they are not copied. """
+
+        state = self.__dict__.copy()
+        state["async_loop"] = None
+        state["async_semaphore"] = None
+        state["free_async_slots"] = []
+
+        return state
+
+
+    def set_up_worker(self, scratch_name):
+        """
+        Prepare this copy of the SpiceInterface to run in a worker process: all its decks are
+        simulated in the scratch folder 'scratch_name' (see _create_scratch_copy) without
+        sharding, since a worker process can't start processes of its own. The statistics start
+        at 0 so that get_statistics returns what the worker did.
+        """
+
+        self.scratch_name = scratch_name
+        self.num_workers = 1
+        self.simulation_counter = 0
+        self.simulation_time = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.rank_correlations = []
+
+
+    def get_statistics(self):
+        """
+        Returns the number of simulations, the simulation time, cache hits and cache misses and the rank correlations.
+        """
+
+        return self.simulation_counter, self.simulation_time, self.cache_hits, self.cache_misses, self.rank_correlations
+
+
+    def add_statistics(self, statistics):
+        """
+        Add the statistics of a worker (returned by its get_statistics) to ours.
+        """
+
+        simulation_counter, simulation_time, cache_hits, cache_misses, rank_correlations = statistics
+        self.simulation_counter += simulation_counter
+        self.simulation_time += simulation_time
+        self.cache_hits += cache_hits
+        self.cache_misses += cache_misses
+        self.rank_correlations.extend(rank_correlations)
+
+
     def get_num_simulations_performed(self):
         """
         Returns the total number of HSPICE sims performed by this SpiceInterface object.
@@ -34,66 +194,56 @@ class SpiceInterface(object):
         return self.simulation_counter
 
 
-    def _setup_data_sweep_file(self, parameter_dict):
+    def get_simulation_time(self):
         """
-        Create an HSPICE .DATA statement with the data from parameter_dict.
-        The .DATA file is hard to read. So, we also write out the parameters to a text file
-        in an easy to read format. This makes it easier to debug.
+        Returns the seconds this SpiceInterface object spent running the simulator.
         """
-        
-        max_items_per_line = 4
 
-        # Get a list of parameter names
-        param_list = list(parameter_dict.keys())
+        return self.simulation_time
 
-        # Write out parameters to a "easy to read format" file (this just helps for debug) 
-        data_file = open(DATA_SWEEP_PATH, 'w')
-        data_file.write("param".ljust(40) + "value".ljust(20) + "\n")
-        dashes = "-"*60
-        data_file.write(dashes+ "\n")
-        for param in param_list :
-            data_file.write(param.ljust(40, '-'))
-            for i in range(len(parameter_dict[param])) :
-                data_file.write(str(parameter_dict[param][i]).ljust(20))
 
-            data_file.write("\n")
-        data_file.close()
+    def get_num_cache_hits(self):
+        """
+        Returns the number of sweep settings that were found in the simulation cache.
+        """
+
+        return self.cache_hits
+
+
+    def get_num_cache_misses(self):
+        """
+        Returns the number of sweep settings that had to be simulated because they were 
+        not in the simulation cache.
+        """
+
+        return self.cache_misses
+
+
+    def has_coarse_profile(self):
+        """
+        Returns True if the coarse transient profile differs from the fine one.
+        """
+
+        return self.tran_profiles[TRAN_PROFILE_COARSE] != self.tran_profiles[TRAN_PROFILE_FINE]
+
+
+    def add_rank_correlation(self, rank_correlation):
+        """
+        Record the rank correlation between the results of the coarse and fine profiles for a sweep.
+        """
+
+        self.rank_correlations.append(rank_correlation)
 
-        # Write the .DATA HPSICE file. This first part writes out the header.
-        hspice_data_file = open(HSPICE_DATA_SWEEP_PATH, 'w')
-        hspice_data_file.write(".DATA sweep_data")
-        item_counter = 0
-        for param_name in param_list:
-            if item_counter >= max_items_per_line:
-                hspice_data_file.write("\n" + param_name)
-                item_counter = 0
-            else:
-                hspice_data_file.write(" " + param_name)
-            item_counter += 1
-        hspice_data_file.write("\n")
-    
-        # Add data for each elements in the lists.
-        num_settings = len(parameter_dict[param_list[0]])
-        for i in range(num_settings):
-            item_counter = 0
-            for param_name in param_list:
-                if item_counter >= max_items_per_line:
-                    hspice_data_file.write(str(parameter_dict[param_name][i]) + "\n")
-                    item_counter = 0
-                else:
-                    hspice_data_file.write(str(parameter_dict[param_name][i]) + " ")
-                item_counter += 1
-            hspice_data_file.write ("\n")
-    
-        # Add the footer
-        hspice_data_file.write(".ENDDATA")
-    
-        hspice_data_file.close()
-    
-        return
-    
 
-    def run(self, sp_path, parameter_dict):    
+    def get_rank_correlations(self):
+        """
+        Returns the rank correlations recorded with add_rank_correlation.
+        """
+
+        return self.rank_correlations
+
+
+    def run(self, sp_path, parameter_dict, as_array=False, tran_profile=TRAN_PROFILE_FINE):    
         """
         This function runs HSPICE on the .sp file at 'sp_path' and returns a dictionary that 
         contains the HSPICE measurements.
@@ -137,73 +287,220 @@ class SpiceInterface(object):
         measurements = {meas_name1: [value1, value2, value3, etc...], 
                         meas_name2: [value1, value2, value3, etc...],
                         etc...}
+
+        The values are the strings found in the .mt0 file ("failed" if HSPICE could not 
+        evaluate a measurement). If 'as_array' is True, a MeasurementTable is returned instead, 
+        with all the values converted to floats at once.
+
+        'tran_profile' is the resolution of the transient analysis (TRAN_PROFILE_FINE or 
+        TRAN_PROFILE_COARSE). The coarse profile is meant for sweeps that only rank sizing combos.
         """
 
-        sp_dir = os.path.dirname(sp_path)
-        sp_filename = os.path.basename(sp_path)
-  
-        # Setup the .DATA sweep file with parameters in 'parameter_dict' 
-        self._setup_data_sweep_file(parameter_dict)
- 
-        # Change working dir so that SPICE output files are created in circuit subdirectory
-        saved_cwd = os.getcwd()
-        os.chdir(sp_dir)
-         
-        # Creat an output file having the ending .lis
-        # Run the SPICE simulation and capture output
-        output_filename = sp_filename.rstrip(".sp") + ".lis"
-        output_file = open(output_filename, "w")
+        parameter_dict = self._add_tran_params(parameter_dict, tran_profile)
+        simulated_parameter_dict, cache_lookup = self._lookup_cache(sp_path, parameter_dict)
+        spice_measurements = None
+        if simulated_parameter_dict is not None:
+            start_time = time.time()
+            spice_measurements = self._simulate(sp_path, simulated_parameter_dict)
+            self.simulation_time += time.time() - start_time
+            self.simulation_counter += len(next(iter(simulated_parameter_dict.values())))
 
-        hspice_success = False
-        hspice_runs = 0
+        return self._merge_measurements(spice_measurements, cache_lookup, as_array)
 
-        # HSPICE simulations might fail for some reasons:
-        # 1- The input file is incorrect, which would be a bug within COFFE.
-        # 2- HSPICE fails to checheck out the license, assuming the license exists, it is likely due
-        #    to many instances checking out the license at the same time or license going down temporarly. 
-        #    In this case, we check if the ".mt0" exists, if not, we run hspice again. 
-        while (not hspice_success) :
-            # last I checked the license is available during the night, so we can try to run hspice uncomment below if this is untrue
-            #utils.check_for_time()
-            subprocess.call(["hspice", sp_filename], stdout=output_file, stderr=output_file)
 
-            # how come this file is closed here, it should be closed only if there is a success
-            # since else the call process will write in a closed file
-            ##output_file.close()
-             
-            # HSPICE should print the measurements in a file having the same
-            # name as the output file with .mt0 ending
-            mt0_path = output_filename.replace(".lis", ".mt0")
+    async def run_async(self, sp_path, parameter_dict, as_array=False, tran_profile=TRAN_PROFILE_FINE):
+        """
+        Coroutine version of run(). Independent decks can be simulated at the same time by 
+        gathering several of these. At most 'num_workers' simulations run at once (the number 
+        of HSPICE licenses or cores we can use), each one in its own scratch copy of the 
+        netlists since all the decks share the same sweep file.
+        """
+
+        parameter_dict = self._add_tran_params(parameter_dict, tran_profile)
+        simulated_parameter_dict, cache_lookup = self._lookup_cache(sp_path, parameter_dict)
+        spice_measurements = None
+        if simulated_parameter_dict is not None:
+            start_time = time.time()
+            spice_measurements = await self._simulate_async(sp_path, simulated_parameter_dict)
+            self.simulation_time += time.time() - start_time
+            self.simulation_counter += len(next(iter(simulated_parameter_dict.values())))
+
+        return self._merge_measurements(spice_measurements, cache_lookup, as_array)
 
-            # check that the ".mt0" file is there
-            if os.path.isfile(mt0_path) :
-                # store the measurments in a dictionary
-                spice_measurements = self.parse_mt0(mt0_path)
-                # delete results file to avoid confusion in future runs
-                os.remove(mt0_path)
-                hspice_success = True
-                output_file.close()
-            # HSPICE failed to run
-            else :
-                hspice_runs = hspice_runs + 1
-                if hspice_runs > 10 :
-                    print("----------------------------------------------------------")
-                    print("                  HSPICE failed to run                    ")
-                    print("----------------------------------------------------------")
-                    print("")
-                    exit(2)
-  
-        # Update simulation counter with the number of simulations done by 
-        # adding the length of the list of parameter values inside the dictionary
-        self.simulation_counter += len(next(iter(parameter_dict.values())))
 
-        # Return to saved cwd
-        os.chdir(saved_cwd)
-           
+    def run_all(self, sp_paths, parameter_dict, as_array=False, tran_profile=TRAN_PROFILE_FINE):
+        """
+        Run the independent decks at 'sp_paths' with the same 'parameter_dict' and return their 
+        measurements (as run() does) in the same order. With more than one worker, the decks 
+        are simulated at the same time with run_async.
+        """
+
+        if self.num_workers == 1 or len(sp_paths) < 2:
+            return [self.run(sp_path, parameter_dict, as_array, tran_profile) for sp_path in sp_paths]
+
+        async def run_decks():
+            return await asyncio.gather(*[self.run_async(sp_path, parameter_dict, as_array, tran_profile) for sp_path in sp_paths])
+
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(run_decks())
+        finally:
+            loop.close()
+
+
+    def _add_tran_params(self, parameter_dict, tran_profile):
+        """ Returns a copy of 'parameter_dict' with the transient parameters of 'tran_profile' in every setting. """
+
+        num_settings = len(next(iter(parameter_dict.values())))
+        tran_parameter_dict = dict(parameter_dict)
+        for param_name, param_value in self.tran_profiles[tran_profile].items():
+            tran_parameter_dict[param_name] = [param_value] * num_settings
+
+        return tran_parameter_dict
+
+
+    def _lookup_cache(self, sp_path, parameter_dict):
+        """
+        Look up every sweep setting of 'parameter_dict' in the cache. Returns the parameters of 
+        the settings that must be simulated (None if they were all cached) and the result of 
+        the lookup, which _merge_measurements needs to put the measurements back together.
+        """
+
+        if self.cache is None:
+            return parameter_dict, None
+
+        # Only the settings that were never simulated before are sent to HSPICE.
+        num_settings = len(next(iter(parameter_dict.values())))
+        row_keys = self.cache.get_row_keys(sp_path, parameter_dict, self.backend.name)
+        rows = self.cache.lookup(row_keys)
+        missed_rows = [i for i in range(num_settings) if rows[i] is None]
+        self.cache_hits += num_settings - len(missed_rows)
+        self.cache_misses += len(missed_rows)
+
+        if len(missed_rows) == 0:
+            return None, (row_keys, rows, missed_rows)
+
+        missed_parameter_dict = {}
+        for param_name, param_values in parameter_dict.items():
+            missed_parameter_dict[param_name] = [param_values[i] for i in missed_rows]
+
+        return missed_parameter_dict, (row_keys, rows, missed_rows)
+
+
+    def _merge_measurements(self, spice_measurements, cache_lookup, as_array):
+        """ Merge the simulated measurements with the cached ones and store them in the cache. """
+
+        if cache_lookup is None:
+            return _format_measurements(_combine_multi_fanin_measurements(spice_measurements), as_array)
+
+        row_keys, rows, missed_rows = cache_lookup
+        if len(missed_rows) > 0:
+            simulated_rows = _measurements_to_rows(spice_measurements)
+            for i, row in zip(missed_rows, simulated_rows):
+                rows[i] = row
+            self.cache.store([row_keys[i] for i in missed_rows], simulated_rows)
+
+        # The fanin measurements are only combined after the cached and simulated 
+        # settings are merged so that we get the same result as a single sweep.
+        return _format_measurements(_combine_multi_fanin_measurements(_rows_to_measurements(rows)), as_array)
+
+
+    def _simulate(self, sp_path, parameter_dict):
+        """
+        Run the simulator on the .sp file at 'sp_path' for all the settings in 'parameter_dict'
+        and return the raw measurements. Large sweeps are split into shards that are simulated
+        in parallel.
+        """
+
+        num_settings = len(next(iter(parameter_dict.values())))
+        num_shards = min(self.num_workers, num_settings // MIN_ROWS_PER_SHARD)
+        if self.scratch_name is not None:
+            sp_path = _create_scratch_copy(sp_path, self.scratch_name)
+
+        try:
+            if num_shards > 1:
+                return self._run_sharded(sp_path, parameter_dict, num_shards)
+            return self.backend.run(sp_path, parameter_dict)
+        except SimulationError:
+            self._simulation_failed()
+
+
+    async def _simulate_async(self, sp_path, parameter_dict):
+        """ Coroutine version of _simulate(), runs the deck in a free scratch slot. """
+
+        # The semaphore and the free slots belong to the event loop that is running
+        loop = asyncio.get_event_loop()
+        if self.async_loop is not loop:
+            self.async_loop = loop
+            self.async_semaphore = asyncio.Semaphore(self.num_workers)
+            self.free_async_slots = list(range(self.num_workers))
+
+        async with self.async_semaphore:
+            slot = self.free_async_slots.pop()
+            slot_sp_path = _create_scratch_copy(sp_path, "slot_" + str(slot))
+            try:
+                return await self.backend.run_async(slot_sp_path, parameter_dict)
+            except SimulationError:
+                self._simulation_failed()
+            finally:
+                # Keep the simulator output next to the original deck, like a normal run does
+                self.backend.copy_listings([slot_sp_path], sp_path)
+                self.free_async_slots.append(slot)
+
+
+    def _simulation_failed(self):
+        """ Print the simulation failure message and quit. """
+
+        print("----------------------------------------------------------")
+        print("                  " + self.backend.name.upper() + " failed to run                    ")
+        print("----------------------------------------------------------")
+        print("")
+        exit(2)
+
+
+    def _run_sharded(self, sp_path, parameter_dict, num_shards):
+        """
+        Split the .DATA sweep in 'parameter_dict' into 'num_shards' contiguous shards and
+        run them in parallel, each one in its own scratch copy of the SPICE netlists.
+        The raw measurements of all shards are merged back in the original sweep order, so
+        the return value is the same as if the whole sweep was simulated at once.
+        """
+
+        num_settings = len(next(iter(parameter_dict.values())))
+        print("Splitting " + str(num_settings) + " sweep settings into " + str(num_shards) + " parallel " + self.backend.name + " runs")
+
+        shard_jobs = []
+        shard_start = 0
+        for shard in range(num_shards):
+            # Contiguous shards of (almost) equal size keep the original combo order.
+            shard_end = (shard + 1) * num_settings // num_shards
+            shard_parameter_dict = {}
+            for param_name, param_values in parameter_dict.items():
+                shard_parameter_dict[param_name] = param_values[shard_start:shard_end]
+            shard_start = shard_end
+
+            shard_sp_path = _create_scratch_copy(sp_path, "shard_" + str(shard))
+            shard_jobs.append((self.backend, shard_sp_path, shard_parameter_dict))
+
+        pool = mp.Pool(num_shards)
+        try:
+            shard_measurements = pool.map(_run_shard, shard_jobs)
+        finally:
+            pool.close()
+            pool.join()
+            # The listings of the shards go next to the original deck, in the order of the shards
+            self.backend.copy_listings([shard_job[1] for shard_job in shard_jobs], sp_path)
+
+        # Merge the per-shard measurements back in the original order
+        spice_measurements = {}
+        for measurements in shard_measurements:
+            for meas_name, meas_values in measurements.items():
+                spice_measurements.setdefault(meas_name, []).extend(meas_values)
+
         return spice_measurements
 
 
-    def parse_mt0(self, filepath):
+    def parse_mt0(self, filepath, as_array=False):
         """
         Parse a HSPICE .mt0 file to collect measurements. 
         This function works on .mt0 files generated from single HSPICE runs,
@@ -217,115 +514,1162 @@ class SpiceInterface(object):
         measurements = {meas_name1: [value1, value2, value3, etc...], 
                         meas_name2: [value1, value2, value3, etc...],
                         etc...}
+
+        If 'as_array' is True, the measurements are returned as a MeasurementTable.
         """
-    
-        # The measurements data structure is what we will be building.
-        # It's a dictionary that maps measurement names to a list of values. 
-        # If this was a simple HSPICE run, the list will only have one element. 
-        # But, if this was a HSPICE sweep, the list will have multiple elements,
-        # one for each sweep setting.
-        # measurements = {meas_name1: [value1, value2, value3, etc...], 
-        #                 meas_name2: [value1, value2, value3, etc...],
-        #                 etc...}
-        measurements = {}
-        meas_names = []
 
-        #parse should be changed for ram block
-        meaz1_names = []
-        meaz2_names = []
-        meaz1counter = 0
-        meaz2counter = 0
-
-        #I'll need an aittional 4 to test carry chains:
-        meaz3_names = []
-        meaz4_names = []
-        meaz5_names = []
-        meaz6_names = []
-        meaz3counter = 0
-        meaz4counter = 0
-        meaz5counter = 0
-        meaz6counter = 0
-    
-        # Open the file for reading
-        mt0_file = open(filepath, 'r')
-    
-        # The first thing we expect to find is the measurement names.
-        # We use the 'parsing_names' flag to show that we are parsing the names.
-        # Once we find 'alter#' we are done parsing the measurement names. 
-        # Then, we start parsing the values themselves.
-        parsing_names = True
-        for line in mt0_file:
-            # Ignore these lines
-            if line.startswith("$"):
-                continue
-            if line.startswith("."):
-                continue
-    
-            if parsing_names:
-                words = line.split()
-                for meas_name in words:
-                    meas_names.append(meas_name)
-                    measurements[meas_name] = []
-                    if "meaz1" in meas_name:
-                        meaz1counter += 1
-                        meaz1_names.append(meas_name)
-                    if "meaz2" in meas_name:
-                        meaz2counter += 1
-                        meaz2_names.append(meas_name)
-                    if "meaz3" in meas_name:
-                        meaz3counter += 1
-                        meaz3_names.append(meas_name)
-                    if "meaz4" in meas_name:
-                        meaz4counter += 1
-                        meaz4_names.append(meas_name)
-                    if "meaz5" in meas_name:
-                        meaz5counter += 1
-                        meaz5_names.append(meas_name)
-                    if "meaz6" in meas_name:
-                        meaz6counter += 1
-                        meaz6_names.append(meas_name)
-                    # When we find 'alter#' we are done parsing measurement names.
-                    if meas_name.startswith("alter#"):
-                        num_measurements = len(meas_names)
-                        current_meas = 0
-                        parsing_names = False
-            else:
-                line = line.replace("\n", "")
-                words = line.split()
-                for meas in words:
-                    # Append each measurement value to the right list.
-                    # We use current_meas and meas_names to keep track of where we 
-                    # need to add the measurement value.
-                    measurements[meas_names[current_meas]].append(meas)
-                    current_meas += 1
-                    if current_meas == num_measurements:
-                        current_meas = 0
+        return _format_measurements(_combine_multi_fanin_measurements(_read_mt0(filepath)), as_array)
 
 
-        
-        mt0_file.close()
-
-        # This part is added to support having tow different fanins (e.g. ram rowdecoder)
-        # If this happens to any other circuit, you should name the delays with mez1 and meaz2
-        # the rest is simply the same.
-        if meaz3counter != 0:
-            for x in range(0,len(meaz1_names)):
-                newname = meaz3_names[x].replace("meaz3_", "meas_")
-                measurements[newname] = max(measurements[meaz1_names[x]],measurements[meaz2_names[x]],measurements[meaz3_names[x]])
-            return measurements             
-        if len(meaz1_names) !=0 and len(meaz2_names) != 0:
-            if len(meaz1_names) != len(meaz2_names):
-                    sys.exit(-1)
-            for x in range(0,len(meaz1_names)):
-                newname = meaz1_names[x].replace("meaz1_", "meas_")
-                measurements[newname] = max(measurements[meaz1_names[x]],measurements[meaz2_names[x]])
-        elif len(meaz1_names) !=0:
-            for x in range(0,len(meaz1_names)):
-                newname = meaz1_names[x].replace("meaz1_", "meas_")
-                measurements[newname] = measurements[meaz1_names[x]]
-        elif len(meaz2_names) !=0:
-            for x in range(0,len(meaz2_names)):
-                newname = meaz2_names[x].replace("meaz2_", "meas_")
-                measurements[newname] = measurements[meaz2_names[x]]
-
-        return measurements         
+
+class MeasurementTable(object):
+    """
+    The SPICE measurements of a sweep as a float64 matrix, 'values', with one row per sweep 
+    setting and one column per measurement. Failed measurements, and any other value that
+    isn't a finite number, are NaN in 'values' and True in the boolean matrix 'failed'. Columns can
+    be accessed by measurement name: table["meas_total_tfall"] is the array of that measurement
+    for all sweep settings and table.is_failed("meas_total_tfall") tells for which settings it 
+    failed.
+    """
+
+    def __init__(self, names, values, failed):
+
+        self.names = names
+        self.values = values
+        self.failed = failed
+        self.column_index = dict((name, i) for i, name in enumerate(names))
+
+        return
+
+
+    def __getitem__(self, meas_name):
+        return self.values[:, self.column_index[meas_name]]
+
+
+    def __contains__(self, meas_name):
+        return meas_name in self.column_index
+
+
+    def __len__(self):
+        return self.values.shape[0]
+
+
+    def is_failed(self, meas_name):
+        """ Returns the boolean array that is True for the settings where 'meas_name' failed. """
+
+        return self.failed[:, self.column_index[meas_name]]
+
+
+    def get_rows(self, rows):
+        """ Returns a MeasurementTable of the sweep settings selected by 'rows' (a slice or a list of indices). """
+
+        return MeasurementTable(self.names, self.values[rows], self.failed[rows])
+
+
+    def column(self, meas_name, failed_value):
+        """ Returns a copy of the 'meas_name' column where failed measurements are set to 'failed_value'. """
+
+        values = self[meas_name].copy()
+        values[self.is_failed(meas_name)] = failed_value
+
+        return values
+
+
+
+class SimulationCache(object):
+    """
+    Disk-backed cache of SPICE measurements. 
+    Every sweep setting is stored separately, keyed by a hash of the top-level .sp file, 
+    all the library files it pulls in with .LIB and .INCLUDE statements (except for the 
+    .DATA sweep file itself), and the parameter values of that sweep setting. 
+    The cache is kept in an SQLite database so it persists across COFFE runs. When the
+    database holds more than 'max_entries' settings, the least recently used are evicted.
+    Several processes can use the same database at the same time.
+    """
+
+    def __init__(self, db_path, max_entries=DEFAULT_CACHE_MAX_ENTRIES):
+
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.connection = self._connect()
+        self.connection.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, measurements TEXT NOT NULL, last_used INTEGER NOT NULL)")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used)")
+        self.connection.commit()
+
+        # Number of stores since the last eviction check, see CACHE_EVICTION_INTERVAL
+        self.num_stores = 0
+
+        # Digests and included libraries of the files we've already hashed.
+        self.library_files = _LibraryFiles()
+
+        return
+
+
+    def __getstate__(self):
+        """ A copy of the cache (e.g. in a worker process) opens its own database connection. """
+
+        state = self.__dict__.copy()
+        del state["connection"]
+
+        return state
+
+
+    def __setstate__(self, state):
+
+        self.__dict__.update(state)
+        self.connection = self._connect()
+
+
+    def _connect(self):
+        """
+        Open a connection to the database. In WAL mode, readers don't block the writer, and the
+        lock of the writer is waited for, so processes sharing the database don't fail on it.
+        """
+
+        connection = sqlite3.connect(self.db_path, timeout=CACHE_LOCK_TIMEOUT)
+        connection.execute("PRAGMA journal_mode=WAL")
+
+        return connection
+
+
+    def get_row_keys(self, sp_path, parameter_dict, simulator_name):
+        """ 
+        Returns the cache key of every sweep setting in 'parameter_dict' for the deck at 'sp_path'.
+        Results of different simulators are kept apart by 'simulator_name'.
+        """
+
+        deck_digest = simulator_name + ":" + self._get_deck_digest(sp_path)
+        param_names = sorted(parameter_dict.keys())
+        num_settings = len(parameter_dict[param_names[0]])
+
+        row_keys = []
+        for i in range(num_settings):
+            row = ";".join(param_name + "=" + str(parameter_dict[param_name][i]) for param_name in param_names)
+            row_keys.append(hashlib.sha256((deck_digest + ";" + row).encode()).hexdigest())
+
+        return row_keys
+
+
+    def lookup(self, row_keys):
+        """ 
+        Returns a list with the cached measurements of every key in 'row_keys'. 
+        The list has None for each key that is not in the cache.
+        """
+
+        cached_rows = {}
+        for chunk_start in range(0, len(row_keys), CACHE_QUERY_CHUNK_SIZE):
+            chunk = row_keys[chunk_start:chunk_start + CACHE_QUERY_CHUNK_SIZE]
+            query = "SELECT key, measurements FROM results WHERE key IN (" + ",".join("?"*len(chunk)) + ")"
+            for key, measurements in self.connection.execute(query, chunk):
+                cached_rows[key] = json.loads(measurements)
+
+        # Mark the hits as recently used. 'last_used' is a counter rather than a time stamp so that
+        # eviction order is exact. It is read from the database, other processes may have used it too.
+        if len(cached_rows) > 0:
+            hit_keys = list(cached_rows.keys())
+            for chunk_start in range(0, len(hit_keys), CACHE_QUERY_CHUNK_SIZE):
+                chunk = hit_keys[chunk_start:chunk_start + CACHE_QUERY_CHUNK_SIZE]
+                self.connection.execute("UPDATE results SET last_used = (SELECT MAX(last_used) + 1 FROM results) WHERE key IN (" +
+                                        ",".join("?"*len(chunk)) + ")", chunk)
+            self.connection.commit()
+
+        return [cached_rows.get(key) for key in row_keys]
+
+
+    def store(self, row_keys, rows):
+        """ Store the measurements in 'rows' under the keys in 'row_keys' and evict old entries. """
+
+        self.connection.executemany("INSERT OR REPLACE INTO results (key, measurements, last_used) " +
+                                    "VALUES (?, ?, (SELECT COALESCE(MAX(last_used), 0) + 1 FROM results))",
+                                    [(key, json.dumps(row)) for key, row in zip(row_keys, rows)])
+
+        self.num_stores += 1
+        if self.num_stores >= CACHE_EVICTION_INTERVAL:
+            self.num_stores = 0
+            self.evict()
+        self.connection.commit()
+
+        return
+
+
+    def evict(self):
+        """ Evict the least recently used entries if the cache holds more than 'max_entries'. """
+
+        num_entries = self.connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        if num_entries > self.max_entries:
+            self.connection.execute("DELETE FROM results WHERE key IN (SELECT key FROM results ORDER BY last_used LIMIT ?)", 
+                                    (num_entries - self.max_entries,))
+        self.connection.commit()
+
+        return
+
+
+    def _get_deck_digest(self, sp_path):
+        """ 
+        Hash the deck at 'sp_path' together with every library file it includes (recursively).
+        The .DATA sweep file is left out since its content is what the row keys are made of.
+        """
+
+        deck_hash = hashlib.sha256()
+        for file_path, digest in self.library_files.get_deck_digests(sp_path):
+            deck_hash.update((file_path + ":" + digest + "\n").encode())
+
+        return deck_hash.hexdigest()
+
+
+
+class _LibraryFiles(object):
+    """ Digests of top-level decks and of the library files they include, rehashed when a file changes. """
+
+    def __init__(self):
+
+        # file_info = {path: (size, mtime, hash_time, digest, library_paths)}
+        self.file_info = {}
+
+        return
+
+
+    def get_deck_digests(self, sp_path):
+        """ 
+        Returns (path, digest) of the deck at 'sp_path' and of every library file it includes 
+        (recursively). The .DATA sweep file is left out.
+        """
+
+        deck_digests = []
+        visited = set()
+        files_to_hash = [os.path.abspath(sp_path)]
+        while len(files_to_hash) > 0:
+            file_path = files_to_hash.pop()
+            if file_path in visited:
+                continue
+            visited.add(file_path)
+            digest, library_paths = self.get_file_info(file_path)
+            deck_digests.append((file_path, digest))
+            files_to_hash.extend(library_paths)
+
+        return deck_digests
+
+
+    def get_file_info(self, file_path):
+        """ Returns the hash of the content of 'file_path' and the paths of the library files it includes. """
+
+        # Hashing the model libraries for every run is slow, so the result is reused while the 
+        # size and modification time of the file don't change. Files modified shortly before 
+        # they were hashed are always hashed again, in case the file system time stamps are too
+        # coarse to see a rewrite.
+        file_stat = os.stat(file_path)
+        if file_path in self.file_info:
+            size, mtime, hash_time, digest, library_paths = self.file_info[file_path]
+            if size == file_stat.st_size and mtime == file_stat.st_mtime and mtime < hash_time - FILE_TIMESTAMP_RESOLUTION:
+                return digest, library_paths
+
+        hash_time = time.time()
+        file_hash = hashlib.sha256()
+        library_paths = []
+        # Relative library paths are relative to the folder of the file that includes them
+        file_dir = os.path.dirname(file_path)
+        with open(file_path, 'rb') as library_file:
+            for line in library_file:
+                file_hash.update(line)
+                match = LIBRARY_STATEMENT_RE.match(line.decode(errors='replace'))
+                if match is None:
+                    continue
+                library_path = os.path.normpath(os.path.join(file_dir, match.group(1)))
+                if os.path.basename(library_path) != HSPICE_DATA_SWEEP_PATH and os.path.isfile(library_path):
+                    library_paths.append(library_path)
+        digest = file_hash.hexdigest()
+        self.file_info[file_path] = (file_stat.st_size, file_stat.st_mtime, hash_time, digest, library_paths)
+
+        return digest, library_paths
+
+
+
+class DeckParameterIndex(object):
+    """
+    Index of the sweep parameters that every top-level deck depends on. A deck depends on the 
+    parameters named in its own statements and, transitively, in the subcircuits (.SUBCKT) and
+    .PARAM expressions of its libraries that it uses. The results of a deck are kept by run_all
+    and reused as long as these parameters and the content of the deck and its libraries don't
+    change, instead of simulating the deck again.
+    """
+
+    def __init__(self, sp_paths, param_names):
+
+        self.library_files = _LibraryFiles()
+
+        # Parameters every deck depends on, {sp_path: [param_name, ...]}
+        self.deck_params = {}
+        # Last results of every deck, {sp_path: (key, measurements)}
+        self.deck_results = {}
+
+        # Number of decks that were simulated and whose results were reused
+        self.num_simulated = 0
+        self.num_reused = 0
+
+        # Names are compared in lower case, like SPICE does
+        param_names_lower = {}
+        for param_name in param_names:
+            param_names_lower[param_name.lower()] = param_name
+
+        # Statements and definitions of every file we've parsed, {path: (top-level names, definitions)}
+        parsed_files = {}
+        for sp_path in sp_paths:
+            names = set()
+            definitions = {}
+            for file_path, digest in self.library_files.get_deck_digests(sp_path):
+                if file_path not in parsed_files:
+                    parsed_files[file_path] = _parse_netlist_names(file_path)
+                file_names, file_definitions = parsed_files[file_path]
+                # Only the statements of the deck itself are simulated, libraries only define things
+                if file_path == os.path.abspath(sp_path):
+                    names.update(file_names)
+                for name, definition_names in file_definitions.items():
+                    definitions.setdefault(name, set()).update(definition_names)
+
+            # Follow the subcircuits and parameters the deck uses down to the sweep parameters
+            names_to_visit = list(names)
+            while len(names_to_visit) > 0:
+                for name in definitions.get(names_to_visit.pop(), ()):
+                    if name not in names:
+                        names.add(name)
+                        names_to_visit.append(name)
+
+            self.deck_params[sp_path] = sorted(param_names_lower[name] for name in names if name in param_names_lower)
+
+        return
+
+
+    def run_all(self, spice_interface, sp_paths, parameter_dict, as_array=False, tran_profile=TRAN_PROFILE_FINE):
+        """
+        Same as SpiceInterface.run_all, but the decks whose parameters and libraries didn't 
+        change since they were last run are not simulated again. Decks that aren't in the 
+        index are always simulated.
+        """
+
+        keys = [self._get_key(sp_path, parameter_dict, as_array, tran_profile) for sp_path in sp_paths]
+        simulated_sp_paths = []
+        for sp_path, key in zip(sp_paths, keys):
+            if key is None or sp_path not in self.deck_results or self.deck_results[sp_path][0] != key:
+                simulated_sp_paths.append(sp_path)
+        simulated_measurements = dict(zip(simulated_sp_paths, spice_interface.run_all(simulated_sp_paths, parameter_dict, as_array, tran_profile)))
+
+        measurements = []
+        for sp_path, key in zip(sp_paths, keys):
+            if sp_path in simulated_measurements:
+                self.num_simulated += 1
+                if key is not None:
+                    self.deck_results[sp_path] = (key, simulated_measurements[sp_path])
+                measurements.append(simulated_measurements[sp_path])
+            else:
+                self.num_reused += 1
+                measurements.append(self.deck_results[sp_path][1])
+
+        return measurements
+
+
+    def _get_key(self, sp_path, parameter_dict, as_array, tran_profile):
+        """ Returns what the results of the deck depend on, None if the deck isn't in the index. """
+
+        if sp_path not in self.deck_params:
+            return None
+
+        param_values = tuple((param_name, tuple(parameter_dict[param_name])) for param_name in self.deck_params[sp_path] if param_name in parameter_dict)
+
+        return (as_array, tran_profile, param_values, tuple(self.library_files.get_deck_digests(sp_path)))
+
+
+
+class NetlistFiles(object):
+    """
+    The files that the NetlistBuilders wrote, and left untouched because they were unchanged,
+    between start() and stop(). FPGA.generate() keeps one for each run.
+    """
+
+    # The collection that the NetlistBuilders currently add their files to
+    active = None
+
+    def __init__(self):
+
+        self.written_paths = []
+        self.unchanged_paths = []
+
+        return
+
+
+    def start(self):
+        """ Make the NetlistBuilders add the files they write from now on to this collection. """
+
+        NetlistFiles.active = self
+
+
+    def stop(self):
+        """ Stop adding files to this collection. """
+
+        if NetlistFiles.active is self:
+            NetlistFiles.active = None
+
+
+    def remove_stale_decks(self, arch_folder):
+        """
+        Delete the top-level decks (.sp) in the subfolders of 'arch_folder' that are not part of this
+        collection. They are left over from a previous run (see utils.create_output_dir).
+        Returns the number of decks deleted.
+        """
+
+        paths = set(self.written_paths + self.unchanged_paths)
+        num_removed = 0
+        for content in os.listdir(arch_folder):
+            content_path = os.path.join(arch_folder, content)
+            if not os.path.isdir(content_path):
+                continue
+            for sub_content in os.listdir(content_path):
+                sub_content_path = os.path.abspath(os.path.join(content_path, sub_content))
+                if sub_content.endswith(".sp") and sub_content_path not in paths and os.path.isfile(sub_content_path):
+                    os.remove(sub_content_path)
+                    num_removed += 1
+
+        return num_removed
+
+
+
+class NetlistBuilder(object):
+    """ 
+    Collects the contents of a SPICE file (a library like subcircuits.l or a top-level deck) in memory. 
+    The netlist generators write to it like to a file, and write_file() writes the whole file at once, 
+    or leaves the file on disk untouched if its contents didn't change.
+    """
+
+    def __init__(self, file_path):
+
+        self.file_path = os.path.abspath(file_path)
+        self.parts = []
+
+        return
+
+
+    def write(self, text):
+        """ Append 'text' to the file. """
+
+        self.parts.append(text)
+
+
+    def getvalue(self):
+        """ Returns the contents of the file. """
+
+        return "".join(self.parts)
+
+
+    def write_file(self):
+        """ 
+        Write the file to disk. It is written to a temporary file first and then renamed, so the simulator 
+        never reads a partially written file. A file whose contents on disk are the same is not rewritten, 
+        which keeps its timestamp. Returns True if the file was written.
+        """
+
+        contents = self.getvalue().encode()
+        if self._is_unchanged(contents):
+            if NetlistFiles.active is not None:
+                NetlistFiles.active.unchanged_paths.append(self.file_path)
+            return False
+
+        tmp_path = self.file_path + ".tmp"
+        netlist_file = open(tmp_path, 'wb')
+        netlist_file.write(contents)
+        netlist_file.close()
+        os.replace(tmp_path, self.file_path)
+        if NetlistFiles.active is not None:
+            NetlistFiles.active.written_paths.append(self.file_path)
+
+        return True
+
+
+    def _is_unchanged(self, contents):
+        """ Returns True if the file on disk has the same hash as 'contents'. """
+
+        try:
+            if os.path.getsize(self.file_path) != len(contents):
+                return False
+            with open(self.file_path, 'rb') as netlist_file:
+                return hashlib.sha256(netlist_file.read()).digest() == hashlib.sha256(contents).digest()
+        except OSError:
+            return False
+
+
+
+class SimulationError(Exception):
+    """ Raised by a simulator backend when the simulator could not be run. """
+    pass
+
+
+
+class SimulatorBackend(object):
+    """
+    Base class of the simulators that SpiceInterface can run the decks with.
+    A backend's run(sp_path, parameter_dict) takes the same arguments as SpiceInterface.run
+    and returns the raw measurements of every sweep setting (see _read_mt0). Top-level decks 
+    live in a folder of their own and include "../includes.l", so the library files and the
+    sweep file are in the parent folder of the deck's folder.
+    """
+
+    # Name of the simulator, used in messages and to keep cached results apart
+    name = ""
+
+    def __init__(self, write_data_file=False, listing=LISTING_KEEP):
+
+        # Also write the parameters of every sweep to an easy to read file (for debug)
+        self.write_data_file = write_data_file
+
+        # What is kept of the simulator output, see LISTING_MODES
+        self.listing = listing
+
+        return
+
+
+    def run(self, sp_path, parameter_dict):
+        raise NotImplementedError
+
+
+    async def run_async(self, sp_path, parameter_dict):
+        """ Coroutine version of run(), the simulator runs as an asyncio subprocess. """
+        raise NotImplementedError
+
+
+    def get_listing_path(self, sp_path):
+        """ Returns the path the listing of the deck at 'sp_path' is written to. """
+
+        if self.listing == LISTING_GZIP:
+            return _get_output_path(sp_path) + ".gz"
+        return _get_output_path(sp_path)
+
+
+    def copy_listings(self, src_sp_paths, sp_path):
+        """ 
+        Write the listings of the decks at 'src_sp_paths' (scratch copies of the deck at 'sp_path'), 
+        one after the other, to the listing of the deck at 'sp_path'. Concatenated gzip files are
+        a valid gzip file too. Decks without a listing (see LISTING_ON_FAILURE) are left out.
+        """
+
+        src_listing_paths = [self.get_listing_path(src_sp_path) for src_sp_path in src_sp_paths]
+        src_listing_paths = [src_listing_path for src_listing_path in src_listing_paths if os.path.isfile(src_listing_path)]
+
+        listing_path = None
+        if len(src_listing_paths) > 0:
+            listing_path = self.get_listing_path(sp_path)
+            listing_file = open(listing_path, 'wb')
+            for src_listing_path in src_listing_paths:
+                src_listing_file = open(src_listing_path, 'rb')
+                shutil.copyfileobj(src_listing_file, listing_file)
+                src_listing_file.close()
+            listing_file.close()
+        self._remove_stale_listings(sp_path, listing_path)
+
+
+    def _open_listing(self, sp_path):
+        """ 
+        Open the file the simulator output of the deck at 'sp_path' is streamed to. That's the 
+        listing itself if it is kept as is, otherwise a temporary file that _close_listing 
+        compresses or drops.
+        """
+
+        output_path = _get_output_path(sp_path)
+        if self.listing == LISTING_KEEP:
+            return open(output_path, 'wb')
+        return open(output_path + ".tmp", 'wb')
+
+
+    def _close_listing(self, sp_path, listing_file, failed):
+        """ 
+        Close the listing opened by _open_listing. It is compressed in the gzip mode, and it is 
+        dropped if it is only kept for failed runs and this run did not fail. The listing left 
+        by an earlier run in another form is removed so it can't be mistaken for this one.
+        """
+
+        listing_file.close()
+        output_path = _get_output_path(sp_path)
+        listing_path = output_path
+        if self.listing == LISTING_GZIP:
+            listing_path = output_path + ".gz"
+            tmp_listing_file = open(listing_file.name, 'rb')
+            gzip_listing_file = gzip.open(listing_path, 'wb')
+            shutil.copyfileobj(tmp_listing_file, gzip_listing_file)
+            gzip_listing_file.close()
+            tmp_listing_file.close()
+            os.remove(listing_file.name)
+        elif self.listing == LISTING_ON_FAILURE:
+            if failed:
+                os.replace(listing_file.name, output_path)
+            else:
+                listing_path = None
+                os.remove(listing_file.name)
+
+        self._remove_stale_listings(sp_path, listing_path)
+
+
+    def _remove_stale_listings(self, sp_path, listing_path):
+        """ Remove the listings of the deck at 'sp_path' other than the one at 'listing_path' (None removes all of them). """
+
+        output_path = _get_output_path(sp_path)
+        for stale_path in [output_path, output_path + ".gz"]:
+            if stale_path != listing_path and os.path.isfile(stale_path):
+                os.remove(stale_path)
+
+
+    def _write_data_file(self, parameter_dict, data_path):
+        """ Write out the parameters to an easy to read file, this just helps for debug. """
+
+        data_file = open(data_path, 'w')
+        data_file.write("param".ljust(40) + "value".ljust(20) + "\n")
+        dashes = "-"*60
+        data_file.write(dashes+ "\n")
+        for param in parameter_dict :
+            data_file.write(param.ljust(40, '-'))
+            for i in range(len(parameter_dict[param])) :
+                data_file.write(str(parameter_dict[param][i]).ljust(20))
+
+            data_file.write("\n")
+        data_file.close()
+
+
+
+class HspiceBackend(SimulatorBackend):
+    """ Runs all the settings of a sweep in one HSPICE run with a .DATA statement. """
+
+    name = "hspice"
+
+    def _setup_data_sweep_file(self, parameter_dict, hspice_data_path, data_path):
+        """
+        Create an HSPICE .DATA statement with the data from parameter_dict.
+        A sizing sweep only changes a few parameters, so the parameters that have the same 
+        value for every sweep setting are written once as .PARAM statements and only the 
+        others go in the .DATA statement.
+        The .DATA file is hard to read. So, if 'write_data_file' is set, we also write out the
+        parameters to a text file in an easy to read format. This makes it easier to debug.
+        """
+        
+        max_items_per_line = 4
+
+        # Get a list of parameter names
+        param_list = list(parameter_dict.keys())
+
+        # Write out parameters to a "easy to read format" file (this just helps for debug) 
+        if self.write_data_file:
+            self._write_data_file(parameter_dict, data_path)
+
+        # Split the parameters into constant and swept ones. The .DATA statement needs 
+        # at least one column since that is what sets the number of sweep settings.
+        constant_params = []
+        swept_params = []
+        for param_name in param_list:
+            if len(set(str(value) for value in parameter_dict[param_name])) == 1:
+                constant_params.append(param_name)
+            else:
+                swept_params.append(param_name)
+        if len(swept_params) == 0:
+            swept_params.append(constant_params.pop(0))
+
+        hspice_data_file = open(hspice_data_path, 'w')
+
+        # Write the constant parameters
+        for param_name in constant_params:
+            hspice_data_file.write(".PARAM " + param_name + "=" + str(parameter_dict[param_name][0]) + "\n")
+
+        # Write the .DATA HPSICE file. This first part writes out the header.
+        hspice_data_file.write(".DATA sweep_data")
+        item_counter = 0
+        for param_name in swept_params:
+            if item_counter >= max_items_per_line:
+                hspice_data_file.write("\n" + param_name)
+                item_counter = 0
+            else:
+                hspice_data_file.write(" " + param_name)
+            item_counter += 1
+        hspice_data_file.write("\n")
+    
+        # Add data for each elements in the lists.
+        num_settings = len(parameter_dict[param_list[0]])
+        for i in range(num_settings):
+            item_counter = 0
+            for param_name in swept_params:
+                if item_counter >= max_items_per_line:
+                    hspice_data_file.write(str(parameter_dict[param_name][i]) + "\n")
+                    item_counter = 0
+                else:
+                    hspice_data_file.write(str(parameter_dict[param_name][i]) + " ")
+                item_counter += 1
+            hspice_data_file.write ("\n")
+    
+        # Add the footer
+        hspice_data_file.write(".ENDDATA")
+    
+        hspice_data_file.close()
+    
+        return
+    
+
+    def run(self, sp_path, parameter_dict):
+
+        sp_dir, sp_filename, output_path, mt0_path = self._prepare_run(sp_path, parameter_dict)
+
+        # The HSPICE output (of all attempts) is streamed to the listing
+        listing_file = self._open_listing(sp_path)
+
+        # HSPICE simulations might fail for some reasons:
+        # 1- The input file is incorrect, which would be a bug within COFFE.
+        # 2- HSPICE fails to checheck out the license, assuming the license exists, it is likely due
+        #    to many instances checking out the license at the same time or license going down temporarly. 
+        #    In this case, we check if the ".mt0" exists, if not, we wait and run hspice again. 
+        for attempt in range(MAX_SIMULATOR_RETRIES + 1):
+            # last I checked the license is available during the night, so we can try to run hspice uncomment below if this is untrue
+            #utils.check_for_time()
+            if attempt > 0:
+                time.sleep(_get_retry_delay(attempt - 1))
+            process = subprocess.Popen(["hspice", sp_filename], stdout=listing_file, stderr=subprocess.STDOUT, cwd=sp_dir)
+            process.wait()
+
+            # check that the ".mt0" file is there
+            if os.path.isfile(mt0_path):
+                return self._collect_measurements(sp_path, mt0_path, listing_file)
+
+        self._close_listing(sp_path, listing_file, True)
+        raise SimulationError(sp_path)
+
+
+    async def run_async(self, sp_path, parameter_dict):
+
+        sp_dir, sp_filename, output_path, mt0_path = self._prepare_run(sp_path, parameter_dict)
+
+        listing_file = self._open_listing(sp_path)
+
+        # Same retries as run(), but waiting doesn't block the other simulations
+        for attempt in range(MAX_SIMULATOR_RETRIES + 1):
+            if attempt > 0:
+                await asyncio.sleep(_get_retry_delay(attempt - 1))
+            process = await asyncio.create_subprocess_exec("hspice", sp_filename, stdout=listing_file, stderr=asyncio.subprocess.STDOUT, cwd=sp_dir)
+            await process.wait()
+
+            if os.path.isfile(mt0_path):
+                return self._collect_measurements(sp_path, mt0_path, listing_file)
+
+        self._close_listing(sp_path, listing_file, True)
+        raise SimulationError(sp_path)
+
+
+    def _prepare_run(self, sp_path, parameter_dict):
+        """ 
+        Write the sweep file for the deck at 'sp_path'. 
+        Returns the folder and file name of the deck and the paths of the .lis and .mt0 files.
+        """
+
+        sp_dir = os.path.dirname(os.path.abspath(sp_path))
+        sp_filename = os.path.basename(sp_path)
+        arch_dir = os.path.dirname(sp_dir)
+  
+        # Setup the .DATA sweep file with parameters in 'parameter_dict' 
+        self._setup_data_sweep_file(parameter_dict, 
+                                    os.path.join(arch_dir, HSPICE_DATA_SWEEP_PATH),
+                                    os.path.join(arch_dir, DATA_SWEEP_PATH))
+         
+        # HSPICE runs in the circuit subdirectory so that its output files are created there.
+        # Creat an output file having the ending .lis
+        output_path = _get_output_path(sp_path)
+        # HSPICE should print the measurements in a file having the same
+        # name as the output file with .mt0 ending
+        mt0_path = output_path.replace(".lis", ".mt0")
+
+        return sp_dir, sp_filename, output_path, mt0_path
+
+
+    def _collect_measurements(self, sp_path, mt0_path, listing_file):
+        """ Read the measurements of a successful run and close its listing. """
+
+        # store the measurments in a dictionary
+        spice_measurements = _read_mt0(mt0_path)
+        # delete results file to avoid confusion in future runs
+        os.remove(mt0_path)
+        self._close_listing(sp_path, listing_file, _has_failed_measurements(spice_measurements))
+
+        return spice_measurements
+
+
+
+class NgspiceBackend(SimulatorBackend):
+    """
+    Runs the decks with ngspice, which needs no license so we can run as many simulations 
+    in parallel as we have cores (see the shards of SpiceInterface). ngspice has no .DATA 
+    sweeps, so every sweep setting is simulated separately: the sweep file holds one .PARAM 
+    statement per parameter and the deck is translated to drop 'SWEEP DATA=sweep_data' from
+    its .TRAN statement. ngspice prints the .MEASURE results instead of writing a .mt0 file,
+    so they are parsed from its output. A measurement that ngspice could not evaluate is
+    reported as "failed", like in HSPICE's .mt0 files.
+    """
+
+    name = "ngspice"
+
+    def run(self, sp_path, parameter_dict):
+
+        sp_dir, ngspice_sp_filename, meas_names = self._prepare_run(sp_path, parameter_dict)
+
+        # All the ngspice output goes in the listing, like the HSPICE output does
+        listing_file = self._open_listing(sp_path)
+
+        spice_measurements = dict((meas_name, []) for meas_name in meas_names)
+        num_settings = len(next(iter(parameter_dict.values())))
+        for i in range(num_settings):
+            self._setup_param_file(parameter_dict, i, os.path.dirname(sp_dir))
+            try:
+                output = subprocess.check_output(["ngspice", "-b", ngspice_sp_filename], stderr=subprocess.STDOUT, cwd=sp_dir)
+            except subprocess.CalledProcessError as error:
+                output = error.output
+            except OSError:
+                self._close_listing(sp_path, listing_file, True)
+                raise SimulationError(sp_path)
+            listing_file.write(output)
+            self._collect_measurements(output, meas_names, spice_measurements)
+
+        self._close_listing(sp_path, listing_file, _has_failed_measurements(spice_measurements))
+
+        return spice_measurements
+
+
+    async def run_async(self, sp_path, parameter_dict):
+
+        sp_dir, ngspice_sp_filename, meas_names = self._prepare_run(sp_path, parameter_dict)
+
+        listing_file = self._open_listing(sp_path)
+
+        spice_measurements = dict((meas_name, []) for meas_name in meas_names)
+        num_settings = len(next(iter(parameter_dict.values())))
+        for i in range(num_settings):
+            self._setup_param_file(parameter_dict, i, os.path.dirname(sp_dir))
+            try:
+                process = await asyncio.create_subprocess_exec("ngspice", "-b", ngspice_sp_filename, 
+                                                               stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT, cwd=sp_dir)
+            except OSError:
+                self._close_listing(sp_path, listing_file, True)
+                raise SimulationError(sp_path)
+            output, _ = await process.communicate()
+            listing_file.write(output)
+            self._collect_measurements(output, meas_names, spice_measurements)
+
+        self._close_listing(sp_path, listing_file, _has_failed_measurements(spice_measurements))
+
+        return spice_measurements
+
+
+    def _prepare_run(self, sp_path, parameter_dict):
+        """ 
+        Translate the deck at 'sp_path'. Returns the folder of the deck, the file name of the 
+        translated deck and the names of the measurements.
+        """
+
+        sp_dir = os.path.dirname(os.path.abspath(sp_path))
+        sp_filename = os.path.basename(sp_path)
+        if self.write_data_file:
+            self._write_data_file(parameter_dict, os.path.join(os.path.dirname(sp_dir), DATA_SWEEP_PATH))
+
+        # Translate the deck and find the names of its measurements
+        ngspice_sp_filename = sp_filename.rstrip(".sp") + "_ngspice.sp"
+        meas_names = self._translate_deck(sp_path, os.path.join(sp_dir, ngspice_sp_filename))
+
+        return sp_dir, ngspice_sp_filename, meas_names
+
+
+    def _setup_param_file(self, parameter_dict, setting, arch_dir):
+        """ Write sweep setting number 'setting' of 'parameter_dict' as .PARAM statements to the sweep file. """
+
+        sweep_file = open(os.path.join(arch_dir, HSPICE_DATA_SWEEP_PATH), 'w')
+        for param_name, param_values in parameter_dict.items():
+            sweep_file.write(".PARAM " + param_name + "=" + str(param_values[setting]) + "\n")
+        sweep_file.close()
+
+
+    def _collect_measurements(self, output, meas_names, spice_measurements):
+        """ Add the measurement results in the ngspice 'output' to 'spice_measurements'. """
+
+        output = output.decode(errors='replace')
+
+        measured_values = {}
+        for line in output.splitlines():
+            match = NGSPICE_MEASUREMENT_RE.match(line)
+            if match is not None:
+                measured_values[match.group(1).lower()] = match.group(2)
+        for meas_name in meas_names:
+            spice_measurements[meas_name].append(measured_values.get(meas_name, "failed"))
+
+
+    def _translate_deck(self, sp_path, ngspice_sp_path):
+        """ 
+        Write the ngspice version of the deck at 'sp_path' to 'ngspice_sp_path'. 
+        Returns the names of the measurements of the deck (in lower case, like HSPICE).
+        """
+
+        meas_names = []
+        sp_file = open(sp_path, 'r')
+        ngspice_sp_file = open(ngspice_sp_path, 'w')
+        for line in sp_file:
+            words = line.split()
+            if len(words) > 0 and words[0].upper() == ".TRAN":
+                # ngspice wants the parameter expressions of the step and stop time in braces
+                line = QUOTED_EXPRESSION_RE.sub(r"{\1}", TRAN_DATA_SWEEP_RE.sub("", line))
+            elif len(words) > 2 and words[0].upper() in (".MEASURE", ".MEAS"):
+                meas_names.append(words[2].lower())
+            ngspice_sp_file.write(line)
+        ngspice_sp_file.close()
+        sp_file.close()
+
+        return meas_names
+
+
+
+# Simulators that SpiceInterface can use
+SIMULATOR_BACKENDS = {HspiceBackend.name: HspiceBackend, NgspiceBackend.name: NgspiceBackend}
+
+
+
+def _read_mt0(filepath):
+    """
+    Read the measurements of a HSPICE .mt0 file as they are, see SpiceInterface.parse_mt0.
+    The measurements of circuits with multiple fanins (meaz1, meaz2, etc.) are not combined
+    here, that is done by _combine_multi_fanin_measurements.
+    """
+
+    # The measurements data structure is what we will be building.
+    # It's a dictionary that maps measurement names to a list of values. 
+    # If this was a simple HSPICE run, the list will only have one element. 
+    # But, if this was a HSPICE sweep, the list will have multiple elements,
+    # one for each sweep setting.
+    # measurements = {meas_name1: [value1, value2, value3, etc...], 
+    #                 meas_name2: [value1, value2, value3, etc...],
+    #                 etc...}
+    measurements = {}
+    meas_names = []
+
+    # Open the file for reading
+    mt0_file = open(filepath, 'r')
+
+    # The first thing we expect to find is the measurement names.
+    # We use the 'parsing_names' flag to show that we are parsing the names.
+    # Once we find 'alter#' we are done parsing the measurement names. 
+    # Then, we start parsing the values themselves.
+    parsing_names = True
+    meas_values = []
+    for line in mt0_file:
+        # Ignore these lines
+        if line.startswith("$"):
+            continue
+        if line.startswith("."):
+            continue
+
+        if parsing_names:
+            words = line.split()
+            for meas_name in words:
+                meas_names.append(meas_name)
+                measurements[meas_name] = []
+                # When we find 'alter#' we are done parsing measurement names.
+                if meas_name.startswith("alter#"):
+                    parsing_names = False
+        else:
+            meas_values.extend(line.split())
+
+    # The values are listed one sweep setting after the other, so every measurement
+    # takes every 'num_measurements'-th value.
+    num_measurements = len(meas_names)
+    for current_meas in range(num_measurements):
+        measurements[meas_names[current_meas]] = meas_values[current_meas::num_measurements]
+
+    mt0_file.close()
+
+    return measurements
+
+
+def _combine_multi_fanin_measurements(measurements):
+    """
+    Add the 'meas_' measurements of circuits that name their delays with meaz1, meaz2, etc. 
+    'measurements' is the dictionary returned by _read_mt0, it is updated in place and returned.
+    """
+
+    #parse should be changed for ram block
+    meaz1_names = [meas_name for meas_name in measurements if "meaz1" in meas_name]
+    meaz2_names = [meas_name for meas_name in measurements if "meaz2" in meas_name]
+    #I'll need an aittional 4 to test carry chains:
+    meaz3_names = [meas_name for meas_name in measurements if "meaz3" in meas_name]
+
+    # This part is added to support having tow different fanins (e.g. ram rowdecoder)
+    # If this happens to any other circuit, you should name the delays with mez1 and meaz2
+    # the rest is simply the same.
+    if len(meaz3_names) != 0:
+        for x in range(0,len(meaz1_names)):
+            newname = meaz3_names[x].replace("meaz3_", "meas_")
+            measurements[newname] = max(measurements[meaz1_names[x]],measurements[meaz2_names[x]],measurements[meaz3_names[x]])
+        return measurements             
+    if len(meaz1_names) !=0 and len(meaz2_names) != 0:
+        if len(meaz1_names) != len(meaz2_names):
+                sys.exit(-1)
+        for x in range(0,len(meaz1_names)):
+            newname = meaz1_names[x].replace("meaz1_", "meas_")
+            measurements[newname] = max(measurements[meaz1_names[x]],measurements[meaz2_names[x]])
+    elif len(meaz1_names) !=0:
+        for x in range(0,len(meaz1_names)):
+            newname = meaz1_names[x].replace("meaz1_", "meas_")
+            measurements[newname] = measurements[meaz1_names[x]]
+    elif len(meaz2_names) !=0:
+        for x in range(0,len(meaz2_names)):
+            newname = meaz2_names[x].replace("meaz2_", "meas_")
+            measurements[newname] = measurements[meaz2_names[x]]
+
+    return measurements
+
+
+def _format_measurements(measurements, as_array):
+    """ Returns 'measurements' as is, or as a MeasurementTable if 'as_array' is True. """
+
+    if not as_array:
+        return measurements
+
+    # Convert all the values in one go. Values that aren't numbers ("failed", "**" when HSPICE
+    # can't print the value, etc.) are only converted one by one if that fails. All the values
+    # that aren't finite numbers are NaN and are flagged in the failure mask.
+    meas_names = list(measurements.keys())
+    meas_strings = np.array([measurements[meas_name] for meas_name in meas_names], dtype=str).reshape(len(meas_names), -1).T
+    failed = (meas_strings == "failed")
+    try:
+        values = np.where(failed, "nan", meas_strings).astype(np.float64)
+    except ValueError:
+        values = np.array([[_parse_meas_value(meas_string) for meas_string in row] for row in meas_strings], dtype=np.float64).reshape(meas_strings.shape)
+    failed |= ~np.isfinite(values)
+    values[failed] = np.nan
+
+    return MeasurementTable(meas_names, values, failed)
+
+
+def _parse_meas_value(meas_string):
+    """ Returns the value of a .mt0 measurement, NaN if it isn't a number. """
+
+    try:
+        return float(meas_string)
+    except ValueError:
+        return np.nan
+
+
+def _measurements_to_rows(measurements):
+    """ Convert a dictionary of measurement lists to a list with one dictionary per sweep setting. """
+
+    meas_names = list(measurements.keys())
+    num_settings = len(measurements[meas_names[0]])
+    return [dict((meas_name, measurements[meas_name][i]) for meas_name in meas_names) for i in range(num_settings)]
+
+
+def _rows_to_measurements(rows):
+    """ Inverse of _measurements_to_rows. """
+
+    measurements = {}
+    for meas_name in rows[0]:
+        measurements[meas_name] = [row[meas_name] for row in rows]
+    return measurements
+
+
+def _has_failed_measurements(spice_measurements):
+    """ Returns True if a measurement of any sweep setting in the raw 'spice_measurements' failed. """
+
+    for meas_values in spice_measurements.values():
+        if "failed" in meas_values:
+            return True
+    return False
+
+
+def _get_output_path(sp_path):
+    """ Returns the path of the simulator output (.lis) file of the deck at 'sp_path'. """
+
+    return os.path.join(os.path.dirname(os.path.abspath(sp_path)), os.path.basename(sp_path).rstrip(".sp") + ".lis")
+
+
+def _get_retry_delay(attempt):
+    """ Returns the jittered exponential backoff delay (in seconds) before retry number 'attempt'. """
+
+    return min(RETRY_BASE_DELAY * 2**attempt, RETRY_MAX_DELAY) * random.uniform(0.5, 1.5)
+
+
+def _parse_netlist_names(file_path):
+    """
+    Returns the names used by the top-level statements of the netlist at 'file_path' and the 
+    names every subcircuit and parameter it defines uses, {name: set of names}. Names are in 
+    lower case. Top-level .PARAM statements are definitions, not statements.
+    """
+
+    top_level_names = set()
+    definitions = {}
+    current_names = top_level_names
+    in_param = False
+    with open(file_path, 'r', errors='replace') as netlist_file:
+        for line in netlist_file:
+            line = line.strip().lower()
+            if len(line) == 0 or line.startswith("*"):
+                continue
+            # Continuation lines belong to the statement above them
+            if line.startswith("+"):
+                line = line[1:]
+            else:
+                words = line.split()
+                in_param = False
+                if words[0] in (".subckt", ".macro"):
+                    current_names = definitions.setdefault(words[1] if len(words) > 1 else "", set())
+                elif words[0] in (".ends", ".eom"):
+                    current_names = top_level_names
+                    continue
+                elif words[0] == ".param" and current_names is top_level_names:
+                    in_param = True
+                    line = line[len(".param"):]
+
+            # '.PARAM a = expr b = expr': each parameter depends on the names of its expression
+            if in_param:
+                for param_name, expression in PARAM_ASSIGNMENT_RE.findall(line):
+                    definitions.setdefault(param_name, set()).update(NETLIST_NAME_RE.findall(expression))
+            else:
+                current_names.update(NETLIST_NAME_RE.findall(line))
+
+    return top_level_names, definitions
+
+
+def _create_scratch_copy(sp_path, scratch_name):
+    """
+    Copy the libraries and the top-level deck at 'sp_path' to the scratch folder 'scratch_name'
+    so that it can be simulated with a sweep file of its own. Returns the path of the copied deck.
+    """
+
+    sp_dir = os.path.dirname(os.path.abspath(sp_path))
+    # Top-level decks include "../includes.l", so the libraries live one folder up.
+    arch_dir = os.path.dirname(sp_dir)
+
+    scratch_dir = os.path.join(arch_dir, SCRATCH_DIR_NAME, scratch_name)
+    scratch_sp_dir = os.path.join(scratch_dir, os.path.basename(sp_dir))
+    if not os.path.exists(scratch_sp_dir):
+        os.makedirs(scratch_sp_dir)
+    for filename in os.listdir(arch_dir):
+        if filename.endswith(".l") and filename != HSPICE_DATA_SWEEP_PATH:
+            _copy_if_changed(os.path.join(arch_dir, filename), os.path.join(scratch_dir, filename))
+    scratch_sp_path = os.path.join(scratch_sp_dir, os.path.basename(sp_path))
+    _copy_if_changed(sp_path, scratch_sp_path)
+
+    return scratch_sp_path
+
+
+def _copy_if_changed(src_path, dst_path):
+    """ Copy 'src_path' to 'dst_path' unless 'dst_path' is already an identical copy. """
+
+    if os.path.isfile(dst_path):
+        src_stat = os.stat(src_path)
+        dst_stat = os.stat(dst_path)
+        if src_stat.st_size == dst_stat.st_size and src_stat.st_mtime_ns == dst_stat.st_mtime_ns:
+            return
+    shutil.copy2(src_path, dst_path)
+
+
+def _run_shard(shard_job):
+    """
+    Run one shard of a sweep. This is executed in a worker process, so the backend must not 
+    change the working directory of the parent. Returns the raw measurements of the shard.
+    """
+
+    backend, sp_path, parameter_dict = shard_job
+
+    return backend.run(sp_path, parameter_dict)
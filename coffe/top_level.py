@@ -1,16 +1,16 @@
 import os
 
+from . import spice
+
 def generate_switch_block_top(mux_name):
     """ Generate the top level switch block SPICE file """
     
     # Create directories
     if not os.path.exists(mux_name):
         os.makedirs(mux_name)  
-    # Change to directory    
-    os.chdir(mux_name)  
     
     switch_block_filename = mux_name + ".sp"
-    sb_file = open(switch_block_filename, 'w')
+    sb_file = spice.NetlistBuilder(os.path.join(mux_name, switch_block_filename))
     sb_file.write(".TITLE Switch block multiplexer\n\n") 
     
     sb_file.write("********************************************************************************\n")
@@ -21,7 +21,7 @@ def generate_switch_block_top(mux_name):
     sb_file.write("********************************************************************************\n")
     sb_file.write("** Setup and input\n")
     sb_file.write("********************************************************************************\n\n")
-    sb_file.write(".TRAN 1p 8n SWEEP DATA=sweep_data\n")
+    sb_file.write(".TRAN 'tran_step' '8n * tran_stop_scale' SWEEP DATA=sweep_data\n")
     sb_file.write(".OPTIONS BRIEF=1\n\n")
     sb_file.write("* Input signal\n")
     sb_file.write("VIN n_in gnd PULSE (0 supply_v 0 0 0 2n 8n)\n\n")
@@ -63,10 +63,8 @@ def generate_switch_block_top(mux_name):
     sb_file.write("Xrouting_wire_load_1 n_1_1 n_2_1 n_hang_1 vsram vsram_n vdd gnd vdd_sb_mux vdd routing_wire_load\n\n")
     sb_file.write("Xrouting_wire_load_2 n_2_1 n_3_1 n_hang_2 vsram vsram_n vdd gnd vdd vdd routing_wire_load\n\n")
     sb_file.write(".END")
-    sb_file.close()
+    sb_file.write_file()
     
-    # Come out of swich block directory
-    os.chdir("../")
     
     return (mux_name + "/" + mux_name + ".sp")
     
@@ -77,11 +75,9 @@ def generate_connection_block_top(mux_name):
     # Create directories
     if not os.path.exists(mux_name):
         os.makedirs(mux_name)  
-    # Change to directory    
-    os.chdir(mux_name)
     
     connection_block_filename = mux_name + ".sp"
-    cb_file = open(connection_block_filename, 'w')
+    cb_file = spice.NetlistBuilder(os.path.join(mux_name, connection_block_filename))
     cb_file.write(".TITLE Connection block multiplexer\n\n") 
     
     cb_file.write("********************************************************************************\n")
@@ -92,7 +88,7 @@ def generate_connection_block_top(mux_name):
     cb_file.write("********************************************************************************\n")
     cb_file.write("** Setup and input\n")
     cb_file.write("********************************************************************************\n\n")
-    cb_file.write(".TRAN 1p 4n SWEEP DATA=sweep_data\n")
+    cb_file.write(".TRAN 'tran_step' '4n * tran_stop_scale' SWEEP DATA=sweep_data\n")
     cb_file.write(".OPTIONS BRIEF=1\n\n")
     cb_file.write("* Input signal\n")
     cb_file.write("VIN n_in gnd PULSE (0 supply_v 0 0 0 2n 4n)\n\n")
@@ -134,10 +130,8 @@ def generate_connection_block_top(mux_name):
     cb_file.write("Xlocal_routing_wire_load_1 n_1_3 n_1_4 vsram vsram_n vdd gnd vdd local_routing_wire_load\n")
     cb_file.write("Xlut_a_driver_1 n_1_4 n_hang1 vsram vsram_n n_hang2 n_hang3 vdd gnd lut_a_driver\n\n")
     cb_file.write(".END")
-    cb_file.close()
+    cb_file.write_file()
 
-    # Come out of connection block directory
-    os.chdir("../")
     
     return (mux_name + "/" + mux_name + ".sp")
 
@@ -148,11 +142,9 @@ def generate_local_mux_top(mux_name):
     # Create directories
     if not os.path.exists(mux_name):
         os.makedirs(mux_name)  
-    # Change to directory    
-    os.chdir(mux_name)
     
     connection_block_filename = mux_name + ".sp"
-    local_mux_file = open(connection_block_filename, 'w')
+    local_mux_file = spice.NetlistBuilder(os.path.join(mux_name, connection_block_filename))
     local_mux_file.write(".TITLE Local routing multiplexer\n\n") 
     
     local_mux_file.write("********************************************************************************\n")
@@ -163,7 +155,7 @@ def generate_local_mux_top(mux_name):
     local_mux_file.write("********************************************************************************\n")
     local_mux_file.write("** Setup and input\n")
     local_mux_file.write("********************************************************************************\n\n")
-    local_mux_file.write(".TRAN 1p 4n SWEEP DATA=sweep_data\n")
+    local_mux_file.write(".TRAN 'tran_step' '4n * tran_stop_scale' SWEEP DATA=sweep_data\n")
     local_mux_file.write(".OPTIONS BRIEF=1\n\n")
     local_mux_file.write("* Input signal\n")
     local_mux_file.write("VIN n_in gnd PULSE (0 supply_v 0 0 0 2n 4n)\n\n")
@@ -200,10 +192,8 @@ def generate_local_mux_top(mux_name):
     local_mux_file.write("Xlocal_routing_wire_load_1 n_1_3 n_1_4 vsram vsram_n vdd gnd vdd_local_mux local_routing_wire_load\n")
     local_mux_file.write("Xlut_A_driver_1 n_1_4 n_hang1 vsram vsram_n n_hang2 n_hang3 vdd gnd lut_A_driver\n\n")
     local_mux_file.write(".END")
-    local_mux_file.close()
+    local_mux_file.write_file()
 
-    # Come out of top-level directory
-    os.chdir("../")
     
     return (mux_name + "/" + mux_name + ".sp")
 
@@ -213,8 +203,6 @@ def generate_sram_read_power_top(name, sram_per_column, unselected_column_count)
     # Create directories
     if not os.path.exists(name):
         os.makedirs(name)  
-    # Change to directory    
-    os.chdir(name)   
 
     # Create and open file
     # The following are important parameter definitions
@@ -232,7 +220,7 @@ def generate_sram_read_power_top(name, sram_per_column, unselected_column_count)
     # create the file and generate the netlist:
 
     filename = name + ".sp"
-    the_file = open(filename, 'w')
+    the_file = spice.NetlistBuilder(os.path.join(name, filename))
     the_file.write(".TITLE SRAM read power measurement circuit \n\n")
     the_file.write("********************************************************************************\n")
     the_file.write("** Include libraries, parameters and other\n")
@@ -242,7 +230,7 @@ def generate_sram_read_power_top(name, sram_per_column, unselected_column_count)
     the_file.write("********************************************************************************\n")
     the_file.write("** Setup and input\n")
     the_file.write("********************************************************************************\n\n")
-    the_file.write(".TRAN 1p '4 * ram_frequency' SWEEP DATA=sweep_data\n")
+    the_file.write(".TRAN 'tran_step' '4 * ram_frequency * tran_stop_scale' SWEEP DATA=sweep_data\n")
     the_file.write(".OPTIONS BRIEF=1\n\n")
     the_file.write("* Input signal\n")
     the_file.write("Vprecharge n_precharge gnd PULSE (supply_v 0 0 50p 50p 'precharge_max' 'ram_frequency')\n")
@@ -321,10 +309,8 @@ def generate_sram_read_power_top(name, sram_per_column, unselected_column_count)
 
     #the_file.write(".print tran V(n_bl_0) V(n_bl_"+str(sram_per_column)+") V(n_br_0) V(Xprechargesa.n_1_2) V(n_br_"+str(sram_per_column)+") V(n_bl"+str(0)+"_"+str(sram_per_column)+") V(n_br"+str(0)+"_"+str(sram_per_column)+") V(Xsram"+str(sram_per_column - 1)+".n_1_2) V(Xsram"+str(sram_per_column - 1)+".n_1_1) V(n_precharge) V(n_wl_eva) I(V_unselected) I(V_selected)\n")   
     the_file.write(".END")
-    the_file.close()
+    the_file.write_file()
 
-    # Come out of top-level directory
-    os.chdir("../")
 
     return (name + "/" + name + ".sp")
 
@@ -337,8 +323,6 @@ def generate_sram_writelh_power_top_lp(name, sram_per_column, unselected_column_
     # Create directories
     if not os.path.exists(name):
         os.makedirs(name)  
-    # Change to directory    
-    os.chdir(name)   
 
     # Create and open file
     # The following are important parameter definitions
@@ -354,7 +338,7 @@ def generate_sram_writelh_power_top_lp(name, sram_per_column, unselected_column_
         duplicate = 0
 
     filename = name + ".sp"
-    the_file = open(filename, 'w')
+    the_file = spice.NetlistBuilder(os.path.join(name, filename))
     the_file.write(".TITLE SRAM write power measurement circuit \n\n")
     the_file.write("********************************************************************************\n")
     the_file.write("** Include libraries, parameters and other\n")
@@ -364,7 +348,7 @@ def generate_sram_writelh_power_top_lp(name, sram_per_column, unselected_column_
     the_file.write("********************************************************************************\n")
     the_file.write("** Setup and input\n")
     the_file.write("********************************************************************************\n\n")
-    the_file.write(".TRAN 1p '4 * ram_frequency' SWEEP DATA=sweep_data\n")
+    the_file.write(".TRAN 'tran_step' '4 * ram_frequency * tran_stop_scale' SWEEP DATA=sweep_data\n")
     the_file.write(".OPTIONS BRIEF=1\n\n")
     the_file.write("* Input signal\n")
     the_file.write("Vprecharge n_precharge gnd PULSE (supply_v_lp 0 0 50p 50p 'precharge_max' 'ram_frequency')\n")
@@ -442,10 +426,8 @@ def generate_sram_writelh_power_top_lp(name, sram_per_column, unselected_column_
 
     the_file.write(".print tran V(tgate_l) V(tgate_r) V(n_bl_0) V(n_bl_"+str(sram_per_column)+") V(n_br_0) V(Xprechargesa.n_1_2) V(n_br_"+str(sram_per_column)+") V(n_bl"+str(0)+"_"+str(sram_per_column)+") V(n_br"+str(0)+"_"+str(sram_per_column)+") V(Xsram"+str(sram_per_column - 1)+".n_1_2) V(Xsram"+str(sram_per_column - 1)+".n_1_1) V(n_precharge) V(n_wl_eva) I(V_unselected) I(V_selected)\n")   
     the_file.write(".END")
-    the_file.close()
+    the_file.write_file()
 
-    # Come out of top-level directory
-    os.chdir("../")
 
     return (name + "/" + name + ".sp")
 
@@ -456,8 +438,6 @@ def generate_mtj_read_power_top_lp(name, mtj_per_column):
     # Create directories
     if not os.path.exists(name):
         os.makedirs(name)  
-    # Change to directory    
-    os.chdir(name)   
 
     # Create and open file
     # The following are important parameter definitions
@@ -475,7 +455,7 @@ def generate_mtj_read_power_top_lp(name, mtj_per_column):
     # create the file and generate the netlist
 
     filename = name + ".sp"
-    the_file = open(filename, 'w')
+    the_file = spice.NetlistBuilder(os.path.join(name, filename))
     the_file.write(".TITLE MTJ write power measurement circuit \n\n")
     the_file.write("********************************************************************************\n")
     the_file.write("** Include libraries, parameters and other\n")
@@ -485,7 +465,7 @@ def generate_mtj_read_power_top_lp(name, mtj_per_column):
     the_file.write("********************************************************************************\n")
     the_file.write("** Setup and input\n")
     the_file.write("********************************************************************************\n\n")
-    the_file.write(".TRAN 1p '4 * ram_frequency' SWEEP DATA=sweep_data\n")
+    the_file.write(".TRAN 'tran_step' '4 * ram_frequency * tran_stop_scale' SWEEP DATA=sweep_data\n")
     the_file.write(".OPTIONS BRIEF=1\n\n")
     the_file.write("* Input signal\n")
     the_file.write("Vprecharge n_precharge gnd PULSE (supply_v_lp 0 0 50p 50p 'precharge_max' 'ram_frequency')\n")
@@ -598,10 +578,8 @@ def generate_mtj_read_power_top_lp(name, mtj_per_column):
     the_file.write(".IC V(X2prechargesa.n_1_2) = 0.95 \n")
 
     the_file.write(".END")
-    the_file.close()
+    the_file.write_file()
 
-    # Come out of top-level directory
-    os.chdir("../")
 
     return (name + "/" + name + ".sp")
 
@@ -613,8 +591,6 @@ def generate_mtj_write_power_top_lp(name, mtj_per_column):
     # Create directories
     if not os.path.exists(name):
         os.makedirs(name)  
-    # Change to directory    
-    os.chdir(name)   
 
     # Create and open file
     # The following are important parameter definitions
@@ -631,7 +607,7 @@ def generate_mtj_write_power_top_lp(name, mtj_per_column):
     # create the file and generate the netlist
 
     filename = name + ".sp"
-    the_file = open(filename, 'w')
+    the_file = spice.NetlistBuilder(os.path.join(name, filename))
     the_file.write(".TITLE MTJ write power measurement circuit \n\n")
     the_file.write("********************************************************************************\n")
     the_file.write("** Include libraries, parameters and other\n")
@@ -641,7 +617,7 @@ def generate_mtj_write_power_top_lp(name, mtj_per_column):
     the_file.write("********************************************************************************\n")
     the_file.write("** Setup and input\n")
     the_file.write("********************************************************************************\n\n")
-    the_file.write(".TRAN 1p '4 * ram_frequency' SWEEP DATA=sweep_data\n")
+    the_file.write(".TRAN 'tran_step' '4 * ram_frequency * tran_stop_scale' SWEEP DATA=sweep_data\n")
     the_file.write(".OPTIONS BRIEF=1\n\n")
     the_file.write("* Input signal\n")
     the_file.write("Vprecharge n_precharge gnd PULSE (supply_v_lp 0 0 50p 50p 'precharge_max' 'ram_frequency')\n")
@@ -727,10 +703,8 @@ def generate_mtj_write_power_top_lp(name, mtj_per_column):
 
 
     the_file.write(".END")
-    the_file.close()
+    the_file.write_file()
 
-    # Come out of top-level directory
-    os.chdir("../")
 
     return (name + "/" + name + ".sp")
 
@@ -741,8 +715,6 @@ def generate_sram_writehh_power_top_lp(name, sram_per_column, unselected_column_
     # Create directories
     if not os.path.exists(name):
         os.makedirs(name)  
-    # Change to directory    
-    os.chdir(name)   
 
     # Create and open file
     # The following are important parameter definitions
@@ -758,7 +730,7 @@ def generate_sram_writehh_power_top_lp(name, sram_per_column, unselected_column_
         duplicate = 0
 
     filename = name + ".sp"
-    the_file = open(filename, 'w')
+    the_file = spice.NetlistBuilder(os.path.join(name, filename))
     the_file.write(".TITLE SRAM write power measurement circuit \n\n")
     the_file.write("********************************************************************************\n")
     the_file.write("** Include libraries, parameters and other\n")
@@ -768,7 +740,7 @@ def generate_sram_writehh_power_top_lp(name, sram_per_column, unselected_column_
     the_file.write("********************************************************************************\n")
     the_file.write("** Setup and input\n")
     the_file.write("********************************************************************************\n\n")
-    the_file.write(".TRAN 1p '4 * ram_frequency' SWEEP DATA=sweep_data\n")
+    the_file.write(".TRAN 'tran_step' '4 * ram_frequency * tran_stop_scale' SWEEP DATA=sweep_data\n")
     the_file.write(".OPTIONS BRIEF=1\n\n")
     the_file.write("* Input signal\n")
     the_file.write("Vprecharge n_precharge gnd PULSE (supply_v_lp 0 0 50p 50p 'precharge_max' 'ram_frequency')\n")
@@ -845,10 +817,8 @@ def generate_sram_writehh_power_top_lp(name, sram_per_column, unselected_column_
 
     the_file.write(".print tran V(tgate_l) V(tgate_r) V(n_bl_0) V(n_bl_"+str(sram_per_column)+") V(n_br_0) V(Xprechargesa.n_1_2) V(n_br_"+str(sram_per_column)+") V(n_bl"+str(0)+"_"+str(sram_per_column)+") V(n_br"+str(0)+"_"+str(sram_per_column)+") V(Xsram"+str(sram_per_column - 1)+".n_1_2) V(Xsram"+str(sram_per_column - 1)+".n_1_1) V(n_precharge) V(n_wl_eva) I(V_unselected) I(V_selected)\n")   
     the_file.write(".END")
-    the_file.close()
+    the_file.write_file()
 
-    # Come out of top-level directory
-    os.chdir("../")
 
     return (name + "/" + name + ".sp")
 
@@ -858,8 +828,6 @@ def generate_sram_writep_power_top_lp(name, sram_per_column, unselected_column_c
     # Create directories
     if not os.path.exists(name):
         os.makedirs(name)  
-    # Change to directory    
-    os.chdir(name)   
 
     # Create and open file
     # The following are important parameter definitions
@@ -875,7 +843,7 @@ def generate_sram_writep_power_top_lp(name, sram_per_column, unselected_column_c
         duplicate = 0
 
     filename = name + ".sp"
-    the_file = open(filename, 'w')
+    the_file = spice.NetlistBuilder(os.path.join(name, filename))
     the_file.write(".TITLE SRAM write power measurement circuit \n\n")
     the_file.write("********************************************************************************\n")
     the_file.write("** Include libraries, parameters and other\n")
@@ -885,7 +853,7 @@ def generate_sram_writep_power_top_lp(name, sram_per_column, unselected_column_c
     the_file.write("********************************************************************************\n")
     the_file.write("** Setup and input\n")
     the_file.write("********************************************************************************\n\n")
-    the_file.write(".TRAN 1p '4 * ram_frequency' SWEEP DATA=sweep_data\n")
+    the_file.write(".TRAN 'tran_step' '4 * ram_frequency * tran_stop_scale' SWEEP DATA=sweep_data\n")
     the_file.write(".OPTIONS BRIEF=1\n\n")
     the_file.write("* Input signal\n")
     the_file.write("Vprecharge n_precharge gnd PULSE (supply_v_lp 0 0 50p 50p 'precharge_max' 'ram_frequency')\n")
@@ -963,10 +931,8 @@ def generate_sram_writep_power_top_lp(name, sram_per_column, unselected_column_c
 
     the_file.write(".print tran V(tgate_l) V(tgate_r) V(n_bl_0) V(n_bl_"+str(sram_per_column)+") V(n_br_0) V(Xprechargesa.n_1_2) V(n_br_"+str(sram_per_column)+") V(n_bl"+str(0)+"_"+str(sram_per_column)+") V(n_br"+str(0)+"_"+str(sram_per_column)+") V(Xsram"+str(sram_per_column - 1)+".n_1_2) V(Xsram"+str(sram_per_column - 1)+".n_1_1) V(n_precharge) V(n_wl_eva) I(V_unselected) I(V_selected)\n")   
     the_file.write(".END")
-    the_file.close()
+    the_file.write_file()
 
-    # Come out of top-level directory
-    os.chdir("../")
 
     return (name + "/" + name + ".sp")
 
@@ -977,8 +943,6 @@ def generate_sram_read_power_top_lp(name, sram_per_column, unselected_column_cou
     # Create directories
     if not os.path.exists(name):
         os.makedirs(name)  
-    # Change to directory    
-    os.chdir(name)   
 
     # Create and open file
     # The following are important parameter definitions
@@ -994,7 +958,7 @@ def generate_sram_read_power_top_lp(name, sram_per_column, unselected_column_cou
         duplicate = 0
 
     filename = name + ".sp"
-    the_file = open(filename, 'w')
+    the_file = spice.NetlistBuilder(os.path.join(name, filename))
     the_file.write(".TITLE SRAM read power measurement circuit \n\n")
     the_file.write("********************************************************************************\n")
     the_file.write("** Include libraries, parameters and other\n")
@@ -1004,7 +968,7 @@ def generate_sram_read_power_top_lp(name, sram_per_column, unselected_column_cou
     the_file.write("********************************************************************************\n")
     the_file.write("** Setup and input\n")
     the_file.write("********************************************************************************\n\n")
-    the_file.write(".TRAN 1p '4 * ram_frequency' SWEEP DATA=sweep_data\n")
+    the_file.write(".TRAN 'tran_step' '4 * ram_frequency * tran_stop_scale' SWEEP DATA=sweep_data\n")
     the_file.write(".OPTIONS BRIEF=1\n\n")
     the_file.write("* Input signal\n")
     the_file.write("Vprecharge n_precharge gnd PULSE (supply_v_lp 0 0 50p 50p 'precharge_max' 'ram_frequency')\n")
@@ -1083,10 +1047,8 @@ def generate_sram_read_power_top_lp(name, sram_per_column, unselected_column_cou
 
     #the_file.write(".print tran V(n_bl_0) V(n_bl_"+str(sram_per_column)+") V(n_br_0) V(Xprechargesa.n_1_2) V(n_br_"+str(sram_per_column)+") V(n_bl"+str(0)+"_"+str(sram_per_column)+") V(n_br"+str(0)+"_"+str(sram_per_column)+") V(Xsram"+str(sram_per_column - 1)+".n_1_2) V(Xsram"+str(sram_per_column - 1)+".n_1_1) V(n_precharge) V(n_wl_eva) I(V_unselected) I(V_selected)\n")   
     the_file.write(".END")
-    the_file.close()
+    the_file.write_file()
 
-    # Come out of top-level directory
-    os.chdir("../")
 
     return (name + "/" + name + ".sp")
 
@@ -1098,12 +1060,10 @@ def generate_pgateoutputcrossbar_top(name, maxwidth, def_use_tgate):
     # Create directories
     if not os.path.exists(name):
         os.makedirs(name)  
-    # Change to directory    
-    os.chdir(name)
 
     # create the spice file and generate the netlist
     filename = name + ".sp"
-    the_file = open(filename, 'w')
+    the_file = spice.NetlistBuilder(os.path.join(name, filename))
     the_file.write(".TITLE A nand2 path\n\n")
 
     the_file.write("********************************************************************************\n")
@@ -1114,7 +1074,7 @@ def generate_pgateoutputcrossbar_top(name, maxwidth, def_use_tgate):
     the_file.write("********************************************************************************\n")
     the_file.write("** Setup and input\n")
     the_file.write("********************************************************************************\n\n")
-    the_file.write(".TRAN 1p 4n SWEEP DATA=sweep_data\n")
+    the_file.write(".TRAN 'tran_step' '4n * tran_stop_scale' SWEEP DATA=sweep_data\n")
     the_file.write(".OPTIONS BRIEF=1\n\n")
     the_file.write("* Input signal\n")
     the_file.write("VIN n_in gnd PULSE (0 supply_v 0 0 0 2n 4n)\n")
@@ -1173,10 +1133,8 @@ def generate_pgateoutputcrossbar_top(name, maxwidth, def_use_tgate):
 
 
     the_file.write(".END")
-    the_file.close()
+    the_file.write_file()
 
-    # Come out of top-level directory
-    os.chdir("../")
 
     return (name + "/" + name + ".sp")
 
@@ -1187,12 +1145,10 @@ def generate_configurabledecoderiii_top(name, fanin1,fanin2, required_size, tgat
     # create directory
     if not os.path.exists(name):
         os.makedirs(name)  
-    # Change to directory    
-    os.chdir(name)
 
     # create spice file and generate netlist
     filename = name + ".sp"
-    the_file = open(filename, 'w')
+    the_file = spice.NetlistBuilder(os.path.join(name, filename))
     the_file.write(".TITLE last stage of configurable decoder\n\n")
 
 
@@ -1204,7 +1160,7 @@ def generate_configurabledecoderiii_top(name, fanin1,fanin2, required_size, tgat
     the_file.write("********************************************************************************\n")
     the_file.write("** Setup and input\n")
     the_file.write("********************************************************************************\n\n")
-    the_file.write(".TRAN 1p 4n SWEEP DATA=sweep_data\n")
+    the_file.write(".TRAN 'tran_step' '4n * tran_stop_scale' SWEEP DATA=sweep_data\n")
     the_file.write(".OPTIONS BRIEF=1\n\n")
     the_file.write("* Input signal\n")
     the_file.write("VIN n_in gnd PULSE (0 supply_v 0 0 0 2n 4n)\n")
@@ -1305,10 +1261,8 @@ def generate_configurabledecoderiii_top(name, fanin1,fanin2, required_size, tgat
         #the_file.write("X2loadnand3"+str(fanout1 + fanin2)+" n_2_"+str(fanout1 + fanin2)+" n_2_out vdd gnd thirdstage1\n")
 
     the_file.write(".END")
-    the_file.close()
+    the_file.write_file()
 
-    # Come out of top-level directory
-    os.chdir("../")
 
     return (name + "/" + name + ".sp")   
 
@@ -1319,13 +1273,11 @@ def generate_mtj_charge(name, colsize):
     # create directory:
     if not os.path.exists(name):
         os.makedirs(name)  
-    # Change to directory    
-    os.chdir(name)
 
     # generate spice file and netlist:
 
     filename = name + ".sp"
-    the_file = open(filename, 'w')
+    the_file = spice.NetlistBuilder(os.path.join(name, filename))
     the_file.write(".TITLE bitline charging process in MTJ-based RAM block\n\n")
 
     the_file.write("********************************************************************************\n")
@@ -1336,7 +1288,7 @@ def generate_mtj_charge(name, colsize):
     the_file.write("********************************************************************************\n")
     the_file.write("** Setup and input\n")
     the_file.write("********************************************************************************\n\n")
-    the_file.write(".TRAN 1p 4n SWEEP DATA=sweep_data\n")
+    the_file.write(".TRAN 'tran_step' '4n * tran_stop_scale' SWEEP DATA=sweep_data\n")
     the_file.write(".OPTIONS BRIEF=1\n\n")
     the_file.write("* Input signal\n")
     the_file.write("VIN n_in_b gnd PULSE (0 supply_v_lp 0 0 0 4n 8n)\n")
@@ -1401,10 +1353,8 @@ def generate_mtj_charge(name, colsize):
 
 
     the_file.write(".END")
-    the_file.close()
+    the_file.write_file()
 
-    # Come out of top-level directory
-    os.chdir("../")
 
     return (name + "/" + name + ".sp")        
 
@@ -1416,13 +1366,11 @@ def generate_mtj_sa_top(name, colsize):
     # create the directory
     if not os.path.exists(name):
         os.makedirs(name)  
-    # Change to directory    
-    os.chdir(name)
 
     # Create the file and generate the netlist:
 
     filename = name + ".sp"
-    the_file = open(filename, 'w')
+    the_file = spice.NetlistBuilder(os.path.join(name, filename))
     the_file.write(".TITLE bitline charging process in MTJ-based RAM block\n\n")
 
     the_file.write("********************************************************************************\n")
@@ -1433,7 +1381,7 @@ def generate_mtj_sa_top(name, colsize):
     the_file.write("********************************************************************************\n")
     the_file.write("** Setup and input\n")
     the_file.write("********************************************************************************\n\n")
-    the_file.write(".TRAN 1p 4n SWEEP DATA=sweep_data\n")
+    the_file.write(".TRAN 'tran_step' '4n * tran_stop_scale' SWEEP DATA=sweep_data\n")
     the_file.write(".OPTIONS BRIEF=1\n\n")
     the_file.write("* Input signal\n")
     the_file.write("VIN n_in gnd PULSE (0 supply_v_lp 'time_bl' 50p 50p 4n 8n)\n")
@@ -1502,10 +1450,8 @@ def generate_mtj_sa_top(name, colsize):
         the_file.write(".IC V(n_br_"+str(i)+") = 0 \n")
 
     the_file.write(".END")
-    the_file.close()
+    the_file.write_file()
 
-    # Come out of top-level directory
-    os.chdir("../")
 
     return (name + "/" + name + ".sp")        
 
@@ -1515,8 +1461,6 @@ def generate_mtj_discharge(name, colsize):
 
     if not os.path.exists(name):
         os.makedirs(name)  
-    # Change to directory    
-    os.chdir(name)
 
     # if the column is too big, this bit discharging circuit only works for half of the path
     half = 0
@@ -1527,7 +1471,7 @@ def generate_mtj_discharge(name, colsize):
 
     # create the spice file and fill it with netlist
     filename = name + ".sp"
-    the_file = open(filename, 'w')
+    the_file = spice.NetlistBuilder(os.path.join(name, filename))
     the_file.write(".TITLE bitline discharging process in MTJ-based RAM block\n\n")
 
     the_file.write("********************************************************************************\n")
@@ -1538,7 +1482,7 @@ def generate_mtj_discharge(name, colsize):
     the_file.write("********************************************************************************\n")
     the_file.write("** Setup and input\n")
     the_file.write("********************************************************************************\n\n")
-    the_file.write(".TRAN 1p 4n SWEEP DATA=sweep_data\n")
+    the_file.write(".TRAN 'tran_step' '4n * tran_stop_scale' SWEEP DATA=sweep_data\n")
     the_file.write(".OPTIONS BRIEF=1\n\n")
     the_file.write("* Input signal\n")
     the_file.write("VIN n_in gnd PULSE (0 supply_v_lp 0 0 0 4n 8n)\n")
@@ -1594,10 +1538,8 @@ def generate_mtj_discharge(name, colsize):
 
 
     the_file.write(".END")
-    the_file.close()
+    the_file.write_file()
 
-    # Come out of top-level directory
-    os.chdir("../")
 
     return (name + "/" + name + ".sp")         
 
@@ -1609,12 +1551,10 @@ def generate_configurabledecoderiii_top_lp(name, fanin1,fanin2, required_size, t
     # Create the directory
     if not os.path.exists(name):
         os.makedirs(name)  
-    # Change to directory    
-    os.chdir(name)
 
     # Create the spice file and generate the netlist
     filename = name + ".sp"
-    the_file = open(filename, 'w')
+    the_file = spice.NetlistBuilder(os.path.join(name, filename))
     the_file.write(".TITLE last stage of configurable decoder\n\n")
 
 
@@ -1626,7 +1566,7 @@ def generate_configurabledecoderiii_top_lp(name, fanin1,fanin2, required_size, t
     the_file.write("********************************************************************************\n")
     the_file.write("** Setup and input\n")
     the_file.write("********************************************************************************\n\n")
-    the_file.write(".TRAN 1p 4n SWEEP DATA=sweep_data\n")
+    the_file.write(".TRAN 'tran_step' '4n * tran_stop_scale' SWEEP DATA=sweep_data\n")
     the_file.write(".OPTIONS BRIEF=1\n\n")
     the_file.write("* Input signal\n")
     the_file.write("VIN n_in gnd PULSE (0 supply_v_lp 0 0 0 2n 4n)\n")
@@ -1724,10 +1664,8 @@ def generate_configurabledecoderiii_top_lp(name, fanin1,fanin2, required_size, t
         #the_file.write("X2loadnand3"+str(fanout1 + fanin2)+" n_2_"+str(fanout1 + fanin2)+" n_2_out vdd gnd thirdstage1\n")
 
     the_file.write(".END")
-    the_file.close()
+    the_file.write_file()
 
-    # Come out of top-level directory
-    os.chdir("../")
 
     return (name + "/" + name + ".sp")   
 
@@ -1738,12 +1676,10 @@ def generate_rowdecoderstage3_top_lp(name, fanin1,fanin2, sramcount, number_of_b
     # Create the dictory:
     if not os.path.exists(name):
         os.makedirs(name)  
-    # Change to directory    
-    os.chdir(name)
 
 
     filename = name + ".sp"
-    the_file = open(filename, 'w')
+    the_file = spice.NetlistBuilder(os.path.join(name, filename))
     the_file.write(".TITLE thirdstage\n\n")
 
 
@@ -1755,7 +1691,7 @@ def generate_rowdecoderstage3_top_lp(name, fanin1,fanin2, sramcount, number_of_b
     the_file.write("********************************************************************************\n")
     the_file.write("** Setup and input\n")
     the_file.write("********************************************************************************\n\n")
-    the_file.write(".TRAN 1p 4n SWEEP DATA=sweep_data\n")
+    the_file.write(".TRAN 'tran_step' '4n * tran_stop_scale' SWEEP DATA=sweep_data\n")
     the_file.write(".OPTIONS BRIEF=1\n\n")
     the_file.write("* Input signal\n")
     the_file.write("VIN n_in gnd PULSE (0 supply_v_lp 0 0 0 2n 4n)\n")
@@ -1844,10 +1780,8 @@ def generate_rowdecoderstage3_top_lp(name, fanin1,fanin2, sramcount, number_of_b
 
 
     the_file.write(".END")
-    the_file.close()
+    the_file.write_file()
 
-    # Come out of top-level directory
-    os.chdir("../")
 
     return (name + "/" + name + ".sp")
 
@@ -1858,12 +1792,10 @@ def generate_wordline_driver_top_lp(name, sramcount, nandsize, smallrow, repeate
     # Create the directory
     if not os.path.exists(name):
         os.makedirs(name)  
-    # Change to directory    
-    os.chdir(name)
 
     # Create the spice file and generate the netlist
     filename = name + ".sp"
-    the_file = open(filename, 'w')
+    the_file = spice.NetlistBuilder(os.path.join(name, filename))
     the_file.write(".TITLE wordline driver\n\n")
 
 
@@ -1875,7 +1807,7 @@ def generate_wordline_driver_top_lp(name, sramcount, nandsize, smallrow, repeate
     the_file.write("********************************************************************************\n")
     the_file.write("** Setup and input\n")
     the_file.write("********************************************************************************\n\n")
-    the_file.write(".TRAN 1p 4n SWEEP DATA=sweep_data\n")
+    the_file.write(".TRAN 'tran_step' '4n * tran_stop_scale' SWEEP DATA=sweep_data\n")
     the_file.write(".OPTIONS BRIEF=1\n\n")
     the_file.write("* Input signal\n")
     the_file.write("VIN n_in gnd PULSE (0 supply_v_lp 0 0 0 2n 4n)\n")
@@ -1944,10 +1876,8 @@ def generate_wordline_driver_top_lp(name, sramcount, nandsize, smallrow, repeate
             the_file.write("Xwirel"+str(i)+" n_1_"+str(i)+" n_1_"+str(i+1)+" wire Rw=wire_wordline_driver_res/"+str(2*sramcount)+" Cw=wire_wordline_driver_cap/"+str(2*sramcount)+"\n")
 
     the_file.write(".END")
-    the_file.close()
+    the_file.write_file()
 
-    # Come out of top-level directory
-    os.chdir("../")
 
     return (name + "/" + name + ".sp")
 
@@ -1958,12 +1888,10 @@ def generate_rowdecoderstage3_top(name, fanin1,fanin2, sramcount, number_of_bank
     # Create the dictory:
     if not os.path.exists(name):
         os.makedirs(name)  
-    # Change to directory    
-    os.chdir(name)
 
     # Create spice file and fill it up with the netlist:
     filename = name + ".sp"
-    the_file = open(filename, 'w')
+    the_file = spice.NetlistBuilder(os.path.join(name, filename))
     the_file.write(".TITLE thirdstage\n\n")
 
 
@@ -1975,7 +1903,7 @@ def generate_rowdecoderstage3_top(name, fanin1,fanin2, sramcount, number_of_bank
     the_file.write("********************************************************************************\n")
     the_file.write("** Setup and input\n")
     the_file.write("********************************************************************************\n\n")
-    the_file.write(".TRAN 1p 4n SWEEP DATA=sweep_data\n")
+    the_file.write(".TRAN 'tran_step' '4n * tran_stop_scale' SWEEP DATA=sweep_data\n")
     the_file.write(".OPTIONS BRIEF=1\n\n")
     the_file.write("* Input signal\n")
     the_file.write("VIN n_in gnd PULSE (0 supply_v 0 0 0 2n 4n)\n")
@@ -2064,10 +1992,8 @@ def generate_rowdecoderstage3_top(name, fanin1,fanin2, sramcount, number_of_bank
 
 
     the_file.write(".END")
-    the_file.close()
+    the_file.write_file()
 
-    # Come out of top-level directory
-    os.chdir("../")
 
     return (name + "/" + name + ".sp")
 
@@ -2077,12 +2003,10 @@ def generate_rowdecoderstage1_top(name, fanout, size):
     # Create directories
     if not os.path.exists(name):
         os.makedirs(name)  
-    # Change to directory    
-    os.chdir(name)
 
     # Create the spice file and generate netlist:
     filename = name + ".sp"
-    the_file = open(filename, 'w')
+    the_file = spice.NetlistBuilder(os.path.join(name, filename))
     the_file.write(".TITLE stage one of the small row decoder\n\n")
 
     the_file.write("********************************************************************************\n")
@@ -2093,7 +2017,7 @@ def generate_rowdecoderstage1_top(name, fanout, size):
     the_file.write("********************************************************************************\n")
     the_file.write("** Setup and input\n")
     the_file.write("********************************************************************************\n\n")
-    the_file.write(".TRAN 1p 4n SWEEP DATA=sweep_data\n")
+    the_file.write(".TRAN 'tran_step' '4n * tran_stop_scale' SWEEP DATA=sweep_data\n")
     the_file.write(".OPTIONS BRIEF=1\n\n")
     the_file.write("* Input signal\n")
     the_file.write("VIN n_in gnd PULSE (0 supply_v 0 0 0 2n 4n)\n")
@@ -2143,10 +2067,8 @@ def generate_rowdecoderstage1_top(name, fanout, size):
         the_file.write("Xloadnand"+str(i)+" n_1_"+str(i)+" n_hang_"+str(i+1)+" vdd gnd rowdecoderstage3\n")
 
     the_file.write(".END")
-    the_file.close()
+    the_file.write_file()
 
-    # Come out of top-level directory
-    os.chdir("../")
 
     return (name + "/" + name + ".sp")
 
@@ -2158,12 +2080,10 @@ def generate_rowdecoderstage1_top_lp(name, fanout, size):
     # Create directories
     if not os.path.exists(name):
         os.makedirs(name)  
-    # Change to directory    
-    os.chdir(name)
 
     # Create the spice file:
     filename = name + ".sp"
-    the_file = open(filename, 'w')
+    the_file = spice.NetlistBuilder(os.path.join(name, filename))
     the_file.write(".TITLE stage one of the small row decoder\n\n")
 
     the_file.write("********************************************************************************\n")
@@ -2174,7 +2094,7 @@ def generate_rowdecoderstage1_top_lp(name, fanout, size):
     the_file.write("********************************************************************************\n")
     the_file.write("** Setup and input\n")
     the_file.write("********************************************************************************\n\n")
-    the_file.write(".TRAN 1p 4n SWEEP DATA=sweep_data\n")
+    the_file.write(".TRAN 'tran_step' '4n * tran_stop_scale' SWEEP DATA=sweep_data\n")
     the_file.write(".OPTIONS BRIEF=1\n\n")
     the_file.write("* Input signal\n")
     the_file.write("VIN n_in gnd PULSE (0 supply_v_lp 0 0 0 2n 4n)\n")
@@ -2224,10 +2144,8 @@ def generate_rowdecoderstage1_top_lp(name, fanout, size):
         the_file.write("Xloadnand"+str(i)+" n_1_"+str(i)+" n_hang_"+str(i+1)+" vdd_lp gnd rowdecoderstage3\n")
 
     the_file.write(".END")
-    the_file.close()
+    the_file.write_file()
 
-    # Come out of top-level directory
-    os.chdir("../")
 
     return (name + "/" + name + ".sp")
 
@@ -2238,12 +2156,10 @@ def generate_configurabledecoder2ii_top(name, fanout, size):
     # Create directories
     if not os.path.exists(name):
         os.makedirs(name)  
-    # Change to directory    
-    os.chdir(name)
 
     # create the file and 
     filename = name + ".sp"
-    the_file = open(filename, 'w')
+    the_file = spice.NetlistBuilder(os.path.join(name, filename))
     the_file.write(".TITLE second stage in configurable decoder\n\n")
 
     the_file.write("********************************************************************************\n")
@@ -2254,7 +2170,7 @@ def generate_configurabledecoder2ii_top(name, fanout, size):
     the_file.write("********************************************************************************\n")
     the_file.write("** Setup and input\n")
     the_file.write("********************************************************************************\n\n")
-    the_file.write(".TRAN 1p 4n SWEEP DATA=sweep_data\n")
+    the_file.write(".TRAN 'tran_step' '4n * tran_stop_scale' SWEEP DATA=sweep_data\n")
     the_file.write(".OPTIONS BRIEF=1\n\n")
     the_file.write("* Input signal\n")
     the_file.write("VIN n_in gnd PULSE (0 supply_v 0 0 0 2n 4n)\n")
@@ -2305,10 +2221,8 @@ def generate_configurabledecoder2ii_top(name, fanout, size):
         the_file.write("Xloadnand"+str(i)+" n_1_"+str(i)+" n_hang_"+str(i+1)+" vdd gnd xconfigurabledecoderiii\n")
 
     the_file.write(".END")
-    the_file.close()
+    the_file.write_file()
 
-    # Come out of top-level directory
-    os.chdir("../")
 
     return (name + "/" + name + ".sp")
 
@@ -2319,12 +2233,10 @@ def generate_configurabledecoder2ii_top_lp(name, fanout, size):
     # Create directories
     if not os.path.exists(name):
         os.makedirs(name)  
-    # Change to directory    
-    os.chdir(name)
 
 
     filename = name + ".sp"
-    the_file = open(filename, 'w')
+    the_file = spice.NetlistBuilder(os.path.join(name, filename))
     the_file.write(".TITLE second stage in configurable decoder\n\n")
 
     the_file.write("********************************************************************************\n")
@@ -2335,7 +2247,7 @@ def generate_configurabledecoder2ii_top_lp(name, fanout, size):
     the_file.write("********************************************************************************\n")
     the_file.write("** Setup and input\n")
     the_file.write("********************************************************************************\n\n")
-    the_file.write(".TRAN 1p 4n SWEEP DATA=sweep_data\n")
+    the_file.write(".TRAN 'tran_step' '4n * tran_stop_scale' SWEEP DATA=sweep_data\n")
     the_file.write(".OPTIONS BRIEF=1\n\n")
     the_file.write("* Input signal\n")
     the_file.write("VIN n_in gnd PULSE (0 supply_v_lp 0 0 0 2n 4n)\n")
@@ -2386,10 +2298,8 @@ def generate_configurabledecoder2ii_top_lp(name, fanout, size):
         the_file.write("Xloadnand"+str(i)+" n_1_"+str(i)+" n_hang_"+str(i+1)+" vdd_lp gnd xconfigurabledecoderiii\n")
 
     the_file.write(".END")
-    the_file.close()
+    the_file.write_file()
 
-    # Come out of top-level directory
-    os.chdir("../")
 
     return (name + "/" + name + ".sp")
 
@@ -2403,11 +2313,9 @@ def generate_rowdecoderstage0_top(name,numberofgates2,numberofgates3, decodersiz
     # Create directories
     if not os.path.exists(name):
         os.makedirs(name)  
-    # Change to directory    
-    os.chdir(name)
 
     filename = name + ".sp"
-    the_file = open(filename, 'w')
+    the_file = spice.NetlistBuilder(os.path.join(name, filename))
     the_file.write(".TITLE RAM row decoder stage 0\n\n")
 
     the_file.write("********************************************************************************\n")
@@ -2418,7 +2326,7 @@ def generate_rowdecoderstage0_top(name,numberofgates2,numberofgates3, decodersiz
     the_file.write("********************************************************************************\n")
     the_file.write("** Setup and input\n")
     the_file.write("********************************************************************************\n\n")
-    the_file.write(".TRAN 1p 5n SWEEP DATA=sweep_data\n")
+    the_file.write(".TRAN 'tran_step' '5n * tran_stop_scale' SWEEP DATA=sweep_data\n")
     the_file.write(".OPTIONS BRIEF=1\n\n")
     the_file.write("* Input signal\n")
     the_file.write("VIN n_in gnd PULSE (0 supply_v 0 0 0 2n 4n)\n")
@@ -2467,10 +2375,8 @@ def generate_rowdecoderstage0_top(name,numberofgates2,numberofgates3, decodersiz
 
 
     the_file.write(".END")
-    the_file.close()
+    the_file.write_file()
 
-    # Come out of the directory
-    os.chdir("../")
 
     return (name + "/" + name + ".sp")
 
@@ -2480,10 +2386,8 @@ def generate_rowdecoderstage0_top_lp(name,numberofgates2,numberofgates3, decoder
     # Create directories
     if not os.path.exists(name):
         os.makedirs(name)  
-    # Change to directory    
-    os.chdir(name)
     filename = name + ".sp"
-    the_file = open(filename, 'w')
+    the_file = spice.NetlistBuilder(os.path.join(name, filename))
     the_file.write(".TITLE RAM row decoder stage 0\n\n")
 
     the_file.write("********************************************************************************\n")
@@ -2494,7 +2398,7 @@ def generate_rowdecoderstage0_top_lp(name,numberofgates2,numberofgates3, decoder
     the_file.write("********************************************************************************\n")
     the_file.write("** Setup and input\n")
     the_file.write("********************************************************************************\n\n")
-    the_file.write(".TRAN 1p 5n SWEEP DATA=sweep_data\n")
+    the_file.write(".TRAN 'tran_step' '5n * tran_stop_scale' SWEEP DATA=sweep_data\n")
     the_file.write(".OPTIONS BRIEF=1\n\n")
     the_file.write("* Input signal\n")
     the_file.write("VIN n_in gnd PULSE (0 supply_v_lp 0 0 0 2n 4n)\n")
@@ -2541,10 +2445,8 @@ def generate_rowdecoderstage0_top_lp(name,numberofgates2,numberofgates3, decoder
         the_file.write("Xnand3"+str(i)+" n_1_"+str(i+1)+" n_hang_"+str(i)+" vdd_lp gnd nand3_lp Wn=inv_nand3_rowdecoderstage13_1_nmos Wp=inv_nand3_rowdecoderstage13_1_pmos\n")
 
     the_file.write(".END")
-    the_file.close()
+    the_file.write_file()
 
-    # Come out of the directory
-    os.chdir("../")
 
     return (name + "/" + name + ".sp")
 
@@ -2555,11 +2457,9 @@ def generate_configurabledecoderi_top(name,numberofgates2,numberofgates3, ConfiD
     # Create directories
     if not os.path.exists(name):
         os.makedirs(name)  
-    # Change to directory    
-    os.chdir(name)
 
     filename = name + ".sp"
-    the_file = open(filename, 'w')
+    the_file = spice.NetlistBuilder(os.path.join(name, filename))
     the_file.write(".TITLE RAM configurable decoder\n\n")
 
 
@@ -2572,7 +2472,7 @@ def generate_configurabledecoderi_top(name,numberofgates2,numberofgates3, ConfiD
     the_file.write("********************************************************************************\n")
     the_file.write("** Setup and input\n")
     the_file.write("********************************************************************************\n\n")
-    the_file.write(".TRAN 1p 5n SWEEP DATA=sweep_data\n")
+    the_file.write(".TRAN 'tran_step' '5n * tran_stop_scale' SWEEP DATA=sweep_data\n")
     the_file.write(".OPTIONS BRIEF=1\n\n")
     the_file.write("* Input signal\n")
     the_file.write("VIN n_in gnd PULSE (0 supply_v 0 0 0 2n 4n)\n")
@@ -2622,10 +2522,8 @@ def generate_configurabledecoderi_top(name,numberofgates2,numberofgates3, ConfiD
         the_file.write("Xnand3"+str(i)+" n_1_"+str(i+1)+" n_hang_"+str(i)+" vdd gnd nand3 Wn=inv_nand3_xconfigurabledecoder3ii_1_nmos Wp=inv_nand3_xconfigurabledecoder3ii_1_pmos\n")
 
     the_file.write(".END")
-    the_file.close()
+    the_file.write_file()
 
-    # Come out of top-level directory
-    os.chdir("../")
 
     return (name + "/" + name + ".sp")
 
@@ -2636,11 +2534,9 @@ def generate_configurabledecoderi_top_lp(name,numberofgates2,numberofgates3, Con
     # Create directories
     if not os.path.exists(name):
         os.makedirs(name)  
-    # Change to directory    
-    os.chdir(name)
 
     filename = name + ".sp"
-    the_file = open(filename, 'w')
+    the_file = spice.NetlistBuilder(os.path.join(name, filename))
     the_file.write(".TITLE RAM configurable decoder\n\n")
 
 
@@ -2653,7 +2549,7 @@ def generate_configurabledecoderi_top_lp(name,numberofgates2,numberofgates3, Con
     the_file.write("********************************************************************************\n")
     the_file.write("** Setup and input\n")
     the_file.write("********************************************************************************\n\n")
-    the_file.write(".TRAN 1p 5n SWEEP DATA=sweep_data\n")
+    the_file.write(".TRAN 'tran_step' '5n * tran_stop_scale' SWEEP DATA=sweep_data\n")
     the_file.write(".OPTIONS BRIEF=1\n\n")
     the_file.write("* Input signal\n")
     the_file.write("VIN n_in gnd PULSE (0 supply_v_lp 0 0 0 2n 4n)\n")
@@ -2703,10 +2599,8 @@ def generate_configurabledecoderi_top_lp(name,numberofgates2,numberofgates3, Con
         the_file.write("Xnand3"+str(i)+" n_1_"+str(i+1)+" n_hang_"+str(i)+" vdd_lp gnd nand3 Wn=inv_nand3_xconfigurabledecoder3ii_1_nmos Wp=inv_nand3_xconfigurabledecoder3ii_1_pmos\n")
 
     the_file.write(".END")
-    the_file.close()
+    the_file.write_file()
 
-    # Come out of top-level directory
-    os.chdir("../")
 
     return (name + "/" + name + ".sp")
 
@@ -2716,11 +2610,9 @@ def generate_columndecoder_top(name, numberoftgates, decsize):
     # Create directories
     if not os.path.exists(name):
         os.makedirs(name)  
-    # Change to directory    
-    os.chdir(name)
 
     filename = name + ".sp"
-    the_file = open(filename, 'w')
+    the_file = spice.NetlistBuilder(os.path.join(name, filename))
     the_file.write(".TITLE RAM column decoder\n\n")
 
 
@@ -2733,7 +2625,7 @@ def generate_columndecoder_top(name, numberoftgates, decsize):
     the_file.write("********************************************************************************\n")
     the_file.write("** Setup and input\n")
     the_file.write("********************************************************************************\n\n")
-    the_file.write(".TRAN 1p 5n SWEEP DATA=sweep_data\n")
+    the_file.write(".TRAN 'tran_step' '5n * tran_stop_scale' SWEEP DATA=sweep_data\n")
     the_file.write(".OPTIONS BRIEF=1\n\n")
     the_file.write("* Input signal\n")
     the_file.write("VIN n_in gnd PULSE (0 supply_v 0 0 0 2n 4n)\n")
@@ -2793,10 +2685,8 @@ def generate_columndecoder_top(name, numberoftgates, decsize):
         the_file.write("Xtgate"+str(i+1)+" gnd n_2_"+str(i+1)+" n_1_"+str(i+2)+" gnd vdd gnd RAM_tgate\n")
 
     the_file.write(".END")
-    the_file.close()
+    the_file.write_file()
 
-    # Come out of top-level directory
-    os.chdir("../")
 
     return (name + "/" + name + ".sp")
 
@@ -2807,11 +2697,9 @@ def generate_columndecoder_top_lp(name, numberoftgates, decsize):
     # Create directories
     if not os.path.exists(name):
         os.makedirs(name)  
-    # Change to directory    
-    os.chdir(name)
 
     filename = name + ".sp"
-    the_file = open(filename, 'w')
+    the_file = spice.NetlistBuilder(os.path.join(name, filename))
     the_file.write(".TITLE RAM column decoder\n\n")
 
 
@@ -2824,7 +2712,7 @@ def generate_columndecoder_top_lp(name, numberoftgates, decsize):
     the_file.write("********************************************************************************\n")
     the_file.write("** Setup and input\n")
     the_file.write("********************************************************************************\n\n")
-    the_file.write(".TRAN 1p 5n SWEEP DATA=sweep_data\n")
+    the_file.write(".TRAN 'tran_step' '5n * tran_stop_scale' SWEEP DATA=sweep_data\n")
     the_file.write(".OPTIONS BRIEF=1\n\n")
     the_file.write("* Input signal\n")
     the_file.write("VIN n_in gnd PULSE (0 supply_v_lp 0 0 0 2n 4n)\n")
@@ -2884,10 +2772,8 @@ def generate_columndecoder_top_lp(name, numberoftgates, decsize):
         the_file.write("Xtgate"+str(i+1)+" gnd n_2_"+str(i+1)+" n_1_"+str(i+2)+" gnd vdd_lp gnd RAM_tgate\n")
 
     the_file.write(".END")
-    the_file.close()
+    the_file.write_file()
 
-    # Come out of top-level directory
-    os.chdir("../")
 
     return (name + "/" + name + ".sp")
 
@@ -2896,11 +2782,9 @@ def generate_writedriver_top(name, numberofsrams):
     # Create directories
     if not os.path.exists(name):
         os.makedirs(name)  
-    # Change to directory    
-    os.chdir(name)
 
     filename = name + ".sp"
-    the_file = open(filename, 'w')
+    the_file = spice.NetlistBuilder(os.path.join(name, filename))
     the_file.write(".TITLE RAM write driver\n\n")
 
 
@@ -2912,7 +2796,7 @@ def generate_writedriver_top(name, numberofsrams):
     the_file.write("********************************************************************************\n")
     the_file.write("** Setup and input\n")
     the_file.write("********************************************************************************\n\n")
-    the_file.write(".TRAN 1p 5n SWEEP DATA=sweep_data\n")
+    the_file.write(".TRAN 'tran_step' '5n * tran_stop_scale' SWEEP DATA=sweep_data\n")
     the_file.write(".OPTIONS BRIEF=1\n\n")
     the_file.write("* Input signal\n")
     the_file.write("VIN n_in gnd PULSE (0 supply_v 0 0 0 2n 4n)\n")
@@ -2995,10 +2879,8 @@ def generate_writedriver_top(name, numberofsrams):
         the_file.write(".IC V(n_br_"+str(i-1)+") = 'supply_v'\n")  
 
     the_file.write(".END")
-    the_file.close()
+    the_file.write_file()
 
-    # Come out of top-level directory
-    os.chdir("../")
 
     return (name + "/" + name + ".sp")
 
@@ -3008,11 +2890,9 @@ def generate_writedriver_top_lp(name, numberofsrams):
     # Create directories
     if not os.path.exists(name):
         os.makedirs(name)  
-    # Change to directory    
-    os.chdir(name)
 
     filename = name + ".sp"
-    the_file = open(filename, 'w')
+    the_file = spice.NetlistBuilder(os.path.join(name, filename))
     the_file.write(".TITLE RAM write driver\n\n")
 
     the_file.write("********************************************************************************\n")
@@ -3023,7 +2903,7 @@ def generate_writedriver_top_lp(name, numberofsrams):
     the_file.write("********************************************************************************\n")
     the_file.write("** Setup and input\n")
     the_file.write("********************************************************************************\n\n")
-    the_file.write(".TRAN 1p 5n SWEEP DATA=sweep_data\n")
+    the_file.write(".TRAN 'tran_step' '5n * tran_stop_scale' SWEEP DATA=sweep_data\n")
     the_file.write(".OPTIONS BRIEF=1\n\n")
     the_file.write("* Input signal\n")
     the_file.write("VIN n_in gnd PULSE (0 supply_v_lp 0 0 0 2n 4n)\n")
@@ -3104,10 +2984,8 @@ def generate_writedriver_top_lp(name, numberofsrams):
     the_file.write("xsamp1 vdd_lp tgate_l tgate_r n_hang_samp vdd_lp gnd samp1\n")
 
     the_file.write(".END")
-    the_file.close()
+    the_file.write_file()
 
-    # Come out of top-level directory
-    os.chdir("../")
 
     return (name + "/" + name + ".sp")
 
@@ -3119,11 +2997,9 @@ def generate_samp_top_part2(name, numberofsrams, difference):
     # Create directories
     if not os.path.exists(name):
         os.makedirs(name)  
-    # Change to directory    
-    os.chdir(name)
 
     filename = name + ".sp"
-    the_file = open(filename, 'w')
+    the_file = spice.NetlistBuilder(os.path.join(name, filename))
     the_file.write(".TITLE Sense amp\n\n")
 
 
@@ -3136,7 +3012,7 @@ def generate_samp_top_part2(name, numberofsrams, difference):
     the_file.write("********************************************************************************\n")
     the_file.write("** Setup and input\n")
     the_file.write("********************************************************************************\n\n")
-    the_file.write(".TRAN 1p 4n SWEEP DATA=sweep_data\n")
+    the_file.write(".TRAN 'tran_step' '4n * tran_stop_scale' SWEEP DATA=sweep_data\n")
     the_file.write(".OPTIONS BRIEF=1\n\n")
     the_file.write("* Input signal\n")
     the_file.write("VIN n_in gnd PULSE ( supply_v 0 0 0 0 4n 8n)\n")
@@ -3207,10 +3083,8 @@ def generate_samp_top_part2(name, numberofsrams, difference):
     the_file.write("xsamp1 n_in tgate_l tgate_r n_out vdd_se gnd samp1\n")
 
     the_file.write(".END")
-    the_file.close()
+    the_file.write_file()
 
-    # Come out of top-level directory
-    os.chdir("../")
 
     return (name + "/" + name + ".sp")
 
@@ -3222,11 +3096,9 @@ def generate_samp_top_part2_lp(name, numberofsrams, difference):
     # Create directories
     if not os.path.exists(name):
         os.makedirs(name)  
-    # Change to directory    
-    os.chdir(name)
 
     filename = name + ".sp"
-    the_file = open(filename, 'w')
+    the_file = spice.NetlistBuilder(os.path.join(name, filename))
     the_file.write(".TITLE Sense amp\n\n")
 
     the_file.write("********************************************************************************\n")
@@ -3237,7 +3109,7 @@ def generate_samp_top_part2_lp(name, numberofsrams, difference):
     the_file.write("********************************************************************************\n")
     the_file.write("** Setup and input\n")
     the_file.write("********************************************************************************\n\n")
-    the_file.write(".TRAN 1p 4n SWEEP DATA=sweep_data\n")
+    the_file.write(".TRAN 'tran_step' '4n * tran_stop_scale' SWEEP DATA=sweep_data\n")
     the_file.write(".OPTIONS BRIEF=1\n\n")
     the_file.write("* Input signal\n")
     the_file.write("VIN n_in gnd PULSE ( supply_v_lp 0 0 0 0 4n 8n)\n")
@@ -3313,10 +3185,8 @@ def generate_samp_top_part2_lp(name, numberofsrams, difference):
     the_file.write("xsamp1 gnd tgate_l tgate_r n_out vdd_se gnd samp1\n")
 
     the_file.write(".END")
-    the_file.close()
+    the_file.write_file()
 
-    # Come out of top-level directory
-    os.chdir("../")
 
     return (name + "/" + name + ".sp")
 
@@ -3327,11 +3197,9 @@ def generate_samp_top_part1(name, numberofsrams, difference):
     # Create directories
     if not os.path.exists(name):
         os.makedirs(name)  
-    # Change to directory    
-    os.chdir(name)
 
     filename = name + ".sp"
-    the_file = open(filename, 'w')
+    the_file = spice.NetlistBuilder(os.path.join(name, filename))
     the_file.write(".TITLE Sense amp\n\n")
 
 
@@ -3343,7 +3211,7 @@ def generate_samp_top_part1(name, numberofsrams, difference):
     the_file.write("********************************************************************************\n")
     the_file.write("** Setup and input\n")
     the_file.write("********************************************************************************\n\n")
-    the_file.write(".TRAN 1p 4n SWEEP DATA=sweep_data\n")
+    the_file.write(".TRAN 'tran_step' '4n * tran_stop_scale' SWEEP DATA=sweep_data\n")
     the_file.write(".OPTIONS BRIEF=1\n\n")
     the_file.write("* Input signal\n")
     the_file.write("VIN n_in gnd PULSE ( 0 supply_v 0 0 0 4n 8n)\n")
@@ -3383,10 +3251,8 @@ def generate_samp_top_part1(name, numberofsrams, difference):
     the_file.write("xsamp1 n_in tgate_l tgate_r n_out vdd_se gnd samp1\n")
 
     the_file.write(".END")
-    the_file.close()
+    the_file.write_file()
 
-    # Come out of top-level directory
-    os.chdir("../")
 
     return (name + "/" + name + ".sp")
 
@@ -3399,13 +3265,11 @@ def generate_samp_top_part1_lp(name, numberofsrams, difference):
     # Create directories
     if not os.path.exists(name):
         os.makedirs(name)  
-    # Change to directory    
-    os.chdir(name)
 
 
     # Create the file spice file and fill it with the netlist:
     filename = name + ".sp"
-    the_file = open(filename, 'w')
+    the_file = spice.NetlistBuilder(os.path.join(name, filename))
     the_file.write(".TITLE Sense amp\n\n")
 
 
@@ -3417,7 +3281,7 @@ def generate_samp_top_part1_lp(name, numberofsrams, difference):
     the_file.write("********************************************************************************\n")
     the_file.write("** Setup and input\n")
     the_file.write("********************************************************************************\n\n")
-    the_file.write(".TRAN 1p 4n SWEEP DATA=sweep_data\n")
+    the_file.write(".TRAN 'tran_step' '4n * tran_stop_scale' SWEEP DATA=sweep_data\n")
     the_file.write(".OPTIONS BRIEF=1\n\n")
     the_file.write("* Input signal\n")
     the_file.write("VIN n_in gnd PULSE ( 0 supply_v_lp 0 0 0 4n 8n)\n")
@@ -3457,10 +3321,8 @@ def generate_samp_top_part1_lp(name, numberofsrams, difference):
     the_file.write("xsamp1 n_in tgate_l tgate_r n_out vdd_se gnd samp1\n")
 
     the_file.write(".END")
-    the_file.close()
+    the_file.write_file()
 
-    # Come out of top-level directory
-    os.chdir("../")
 
     return (name + "/" + name + ".sp")
 
@@ -3472,14 +3334,12 @@ def generate_samp_top(name, numberofsrams):
     # Create directories
     if not os.path.exists(name):
         os.makedirs(name)  
-    # Change to directory    
-    os.chdir(name)
 
 
 
     # Create the file spice file and fill it with the netlist:
     filename = name + ".sp"
-    the_file = open(filename, 'w')
+    the_file = spice.NetlistBuilder(os.path.join(name, filename))
     the_file.write(".TITLE Sense amp\n\n")
 
 
@@ -3492,7 +3352,7 @@ def generate_samp_top(name, numberofsrams):
     the_file.write("********************************************************************************\n")
     the_file.write("** Setup and input\n")
     the_file.write("********************************************************************************\n\n")
-    the_file.write(".TRAN 1p 4n SWEEP DATA=sweep_data\n")
+    the_file.write(".TRAN 'tran_step' '4n * tran_stop_scale' SWEEP DATA=sweep_data\n")
     the_file.write(".OPTIONS BRIEF=1\n\n")
     the_file.write("* Input signal\n")
     the_file.write("VIN n_in gnd PULSE ( 0 supply_v 400p 0 0 4n 8n)\n")
@@ -3556,10 +3416,8 @@ def generate_samp_top(name, numberofsrams):
     the_file.write("xsamp1 n_in tgate_l tgate_r n_out vdd_se gnd samp1\n")
 
     the_file.write(".END")
-    the_file.close()
+    the_file.write_file()
 
-    # Come out of top-level directory
-    os.chdir("../")
 
     return (name + "/" + name + ".sp")
 
@@ -3570,11 +3428,9 @@ def generate_precharge_top(name, numberofsrams):
     # Create directories
     if not os.path.exists(name):
         os.makedirs(name)  
-    # Change to directory    
-    os.chdir(name)
 
     filename = name + ".sp"
-    the_file = open(filename, 'w')
+    the_file = spice.NetlistBuilder(os.path.join(name, filename))
     the_file.write(".TITLE precharge and equalization\n\n")
 
     half = 0
@@ -3594,7 +3450,7 @@ def generate_precharge_top(name, numberofsrams):
     the_file.write("********************************************************************************\n")
     the_file.write("** Setup and input\n")
     the_file.write("********************************************************************************\n\n")
-    the_file.write(".TRAN 1p 4n SWEEP DATA=sweep_data\n")
+    the_file.write(".TRAN 'tran_step' '4n * tran_stop_scale' SWEEP DATA=sweep_data\n")
     the_file.write(".OPTIONS BRIEF=1\n\n")
     the_file.write("* Input signal\n")
     the_file.write("VIN n_in gnd PULSE (0 supply_v 0 0 0 4n 8n)\n")
@@ -3641,10 +3497,8 @@ def generate_precharge_top(name, numberofsrams):
     the_file.write(".IC V(n_br_0) = 'supply_v'\n")
     the_file.write(".IC V(tgate_r) = 'supply_v'\n")
     the_file.write(".END")
-    the_file.close()
+    the_file.write_file()
 
-    # Come out of top-level directory
-    os.chdir("../")
 
     return (name + "/" + name + ".sp")
 
@@ -3655,11 +3509,9 @@ def generate_precharge_top_lp(name, numberofsrams):
     # Create directories
     if not os.path.exists(name):
         os.makedirs(name)  
-    # Change to directory    
-    os.chdir(name)
 
     filename = name + ".sp"
-    the_file = open(filename, 'w')
+    the_file = spice.NetlistBuilder(os.path.join(name, filename))
     the_file.write(".TITLE precharge and equalization\n\n")
 
     half = 0
@@ -3680,7 +3532,7 @@ def generate_precharge_top_lp(name, numberofsrams):
     the_file.write("********************************************************************************\n")
     the_file.write("** Setup and input\n")
     the_file.write("********************************************************************************\n\n")
-    the_file.write(".TRAN 1p 4n SWEEP DATA=sweep_data\n")
+    the_file.write(".TRAN 'tran_step' '4n * tran_stop_scale' SWEEP DATA=sweep_data\n")
     the_file.write(".OPTIONS BRIEF=1\n\n")
     the_file.write("* Input signal\n")
     the_file.write("VIN n_in gnd PULSE (0 supply_v_lp 0 0 0 4n 8n)\n")
@@ -3727,10 +3579,8 @@ def generate_precharge_top_lp(name, numberofsrams):
     the_file.write(".IC V(n_br_0) = 'supply_v_lp'\n")
     the_file.write(".IC V(tgate_r) = 'supply_v_lp'\n")
     the_file.write(".END")
-    the_file.close()
+    the_file.write_file()
 
-    # Come out of top-level directory
-    os.chdir("../")
 
     return (name + "/" + name + ".sp")
 
@@ -3740,11 +3590,9 @@ def generate_HB_local_mux_top(mux_name, name):
     # Create directories
     if not os.path.exists(mux_name):
         os.makedirs(mux_name)  
-    # Change to directory    
-    os.chdir(mux_name)
     
     connection_block_filename = mux_name + ".sp"
-    local_mux_file = open(connection_block_filename, 'w')
+    local_mux_file = spice.NetlistBuilder(os.path.join(mux_name, connection_block_filename))
     local_mux_file.write(".TITLE RAM Local routing multiplexer\n\n") 
     
     local_mux_file.write("********************************************************************************\n")
@@ -3755,7 +3603,7 @@ def generate_HB_local_mux_top(mux_name, name):
     local_mux_file.write("********************************************************************************\n")
     local_mux_file.write("** Setup and input\n")
     local_mux_file.write("********************************************************************************\n\n")
-    local_mux_file.write(".TRAN 1p 4n SWEEP DATA=sweep_data\n")
+    local_mux_file.write(".TRAN 'tran_step' '4n * tran_stop_scale' SWEEP DATA=sweep_data\n")
     local_mux_file.write(".OPTIONS BRIEF=1\n\n")
     local_mux_file.write("* Input signal\n")
     local_mux_file.write("VIN n_in gnd PULSE (0 supply_v 0 0 0 2n 4n)\n\n")
@@ -3802,10 +3650,8 @@ def generate_HB_local_mux_top(mux_name, name):
     local_mux_file.write("Xwirer_edi n_1_4 n_1_5 wire Rw=wire_"+name+"_1_res Cw=wire_"+name+"_1_cap \n")
     local_mux_file.write("Xff n_1_5 n_hang1 vsram vsram_n vdd gnd gnd vdd gnd vdd vdd gnd ff\n\n")
     local_mux_file.write(".END")
-    local_mux_file.close()
+    local_mux_file.write_file()
 
-    # Come out of top-level directory
-    os.chdir("../")
     
     return (mux_name + "/" + mux_name + ".sp")
 
@@ -3819,11 +3665,9 @@ def generate_RAM_local_mux_top(mux_name):
     # Create directories
     if not os.path.exists(mux_name):
         os.makedirs(mux_name)  
-    # Change to directory    
-    os.chdir(mux_name)
     
     connection_block_filename = mux_name + ".sp"
-    local_mux_file = open(connection_block_filename, 'w')
+    local_mux_file = spice.NetlistBuilder(os.path.join(mux_name, connection_block_filename))
     local_mux_file.write(".TITLE RAM Local routing multiplexer\n\n") 
     
     local_mux_file.write("********************************************************************************\n")
@@ -3834,7 +3678,7 @@ def generate_RAM_local_mux_top(mux_name):
     local_mux_file.write("********************************************************************************\n")
     local_mux_file.write("** Setup and input\n")
     local_mux_file.write("********************************************************************************\n\n")
-    local_mux_file.write(".TRAN 1p 4n SWEEP DATA=sweep_data\n")
+    local_mux_file.write(".TRAN 'tran_step' '4n * tran_stop_scale' SWEEP DATA=sweep_data\n")
     local_mux_file.write(".OPTIONS BRIEF=1\n\n")
     local_mux_file.write("* Input signal\n")
     local_mux_file.write("VIN n_in gnd PULSE (0 supply_v 0 0 0 2n 4n)\n\n")
@@ -3872,10 +3716,8 @@ def generate_RAM_local_mux_top(mux_name):
     local_mux_file.write("Xff n_1_4 n_hang1 vsram vsram_n vdd gnd gnd vdd gnd vdd vdd gnd ff\n\n")
     #im putting a flip flop here for now, if we are going to move it, this needs to change.
     local_mux_file.write(".END")
-    local_mux_file.close()
+    local_mux_file.write_file()
 
-    # Come out of top-level directory
-    os.chdir("../")
     
     return (mux_name + "/" + mux_name + ".sp")
 
@@ -3887,11 +3729,9 @@ def generate_RAM_local_mux_top_lp(mux_name):
     # Create directories
     if not os.path.exists(mux_name):
         os.makedirs(mux_name)  
-    # Change to directory    
-    os.chdir(mux_name)
     
     connection_block_filename = mux_name + ".sp"
-    local_mux_file = open(connection_block_filename, 'w')
+    local_mux_file = spice.NetlistBuilder(os.path.join(mux_name, connection_block_filename))
     local_mux_file.write(".TITLE RAM Local routing multiplexer\n\n") 
     
     local_mux_file.write("********************************************************************************\n")
@@ -3902,7 +3742,7 @@ def generate_RAM_local_mux_top_lp(mux_name):
     local_mux_file.write("********************************************************************************\n")
     local_mux_file.write("** Setup and input\n")
     local_mux_file.write("********************************************************************************\n\n")
-    local_mux_file.write(".TRAN 1p 4n SWEEP DATA=sweep_data\n")
+    local_mux_file.write(".TRAN 'tran_step' '4n * tran_stop_scale' SWEEP DATA=sweep_data\n")
     local_mux_file.write(".OPTIONS BRIEF=1\n\n")
     local_mux_file.write("* Input signal\n")
     local_mux_file.write("VIN n_in gnd PULSE (0 supply_v 0 0 0 2n 4n)\n\n")
@@ -3961,10 +3801,8 @@ def generate_RAM_local_mux_top_lp(mux_name):
     local_mux_file.write("Xff n_1_5 n_hang1 vsram vsram_n vdd_lp gnd gnd vdd_lp gnd vdd_lp vdd gnd ff\n\n")
     #im putting a flip flop here for now, if we are going to move it, this needs to change.
     local_mux_file.write(".END")
-    local_mux_file.close()
+    local_mux_file.write_file()
 
-    # Come out of top-level directory
-    os.chdir("../")
     
     return (mux_name + "/" + mux_name + ".sp")
     
@@ -3980,11 +3818,9 @@ def generate_lut6_top(lut_name, use_tgate):
     # Create directory
     if not os.path.exists(lut_name):
         os.makedirs(lut_name)  
-    # Change to directory    
-    os.chdir(lut_name) 
     
     lut_filename = lut_name + ".sp"
-    lut_file = open(lut_filename, 'w')
+    lut_file = spice.NetlistBuilder(os.path.join(lut_name, lut_filename))
     lut_file.write(".TITLE 6-LUT\n\n") 
     
     lut_file.write("********************************************************************************\n")
@@ -3995,7 +3831,7 @@ def generate_lut6_top(lut_name, use_tgate):
     lut_file.write("********************************************************************************\n")
     lut_file.write("** Setup and input\n")
     lut_file.write("********************************************************************************\n\n")
-    lut_file.write(".TRAN 1p 4n SWEEP DATA=sweep_data\n")
+    lut_file.write(".TRAN 'tran_step' '4n * tran_stop_scale' SWEEP DATA=sweep_data\n")
     lut_file.write(".OPTIONS BRIEF=1\n\n")
     lut_file.write("* Input signal\n")
     lut_file.write("VIN n_in gnd PULSE (0 supply_v 0 0 0 2n 4n)\n\n")
@@ -4077,10 +3913,8 @@ def generate_lut6_top(lut_name, use_tgate):
         lut_file.write("Xlut_output_load n_out n_local_out n_general_out vsram vsram_n vdd gnd vdd vdd lut_output_load\n\n")
     
     lut_file.write(".END")
-    lut_file.close()
+    lut_file.write_file()
 
-    # Come out of lut directory
-    os.chdir("../")
     
     return (lut_name + "/" + lut_name + ".sp")
  
@@ -4097,11 +3931,9 @@ def generate_lut5_top(lut_name, use_tgate):
     # Create directory
     if not os.path.exists(lut_name):
         os.makedirs(lut_name)  
-    # Change to directory    
-    os.chdir(lut_name) 
     
     lut_filename = lut_name + ".sp"
-    lut_file = open(lut_filename, 'w')
+    lut_file = spice.NetlistBuilder(os.path.join(lut_name, lut_filename))
     lut_file.write(".TITLE 5-LUT\n\n") 
     
     lut_file.write("********************************************************************************\n")
@@ -4112,7 +3944,7 @@ def generate_lut5_top(lut_name, use_tgate):
     lut_file.write("********************************************************************************\n")
     lut_file.write("** Setup and input\n")
     lut_file.write("********************************************************************************\n\n")
-    lut_file.write(".TRAN 1p 4n SWEEP DATA=sweep_data\n")
+    lut_file.write(".TRAN 'tran_step' '4n * tran_stop_scale' SWEEP DATA=sweep_data\n")
     lut_file.write(".OPTIONS BRIEF=1\n\n")
     lut_file.write("* Input signal\n")
     lut_file.write("VIN n_in gnd PULSE (0 supply_v 0 0 0 2n 4n)\n\n")
@@ -4168,10 +4000,8 @@ def generate_lut5_top(lut_name, use_tgate):
         lut_file.write("Xlut_output_load n_out n_local_out n_general_out vsram vsram_n vdd gnd vdd vdd lut_output_load\n\n")
     
     lut_file.write(".END")
-    lut_file.close()
+    lut_file.write_file()
 
-    # Come out of lut directory
-    os.chdir("../")
     
     return (lut_name + "/" + lut_name + ".sp") 
  
@@ -4188,11 +4018,9 @@ def generate_lut4_top(lut_name, use_tgate):
     # Create directory
     if not os.path.exists(lut_name):
         os.makedirs(lut_name)  
-    # Change to directory    
-    os.chdir(lut_name) 
     
     lut_filename = lut_name + ".sp"
-    lut_file = open(lut_filename, 'w')
+    lut_file = spice.NetlistBuilder(os.path.join(lut_name, lut_filename))
     lut_file.write(".TITLE 4-LUT\n\n") 
     
     lut_file.write("********************************************************************************\n")
@@ -4203,7 +4031,7 @@ def generate_lut4_top(lut_name, use_tgate):
     lut_file.write("********************************************************************************\n")
     lut_file.write("** Setup and input\n")
     lut_file.write("********************************************************************************\n\n")
-    lut_file.write(".TRAN 1p 4n SWEEP DATA=sweep_data\n")
+    lut_file.write(".TRAN 'tran_step' '4n * tran_stop_scale' SWEEP DATA=sweep_data\n")
     lut_file.write(".OPTIONS BRIEF=1\n\n")
     lut_file.write("* Input signal\n")
     lut_file.write("VIN n_in gnd PULSE (0 supply_v 0 0 0 2n 4n)\n\n")
@@ -4259,10 +4087,8 @@ def generate_lut4_top(lut_name, use_tgate):
         lut_file.write("Xlut_output_load n_out n_local_out n_general_out vsram vsram_n vdd gnd vdd vdd lut_output_load\n\n")
 
     lut_file.write(".END")
-    lut_file.close()
+    lut_file.write_file()
 
-    # Come out of lut directory
-    os.chdir("../")
     
     return (lut_name + "/" + lut_name + ".sp")
     
@@ -4273,11 +4099,9 @@ def generate_lut_driver_top(input_driver_name, input_driver_type):
     # Create directories
     if not os.path.exists(input_driver_name):
         os.makedirs(input_driver_name)  
-    # Change to directory    
-    os.chdir(input_driver_name) 
  
     lut_driver_filename = input_driver_name + ".sp"
-    input_driver_file = open(lut_driver_filename, 'w')
+    input_driver_file = spice.NetlistBuilder(os.path.join(input_driver_name, lut_driver_filename))
     input_driver_file.write(".TITLE " + input_driver_name + " \n\n") 
  
     input_driver_file.write("********************************************************************************\n")
@@ -4288,7 +4112,7 @@ def generate_lut_driver_top(input_driver_name, input_driver_type):
     input_driver_file.write("********************************************************************************\n")
     input_driver_file.write("** Setup and input\n")
     input_driver_file.write("********************************************************************************\n\n")
-    input_driver_file.write(".TRAN 1p 4n SWEEP DATA=sweep_data\n")
+    input_driver_file.write(".TRAN 'tran_step' '4n * tran_stop_scale' SWEEP DATA=sweep_data\n")
     input_driver_file.write(".OPTIONS BRIEF=1\n\n")
     input_driver_file.write("* Input signal\n")
     input_driver_file.write("VIN n_in gnd PULSE (0 supply_v 0 0 0 2n 4n)\n\n")
@@ -4341,10 +4165,8 @@ def generate_lut_driver_top(input_driver_name, input_driver_type):
     input_driver_file.write("X" + input_driver_name + "_load_1 n_out vdd gnd " + input_driver_name + "_load\n")
     input_driver_file.write("X" + input_driver_name + "_load_2 n_out_n vdd gnd " + input_driver_name + "_load\n\n")
     input_driver_file.write(".END")
-    input_driver_file.close()
+    input_driver_file.write_file()
 
-    # Come out of lut_driver directory
-    os.chdir("../")
     
     return (input_driver_name + "/" + input_driver_name + ".sp")
     
@@ -4356,11 +4178,9 @@ def generate_lut_driver_not_top(input_driver_name, input_driver_type):
     input_driver_name_no_not = input_driver_name.replace("_not", "")
     if not os.path.exists(input_driver_name_no_not):
         os.makedirs(input_driver_name_no_not)  
-    # Change to directory    
-    os.chdir(input_driver_name_no_not)    
     
     lut_driver_filename = input_driver_name + ".sp"
-    input_driver_file = open(lut_driver_filename, 'w')
+    input_driver_file = spice.NetlistBuilder(os.path.join(input_driver_name_no_not, lut_driver_filename))
     input_driver_file.write(".TITLE " + input_driver_name + " \n\n") 
     
     input_driver_file.write("********************************************************************************\n")
@@ -4371,7 +4191,7 @@ def generate_lut_driver_not_top(input_driver_name, input_driver_type):
     input_driver_file.write("********************************************************************************\n")
     input_driver_file.write("** Setup and input\n")
     input_driver_file.write("********************************************************************************\n\n")
-    input_driver_file.write(".TRAN 1p 4n SWEEP DATA=sweep_data\n")
+    input_driver_file.write(".TRAN 'tran_step' '4n * tran_stop_scale' SWEEP DATA=sweep_data\n")
     input_driver_file.write(".OPTIONS BRIEF=1\n\n")
     input_driver_file.write("* Input signal\n")
     input_driver_file.write("VIN n_in gnd PULSE (0 supply_v 0 0 0 2n 4n)\n\n")
@@ -4417,10 +4237,8 @@ def generate_lut_driver_not_top(input_driver_name, input_driver_type):
     input_driver_file.write("X" + input_driver_name_no_not + "_load_1 n_out n_vdd n_gnd " + input_driver_name_no_not + "_load\n")
     input_driver_file.write("X" + input_driver_name_no_not + "_load_2 n_out_n n_vdd n_gnd " + input_driver_name_no_not + "_load\n\n")
     input_driver_file.write(".END")
-    input_driver_file.close()
+    input_driver_file.write_file()
 
-    # Come out of lut_driver directory
-    os.chdir("../")
     
     return (input_driver_name_no_not + "/" + input_driver_name + ".sp")    
    
@@ -4431,11 +4249,9 @@ def generate_lut_and_driver_top(input_driver_name, input_driver_type, use_tgate,
     # Create directories
     if not os.path.exists(input_driver_name):
         os.makedirs(input_driver_name)  
-    # Change to directory    
-    os.chdir(input_driver_name)  
     
     lut_driver_filename = input_driver_name + "_with_lut.sp"
-    spice_file = open(lut_driver_filename, 'w')
+    spice_file = spice.NetlistBuilder(os.path.join(input_driver_name, lut_driver_filename))
     spice_file.write(".TITLE " + input_driver_name + " \n\n") 
     
     spice_file.write("********************************************************************************\n")
@@ -4447,7 +4263,7 @@ def generate_lut_and_driver_top(input_driver_name, input_driver_type, use_tgate,
     spice_file.write("********************************************************************************\n")
     spice_file.write("** Setup and input\n")
     spice_file.write("********************************************************************************\n\n")
-    spice_file.write(".TRAN 1p 16n SWEEP DATA=sweep_data\n")
+    spice_file.write(".TRAN 'tran_step' '16n * tran_stop_scale' SWEEP DATA=sweep_data\n")
     spice_file.write(".OPTIONS BRIEF=1\n\n")
     spice_file.write("* Input signal\n")
     spice_file.write("VIN_SRAM n_in_sram gnd PULSE (0 supply_v 4n 0 0 4n 8n)\n")
@@ -4513,10 +4329,8 @@ def generate_lut_and_driver_top(input_driver_name, input_driver_type, use_tgate,
     
     
     spice_file.write(".END")
-    spice_file.close()
+    spice_file.write_file()
 
-    # Come out of lut_driver directory
-    os.chdir("../")  
   
     
 def generate_local_ble_output_top(name, use_tgate):
@@ -4525,11 +4339,9 @@ def generate_local_ble_output_top(name, use_tgate):
     # Create directories
     if not os.path.exists(name):
         os.makedirs(name)  
-    # Change to directory    
-    os.chdir(name)   
     
     local_ble_output_filename = name + ".sp"
-    top_file = open(local_ble_output_filename, 'w')
+    top_file = spice.NetlistBuilder(os.path.join(name, local_ble_output_filename))
     top_file.write(".TITLE Local BLE output\n\n") 
     
     top_file.write("********************************************************************************\n")
@@ -4540,7 +4352,7 @@ def generate_local_ble_output_top(name, use_tgate):
     top_file.write("********************************************************************************\n")
     top_file.write("** Setup and input\n")
     top_file.write("********************************************************************************\n\n")
-    top_file.write(".TRAN 1p 4n SWEEP DATA=sweep_data\n")
+    top_file.write(".TRAN 'tran_step' '4n * tran_stop_scale' SWEEP DATA=sweep_data\n")
     top_file.write(".OPTIONS BRIEF=1\n\n")
     top_file.write("* Input signal\n")
     top_file.write("VIN n_in gnd PULSE (0 supply_v 0 0 0 2n 4n)\n\n")
@@ -4585,10 +4397,8 @@ def generate_local_ble_output_top(name, use_tgate):
 
     top_file.write("Xlocal_ble_output_load n_local_out vsram vsram_n vdd gnd local_ble_output_load\n")
     top_file.write(".END")
-    top_file.close()
+    top_file.write_file()
 
-    # Come out of top-level directory
-    os.chdir("../")
     
     return (name + "/" + name + ".sp")
     
@@ -4599,11 +4409,9 @@ def generate_general_ble_output_top(name, use_tgate):
     # Create directories
     if not os.path.exists(name):
         os.makedirs(name)  
-    # Change to directory    
-    os.chdir(name)  
     
     general_ble_output_filename = name + ".sp"
-    top_file = open(general_ble_output_filename, 'w')
+    top_file = spice.NetlistBuilder(os.path.join(name, general_ble_output_filename))
     top_file.write(".TITLE General BLE output\n\n") 
     
     top_file.write("********************************************************************************\n")
@@ -4614,7 +4422,7 @@ def generate_general_ble_output_top(name, use_tgate):
     top_file.write("********************************************************************************\n")
     top_file.write("** Setup and input\n")
     top_file.write("********************************************************************************\n\n")
-    top_file.write(".TRAN 1p 4n SWEEP DATA=sweep_data\n")
+    top_file.write(".TRAN 'tran_step' '4n * tran_stop_scale' SWEEP DATA=sweep_data\n")
     top_file.write(".OPTIONS BRIEF=1\n\n")
     top_file.write("* Input signal\n")
     top_file.write("VIN n_in gnd PULSE (0 supply_v 0 0 0 2n 4n)\n\n")
@@ -4659,10 +4467,8 @@ def generate_general_ble_output_top(name, use_tgate):
 
     top_file.write("Xgeneral_ble_output_load n_general_out n_hang1 vsram vsram_n vdd gnd general_ble_output_load\n")
     top_file.write(".END")
-    top_file.close()
+    top_file.write_file()
 
-    # Come out of top-level directory
-    os.chdir("../")
     
     return (name + "/" + name + ".sp")
     
@@ -4679,11 +4485,9 @@ def generate_flut_mux_top(name, use_tgate, enable_carry_chain):
     # Create directories
     if not os.path.exists(name):
         os.makedirs(name)  
-    # Change to directory    
-    os.chdir(name)  
     
     filename = name + ".sp"
-    top_file = open(filename, 'w')
+    top_file = spice.NetlistBuilder(os.path.join(name, filename))
     top_file.write(".TITLE General BLE output\n\n") 
     
     top_file.write("********************************************************************************\n")
@@ -4694,7 +4498,7 @@ def generate_flut_mux_top(name, use_tgate, enable_carry_chain):
     top_file.write("********************************************************************************\n")
     top_file.write("** Setup and input\n")
     top_file.write("********************************************************************************\n\n")
-    top_file.write(".TRAN 1p 4n SWEEP DATA=sweep_data\n")
+    top_file.write(".TRAN 'tran_step' '4n * tran_stop_scale' SWEEP DATA=sweep_data\n")
     top_file.write(".OPTIONS BRIEF=1\n\n")
     top_file.write("* Input signal\n")
     top_file.write("VIN n_in gnd PULSE (0 supply_v 0 0 0 2n 4n)\n\n")
@@ -4753,10 +4557,8 @@ def generate_flut_mux_top(name, use_tgate, enable_carry_chain):
 
     top_file.write("Xgeneral_ble_output_load n_general_out n_hang1 vsram vsram_n vdd gnd general_ble_output_load\n")
     top_file.write(".END")
-    top_file.close()
+    top_file.write_file()
 
-    # Come out of top-level directory
-    os.chdir("../")
     
     return (name + "/" + name + ".sp")
 
@@ -4767,11 +4569,9 @@ def generate_cc_mux_top(name, use_tgate):
     # Create directories
     if not os.path.exists(name):
         os.makedirs(name)  
-    # Change to directory    
-    os.chdir(name)  
     
     filename = name + ".sp"
-    top_file = open(filename, 'w')
+    top_file = spice.NetlistBuilder(os.path.join(name, filename))
     top_file.write(".TITLE Carry chain mux\n\n") 
     
     top_file.write("********************************************************************************\n")
@@ -4782,7 +4582,7 @@ def generate_cc_mux_top(name, use_tgate):
     top_file.write("********************************************************************************\n")
     top_file.write("** Setup and input\n")
     top_file.write("********************************************************************************\n\n")
-    top_file.write(".TRAN 1p 4n SWEEP DATA=sweep_data\n")
+    top_file.write(".TRAN 'tran_step' '4n * tran_stop_scale' SWEEP DATA=sweep_data\n")
     top_file.write(".OPTIONS BRIEF=1\n\n")
     top_file.write("* Input signal\n")
     top_file.write("VIN n_in gnd PULSE (0 supply_v 0 0 0 2n 4n)\n\n")
@@ -4831,10 +4631,8 @@ def generate_cc_mux_top(name, use_tgate):
 
     top_file.write("Xgeneral_ble_output_load n_general_out n_hang1 vsram vsram_n vdd gnd general_ble_output_load\n")
     top_file.write(".END")
-    top_file.close()
+    top_file.write_file()
 
-    # Come out of top-level directory
-    os.chdir("../")
     
     return (name + "/" + name + ".sp")
 
@@ -4846,11 +4644,9 @@ def generate_carrychain_top(name, architecture):
     # Create directories
     if not os.path.exists(name):
         os.makedirs(name)  
-    # Change to directory    
-    os.chdir(name)  
     
     filename = name + ".sp"
-    top_file = open(filename, 'w')
+    top_file = spice.NetlistBuilder(os.path.join(name, filename))
     top_file.write(".TITLE Carry Chain\n\n") 
     
     top_file.write("********************************************************************************\n")
@@ -4861,7 +4657,7 @@ def generate_carrychain_top(name, architecture):
     top_file.write("********************************************************************************\n")
     top_file.write("** Setup and input\n")
     top_file.write("********************************************************************************\n\n")
-    top_file.write(".TRAN 1p 26n SWEEP DATA=sweep_data\n")
+    top_file.write(".TRAN 'tran_step' '26n * tran_stop_scale' SWEEP DATA=sweep_data\n")
     top_file.write(".OPTIONS BRIEF=1\n\n")
     top_file.write("* Input signals\n")
 
@@ -4966,10 +4762,8 @@ def generate_carrychain_top(name, architecture):
     # sum typical load
     #top_file.write("Xmux2 vdd n_gnd n_cin n_cout n_sum_out vdd_test gnd FA_carry_chain\n")
     top_file.write(".END")
-    top_file.close()
+    top_file.write_file()
 
-    # Come out of top-level directory
-    os.chdir("../")
     
     return (name + "/" + name + ".sp")
     """
@@ -4979,11 +4773,9 @@ def generate_carry_chain_ripple_top(name):
     # Create directories
     if not os.path.exists(name):
         os.makedirs(name)  
-    # Change to directory    
-    os.chdir(name)  
     
     filename = name + ".sp"
-    top_file = open(filename, 'w')
+    top_file = spice.NetlistBuilder(os.path.join(name, filename))
     top_file.write(".TITLE Carry Chain\n\n") 
     
     top_file.write("********************************************************************************\n")
@@ -4994,7 +4786,7 @@ def generate_carry_chain_ripple_top(name):
     top_file.write("********************************************************************************\n")
     top_file.write("** Setup and input\n")
     top_file.write("********************************************************************************\n\n")
-    top_file.write(".TRAN 1p 26n SWEEP DATA=sweep_data\n")
+    top_file.write(".TRAN 'tran_step' '26n * tran_stop_scale' SWEEP DATA=sweep_data\n")
     top_file.write(".OPTIONS BRIEF=1\n\n")
     top_file.write("* Input signals\n")
 
@@ -5042,10 +4834,8 @@ def generate_carry_chain_ripple_top(name):
     top_file.write("Xthemux n_out n_out2 vdd gnd vdd gnd carry_chain_mux\n")  
 
     top_file.write(".END")
-    top_file.close()
+    top_file.write_file()
 
-    # Come out of top-level directory
-    os.chdir("../")
     
     return (name + "/" + name + ".sp")
     
@@ -5056,11 +4846,9 @@ def generate_carry_chain_skip_top(name, use_tgate):
     # Create directories
     if not os.path.exists(name):
         os.makedirs(name)  
-    # Change to directory    
-    os.chdir(name)  
     
     filename = name + ".sp"
-    top_file = open(filename, 'w')
+    top_file = spice.NetlistBuilder(os.path.join(name, filename))
     top_file.write(".TITLE Carry Chain\n\n") 
     
     top_file.write("********************************************************************************\n")
@@ -5071,7 +4859,7 @@ def generate_carry_chain_skip_top(name, use_tgate):
     top_file.write("********************************************************************************\n")
     top_file.write("** Setup and input\n")
     top_file.write("********************************************************************************\n\n")
-    top_file.write(".TRAN 1p 26n SWEEP DATA=sweep_data\n")
+    top_file.write(".TRAN 'tran_step' '26n * tran_stop_scale' SWEEP DATA=sweep_data\n")
     top_file.write(".OPTIONS BRIEF=1\n\n")
     top_file.write("* Input signals\n")
 
@@ -5119,10 +4907,8 @@ def generate_carry_chain_skip_top(name, use_tgate):
     top_file.write("Xthemux n_out n_out2 vdd gnd vdd gnd carry_chain_mux\n")  
 
     top_file.write(".END")
-    top_file.close()
+    top_file.write_file()
 
-    # Come out of top-level directory
-    os.chdir("../")
     
     return (name + "/" + name + ".sp")
 
@@ -5134,11 +4920,9 @@ def generate_carrychain_top(name):
     # Create directories
     if not os.path.exists(name):
         os.makedirs(name)  
-    # Change to directory    
-    os.chdir(name)  
     
     filename = name + ".sp"
-    top_file = open(filename, 'w')
+    top_file = spice.NetlistBuilder(os.path.join(name, filename))
     top_file.write(".TITLE Carry Chain\n\n") 
     
     top_file.write("********************************************************************************\n")
@@ -5149,7 +4933,7 @@ def generate_carrychain_top(name):
     top_file.write("********************************************************************************\n")
     top_file.write("** Setup and input\n")
     top_file.write("********************************************************************************\n\n")
-    top_file.write(".TRAN 1p 26n SWEEP DATA=sweep_data\n")
+    top_file.write(".TRAN 'tran_step' '26n * tran_stop_scale' SWEEP DATA=sweep_data\n")
     top_file.write(".OPTIONS BRIEF=1\n\n")
     top_file.write("* Input signals\n")
 
@@ -5209,10 +4993,8 @@ def generate_carrychain_top(name):
     top_file.write("Xcarrychain_load vdd gnd n_1_2 n_1_3 n_sum_out2 n_p_3 vdd gnd FA_carry_chain\n")      
 
     top_file.write(".END")
-    top_file.close()
+    top_file.write_file()
 
-    # Come out of top-level directory
-    os.chdir("../")
     
     return (name + "/" + name + ".sp")
     
@@ -5222,11 +5004,9 @@ def generate_carry_inter_top(name):
     # Create directories
     if not os.path.exists(name):
         os.makedirs(name)  
-    # Change to directory    
-    os.chdir(name)  
     
     filename = name + ".sp"
-    top_file = open(filename, 'w')
+    top_file = spice.NetlistBuilder(os.path.join(name, filename))
     top_file.write(".TITLE Carry Chain\n\n") 
     
     top_file.write("********************************************************************************\n")
@@ -5237,7 +5017,7 @@ def generate_carry_inter_top(name):
     top_file.write("********************************************************************************\n")
     top_file.write("** Setup and input\n")
     top_file.write("********************************************************************************\n\n")
-    top_file.write(".TRAN 1p 26n SWEEP DATA=sweep_data\n")
+    top_file.write(".TRAN 'tran_step' '26n * tran_stop_scale' SWEEP DATA=sweep_data\n")
     top_file.write(".OPTIONS BRIEF=1\n\n")
     top_file.write("* Input signals\n")
 
@@ -5288,10 +5068,8 @@ def generate_carry_inter_top(name):
     
 
     top_file.write(".END")
-    top_file.close()
+    top_file.write_file()
 
-    # Come out of top-level directory
-    os.chdir("../")
     
     return (name + "/" + name + ".sp")
 
@@ -5301,11 +5079,9 @@ def generate_carrychainand_top(name, use_tgate, nand1_size, nand2_size):
     # Create directories
     if not os.path.exists(name):
         os.makedirs(name)  
-    # Change to directory    
-    os.chdir(name)  
     
     filename = name + ".sp"
-    top_file = open(filename, 'w')
+    top_file = spice.NetlistBuilder(os.path.join(name, filename))
     top_file.write(".TITLE Carry Chain\n\n") 
     
     top_file.write("********************************************************************************\n")
@@ -5316,7 +5092,7 @@ def generate_carrychainand_top(name, use_tgate, nand1_size, nand2_size):
     top_file.write("********************************************************************************\n")
     top_file.write("** Setup and input\n")
     top_file.write("********************************************************************************\n\n")
-    top_file.write(".TRAN 1p 26n SWEEP DATA=sweep_data\n")
+    top_file.write(".TRAN 'tran_step' '26n * tran_stop_scale' SWEEP DATA=sweep_data\n")
     top_file.write(".OPTIONS BRIEF=1\n\n")
     top_file.write("* Input signals\n")
 
@@ -5384,10 +5160,8 @@ def generate_carrychainand_top(name, use_tgate, nand1_size, nand2_size):
     top_file.write("Xcarrychain_mux n_1_4 n_1_5 vdd gnd vdd gnd carry_chain_mux\n")     
 
     top_file.write(".END")
-    top_file.close()
+    top_file.write_file()
 
-    # Come out of top-level directory
-    os.chdir("../")
     
     return (name + "/" + name + ".sp")
     
@@ -5396,11 +5170,9 @@ def generate_skip_mux_top(name, use_tgate):
     # Create directories
     if not os.path.exists(name):
         os.makedirs(name)  
-    # Change to directory    
-    os.chdir(name)  
     
     filename = name + ".sp"
-    top_file = open(filename, 'w')
+    top_file = spice.NetlistBuilder(os.path.join(name, filename))
     top_file.write(".TITLE Carry Chain\n\n")
 
 
@@ -5413,7 +5185,7 @@ def generate_skip_mux_top(name, use_tgate):
     top_file.write("********************************************************************************\n")
     top_file.write("** Setup and input\n")
     top_file.write("********************************************************************************\n\n")
-    top_file.write(".TRAN 1p 4n SWEEP DATA=sweep_data\n")
+    top_file.write(".TRAN 'tran_step' '4n * tran_stop_scale' SWEEP DATA=sweep_data\n")
     top_file.write(".OPTIONS BRIEF=1\n\n")
     top_file.write("* Input signal\n")
     top_file.write("VIN n_in gnd PULSE (0 supply_v 0 0 0 2n 4n)\n\n")
@@ -5467,10 +5239,8 @@ def generate_skip_mux_top(name, use_tgate):
     top_file.write("Xcarrychain_mux n_1_4 n_1_5 vdd gnd vdd gnd carry_chain_mux\n")     
 
     top_file.write(".END")
-    top_file.close()
+    top_file.write_file()
 
-    # Come out of top-level directory
-    os.chdir("../")
     return (name + "/" + name + ".sp")
 
 
@@ -5479,11 +5249,9 @@ def generate_dedicated_driver_top (name, top_name, num_bufs):
     # Create directories
     if not os.path.exists(name):
         os.makedirs(name)  
-    # Change to directory    
-    os.chdir(name)  
     
     filename = name + ".sp"
-    top_file = open(filename, 'w')
+    top_file = spice.NetlistBuilder(os.path.join(name, filename))
     top_file.write(".TITLE Dedicated Routing Driver\n\n")
 
 
@@ -5496,7 +5264,7 @@ def generate_dedicated_driver_top (name, top_name, num_bufs):
     top_file.write("********************************************************************************\n")
     top_file.write("** Setup and input\n")
     top_file.write("********************************************************************************\n\n")
-    top_file.write(".TRAN 1p 4n SWEEP DATA=sweep_data\n")
+    top_file.write(".TRAN 'tran_step' '4n * tran_stop_scale' SWEEP DATA=sweep_data\n")
     top_file.write(".OPTIONS BRIEF=1\n\n")
     top_file.write("* Input signal\n")
     top_file.write("VIN n_in gnd PULSE (0 supply_v 0 0 0 2n 4n)\n\n")
@@ -5552,8 +5320,6 @@ def generate_dedicated_driver_top (name, top_name, num_bufs):
     top_file.write("Xff n_1_3 n_hang2 vdd gnd vdd nnd gnd vdd gnd vdd vdd gnd ff\n")
    
     top_file.write(".END")
-    top_file.close()
+    top_file.write_file()
 
-    # Come out of top-level directory
-    os.chdir("../")
     return (name + "/" + name + ".sp")
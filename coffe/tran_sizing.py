@@ -9,9 +9,13 @@
 import os
 import math
 import time
+import pickle
+import hashlib
 from . import spice
 from itertools import product
 import sys
+import multiprocessing as mp
+import numpy as np
 
 # This flag controls whether or not to print a bunch of ERF messages to the terminal
 ERF_MONITOR_VERBOSE = True
@@ -20,6 +24,58 @@ ERF_MONITOR_VERBOSE = True
 ERF_ERROR_TOLERANCE = 0.1
 # Maximum number of times the algorithm will try to meet ERF_ERROR_TOLERANCE before quitting.
 ERF_MAX_ITERATIONS = 4
+# The ERF of an inverter makes its NMOS or PMOS at most ERF_MAX_SIZE_RATIO times larger than the other one.
+# The upper bound of that size is found by simulating the candidate sizes in rounds of doubling length. 
+# For bulk, ERF_REFINE_NUM_SIZES evenly spaced sizes between the bound and the size before it are then 
+# simulated in one sweep, and the balanced size is interpolated between the two closest of these sizes.
+ERF_MAX_SIZE_RATIO = 4
+ERF_REFINE_NUM_SIZES = 7
+# The joint ERF mode (see erf_inverters_jointly) tries ERF_JOINT_NUM_RATIOS P/N ratios for every inverter in one sweep.
+ERF_JOINT_NUM_RATIOS = 9
+# Number of sizing combos of a coarse ranking sweep that are simulated again with the fine 
+# transient profile to check the coarse ranking.
+RANK_CHECK_NUM_COMBOS = 10
+# Surrogate-model pruning of the sizing combos (see prune_sizing_combos). Only sweeps with more 
+# than SURROGATE_MIN_COMBOS combos are pruned. The space-filling sample that the model is fitted to 
+# has SURROGATE_SAMPLES_PER_TERM combos per term of the model (at least SURROGATE_MIN_SAMPLES).
+# Combos predicted to cost at most SURROGATE_MIN_BAND more than the predicted best are always simulated.
+SURROGATE_MIN_COMBOS = 100
+SURROGATE_SAMPLES_PER_TERM = 2
+SURROGATE_MIN_SAMPLES = 10
+SURROGATE_MIN_BAND = 0.01
+# In the parallel sizing mode, every subcircuit is sized in this scratch folder (see spice._create_scratch_copy)
+# and the output of its worker process goes to a log file in the sizing_results folder.
+PARALLEL_SIZING_SCRATCH_PREFIX = "sizing_"
+# The state of the FPGA transistor sizing is saved to this file in the architecture folder before 
+# every subcircuit is sized and after every sizing iteration (see _SizingCheckpoint).
+SIZING_CHECKPOINT_FILENAME = "sizing_checkpoint.pkl"
+# The run options that change the sizing results. A checkpoint is only resumed with the architecture and 
+# the values of these options it was saved with. The number of iterations can change, to size for longer.
+CHECKPOINT_RUN_OPTIONS = ["opt_type", "initial_sizes", "re_erf", "area_opt_weight", "delay_opt_weight", "size_hb_interfaces", 
+						  "quick_mode", "spice_backend", "coarse_tran_step", "coarse_tran_stop_scale", "surrogate_pruning", 
+						  "search_strategy", "joint_erf", "erf_reuse", "sim_budget", "sim_budget_unit", "optimize_height", 
+						  "parallel_sizing"]
+# Search strategies that can replace the grid search over the sizing ranges (see SEARCH_STRATEGIES).
+# Every step of a strategy simulates the new combos it asks for in one HSPICE sweep, and a strategy 
+# takes at most SEARCH_MAX_STEPS steps. Coordinate descent sweeps COORDINATE_SEARCH_RADIUS sizes on 
+# each side of the current size. Pattern search and Nelder-Mead start with steps of 
+# PATTERN_SEARCH_INITIAL_STEP and NELDER_MEAD_INITIAL_STEP sizes.
+SEARCH_GRID = "grid"
+SEARCH_MAX_STEPS = 50
+COORDINATE_SEARCH_RADIUS = 3
+PATTERN_SEARCH_INITIAL_STEP = 4
+NELDER_MEAD_INITIAL_STEP = 2
+# Rough target for the number of sizing combos of a search over the sizing ranges (see update_sizing_ranges).
+MAX_SIZING_COMBINATIONS = 4000
+# With a simulation budget (see SimulationBudget), in seconds of simulator time or in simulations, the number of 
+# combos and of re-ERFs of every search are chosen from the budget instead. At most BUDGET_RE_ERF_SHARE of the 
+# budget of a search goes to re-ERFs. A subcircuit whose number of searches is not known yet is expected to take 
+# BUDGET_SEARCHES_PER_GROUP searches per transistor group, and every subcircuit gets at least BUDGET_MIN_SHARE.
+BUDGET_UNIT_SECONDS = "seconds"
+BUDGET_UNIT_SIMULATIONS = "simulations"
+BUDGET_RE_ERF_SHARE = 0.25
+BUDGET_SEARCHES_PER_GROUP = 2
+BUDGET_MIN_SHARE = 0.02
 
 
 
@@ -556,13 +612,73 @@ def cost_function(area, delay, area_opt_weight, delay_opt_weight):
 	return pow(area,area_opt_weight)*pow(delay,delay_opt_weight)
 	
 
+def _get_erf_candidate_sizes(inv_size, use_finfet):
+	""" 
+	Returns the sizes we try for the transistor we make bigger to ERF an inverter of size 'inv_size', 
+	in increasing order. For bulk, the sizes go up by 'inv_size' nanometers, for FinFETs by one fin.
+	The last size is the first one that is more than ERF_MAX_SIZE_RATIO times 'inv_size'.
+	"""
+
+	candidate_sizes = [inv_size]
+	while candidate_sizes[-1]/inv_size <= ERF_MAX_SIZE_RATIO:
+		if not use_finfet:
+			candidate_sizes.append((len(candidate_sizes) + 1)*inv_size)
+		else:
+			candidate_sizes.append(inv_size + len(candidate_sizes))
+
+	return candidate_sizes
+
+
+def _get_erf_sweep_parameter_dict(parameter_dict, target_tran_name, target_tran_sizes, use_finfet):
+	""" 
+	Returns a parameter dict for an HSPICE sweep over 'target_tran_sizes' for the transistor 'target_tran_name'. 
+	All other parameters keep the value they have in 'parameter_dict'.
+	"""
+
+	# Normally when we change transistor sizes, we should recalculate areas
+	# and wire RC to account for the change. In this case, however, we are going
+	# to make the simplifying assumption that the changes we are making will not
+	# have a significant impact on area and on wire lengths. Thus, we save CPU time
+	# and just use the same wire RC for this part of the algorithm. 
+	sweep_parameter_dict = {}
+	for name, values in parameter_dict.items():
+		sweep_parameter_dict[name] = [values[0]]*len(target_tran_sizes)
+
+	# The target transistor size is in nm for bulk and number of fins for FinFETs
+	if not use_finfet:
+		sweep_parameter_dict[target_tran_name] = [1e-9*size for size in target_tran_sizes]
+	else:
+		sweep_parameter_dict[target_tran_name] = list(target_tran_sizes)
+
+	return sweep_parameter_dict
+
+
+def _interpolate_erf_size(sizes, diffs, is_pmos):
+	""" 
+	Returns the size where tfall-trise crosses zero, interpolating linearly between the two closest 
+	sizes on either side of the crossing, and these two sizes.
+	'sizes' must be in increasing order, and 'diffs' is the measured tfall-trise of each size. Making 
+	the PMOS bigger makes tfall-trise go up, making the NMOS bigger makes it go down.
+	"""
+
+	for i in range(1, len(sizes)):
+		if (is_pmos and diffs[i] > 0) or (not is_pmos and diffs[i] < 0):
+			break
+	lower_size, upper_size = sizes[i-1], sizes[i]
+	lower_diff, upper_diff = diffs[i-1], diffs[i]
+	balanced_size = lower_size + (upper_size - lower_size)*lower_diff/(lower_diff - upper_diff)
+
+	return balanced_size, lower_size, upper_size
+
+
 def erf_inverter_balance_trise_tfall(sp_path,
 									 inv_name,
 									 inv_size,
 									 target_tran_name,
 									 parameter_dict,
 									 fpga_inst,
-									 spice_interface):
+									 spice_interface,
+									 start_size=None):
 	"""
 	This function will balance the rise and fall delays of an inverter by either making the 
 	NMOS bigger or the PMOS bigger.
@@ -586,8 +702,12 @@ def erf_inverter_balance_trise_tfall(sp_path,
 		An FPGA object.
 	spice_interface
 		A spice interface object.
+	start_size
+		Size of target_tran_name that probably balances the inverter (e.g. from an ERF ratio
+		store). If given, the upper bound search starts at the candidate size below it.
 
-	Returns: target_tran_size, which is the size for target_tran_name that gives ERF
+	Returns: target_tran_size, which is the size for target_tran_name that gives ERF. Returns None
+	if the search started from 'start_size' and its first size is already an upper bound.
 	"""
 
 	# This function will balance the rise and fall times of an inverter by either making 
@@ -607,119 +727,131 @@ def erf_inverter_balance_trise_tfall(sp_path,
 		parameter_dict[inv_name + "_pmos"] = [inv_size]
 
 	# The first thing we are going to do is increase the PMOS size in fixed increments
-	# to get an upper bound on the PMOS size. We also monitor trise. We expect that 
+	# to get an upper bound on the PMOS size. We simulate the candidate sizes in rounds of 
+	# 2, 2, 4, 8, etc. sizes with one HSPICE sweep per round, so the number of HSPICE runs only 
+	# grows with the log of the number of sizes we need to try. We also monitor trise. We expect that 
 	# increasing the PMOS size will decrease trise and increase tfall (because we are making
 	# the pull up stronger). If at any time, we see that increasing the PMOS is increasing 
 	# trise, we should stop increasing the PMOS size. We might be self-loading the inverter.
 	if ERF_MONITOR_VERBOSE:
 		print("Looking for " + target_tran_name + " size upper bound")
+	candidate_sizes = _get_erf_candidate_sizes(inv_size, fpga_inst.specs.use_finfet)
 	upper_bound_not_found = True
 	self_loading = False
-	bulk_multiplication_factor = 1
-	finfet_num_fins = inv_size
 	valid_delays = True
+	# The sizes we simulated so far and their tfall-trise, in increasing size order
+	measured_sizes = []
+	measured_diffs = []
 
 	previous_tfall = 1
 	previous_trise = 1
+	first_index = 0
+	if start_size is not None:
+		first_index = max([i for i in range(len(candidate_sizes)) if candidate_sizes[i] <= start_size] + [0])
+	round_start = first_index
 	while upper_bound_not_found and not self_loading:
-		# Increase the target transistor size, update parameter dict and run HSPICE
-		# The target transistor size is in nm for bulk and number of fins for FinFETs
-		if not fpga_inst.specs.use_finfet :
-			target_tran_size = bulk_multiplication_factor*inv_size
-			parameter_dict[target_tran_name][0] = 1e-9*target_tran_size
-			spice_meas = spice_interface.run(sp_path, parameter_dict)
-		else :
-			target_tran_size = finfet_num_fins
-			parameter_dict[target_tran_name][0] = target_tran_size
-			spice_meas = spice_interface.run(sp_path, parameter_dict)
-		
-		# Get the rise and fall measurements for our inverter out of 'spice_meas'
-		# This was a single HSPICE run, so the value we want is at index 0
-		tfall_str = spice_meas["meas_" + inv_name + "_tfall"][0]
-		trise_str = spice_meas["meas_" + inv_name + "_trise"][0]
-
-		# Check if the HSPICE measurement failed. If it did, this might mean that the level
-		# restorers are too strong which messes up one of the transitions. Making the gate
-		# length for the level restorers larger could solve this problem.
-		# Note that it's also possible that something else is causing the failure...
-		if tfall_str == "failed" or trise_str == "failed":
-			print("ERROR: HSPICE measurement failed.")
-			print("Consider increasing level-restorers gate length by increasing the 'rest_length_factor' parameter in the input file.")
-			exit(1)
+		# The last candidate size is too large, so we always stop before we run out of candidates
+		round_sizes = candidate_sizes[round_start:round_start + max(round_start - first_index, 2)]
+		round_start += len(round_sizes)
+		sweep_parameter_dict = _get_erf_sweep_parameter_dict(parameter_dict, target_tran_name, round_sizes, fpga_inst.specs.use_finfet)
+		spice_meas = spice_interface.run(sp_path, sweep_parameter_dict)
 
-		tfall = float(tfall_str)
-		trise = float(trise_str)
+		# Look at the sizes of this round in increasing order, like we would if we simulated them one by one
+		for i in range(len(round_sizes)):
+			target_tran_size = round_sizes[i]
 
-		# Sometimes we increase the transistor to a point where the delay
-		# would be negative. I.e. the transition at the output is faster than the transition
-		# at the input. This can cause COFFE to measure a 'negative' delay.
-		# In this case, we stop ERF attempt.
-		if tfall < 0 or trise < 0 :
-			print("Negative delay detected during ERF. Output transition may be faster than input transition. Stopping upper bound search.")
-			upper_bound_not_found = False
-			valid_delays = False
+			# Get the rise and fall measurements for our inverter out of 'spice_meas'
+			tfall_str = spice_meas["meas_" + inv_name + "_tfall"][i]
+			trise_str = spice_meas["meas_" + inv_name + "_trise"][i]
 
+			# Check if the HSPICE measurement failed. If it did, this might mean that the level
+			# restorers are too strong which messes up one of the transitions. Making the gate
+			# length for the level restorers larger could solve this problem.
+			# Note that it's also possible that something else is causing the failure...
+			if tfall_str == "failed" or trise_str == "failed":
+				print("ERROR: HSPICE measurement failed.")
+				print("Consider increasing level-restorers gate length by increasing the 'rest_length_factor' parameter in the input file.")
+				exit(1)
 
-		if ERF_MONITOR_VERBOSE:
-			if "_pmos" in target_tran_name:
-				sizing_bounds_str = ("NMOS=" + str(inv_size) + 
-									 "  PMOS=" + str(target_tran_size))
-			else:
-				sizing_bounds_str = ("NMOS=" + str(target_tran_size) + 
-									 "  PMOS=" + str(inv_size))
-			print((sizing_bounds_str + ": tfall=" + tfall_str + " trise=" + trise_str + 
-				   " diff=" + str(tfall-trise)))
+			tfall = float(tfall_str)
+			trise = float(trise_str)
+			measured_sizes.append(target_tran_size)
+			measured_diffs.append(tfall-trise)
 
-		# We accept negative delays on the first inverter in a driver.
-		if "_1_" not in target_tran_name and "_0_" not in target_tran_name and "_2_" not in target_tran_name:
+			# Sometimes we increase the transistor to a point where the delay
+			# would be negative. I.e. the transition at the output is faster than the transition
+			# at the input. This can cause COFFE to measure a 'negative' delay.
+			# In this case, we stop ERF attempt.
 			if tfall < 0 or trise < 0 :
-				print("ERROR: Unexpected negative delay.")
-				if not fpga_inst.specs.use_finfet:
-					exit(1)
-				else:
-					# Hack to fix finfets becoming to strong (weird things were happening to the waveforms)
-					if finfet_num_fins != inv_size:
-						finfet_num_fins -= 1
-						
-
-		# Figure out if we have found the upper bound by looking at tfall and trise. 
-		# For a PMOS, upper bound is found if tfall > trise
-		# For an NMOS, upper bound is found if tfall < trise 
-		# We use the transistor name to figure out if our target tran is an NMOS or PMOS
-		if "_pmos" in target_tran_name:
-			if tfall > trise:
+				print("Negative delay detected during ERF. Output transition may be faster than input transition. Stopping upper bound search.")
 				upper_bound_not_found = False
-				if ERF_MONITOR_VERBOSE:
-					print("Upper bound found, PMOS=" + str(target_tran_size))
-			else:
-				# Check if trise is increasing or decreasing by comparing to previous trise
-				if trise >= previous_trise or target_tran_size/inv_size > 4:
-					self_loading = True
+				valid_delays = False
+
+
+			if ERF_MONITOR_VERBOSE:
+				if "_pmos" in target_tran_name:
+					sizing_bounds_str = ("NMOS=" + str(inv_size) + 
+										 "  PMOS=" + str(target_tran_size))
+				else:
+					sizing_bounds_str = ("NMOS=" + str(target_tran_size) + 
+										 "  PMOS=" + str(inv_size))
+				print((sizing_bounds_str + ": tfall=" + tfall_str + " trise=" + trise_str + 
+					   " diff=" + str(tfall-trise)))
+
+			# We accept negative delays on the first inverter in a driver.
+			# FinFETs can also become too strong (weird things were happening to the waveforms), 
+			# for them we just stop the upper bound search.
+			if "_1_" not in target_tran_name and "_0_" not in target_tran_name and "_2_" not in target_tran_name:
+				if tfall < 0 or trise < 0 :
+					print("ERROR: Unexpected negative delay.")
+					if not fpga_inst.specs.use_finfet:
+						exit(1)
+
+			# Figure out if we have found the upper bound by looking at tfall and trise. 
+			# For a PMOS, upper bound is found if tfall > trise
+			# For an NMOS, upper bound is found if tfall < trise 
+			# We use the transistor name to figure out if our target tran is an NMOS or PMOS
+			if "_pmos" in target_tran_name:
+				if tfall > trise:
+					upper_bound_not_found = False
 					if ERF_MONITOR_VERBOSE:
-						print("Increasing PMOS is no longer decreasing trise")
-						print(("or the ratio is too large, using PMOS=" + 
-							   str(target_tran_size)))
-						print("")
-				previous_trise = trise    
-		else:
-			if trise > tfall:
-				upper_bound_not_found = False
-				if ERF_MONITOR_VERBOSE:
-					print("Upper bound found, NMOS=" + str(target_tran_size))
+						print("Upper bound found, PMOS=" + str(target_tran_size))
+				else:
+					# Check if trise is increasing or decreasing by comparing to previous trise
+					if trise >= previous_trise or target_tran_size/inv_size > ERF_MAX_SIZE_RATIO:
+						self_loading = True
+						if ERF_MONITOR_VERBOSE:
+							print("Increasing PMOS is no longer decreasing trise")
+							print(("or the ratio is too large, using PMOS=" + 
+								   str(target_tran_size)))
+							print("")
+					previous_trise = trise    
 			else:
-				# Check if tfall is increasing or decreasing by comparing to previous tfall
-				if tfall >= previous_tfall or target_tran_size/inv_size > 4:
-					self_loading = True
+				if trise > tfall:
+					upper_bound_not_found = False
 					if ERF_MONITOR_VERBOSE:
-						print("Increasing NMOS is no longer decreasing tfall ")
-						print(("or the ratio is too large, using NMOS=" + 
-							   str(target_tran_size)))
-				previous_tfall = tfall   
-
-		# For bulk, this will increment the target transistor size by another 'inv_size'
-		bulk_multiplication_factor += 1
-		# For FinFETs, this will increment the target transistor size by one fin
-		finfet_num_fins += 1
+						print("Upper bound found, NMOS=" + str(target_tran_size))
+				else:
+					# Check if tfall is increasing or decreasing by comparing to previous tfall
+					if tfall >= previous_tfall or target_tran_size/inv_size > ERF_MAX_SIZE_RATIO:
+						self_loading = True
+						if ERF_MONITOR_VERBOSE:
+							print("Increasing NMOS is no longer decreasing tfall ")
+							print(("or the ratio is too large, using NMOS=" + 
+								   str(target_tran_size)))
+					previous_tfall = tfall   
+
+			# The sizes after this one are larger than we need
+			if not upper_bound_not_found or self_loading:
+				break
+
+		# If we started above the smallest size and the first size we tried is already an upper bound,  
+		# we don't know where the lower bound is, nor even if it's this transistor we have to make bigger.
+		# The caller has to start over without a start size.
+		if first_index > 0 and not upper_bound_not_found and len(measured_sizes) == 1:
+			if ERF_MONITOR_VERBOSE:
+				print("Upper bound is the first size tried, starting over without the start size")
+			return None
 
 	# At this point, we have found an upper bound for our target transistor. If the 
 	# inverter is self-loaded, we are just going to use whatever transistor size we 
@@ -729,94 +861,19 @@ def erf_inverter_balance_trise_tfall(sp_path,
 	# That is, once we find the upper bound, there isn't much more we can do to balance
 	# the rise and fall for FinFETs (we are limited by number of fins). With bulk on the 
 	# other hand, we have "nanometer granularity" so we can refine the ERF more.
-	if valid_delays and not self_loading and not fpga_inst.specs.use_finfet:      
-
-		# The trise/tfall equality occurs in [target_tran_size-inv_size, target_tran_size]
-		# To find it, we'll sweep this range in two steps. In the first step, we'll sweep
-		# it in increments of min_tran_width. This will allow us to narrow down the range
-		# where equality occurs. In the second step, we'll sweep the new smaller range with
-		# a 1 nm granularity. This two step approach is meant to reduce runtime, but I have
-		# no data proving that it actually does reduce runtime.
-		nm_size_lower_bound = target_tran_size - inv_size
-		nm_size_upper_bound = target_tran_size
-		interval = fpga_inst.specs.min_tran_width
-
-		# Create a list of transistor sizes we want to try
-		nm_size_list = []
-		current_nm_size = nm_size_lower_bound
-		while current_nm_size <= nm_size_upper_bound:
-			nm_size_list.append(current_nm_size)
-			current_nm_size += interval
-		 
-		# Normally when we change transistor sizes, we should recalculate areas
-		# and wire RC to account for the change. In this case, however, we are going
-		# to make the simplifying assumption that the changes we are making will not
-		# have a significant impact on area and on wire lengths. Thus, we save CPU time
-		# and just use the same wire RC for this part of the algorithm. 
-		#
-		# So what we are going to do here is use the parameter_dict that we defined earlier
-		# in this function to populate a new parameter dict for the HSPICE sweep that we
-		# want to do. All parameters will keep the same value as the one in parameter_dict
-		# except for the target transistor that we want to sweep.
-		sweep_parameter_dict = {}
-		for i in range(len(nm_size_list)):
-			for name in list(parameter_dict.keys()):
-				# Get the value from the existing dictionary and only change it if it's our
-				# target transistor.
-				value = parameter_dict[name][0]
-				if name == target_tran_name:
-					value = 1e-9*nm_size_list[i]
-
-				# On the first iteration, we have to add the lists themselves, but every 
-				# other iteration we can just append to the lists.
-				if i == 0:
-					sweep_parameter_dict[name] = [value]
-				else:
-					sweep_parameter_dict[name].append(value)
+	# If the upper bound is the first size we tried, the inverter is as balanced as it gets.
+	if valid_delays and not self_loading and not fpga_inst.specs.use_finfet and len(measured_sizes) > 1:      
 
-		# Run HSPICE sweep
-		if ERF_MONITOR_VERBOSE:
-			print("Running HSPICE sweep on: " + sp_path + "")
-
-		spice_meas = spice_interface.run(sp_path, sweep_parameter_dict)
-		
-		# Find the new interval where the tfall trise equality occurs.
-		for i in range(len(nm_size_list)):
-			tfall_str = spice_meas["meas_" + inv_name + "_tfall"][i]
-			trise_str = spice_meas["meas_" + inv_name + "_trise"][i]
-			tfall = float(tfall_str)
-			trise = float(trise_str)
-		 
-			# We are making the PMOS bigger, that means that initially, tfall was smaller
-			# than trise. At some point, making the PMOS larger will make trise smaller 
-			# than tfall. That's what we use to identify our ERF transistor size interval. 
-			if "_pmos" in target_tran_name:
-				if tfall > trise:
-					nm_size_upper_bound = nm_size_list[i]
-					nm_size_lower_bound = nm_size_list[i-1]
-					break
-			# We are making the NMOS bigger, that means that initially, trise was smaller 
-			# than tfall. At some point, making the NMOS larger will make tfall smaller
-			# than trise. That's what we use to identify our ERF transistor size interval.
-			else:
-				if trise > tfall:
-					nm_size_upper_bound = nm_size_list[i]
-					nm_size_lower_bound = nm_size_list[i-1]
-					break
-			   
-		# checks to see if indicies are swapped
-		# this was a work around when there was bug and was not too clear as to what was happening 
-		# it should no longer be necessary, but there's not harm in checking anyways
-		# if the lower bound is larger than the upper bound, the lower bound becomes the upper bound
-		# and vice versa. The net effect is that in the 1nm sweep, we'll just sweep more sizes.
-		if nm_size_lower_bound > nm_size_upper_bound:
-			print("***WARNING: ERF boundaries were swapped.***")
-			temp_size = nm_size_upper_bound
-			nm_size_upper_bound = nm_size_lower_bound
-			nm_size_lower_bound = temp_size
+		# The trise/tfall equality occurs in [target_tran_size-inv_size, target_tran_size].
+		# To find it, we'll sweep this range with a few evenly spaced sizes in one HSPICE sweep. 
+		# Then we interpolate tfall-trise between the two closest sizes on either side of the 
+		# equality and round to 1 nm.
+		is_pmos = "_pmos" in target_tran_name
+		nm_size_lower_bound = measured_sizes[-2]
+		nm_size_upper_bound = measured_sizes[-1]
 
 		if ERF_MONITOR_VERBOSE:
-			if "_pmos" in target_tran_name:
+			if is_pmos:
 				print(("ERF PMOS size in range: [" + 
 					   str(int(nm_size_lower_bound)) + ", " + 
 					   str(int(nm_size_upper_bound)) + "]"))
@@ -824,44 +881,25 @@ def erf_inverter_balance_trise_tfall(sp_path,
 				print(("ERF NMOS size in range: [" + 
 					   str(int(nm_size_lower_bound)) + ", " + 
 					   str(int(nm_size_upper_bound)) + "]"))
-		
-		# We know that ERF is in between nm_size_lower_bound and nm_size_upper_bound
-		# Now we'll sweep this interval with a 1 nm step.
-		interval = 1
-		# Create a list of transistor sizes we want to try
+
+		# Create a list of transistor sizes we want to try (at least 1 nm apart)
+		interval = (nm_size_upper_bound - nm_size_lower_bound)/(ERF_REFINE_NUM_SIZES + 1)
 		nm_size_list = []
-		current_nm_size = nm_size_lower_bound
-		while current_nm_size <= nm_size_upper_bound:
-			nm_size_list.append(current_nm_size)
-			current_nm_size += interval
-		
-		# Make a new sweep parameter dict
-		sweep_parameter_dict = {}
-		for i in range(len(nm_size_list)):
-			for name in list(parameter_dict.keys()):
-				# Get the value from the existing dictionary and only change it if it's our
-				# target transistor.
-				value = parameter_dict[name][0]
-				if name == target_tran_name:
-					value = 1e-9*nm_size_list[i]
-
-				# On the first iteration, we have to add the lists themselves, but every 
-				# other iteration we can just append to the lists.
-				if i == 0:
-					sweep_parameter_dict[name] = [value]
-				else:
-					sweep_parameter_dict[name].append(value)
+		for i in range(1, ERF_REFINE_NUM_SIZES + 1):
+			current_nm_size = round(nm_size_lower_bound + i*interval)
+			if current_nm_size not in nm_size_list and nm_size_lower_bound < current_nm_size < nm_size_upper_bound:
+				nm_size_list.append(current_nm_size)
 
 		# Run HSPICE sweep
 		if ERF_MONITOR_VERBOSE:
 			print("Running HSPICE sweep on: " + sp_path + "")
-		spice_meas = spice_interface.run(sp_path, sweep_parameter_dict)
+		if len(nm_size_list) > 0:
+			sweep_parameter_dict = _get_erf_sweep_parameter_dict(parameter_dict, target_tran_name, nm_size_list, fpga_inst.specs.use_finfet)
+			spice_meas = spice_interface.run(sp_path, sweep_parameter_dict)
 
-		# This time around, we want to select the PMOS size that makes the difference
-		# between trise and tfall as small as possible. (we know that the minimum
-		# was in the interval we just swept)
-		current_best_tfall_trise_balance = 1
-		best_index = 0
+		# Add the new sizes to the two sizes around the equality
+		refined_sizes = [nm_size_lower_bound]
+		refined_diffs = [measured_diffs[-2]]
 		for i in range(len(nm_size_list)):
 			tfall_str = spice_meas["meas_" + inv_name + "_tfall"][i]
 			trise_str = spice_meas["meas_" + inv_name + "_trise"][i]
@@ -869,17 +907,16 @@ def erf_inverter_balance_trise_tfall(sp_path,
 			# from crashing but it will throw away that part of the results
 			try:
 				tfall = float(tfall_str)
-			except ValueError:
-				tfall = 1;
-			try:
 				trise = float(trise_str)
 			except ValueError:
-				trise = 2;
-			diff = abs(tfall-trise)
-			if diff < current_best_tfall_trise_balance:
-				current_best_tfall_trise_balance = diff
-				best_index = i
-		target_tran_size = nm_size_list[best_index]
+				continue
+			refined_sizes.append(nm_size_list[i])
+			refined_diffs.append(tfall-trise)
+		refined_sizes.append(nm_size_upper_bound)
+		refined_diffs.append(measured_diffs[-1])
+
+		balanced_size, lower_size, upper_size = _interpolate_erf_size(refined_sizes, refined_diffs, is_pmos)
+		target_tran_size = float(min(max(round(balanced_size), lower_size), upper_size))
 
 		if ERF_MONITOR_VERBOSE:
 			print("ERF PMOS size is " + str(target_tran_size) + "\n")
@@ -896,7 +933,8 @@ def erf_inverter(sp_path,
 				 inv_drive_strength, 
 				 parameter_dict,
 				 fpga_inst, 
-				 spice_interface):
+				 spice_interface,
+				 start_ratio=None):
 	""" 
 	Equalize the rise and fall delays of an inverter by increasing the size of either the
 	NMOS or the PMOS transistor.
@@ -916,6 +954,10 @@ def erf_inverter(sp_path,
 
 	spice_interface
 		A spice interface object
+
+	start_ratio
+		A P/N ratio that probably balances the inverter (e.g. from an ERF ratio store). If given,
+		we make the transistor it makes bigger bigger, starting the search from that size.
 	"""        
 	
 	if ERF_MONITOR_VERBOSE:
@@ -944,52 +986,85 @@ def erf_inverter(sp_path,
 		parameter_dict[nmos_name][0] = inv_size
 		parameter_dict[pmos_name][0] = inv_size
 
-	# The NMOS and PMOS sizes of this inverter are both equal to 'inv_size' right now.
-	# That is, they are equal. We'll run HSPICE on the circuit to get initial rise and fall
-	# delays. Then, we'll use these delays to figure out if it's the NMOS we need to 
-	# make bigger to balance rise/fall or the PMOS.
-	spice_meas = spice_interface.run(sp_path, parameter_dict)
-	
-	# Get the rise and fall measurements for our inverter out of 'spice_meas'
-	# This was a single HSPICE run, so the value we want is at index 0
-
-
-	inv_tfall_str = spice_meas["meas_" + inv_name + "_tfall"][0]
-	inv_trise_str = spice_meas["meas_" + inv_name + "_trise"][0]
-	
-	# Check if the HSPICE measurement failed. If it did, this might mean that the level
-	# restorers are too strong which messes up one of the transitions. Making the gate
-	# length for the level restorers larger could solve this problem.
-	# Note that it's also possible that something else is causing the failure...
-	if inv_tfall_str == "failed" or inv_trise_str == "failed":
-		print("ERROR: HSPICE measurement failed.")
-		print("Consider increasing level-restorers gate length by increasing the 'rest_length_factor' parameter in the input file.")
-		exit(1)
-
-	inv_tfall = float(inv_tfall_str)
-	inv_trise = float(inv_trise_str)
-
-	# If the rise time is faster, nmos must be made bigger.
-	# If the fall time is faster, pmos must be made bigger. 
-	if inv_trise > inv_tfall:
-		# ERF by increasing PMOS size
-		pmos_size = erf_inverter_balance_trise_tfall(sp_path,
-													 inv_name,
-													 inv_size,
-													 pmos_name,
-													 parameter_dict,
-													 fpga_inst,
-													 spice_interface)
-																   
-	else:    
-		# ERF by increasing NMOS size 
-		nmos_size = erf_inverter_balance_trise_tfall(sp_path,
-													 inv_name,
-													 inv_size,
-													 nmos_name,
-													 parameter_dict,
-													 fpga_inst,
-													 spice_interface)  
+	# If we have a ratio that probably balances the inverter, it tells us which transistor to make
+	# bigger and where to start. The smallest of the NMOS and PMOS keeps 'inv_size'. If the search
+	# can't start there, we ERF the inverter like we do without a start ratio.
+	target_tran_size = None
+	if start_ratio is not None and start_ratio != 1:
+		make_pmos_bigger = start_ratio > 1
+		if make_pmos_bigger:
+			target_tran_size = erf_inverter_balance_trise_tfall(sp_path,
+																inv_name,
+																inv_size,
+																pmos_name,
+																parameter_dict,
+																fpga_inst,
+																spice_interface,
+																inv_size*start_ratio)
+		else:
+			target_tran_size = erf_inverter_balance_trise_tfall(sp_path,
+																inv_name,
+																inv_size,
+																nmos_name,
+																parameter_dict,
+																fpga_inst,
+																spice_interface,
+																inv_size/start_ratio)
+
+	if target_tran_size is None:
+		# The NMOS and PMOS sizes of this inverter are both equal to 'inv_size' right now.
+		# That is, they are equal. We'll run HSPICE on the circuit to get initial rise and fall
+		# delays. Then, we'll use these delays to figure out if it's the NMOS we need to 
+		# make bigger to balance rise/fall or the PMOS.
+		spice_meas = spice_interface.run(sp_path, parameter_dict)
+	
+		# Get the rise and fall measurements for our inverter out of 'spice_meas'
+		# This was a single HSPICE run, so the value we want is at index 0
+
+
+		inv_tfall_str = spice_meas["meas_" + inv_name + "_tfall"][0]
+		inv_trise_str = spice_meas["meas_" + inv_name + "_trise"][0]
+	
+		# Check if the HSPICE measurement failed. If it did, this might mean that the level
+		# restorers are too strong which messes up one of the transitions. Making the gate
+		# length for the level restorers larger could solve this problem.
+		# Note that it's also possible that something else is causing the failure...
+		if inv_tfall_str == "failed" or inv_trise_str == "failed":
+			print("ERROR: HSPICE measurement failed.")
+			print("Consider increasing level-restorers gate length by increasing the 'rest_length_factor' parameter in the input file.")
+			exit(1)
+
+		inv_tfall = float(inv_tfall_str)
+		inv_trise = float(inv_trise_str)
+
+		# If the rise time is faster, nmos must be made bigger.
+		# If the fall time is faster, pmos must be made bigger. 
+		make_pmos_bigger = inv_trise > inv_tfall
+
+		if make_pmos_bigger:
+			# ERF by increasing PMOS size
+			target_tran_size = erf_inverter_balance_trise_tfall(sp_path,
+																inv_name,
+																inv_size,
+																pmos_name,
+																parameter_dict,
+																fpga_inst,
+																spice_interface)
+
+		else:
+			# ERF by increasing NMOS size
+			target_tran_size = erf_inverter_balance_trise_tfall(sp_path,
+																inv_name,
+																inv_size,
+																nmos_name,
+																parameter_dict,
+																fpga_inst,
+																spice_interface)
+
+	if make_pmos_bigger:
+		pmos_size = target_tran_size
+	else:
+		nmos_size = target_tran_size
 	 
 	# Update the parameter dict
 	if not fpga_inst.specs.use_finfet :
@@ -1012,6 +1087,290 @@ def erf_inverter(sp_path,
 	return 
    
 
+def _get_erf_inverter_sizes(inv_size, ratio, use_finfet):
+	""" 
+	Returns the NMOS and PMOS sizes of an inverter of size 'inv_size' with a P/N ratio of 'ratio'.
+	The smallest of the two keeps 'inv_size', the other one is rounded to 1 nm (bulk) or to a fin (FinFETs).
+	"""
+
+	if ratio >= 1:
+		return inv_size, max(inv_size, round(inv_size*ratio))
+	return max(inv_size, round(inv_size/ratio)), inv_size
+
+
+def erf_inverters_jointly(sp_path, 
+						  inverter_names, 
+						  inverter_drive_strengths, 
+						  erf_iteration,
+						  parameter_dict,
+						  fpga_inst, 
+						  spice_interface,
+						  start_ratios=None):
+	""" 
+	Equalize the rise and fall delays of all inverters in 'inverter_names' at the same time.
+	Row i of a single HSPICE sweep multiplies the P/N ratio of every inverter by the same factor i, 
+	and each inverter gets the ratio where its own tfall-trise crosses zero, interpolated between rows.
+	The factors span ERF_MAX_SIZE_RATIO on both sides of the current ratios in the first ERF iteration, 
+	and a range half as wide (in log scale) every iteration after that.
+	'start_ratios' ({inverter name: ratio}, e.g. from an ERF ratio store) are P/N ratios that probably
+	balance the inverters. In the first iteration, an inverter with a start ratio starts from it with
+	the range of the second iteration, as if a first iteration had found it.
+	Like erf_inverter, this mutates parameter_dict and the fpga object with the ERFed sizes.
+	"""
+
+	if len(inverter_names) == 0:
+		return
+
+	if ERF_MONITOR_VERBOSE:
+		print("ERF MONITOR: " + ", ".join(inverter_names) + " (joint)")
+
+	if start_ratios is None:
+		start_ratios = {}
+
+	# Get the size of the smallest transistor of each inverter, its current P/N ratio and the
+	# largest factor we multiply that ratio with. In the first iteration, we start from equal
+	# NMOS and PMOS sizes like erf_inverter does, unless we have a start ratio.
+	# The pmos and nmos size are different depending on whether we are dealing with FinFETs 
+	# or bulk. For bulk, the sizes are the transistor diffusion width in nanometers.
+	# For FinFETs, the size refers to the number of fins.
+	inv_sizes = []
+	current_ratios = []
+	max_factors = []
+	for i in range(len(inverter_names)):
+		if not fpga_inst.specs.use_finfet :
+			inv_sizes.append(inverter_drive_strengths[i]*fpga_inst.specs.min_tran_width)
+		else :
+			inv_sizes.append(inverter_drive_strengths[i])
+		range_iteration = erf_iteration
+		if erf_iteration == 1 and start_ratios.get(inverter_names[i]) is not None:
+			current_ratios.append(start_ratios[inverter_names[i]])
+			range_iteration = 2
+		elif erf_iteration == 1:
+			current_ratios.append(1.0)
+		else:
+			nmos_size = fpga_inst.transistor_sizes[inverter_names[i] + "_nmos"]
+			pmos_size = fpga_inst.transistor_sizes[inverter_names[i] + "_pmos"]
+			current_ratios.append(float(pmos_size)/nmos_size)
+		max_factors.append(ERF_MAX_SIZE_RATIO**(1.0/2**(range_iteration - 1)))
+
+	# Row j multiplies the current ratio of each inverter with its largest factor to the power
+	# exponents[j], in increasing order
+	half_num_ratios = ERF_JOINT_NUM_RATIOS//2
+	exponents = [float(j)/half_num_ratios for j in range(-half_num_ratios, half_num_ratios + 1)]
+
+	# Make the parameter dict of the sweep. All parameters keep their value except for the inverter sizes.
+	sweep_parameter_dict = {}
+	for name, values in parameter_dict.items():
+		sweep_parameter_dict[name] = [values[0]]*len(exponents)
+	row_ratios = []
+	for i in range(len(inverter_names)):
+		# Keep the ratios of this inverter within ERF_MAX_SIZE_RATIO
+		ratios = [min(max(current_ratios[i]*max_factors[i]**exponent, 1.0/ERF_MAX_SIZE_RATIO), ERF_MAX_SIZE_RATIO) for exponent in exponents]
+		row_ratios.append(ratios)
+		nmos_values = []
+		pmos_values = []
+		for ratio in ratios:
+			nmos_size, pmos_size = _get_erf_inverter_sizes(inv_sizes[i], ratio, fpga_inst.specs.use_finfet)
+			if not fpga_inst.specs.use_finfet :
+				nmos_values.append(1e-9*nmos_size)
+				pmos_values.append(1e-9*pmos_size)
+			else :
+				nmos_values.append(nmos_size)
+				pmos_values.append(pmos_size)
+		sweep_parameter_dict[inverter_names[i] + "_nmos"] = nmos_values
+		sweep_parameter_dict[inverter_names[i] + "_pmos"] = pmos_values
+
+	# Run HSPICE sweep
+	if ERF_MONITOR_VERBOSE:
+		print("Running HSPICE sweep on: " + sp_path + "")
+	spice_meas = spice_interface.run(sp_path, sweep_parameter_dict)
+
+	# Pick the ratio of each inverter from its own tfall and trise
+	for i in range(len(inverter_names)):
+		inv_name = inverter_names[i]
+		log_ratios = []
+		diffs = []
+		for j in range(len(exponents)):
+			# For some reason I occasionally see a failure due to "internal timestep being too small" The following shall avoid the program
+			# from crashing but it will throw away that part of the results
+			try:
+				tfall = float(spice_meas["meas_" + inv_name + "_tfall"][j])
+				trise = float(spice_meas["meas_" + inv_name + "_trise"][j])
+			except ValueError:
+				continue
+			log_ratios.append(math.log(row_ratios[i][j]))
+			diffs.append(tfall - trise)
+		if len(diffs) == 0:
+			print("ERROR: HSPICE measurement failed.")
+			print("Consider increasing level-restorers gate length by increasing the 'rest_length_factor' parameter in the input file.")
+			exit(1)
+
+		# Making the PMOS bigger (a larger ratio) makes tfall-trise go up. We interpolate where it crosses zero,  
+		# and if it doesn't (e.g. the inverter is self-loaded), we use the ratio that gets closest.
+		best_index = min(range(len(diffs)), key=lambda j: abs(diffs[j]))
+		ratio = math.exp(log_ratios[best_index])
+		for j in range(1, len(diffs)):
+			if diffs[j-1] <= 0 < diffs[j]:
+				ratio = math.exp(log_ratios[j-1] + (log_ratios[j] - log_ratios[j-1])*diffs[j-1]/(diffs[j-1] - diffs[j]))
+				break
+		nmos_size, pmos_size = _get_erf_inverter_sizes(inv_sizes[i], ratio, fpga_inst.specs.use_finfet)
+
+		if ERF_MONITOR_VERBOSE:
+			print(inv_name + ": NMOS=" + str(nmos_size) + "  PMOS=" + str(pmos_size))
+
+		# Update the parameter dict and the fpga_inst transistor sizes with new NMOS & PMOS sizes
+		if not fpga_inst.specs.use_finfet :
+			parameter_dict[inv_name + "_nmos"][0] = 1e-9*nmos_size
+			parameter_dict[inv_name + "_pmos"][0] = 1e-9*pmos_size
+			fpga_inst.transistor_sizes[inv_name + "_nmos"] = (nmos_size/fpga_inst.specs.min_tran_width)
+			fpga_inst.transistor_sizes[inv_name + "_pmos"] = (pmos_size/fpga_inst.specs.min_tran_width)
+		else :
+			parameter_dict[inv_name + "_nmos"][0] = nmos_size
+			parameter_dict[inv_name + "_pmos"][0] = pmos_size
+			fpga_inst.transistor_sizes[inv_name + "_nmos"] = (nmos_size)
+			fpga_inst.transistor_sizes[inv_name + "_pmos"] = (pmos_size)
+
+	if ERF_MONITOR_VERBOSE:
+		print("")
+	sys.stdout.flush()
+
+	return
+
+
+class ErfRatioStore(object):
+	""" 
+	The inverter P/N ratios found by ERF (see erf), kept across the sizing searches and FPGA sizing 
+	iterations to skip or warm-start later ERFs. The ratios are stored per subcircuit (its top-level 
+	SPICE file) and inverter, along with the size context they were found for: the sizes of the 
+	transistor groups the subcircuit was ERFed with. The nearest stored ratio is the one with the 
+	size context at the smallest distance (sum of the log size differences of the common groups). 
+	"""
+
+	def __init__(self):
+
+		# (sp_path, inverter name): {size context: ratio}, a size context is a sorted tuple of (element name, size)
+		self.ratios = {}
+		# Number of ERFs that looked for stored ratios, that were skipped because the stored ratios 
+		# still balanced rise and fall, and that were warm-started from stored ratios
+		self.num_erfs = 0
+		self.num_skipped = 0
+		self.num_warm_starts = 0
+
+
+	def add(self, sp_path, size_context, erf_ratios):
+		""" Store the ratios in 'erf_ratios' ({inverter name: ratio}) found for 'size_context' ({element name: size}). """
+
+		size_context_key = tuple(sorted(size_context.items()))
+		for inv_name, ratio in erf_ratios.items():
+			self.ratios.setdefault((sp_path, inv_name), {})[size_context_key] = ratio
+
+
+	def get_nearest(self, sp_path, inv_name, size_context):
+		""" Returns the stored ratio of the inverter with the nearest size context, None if there is none. """
+
+		nearest_ratio = None
+		nearest_distance = None
+		for size_context_key, ratio in self.ratios.get((sp_path, inv_name), {}).items():
+			distance = 0.0
+			num_common = 0
+			for name, size in size_context_key:
+				if name in size_context:
+					distance += abs(math.log(float(size)/size_context[name]))
+					num_common += 1
+			if num_common == 0:
+				continue
+			if nearest_distance is None or distance < nearest_distance:
+				nearest_ratio = ratio
+				nearest_distance = distance
+
+		return nearest_ratio
+
+
+	def reset_statistics(self):
+		""" Reset the ERF counts, e.g. in a worker process of the parallel sizing mode (see update). """
+
+		self.num_erfs = 0
+		self.num_skipped = 0
+		self.num_warm_starts = 0
+
+
+	def update(self, other):
+		""" Add the ratios and the ERF counts of the store 'other' to this one. """
+
+		for key, ratios in other.ratios.items():
+			self.ratios.setdefault(key, {}).update(ratios)
+		self.num_erfs += other.num_erfs
+		self.num_skipped += other.num_skipped
+		self.num_warm_starts += other.num_warm_starts
+
+
+def erf_stored_ratios(sp_path, inverter_names, inverter_drive_strengths, stored_ratios, parameter_dict, fpga_inst, spice_interface):
+	""" 
+	Check if the P/N ratios in 'stored_ratios' (e.g. from an ERF ratio store) still balance the rise and 
+	fall delays of all inverters in 'inverter_names' within ERF_ERROR_TOLERANCE, with one HSPICE run.
+	If they do, the parameter dict and the fpga object get the sizes of these ratios and we return
+	the ratios like erf does. Otherwise, returns None and the fpga object is unchanged.
+	"""
+
+	# The pmos and nmos size are different depending on whether we are dealing with FinFETs 
+	# or bulk. For bulk, the sizes are the transistor diffusion width in nanometers.
+	# For FinFETs, the size refers to the number of fins.
+	inverter_sizes = {}
+	for i in range(len(inverter_names)):
+		inv_name = inverter_names[i]
+		if not fpga_inst.specs.use_finfet :
+			inv_size = inverter_drive_strengths[i]*fpga_inst.specs.min_tran_width
+		else :
+			inv_size = inverter_drive_strengths[i]
+		inverter_sizes[inv_name] = _get_erf_inverter_sizes(inv_size, stored_ratios[inv_name], fpga_inst.specs.use_finfet)
+
+	stored_parameter_dict = parameter_dict.copy()
+	for inv_name, (nmos_size, pmos_size) in inverter_sizes.items():
+		if not fpga_inst.specs.use_finfet :
+			stored_parameter_dict[inv_name + "_nmos"] = [1e-9*nmos_size]
+			stored_parameter_dict[inv_name + "_pmos"] = [1e-9*pmos_size]
+		else :
+			stored_parameter_dict[inv_name + "_nmos"] = [nmos_size]
+			stored_parameter_dict[inv_name + "_pmos"] = [pmos_size]
+
+	if ERF_MONITOR_VERBOSE:
+		print("ERF MONITOR: trying stored P/N ratios of " + ", ".join(inverter_names))
+	spice_meas = spice_interface.run(sp_path, stored_parameter_dict)
+
+	# Check the trise/tfall error of all inverters 
+	for inv_name in inverter_names:
+		try:
+			tfall = float(spice_meas["meas_" + inv_name + "_tfall"][0])
+			trise = float(spice_meas["meas_" + inv_name + "_trise"][0])
+		except ValueError:
+			return None
+		erf_error = abs((tfall - trise)/tfall)
+		if erf_error > ERF_ERROR_TOLERANCE:
+			if ERF_MONITOR_VERBOSE:
+				print(inv_name + " failed to meet ERF tolerance (erf_err=" + str(100*round(erf_error,3)) + "%), running ERF\n")
+			return None
+
+	if ERF_MONITOR_VERBOSE:
+		print("All inverters met ERF tolerance with the stored ratios\n")
+
+	# Update the parameter dict and the fpga_inst transistor sizes with new NMOS & PMOS sizes
+	erf_ratios = {}
+	for inv_name, (nmos_size, pmos_size) in inverter_sizes.items():
+		parameter_dict[inv_name + "_nmos"] = stored_parameter_dict[inv_name + "_nmos"]
+		parameter_dict[inv_name + "_pmos"] = stored_parameter_dict[inv_name + "_pmos"]
+		if not fpga_inst.specs.use_finfet :
+			fpga_inst.transistor_sizes[inv_name + "_nmos"] = (nmos_size/fpga_inst.specs.min_tran_width)
+			fpga_inst.transistor_sizes[inv_name + "_pmos"] = (pmos_size/fpga_inst.specs.min_tran_width)
+		else :
+			fpga_inst.transistor_sizes[inv_name + "_nmos"] = (nmos_size)
+			fpga_inst.transistor_sizes[inv_name + "_pmos"] = (pmos_size)
+		erf_ratios[inv_name] = float(fpga_inst.transistor_sizes[inv_name + "_pmos"])/fpga_inst.transistor_sizes[inv_name + "_nmos"]
+
+	sys.stdout.flush()
+
+	return erf_ratios
+
+
 def erf(sp_path, 
 		element_names, 
 		element_sizes, 
@@ -1021,6 +1380,10 @@ def erf(sp_path,
 	Equalize rise and fall times of all inverters listed in 'element_names' for the  
 	transistor sizes in 'config'.
 
+	If the FPGA has an ERF ratio store (see ErfRatioStore), the stored ratios nearest to 'element_sizes'
+	are tried first and the ERF is skipped if they still balance rise and fall within ERF_ERROR_TOLERANCE. 
+	Otherwise, they are the starting points of the ERF.
+
 	Returns the inverter ratios that give equal rise and fall. 
 	"""
 
@@ -1045,6 +1408,29 @@ def erf(sp_path,
 			parameter_dict[wire_name + "_res"] = [rc_data[0]]
 			parameter_dict[wire_name + "_cap"] = [rc_data[1]*1e-15]
 
+	# Look for stored ratios of the inverters found for similar sizes
+	inverter_indices = [i for i in range(len(element_names)) if element_names[i].startswith("inv_")]
+	size_context = dict(zip(element_names, element_sizes))
+	erf_ratio_store = fpga_inst.erf_ratio_store
+	start_ratios = {}
+	if erf_ratio_store is not None and len(inverter_indices) > 0:
+		erf_ratio_store.num_erfs += 1
+		for i in inverter_indices:
+			start_ratios[element_names[i]] = erf_ratio_store.get_nearest(sp_path, element_names[i], size_context)
+		if None not in start_ratios.values():
+			erf_ratios = erf_stored_ratios(sp_path, 
+										   [element_names[i] for i in inverter_indices], 
+										   [element_sizes[i] for i in inverter_indices], 
+										   start_ratios, 
+										   parameter_dict, 
+										   fpga_inst, 
+										   spice_interface)
+			if erf_ratios is not None:
+				erf_ratio_store.num_skipped += 1
+				return erf_ratios
+		if any(ratio is not None for ratio in start_ratios.values()):
+			erf_ratio_store.num_warm_starts += 1
+
 	# Set ERF tolerance flag to False so that we can enter the while loop
 	erf_tolerance_met = False
 	erf_iteration = 1
@@ -1052,20 +1438,36 @@ def erf(sp_path,
 		# Start by assuming that ERF tolerance will be met.
 		erf_tolerance_met = True
 
-		# ERF each inverter in the circuit
-		for i in range(len(element_names)):
-			circuit_element = element_names[i]
-			element_size = element_sizes[i]
-	
-			# If the element is an inverter, equalize its rise and fall delays
-			# 'erf_inverter' will mutate parameter dict and the fpga object with ERFed sizes.
-			if element_names[i].startswith("inv_"):
-				erf_inverter(sp_path, 
-							 circuit_element, 
-							 element_size, 
-							 parameter_dict, 
-							 fpga_inst, 
-							 spice_interface)
+		# ERF all inverters of the circuit at the same time in one HSPICE sweep
+		if fpga_inst.specs.joint_erf:
+			erf_inverters_jointly(sp_path, 
+								  [element_names[i] for i in inverter_indices], 
+								  [element_sizes[i] for i in inverter_indices], 
+								  erf_iteration,
+								  parameter_dict, 
+								  fpga_inst, 
+								  spice_interface,
+								  start_ratios)
+		else:
+			# ERF each inverter in the circuit
+			for i in range(len(element_names)):
+				circuit_element = element_names[i]
+				element_size = element_sizes[i]
+	
+				# If the element is an inverter, equalize its rise and fall delays
+				# 'erf_inverter' will mutate parameter dict and the fpga object with ERFed sizes.
+				if element_names[i].startswith("inv_"):
+					# Only the first ERF iteration starts from the stored ratios
+					start_ratio = None
+					if erf_iteration == 1:
+						start_ratio = start_ratios.get(circuit_element)
+					erf_inverter(sp_path, 
+								 circuit_element, 
+								 element_size, 
+								 parameter_dict, 
+								 fpga_inst, 
+								 spice_interface,
+								 start_ratio)
 				
 	
 		# At this point, all inverters have been ERFed.
@@ -1131,6 +1533,9 @@ def erf(sp_path,
 			pmos_size = fpga_inst.transistor_sizes[circuit_element + "_pmos"]
 			erf_ratios[circuit_element] = float(pmos_size)/nmos_size
 
+	if erf_ratio_store is not None:
+		erf_ratio_store.add(sp_path, size_context, erf_ratios)
+
 	return erf_ratios
 				  
 
@@ -1202,7 +1607,420 @@ def run_combo(fpga_inst, sp_path, element_names, combo, erf_ratios, spice_interf
 	
 	return tfall, trise
 
+
+def get_rank_correlation(values1, values2):
+	""" Returns the Spearman rank correlation of two lists of values, or None if either list
+		has a single distinct value. Tied values get the average of their ranks. """
+
+	ranks = []
+	for values in (values1, values2):
+		unique_values, value_ids = np.unique(np.asarray(values, dtype=float), return_inverse=True)
+		if len(unique_values) < 2:
+			return None
+		order = np.argsort(value_ids, kind="mergesort")
+		value_ranks = np.empty(len(value_ids))
+		value_ranks[order] = np.arange(len(value_ids))
+		ranks.append((np.bincount(value_ids, value_ranks)/np.bincount(value_ids))[value_ids])
+
+	return float(np.corrcoef(ranks[0], ranks[1])[0, 1])
+
+
+def simulate_sizing_combos(fpga_inst, opt_type, sizable_circuit, parameter_dict, combo_indices, tfall_trise_list, 
+						   eval_delay_list, spice_interface, is_ram_component, is_cc_component):
+	""" Simulate the sizing combos at 'combo_indices' of the sweep in 'parameter_dict' with the coarse 
+		transient profile, this sweep only ranks the combos. The tfall and trise and the evaluation delay 
+		of every simulated combo are put in 'tfall_trise_list' and 'eval_delay_list' at its index. """
+
+	combo_parameter_dict = {}
+	for param_name, param_values in parameter_dict.items():
+		combo_parameter_dict[param_name] = [param_values[i] for i in combo_indices]
+
+	# Run HSPICE data sweep
+	print(("Running HSPICE for " + str(len(combo_indices)) + 
+		   " transistor sizing combinations..."))
+	spice_meas = spice_interface.run(sizable_circuit.top_spice_path, combo_parameter_dict, as_array=True, tran_profile=spice.TRAN_PROFILE_COARSE)
+
+	# Now we need to create a list of tfall_trise to be compatible with old code
+	# Failed measurements are set to 1.
+	tfall_list = spice_meas.column("meas_total_tfall", 1).tolist()
+	trise_list = spice_meas.column("meas_total_trise", 1).tolist()
+	meas_logic_low_voltage = spice_meas.column("meas_logic_low_voltage", 1).tolist()
+
+	# Get delay metric used for evaluation for each transistor sizing combo
+	for i in range(len(combo_indices)):
+		tfall_trise_list[combo_indices[i]] = (tfall_list[i], trise_list[i])
+		eval_delay_list[combo_indices[i]] = get_eval_delay(fpga_inst, opt_type, sizable_circuit, tfall_list[i], trise_list[i], meas_logic_low_voltage[i], is_ram_component, is_cc_component)
+
+
+def get_space_filling_sample(points, num_samples):
+	""" Returns the indices of 'num_samples' rows of 'points' (an array with one row per point) that 
+		spread out over the space they cover. The first one is the point closest to the center and
+		each next one is the point farthest from all the points chosen so far. """
+
+	center = (points.min(axis=0) + points.max(axis=0))/2
+	sample = [int(np.argmin(((points - center)**2).sum(axis=1)))]
+	min_distances = ((points - points[sample[0]])**2).sum(axis=1)
+	while len(sample) < num_samples:
+		next_point = int(np.argmax(min_distances))
+		sample.append(next_point)
+		min_distances = np.minimum(min_distances, ((points - points[next_point])**2).sum(axis=1))
+
+	return sample
+
+
+def get_quadratic_terms(points):
+	""" Returns the terms of a full quadratic model (1, x_i and x_i*x_j) for every row of 'points'. """
+
+	num_dims = points.shape[1]
+	terms = [np.ones(len(points))]
+	for i in range(num_dims):
+		terms.append(points[:, i])
+	for i in range(num_dims):
+		for j in range(i, num_dims):
+			terms.append(points[:, i]*points[:, j])
+
+	return np.column_stack(terms)
+
+
+def prune_sizing_combos(fpga_inst, opt_type, sizable_circuit, sizing_combos, parameter_dict, area_list, tfall_trise_list, 
+						eval_delay_list, area_opt_weight, delay_opt_weight, spice_interface, is_ram_component, is_cc_component):
+	""" Simulate only the sizing combos that might be the best one. 
+		We first simulate a space-filling sample of the combos and fit a quadratic response surface 
+		of log(delay) versus log(transistor sizes) to it. The cost of every combo is predicted from 
+		this delay and its exact area. Only the combos whose predicted cost is within a confidence 
+		band ('surrogate_band' standard errors of the model) of the predicted best are simulated. 
+		Returns the indices of the simulated combos, or None if the sweep is not worth pruning
+		(nothing is simulated then). """
+
+	num_combos = len(sizing_combos)
+	if num_combos <= SURROGATE_MIN_COMBOS:
+		return None
+
+	# Model the sizes that change, in log scale since delays go with 1/size
+	points = np.log(np.array(sizing_combos, dtype=float))
+	points = points[:, points.max(axis=0) > points.min(axis=0)]
+	points = (points - points.min(axis=0))/(points.max(axis=0) - points.min(axis=0))
+	terms = get_quadratic_terms(points)
+	num_samples = max(SURROGATE_SAMPLES_PER_TERM*terms.shape[1], SURROGATE_MIN_SAMPLES)
+	if 2*num_samples >= num_combos:
+		return None
+
+	print("Simulating a sample of " + str(num_samples) + " combos to prune the " + str(num_combos) + " sizing combinations...")
+	sample = get_space_filling_sample(points, num_samples)
+	simulate_sizing_combos(fpga_inst, opt_type, sizable_circuit, parameter_dict, sample, tfall_trise_list, 
+						   eval_delay_list, spice_interface, is_ram_component, is_cc_component)
+
+	# Fit the model to the combos that didn't fail (get_eval_delay gives them a delay of 100)
+	fit_sample = [i for i in sample if eval_delay_list[i] < 100]
+	sampled = set(sample)
+	if len(fit_sample) <= terms.shape[1]:
+		print("Too many failed simulations to fit a surrogate model, simulating all combos\n")
+		remaining_combos = [i for i in range(num_combos) if i not in sampled]
+		simulate_sizing_combos(fpga_inst, opt_type, sizable_circuit, parameter_dict, remaining_combos, tfall_trise_list, 
+							   eval_delay_list, spice_interface, is_ram_component, is_cc_component)
+		return list(range(num_combos))
+	log_delays = np.log([eval_delay_list[i] for i in fit_sample])
+	coefficients, _, _, _ = np.linalg.lstsq(terms[fit_sample], log_delays, rcond=None)
+	residuals = log_delays - terms[fit_sample].dot(coefficients)
+	std_error = math.sqrt((residuals**2).sum()/(len(fit_sample) - terms.shape[1]))
+
+	# Predicted log(cost) of every combo, and the band of log(cost) we keep
+	predicted_delays = np.exp(terms.dot(coefficients))
+	predicted_log_costs = np.log([cost_function(area_list[i], predicted_delays[i], area_opt_weight, delay_opt_weight) for i in range(num_combos)])
+	band = max(fpga_inst.specs.surrogate_band*delay_opt_weight*std_error, math.log(1 + SURROGATE_MIN_BAND))
+	in_band = predicted_log_costs <= predicted_log_costs.min() + band
+
+	band_combos = [i for i in range(num_combos) if in_band[i] and i not in sampled]
+	if len(band_combos) > 0:
+		simulate_sizing_combos(fpga_inst, opt_type, sizable_circuit, parameter_dict, band_combos, tfall_trise_list, 
+							   eval_delay_list, spice_interface, is_ram_component, is_cc_component)
+
+	# How well the model ranks the combos it didn't see
+	simulated_combos = sample + band_combos
+	check_combos = [i for i in band_combos if eval_delay_list[i] < 100]
+	rank_correlation = None
+	if len(check_combos) > 2:
+		simulated_costs = [cost_function(area_list[i], eval_delay_list[i], area_opt_weight, delay_opt_weight) for i in check_combos]
+		rank_correlation = get_rank_correlation(predicted_log_costs[check_combos], simulated_costs)
+	num_saved = num_combos - len(simulated_combos)
+	print("Surrogate pruning: simulated " + str(len(simulated_combos)) + " of " + str(num_combos) + " combos (" + 
+		  str(len(sample)) + " sampled, " + str(len(band_combos)) + " in the band), saved " + str(num_saved) + 
+		  " simulations (" + str(round(100.0*num_saved/num_combos, 1)) + "%)")
+	print("Surrogate model standard error: " + ("%.3g" % std_error) + " (log delay), rank correlation of predicted and simulated costs: " + 
+		  ("undefined" if rank_correlation is None else str(round(rank_correlation, 4))))
+	print("")
+
+	return simulated_combos
+
+
+def check_coarse_ranking(fpga_inst, opt_type, sizable_circuit, parameter_dict, cost_list, area_list, 
+						 area_opt_weight, delay_opt_weight, spice_interface, is_ram_component, is_cc_component):
+	""" Simulate a sample of the sizing combos of a coarse ranking sweep again with the fine 
+		transient profile and record the rank correlation of the costs of both profiles.
+		'cost_list' is the sorted list of (cost, combo_index) of the coarse sweep. """
+
+	num_samples = min(RANK_CHECK_NUM_COMBOS, len(cost_list))
+	if num_samples < 2:
+		return
+
+	# Sample combos evenly over the coarse ranking, starting with the best one
+	sample_ranks = sorted(set([int(round(rank)) for rank in np.linspace(0, len(cost_list) - 1, num_samples)]))
+	combo_indices = [cost_list[rank][1] for rank in sample_ranks]
+	sample_parameter_dict = {}
+	for param_name, param_values in parameter_dict.items():
+		sample_parameter_dict[param_name] = [param_values[i] for i in combo_indices]
+
+	print(("Checking the coarse ranking with " + str(len(combo_indices)) + " fine transient simulations..."))
+	spice_meas = spice_interface.run(sizable_circuit.top_spice_path, sample_parameter_dict, as_array=True)
+	tfall_list = spice_meas.column("meas_total_tfall", 1).tolist()
+	trise_list = spice_meas.column("meas_total_trise", 1).tolist()
+	meas_logic_low_voltage = spice_meas.column("meas_logic_low_voltage", 1).tolist()
+
+	coarse_cost_list = []
+	fine_cost_list = []
+	for i in range(len(combo_indices)):
+		delay = get_eval_delay(fpga_inst, opt_type, sizable_circuit, tfall_list[i], trise_list[i], meas_logic_low_voltage[i], is_ram_component, is_cc_component)
+		coarse_cost_list.append(cost_list[sample_ranks[i]][0])
+		fine_cost_list.append(cost_function(area_list[combo_indices[i]], delay, area_opt_weight, delay_opt_weight))
+
+	rank_correlation = get_rank_correlation(coarse_cost_list, fine_cost_list)
+	if rank_correlation is None:
+		print("Rank correlation of coarse and fine costs: undefined (all sampled costs are equal)")
+	else:
+		print(("Rank correlation of coarse and fine costs: " + str(round(rank_correlation, 4))))
+		spice_interface.add_rank_correlation(rank_correlation)
+	print("")
+
 	
+def _get_combo_values(value, num_combos):
+	""" Returns a list with the value of each of the 'num_combos' sizing combos of an area or wire RC value 
+		of the FPGA evaluated for a batch of combos. Values that don't depend on the combo are not arrays. """
+
+	if isinstance(value, np.ndarray):
+		return value.tolist()
+	return [value]*num_combos
+
+
+def get_sizing_combo_loads(fpga_inst, opt_type, sizable_circuit, element_names, sizing_combos, erf_ratios, 
+						   is_ram_component, is_cc_component):
+	""" Calculates the area and wire loads of each transistor sizing combination in 'sizing_combos'. 
+		Returns the evaluation area of each combo and the parameter dict of the HSPICE sweep over all of them. 
+		The areas of all the combos are evaluated at once. The sizes of the elements in 'element_names' are set 
+		to NumPy arrays with the size of the element in each combo, so the area update of the FPGA computes 
+		arrays with one value per combo for everything that depends on these sizes.
+		Every combo gets the wire RC of the last combo. This keeps the sweeps identical to the old loop,
+		which appended the same wire RC dict for every combo. """
+
+	print("Calculating area and wire data for all transistor sizing combinations...")
+
+	num_combos = len(sizing_combos)
+	combo_sizes = [np.array([combo[i] for combo in sizing_combos]) for i in range(len(element_names))]
+
+	# Update FPGA transistor sizes
+	fpga_inst._update_transistor_sizes(element_names, combo_sizes, fpga_inst.specs.use_finfet, erf_ratios)
+	# Calculate area of everything
+	fpga_inst.update_area()
+	# Get evaluation area
+	area_list = _get_combo_values(get_eval_area(fpga_inst, opt_type, sizable_circuit, is_ram_component, is_cc_component), num_combos)
+
+	# Size the FPGA like the last combo
+	fpga_inst._update_transistor_sizes(element_names, sizing_combos[-1], fpga_inst.specs.use_finfet, erf_ratios)
+	fpga_inst.update_area()
+	# Re-calculate wire lengths
+	fpga_inst.update_wires()
+	# Update wire resistance and capacitance
+	fpga_inst.update_wire_rc()
+
+	# We have to make a parameter dict for HSPICE. The sizes of the transistors we aren't sweeping are the
+	# current sizes of the FPGA.
+	current_tran_sizes = {}
+	if not fpga_inst.specs.use_finfet :
+		for tran_name, tran_size in fpga_inst.transistor_sizes.items():
+			current_tran_sizes[tran_name] = 1e-9*tran_size*fpga_inst.specs.min_tran_width
+	else :
+		for tran_name, tran_size in fpga_inst.transistor_sizes.items():
+			current_tran_sizes[tran_name] = tran_size
+
+	parameter_dict = {}
+	for tran_name, tran_size in current_tran_sizes.items():
+		# We need this temp value to compare agains 'element_names'
+		tmp_tran_name = tran_name.replace("_nmos", "")
+		tmp_tran_name = tmp_tran_name.replace("_pmos", "")
+
+		# If this transistor is one of the transistor sizes that we are sweeping,
+		# we have to properly compute the size, if we aren't sweeping it, just add
+		# the current size to the list.
+		if tmp_tran_name not in element_names:
+			parameter_dict[tran_name] = [tran_size]*num_combos
+			continue
+
+		# We need this id to pick the right data from sizing combo
+		element_id = element_names.index(tmp_tran_name)
+		parameter_dict[tran_name] = []
+		for combo in sizing_combos:
+			# Let's calculate the size of this transistor
+			if not fpga_inst.specs.use_finfet :
+				tran_size = 1e-9*(combo[element_id]*fpga_inst.specs.min_tran_width)
+			else :
+				tran_size = (combo[element_id])
+
+			# If transistor is an inverter, we need to do some stuff to calc sizes for
+			# both the NMOS and PMOS, if it is anything else (eg. ptran), we can just add 
+			# it directly.
+			if tran_name.startswith("inv_"):
+				if tran_name.endswith("_nmos"):
+					# If the NMOS is bigger than the PMOS
+					if erf_ratios[tmp_tran_name] < 1:
+						nmos_size = tran_size/erf_ratios[tmp_tran_name]
+					# If the PMOS is bigger than the NMOS
+					else:
+						nmos_size = tran_size
+					parameter_dict[tran_name].append(nmos_size)
+				else:
+					# If the NMOS is bigger than the PMOS
+					if erf_ratios[tmp_tran_name] < 1:
+						pmos_size = tran_size
+					# If the PMOS is bigger than the NMOS
+					else:
+						pmos_size = tran_size*erf_ratios[tmp_tran_name]
+					parameter_dict[tran_name].append(pmos_size)
+			else: 
+				parameter_dict[tran_name].append(tran_size) 
+
+	# Now add the wire information. Every combo gets the wire loads of the last combo, like it did when
+	# the loads were computed combo by combo into the same wire_rc_dict.
+	for wire_name, rc_data in fpga_inst.wire_rc_dict.items():
+		parameter_dict[wire_name + "_res"] = [rc_data[0]]*num_combos
+		parameter_dict[wire_name + "_cap"] = [rc_data[1]*1e-15]*num_combos
+
+	return area_list, parameter_dict
+
+
+def print_top_sizing_combos(cost_list, area_list, eval_delay_list, tfall_trise_list):
+	""" Print the 10 sizing combos with the lowest cost. 'cost_list' is sorted and holds (cost, combo_index) tuples. """
+
+	print("TOP 10 BEST COST RESULTS")
+	print("------------------------")
+	
+	for i in range(min(10, len(cost_list))):
+		combo_index = cost_list[i][1]
+		print(("Combo #" + str(combo_index).ljust(6) + 
+			   "cost=" + str(round(cost_list[i][0],6)).ljust(9) + 
+			   "area=" + str(round(area_list[combo_index]/1000000,3)).ljust(8) + 
+			   "delay=" + str(round(eval_delay_list[combo_index],13)).ljust(10) + 
+			   "tfall=" + str(round(tfall_trise_list[combo_index][0],13)).ljust(10) + 
+			   "trise=" + str(round(tfall_trise_list[combo_index][1],13)).ljust(10)))
+	print("")
+
+
+def finish_sizing_search(fpga_inst, sizable_circuit, opt_type, element_names, sizing_combos, cost_list, re_erf, 
+						 area_opt_weight, delay_opt_weight, spice_interface, is_ram_component, is_cc_component):
+	""" 
+		Re-balance the rise and fall times of the top 're_erf' combos of 'cost_list' (sorted, it holds
+		(cost, combo_index) tuples) and pick the lowest cost one as the best transistor sizing.
+		The FPGA is updated to the best combo. Returns the sizes of the best combo, its detailed 
+		NMOS and PMOS sizes and its re-balancing results.
+	"""
+
+	# Re-ERF some of the top results
+	# This is the number of top results to re-ERF
+	re_erf_num = min(re_erf, len(cost_list))
+	best_results = []
+	for i in range(re_erf_num):
+		# Re-ERF i-th best combo
+		print(("Re-equalizing rise and fall times on combo #" + str(cost_list[i][1]) + 
+			   " (ranked #" + str(i+1) + ")\n"))
+		erf_ratios = erf_combo(fpga_inst, 
+							   sizable_circuit.top_spice_path, 
+							   element_names, 
+							   sizing_combos[cost_list[i][1]], 
+							   spice_interface)
+
+		# Measure delay for combo
+		trise, tfall = run_combo(fpga_inst, 
+								 sizable_circuit.top_spice_path, 
+								 element_names, 
+								 sizing_combos[cost_list[i][1]], 
+								 erf_ratios,
+								 spice_interface)
+
+		# Get final delay (we use final because ERFing is done for each combo)
+		delay = get_final_delay(fpga_inst, opt_type, sizable_circuit, tfall, trise, is_ram_component, is_cc_component)
+		# Get area (run_combo will have updated the area numbers for us so we can get it 
+		# directly)
+		area = get_final_area(fpga_inst, opt_type, sizable_circuit, is_ram_component, is_cc_component)
+		# Calculate cost
+		cost = cost_function(area, delay, area_opt_weight, delay_opt_weight)
+		# Add to best results (cost, combo_index, area, delay, tfall, trise, erf_ratios)
+		best_results.append((cost, cost_list[i][1], area, delay, tfall, trise, erf_ratios))
+		
+	# Sort the newly ERF results
+	best_results.sort()
+	
+	print("BEST COST RESULTS AFTER RE-BALANCING")
+	print("------------------------------------")
+	for result in best_results:
+		print(("Combo #" + str(result[1]).ljust(6) + 
+			   "cost=" + str(round(result[0],6)).ljust(9) + 
+			   "area=" + str(round(result[2]/1000000,3)).ljust(8) + 
+			   "delay=" + str(round(result[3],13)).ljust(10) + 
+			   "tfall=" + str(round(result[4],13)).ljust(10) + 
+			   "trise=" + str(round(result[5],13)).ljust(10)))
+	print("")
+
+	# Write post-erf results to file
+	# TODO: Turn this off for now
+	#erf_export_filename = (spice_filedir + 
+	#                       sizable_circuit.name + 
+	#                       "_o" + str(outer_iter) + 
+	#                       "_i" + str(inner_iter) + 
+	#                       "_b" + str(bunch_num) + "_erf.csv")
+	#export_erf_results(erf_export_filename, 
+	#                   element_names, 
+	#                   sizing_combos, 
+	#                   best_results)
+	
+	# Update transistor sizes file as well as area and wires to best combo
+	best_combo = sizing_combos[best_results[0][1]]
+	best_combo_erf_ratios = best_results[0][6]
+	# Update transistor sizes
+	fpga_inst._update_transistor_sizes(element_names, best_combo, fpga_inst.specs.use_finfet, best_combo_erf_ratios)
+	# Calculate area of everything
+	fpga_inst.update_area()
+	# Re-calculate wire lengths
+	fpga_inst.update_wires()
+	# Update wire resistance and capacitance
+	fpga_inst.update_wire_rc()
+	
+	# We want to return the best combo, this must contain all NMOS and PMOS values
+	best_combo_detailed = {}
+	best_combo_dict = {}
+	for i in range(len(element_names)):
+		name = element_names[i]
+		if "ptran_" in name:
+			best_combo_dict[name] = best_combo[i]
+			best_combo_detailed[name + "_nmos"] = best_combo[i]
+		elif "tgate_" in name:
+			best_combo_dict[name] = best_combo[i]
+			best_combo_detailed[name + "_nmos"] = best_combo[i]
+			best_combo_detailed[name + "_pmos"] = best_combo[i]
+		elif "rest_" in name:
+			best_combo_dict[name] = best_combo[i]
+			best_combo_detailed[name + "_pmos"] = best_combo[i]
+		elif "inv_" in name:
+			best_combo_dict[name] = best_combo[i]
+			# If the NMOS is bigger than the PMOS
+			if best_combo_erf_ratios[name] < 1:
+				best_combo_detailed[name + "_nmos"] = best_combo[i]/best_combo_erf_ratios[name]
+				best_combo_detailed[name + "_pmos"] = best_combo[i]
+			# If the PMOS is bigger than the NMOS
+			else:
+				best_combo_detailed[name + "_nmos"] = best_combo[i]
+				best_combo_detailed[name + "_pmos"] = best_combo[i]*best_combo_erf_ratios[name]
+		
+	return (best_combo_dict, best_combo_detailed, best_results[0])
+
+
 def search_ranges(sizing_ranges, fpga_inst, sizable_circuit, opt_type, re_erf, area_opt_weight, 
 				  delay_opt_weight, outer_iter, inner_iter, bunch_num, spice_interface, is_ram_component, is_cc_component):
 	""" 
@@ -1239,286 +2057,327 @@ def search_ranges(sizing_ranges, fpga_inst, sizable_circuit, opt_type, re_erf, a
 	if ERF_MONITOR_VERBOSE:
 		print("")
 
+	# With a simulation budget, we learn what the ERFs and the sizing combos of this subcircuit cost
+	sim_budget = fpga_inst.sim_budget
+	if sim_budget is not None:
+		sim_budget.measure(spice_interface)
+
 	# Find ERF ratios for middle combo
 	erf_ratios = erf_combo(fpga_inst, 
 						   sizable_circuit.top_spice_path, 
 						   element_names, 
 						   middle_combo,
 						   spice_interface)
+	if sim_budget is not None:
+		sim_budget.add_erf_cost(sizable_circuit.name, sim_budget.measure(spice_interface), 1)
 	
 	# For each transistor sizing combination, we want to calculate area, wire sizes, 
-	# and wire R and C
-	print("Calculating area and wire data for all transistor sizing combinations...")
+	# and wire R and C, and make a parameter dict for HSPICE
+	area_list, parameter_dict = get_sizing_combo_loads(fpga_inst, opt_type, sizable_circuit, element_names, sizing_combos, 
+													   erf_ratios, is_ram_component, is_cc_component)
+
+	# Simulate the combos with the coarse transient profile, this sweep only ranks them. 
+	# The top combos are measured again with the fine profile when they are re-ERFed below.
+	# With surrogate pruning, only the combos that might be the best one are simulated.
+	tfall_trise_list = [None]*len(sizing_combos)
+	eval_delay_list = [None]*len(sizing_combos)
+	simulated_combos = None
+	if fpga_inst.specs.surrogate_band > 0:
+		simulated_combos = prune_sizing_combos(fpga_inst, opt_type, sizable_circuit, sizing_combos, parameter_dict, area_list, tfall_trise_list, 
+											   eval_delay_list, area_opt_weight, delay_opt_weight, spice_interface, is_ram_component, is_cc_component)
+	if simulated_combos is None:
+		simulated_combos = list(range(len(sizing_combos)))
+		simulate_sizing_combos(fpga_inst, opt_type, sizable_circuit, parameter_dict, simulated_combos, tfall_trise_list, 
+							   eval_delay_list, spice_interface, is_ram_component, is_cc_component)
+		
+	# len(area_list) should be equal to len(delay_list), make sure...
+	assert len(area_list) == len(eval_delay_list)
 	
-	area_list = []
-	wire_rc_list = []
-	eval_delay_list = []
+	# Calculate cost for each combo (area-delay product)
+	# Results list holds a tuple, (cost, combo_index, area, delay)
+	print("Calculating cost for each transistor sizing combinations...")
+	print("")
+	cost_list = []
+	for i in simulated_combos:
+		area = area_list[i]
+		delay = eval_delay_list[i]
+		cost = cost_function(area, delay, area_opt_weight, delay_opt_weight)
+		cost_list.append((cost, i))
+		
+	# Sort based on cost
+	cost_list.sort()
+	
+	# Print top 10 results
+	print_top_sizing_combos(cost_list, area_list, eval_delay_list, tfall_trise_list)
 
-	for combo in sizing_combos:
-		# Update FPGA transistor sizes
-		fpga_inst._update_transistor_sizes(element_names, combo, fpga_inst.specs.use_finfet, erf_ratios)
-		# Calculate area of everything
-		fpga_inst.update_area()
-		# Get evaluation area
-		area_list.append(get_eval_area(fpga_inst, opt_type, sizable_circuit, is_ram_component, is_cc_component))
-		# Re-calculate wire lengths
-		fpga_inst.update_wires()
-		# Update wire resistance and capacitance
-		fpga_inst.update_wire_rc()
-		wire_rc = fpga_inst.wire_rc_dict
-		wire_rc_list.append(wire_rc)
-
-	
-	# We have to make a parameter dict for HSPICE
-	current_tran_sizes = {}
-	if not fpga_inst.specs.use_finfet :
-		for tran_name, tran_size in fpga_inst.transistor_sizes.items():
-			current_tran_sizes[tran_name] = 1e-9*tran_size*fpga_inst.specs.min_tran_width
-	else :
-		for tran_name, tran_size in fpga_inst.transistor_sizes.items():
-			current_tran_sizes[tran_name] = tran_size
+	if spice_interface.has_coarse_profile():
+		check_coarse_ranking(fpga_inst, opt_type, sizable_circuit, parameter_dict, cost_list, area_list, 
+							 area_opt_weight, delay_opt_weight, spice_interface, is_ram_component, is_cc_component)
+	if sim_budget is not None:
+		sim_budget.add_combo_cost(sizable_circuit.name, sim_budget.measure(spice_interface), len(sizing_combos))
+	
+	# Write results to file
+	# TODO: Turning this off for now
+	#export_filename = (spice_filedir + 
+	#                   sizable_circuit.name + 
+	#                   "_o" + str(outer_iter) + 
+	#                   "_i" + str(inner_iter) + 
+	#                   "_b" + str(bunch_num) + ".csv")
+	#export_all_results(export_filename, 
+	#                   element_names, 
+	#                   sizing_combos, 
+	#                   cost_list, 
+	#                   area_list, 
+	#                   eval_delay_list, 
+	#                   tfall_trise_list)
 
-	# Initialize the parameter dict to all empty lists
-	parameter_dict = {}
-	for tran_name in list(current_tran_sizes.keys()):
-		parameter_dict[tran_name] = []
-	for wire_name in list(wire_rc_list[0].keys()):
-		parameter_dict[wire_name + "_res"] = []
-		parameter_dict[wire_name + "_cap"] = []
+	# Re-ERF the top results and update the FPGA to the best combo
+	search_results = finish_sizing_search(fpga_inst, sizable_circuit, opt_type, element_names, sizing_combos, cost_list, re_erf, 
+										  area_opt_weight, delay_opt_weight, spice_interface, is_ram_component, is_cc_component)
+	if sim_budget is not None:
+		sim_budget.add_erf_cost(sizable_circuit.name, sim_budget.measure(spice_interface), min(re_erf, len(cost_list)))
 
-	for i in range(len(sizing_combos)):
-		for tran_name, tran_size in current_tran_sizes.items():
-			# We need this temp value to compare agains 'element_names'
-			tmp_tran_name = tran_name.replace("_nmos", "")
-			tmp_tran_name = tmp_tran_name.replace("_pmos", "")
-		   
-			# If this transistor is one of the transistor sizes that we are sweeping,
-			# we have to properly compute the size, if we aren't sweeping it, just add
-			# the current size to the list.
-			if tmp_tran_name in element_names:
-				# We need this id to pick the right data from sizing combo
-				element_id = element_names.index(tmp_tran_name)
-
-				# Let's calculate the size of this transistor
-				if not fpga_inst.specs.use_finfet :
-					tran_size = 1e-9*(sizing_combos[i][element_id]*fpga_inst.specs.min_tran_width)
-				else :
-					tran_size = (sizing_combos[i][element_id])
-
-				# If transistor is an inverter, we need to do some stuff to calc sizes for
-				# both the NMOS and PMOS, if it is anything else (eg. ptran), we can just add 
-				# it directly.
-				if tran_name.startswith("inv_"):
-					if tran_name.endswith("_nmos"):
-						# If the NMOS is bigger than the PMOS
-						if erf_ratios[tmp_tran_name] < 1:
-							nmos_size = tran_size/erf_ratios[tmp_tran_name]
-						# If the PMOS is bigger than the NMOS
-						else:
-							nmos_size = tran_size
-						parameter_dict[tran_name].append(nmos_size)
-					else:
-						# If the NMOS is bigger than the PMOS
-						if erf_ratios[tmp_tran_name] < 1:
-							pmos_size = tran_size
-						# If the PMOS is bigger than the NMOS
-						else:
-							pmos_size = tran_size*erf_ratios[tmp_tran_name]
-						parameter_dict[tran_name].append(pmos_size)
-
-				else: 
-					parameter_dict[tran_name].append(tran_size) 
-			else:
-				parameter_dict[tran_name].append(tran_size)
+	return search_results
+  
 	
-		# Now add the wire information for this wire
-		for wire_name, rc_data in wire_rc_list[i].items():
-			parameter_dict[wire_name + "_res"].append(rc_data[0])
-			parameter_dict[wire_name + "_cap"].append(rc_data[1]*1e-15)
-   
-	# Run HSPICE data sweep
-	print(("Running HSPICE for " + str(len(sizing_combos)) + 
-		   " transistor sizing combinations..."))
-	spice_meas = spice_interface.run(sizable_circuit.top_spice_path, parameter_dict)
+def _get_search_point(values):
+	""" Rounds 'values' to integer sizes of at least 1. """
 
-	# Now we need to create a list of tfall_trise to be compatible with old code
-	tfall_trise_list = []
-	meas_logic_low_voltage = []
-	for i in range(len(sizing_combos)):
-		tfall_str = spice_meas["meas_total_tfall"][i]
-		trise_str = spice_meas["meas_total_trise"][i]
-		if spice_meas["meas_logic_low_voltage"][i] == "failed" :
-			meas_logic_low_voltage.append(1)
-		else :
-			meas_logic_low_voltage.append(float(spice_meas["meas_logic_low_voltage"][i]))
+	return tuple(max(1, int(round(value))) for value in values)
+
+
+def _get_poll_points(point, step):
+	""" Returns the points 'step' sizes larger and smaller than 'point' along each element. """
 
-		if tfall_str == "failed":
-			tfall = 1
+	poll_points = []
+	for i in range(len(point)):
+		for offset in (-step, step):
+			poll_point = _get_search_point(point[:i] + (point[i] + offset,) + point[i+1:])
+			if poll_point != point and poll_point not in poll_points:
+				poll_points.append(poll_point)
+
+	return poll_points
+
+
+def coordinate_search(evaluate, start):
+	"""
+		Coordinate descent over integer sizes. 'evaluate' takes a list of points and returns their
+		costs, each call is one HSPICE sweep. Each step sweeps the sizes within COORDINATE_SEARCH_RADIUS
+		of the current size of one element, the other elements being fixed, and moves to the best one. 
+		If the best size is at the edge of the sweep, the element is swept again around it. 
+		The search stops when a pass over all the elements doesn't change any size.
+	"""
+
+	best = tuple(start)
+	best_cost = evaluate([best])[0]
+	num_steps = 1
+	improved = True
+	while improved and num_steps < SEARCH_MAX_STEPS:
+		improved = False
+		for i in range(len(best)):
+			while num_steps < SEARCH_MAX_STEPS:
+				line = [_get_search_point(best[:i] + (best[i] + offset,) + best[i+1:]) 
+						for offset in range(-COORDINATE_SEARCH_RADIUS, COORDINATE_SEARCH_RADIUS + 1)]
+				line_cost, line_best = min(zip(evaluate(line), line))
+				num_steps += 1
+				if line_cost >= best_cost:
+					break
+				improved = True
+				move = abs(line_best[i] - best[i])
+				best, best_cost = line_best, line_cost
+				if move < COORDINATE_SEARCH_RADIUS:
+					break
+
+	return best
+
+
+def pattern_search(evaluate, start, initial_step=PATTERN_SEARCH_INITIAL_STEP):
+	"""
+		Compass pattern search over integer sizes. 'evaluate' takes a list of points and returns their
+		costs, each call is one HSPICE sweep. Each step polls the points one step larger and smaller than 
+		the current best point along every element and moves to the best of them if it is better. 
+		Otherwise, the step is halved. The search stops when no point one size away is better.
+	"""
+
+	best = tuple(start)
+	best_cost = evaluate([best])[0]
+	num_steps = 1
+	step = initial_step
+	while step >= 1 and num_steps < SEARCH_MAX_STEPS:
+		poll_points = _get_poll_points(best, step)
+		if len(poll_points) == 0:
+			break
+		poll_cost, poll_best = min(zip(evaluate(poll_points), poll_points))
+		num_steps += 1
+		if poll_cost < best_cost:
+			best, best_cost = poll_best, poll_cost
 		else:
-			tfall = float(tfall_str)
-		if trise_str == "failed":
-			trise = 1
+			step = step//2
+
+	return best
+
+
+def nelder_mead_search(evaluate, start):
+	"""
+		Nelder-Mead simplex search over integer sizes. 'evaluate' takes a list of points and returns their
+		costs, each call is one HSPICE sweep. The initial simplex is 'start' and the points 
+		NELDER_MEAD_INITIAL_STEP sizes larger along each element. Each step evaluates the reflection, 
+		the expansion and both contractions of the worst vertex together and applies the usual 
+		Nelder-Mead rules. When none of them is accepted, the simplex shrinks towards the best vertex 
+		in another step. Rounding to integer sizes makes the simplex collapse onto one point 
+		eventually, then a step-1 pattern search polishes it.
+	"""
+
+	start = tuple(start)
+	simplex = [start] + [_get_search_point(start[:i] + (start[i] + NELDER_MEAD_INITIAL_STEP,) + start[i+1:]) 
+						 for i in range(len(start))]
+	vertices = sorted(zip(evaluate(simplex), simplex))
+	num_steps = 1
+	while len(set(vertex for cost, vertex in vertices)) > 1 and num_steps < SEARCH_MAX_STEPS:
+		best_cost, best = vertices[0]
+		worst_cost, worst = vertices[-1]
+		second_worst_cost = vertices[-2][0]
+
+		# Reflect the worst vertex through the centroid of the others
+		centroid = np.mean([vertex for cost, vertex in vertices[:-1]], axis=0)
+		direction = centroid - np.array(worst)
+		reflection = _get_search_point(centroid + direction)
+		expansion = _get_search_point(centroid + 2*direction)
+		outside_contraction = _get_search_point(centroid + 0.5*direction)
+		inside_contraction = _get_search_point(centroid - 0.5*direction)
+		reflection_cost, expansion_cost, outside_cost, inside_cost = evaluate([reflection, expansion, 
+																			   outside_contraction, inside_contraction])
+		num_steps += 1
+
+		new_vertex = None
+		if reflection_cost < best_cost:
+			if expansion_cost < reflection_cost:
+				new_vertex = (expansion_cost, expansion)
+			else:
+				new_vertex = (reflection_cost, reflection)
+		elif reflection_cost < second_worst_cost:
+			new_vertex = (reflection_cost, reflection)
+		elif reflection_cost < worst_cost:
+			if outside_cost <= reflection_cost:
+				new_vertex = (outside_cost, outside_contraction)
+		elif inside_cost < worst_cost:
+			new_vertex = (inside_cost, inside_contraction)
+
+		if new_vertex is not None and new_vertex[1] != worst:
+			vertices[-1] = new_vertex
 		else:
-			trise = float(trise_str)
-		tfall_trise_list.append((tfall, trise))
-  
-	# Get delay metric used for evaluation for each transistor sizing combo as well as 
-	# ERF error
-	for i in range(len(tfall_trise_list)):    
-		# Calculate evaluation delay
-		tfall_trise = tfall_trise_list[i]
+			# Shrink the other vertices halfway towards the best one, rounding towards it
+			shrunk = [tuple(best[i] + int((vertex[i] - best[i])/2) for i in range(len(best))) 
+					  for cost, vertex in vertices[1:]]
+			vertices = [vertices[0]] + list(zip(evaluate(shrunk), shrunk))
+			num_steps += 1
+		vertices.sort()
 
+	return pattern_search(evaluate, vertices[0][1], 1)
 
-		delay = get_eval_delay(fpga_inst, opt_type, sizable_circuit, tfall_trise[0], tfall_trise[1], meas_logic_low_voltage[i], is_ram_component, is_cc_component)
 
+# The search strategies selectable with the 'search_strategy' run option, besides SEARCH_GRID
+SEARCH_STRATEGIES = {"coordinate": coordinate_search,
+					 "pattern": pattern_search,
+					 "nelder_mead": nelder_mead_search}
 
-		eval_delay_list.append(delay)
-		
-	# len(area_list) should be equal to len(delay_list), make sure...
-	assert len(area_list) == len(eval_delay_list)
-	
-	# Calculate cost for each combo (area-delay product)
-	# Results list holds a tuple, (cost, combo_index, area, delay)
-	print("Calculating cost for each transistor sizing combinations...")
+
+def search_with_strategy(search_strategy, sizing_ranges, fpga_inst, sizable_circuit, opt_type, re_erf, area_opt_weight, 
+						 delay_opt_weight, spice_interface, is_ram_component, is_cc_component):
+	"""
+		Search transistor sizes with one of the SEARCH_STRATEGIES instead of a grid over 'sizing_ranges'.
+		The search starts from the middle of the ranges but isn't limited to them, sizes can grow as
+		much as needed and shrink down to 1. Elements with a fixed size in 'sizing_ranges' (level-restorers, etc.)
+		keep it. Every step of the strategy simulates the new combos it asks for in one HSPICE sweep, 
+		with the P/N ratios of the middle combo. Then, like in search_ranges, the top 're_erf' combos 
+		are re-balanced and the lowest cost one is the best transistor sizing.
+	"""
+
+	element_names = sorted(sizing_ranges.keys())
+	middle_combo = get_middle_value_config(element_names, sizing_ranges)
+
+	print("Determining initial inverter P/N ratios...")
+	if ERF_MONITOR_VERBOSE:
+		print("")
+
+	# Find ERF ratios for middle combo
+	erf_ratios = erf_combo(fpga_inst, 
+						   sizable_circuit.top_spice_path, 
+						   element_names, 
+						   middle_combo,
+						   spice_interface)
+
+	# The strategy only searches the sizes of the elements that don't have a fixed size
+	free_elements = [i for i in range(len(element_names)) if sizing_ranges[element_names[i]][0] != sizing_ranges[element_names[i]][1]]
+
+	# Every combo simulated so far. Its area, delays and sweep parameters are at the same index.
+	sizing_combos = []
+	combo_indices = {}
+	area_list = []
+	tfall_trise_list = []
+	eval_delay_list = []
+	parameter_dict = {}
+	sweep_sizes = []
+
+	def evaluate(points):
+		combos = []
+		for point in points:
+			combo = list(middle_combo)
+			for i in range(len(free_elements)):
+				combo[free_elements[i]] = point[i]
+			combos.append(tuple(combo))
+
+		# Simulate the combos we haven't simulated yet in one sweep
+		new_combos = []
+		for combo in combos:
+			if combo not in combo_indices:
+				combo_indices[combo] = len(sizing_combos) + len(new_combos)
+				new_combos.append(combo)
+		if len(new_combos) > 0:
+			new_area_list, new_parameter_dict = get_sizing_combo_loads(fpga_inst, opt_type, sizable_circuit, element_names, new_combos, 
+																	   erf_ratios, is_ram_component, is_cc_component)
+			new_tfall_trise_list = [None]*len(new_combos)
+			new_eval_delay_list = [None]*len(new_combos)
+			simulate_sizing_combos(fpga_inst, opt_type, sizable_circuit, new_parameter_dict, list(range(len(new_combos))), 
+								   new_tfall_trise_list, new_eval_delay_list, spice_interface, is_ram_component, is_cc_component)
+			sizing_combos.extend(new_combos)
+			area_list.extend(new_area_list)
+			tfall_trise_list.extend(new_tfall_trise_list)
+			eval_delay_list.extend(new_eval_delay_list)
+			for param_name, param_values in new_parameter_dict.items():
+				parameter_dict.setdefault(param_name, []).extend(param_values)
+			sweep_sizes.append(len(new_combos))
+
+		return [cost_function(area_list[combo_indices[combo]], eval_delay_list[combo_indices[combo]], area_opt_weight, delay_opt_weight) 
+				for combo in combos]
+
+	print("Searching transistor sizes with the " + search_strategy + " search strategy...")
+	start = tuple(middle_combo[i] for i in free_elements)
+	if len(free_elements) > 0:
+		SEARCH_STRATEGIES[search_strategy](evaluate, start)
+	else:
+		evaluate([start])
+	print("Simulated " + str(len(sizing_combos)) + " transistor sizing combinations in " + str(len(sweep_sizes)) + " sweeps")
 	print("")
+
+	# Calculate cost for each combo (area-delay product)
 	cost_list = []
-	for i in range(len(eval_delay_list)):
-		area = area_list[i]
-		delay = eval_delay_list[i]
-		cost = cost_function(area, delay, area_opt_weight, delay_opt_weight)
-		cost_list.append((cost, i))
-		
-	# Sort based on cost
+	for i in range(len(sizing_combos)):
+		cost_list.append((cost_function(area_list[i], eval_delay_list[i], area_opt_weight, delay_opt_weight), i))
 	cost_list.sort()
-	
+
 	# Print top 10 results
-	print("TOP 10 BEST COST RESULTS")
-	print("------------------------")
-	
-	for i in range(min(10, len(cost_list))):
-		combo_index = cost_list[i][1]
-		print(("Combo #" + str(combo_index).ljust(6) + 
-			   "cost=" + str(round(cost_list[i][0],6)).ljust(9) + 
-			   "area=" + str(round(area_list[combo_index]/1000000,3)).ljust(8) + 
-			   "delay=" + str(round(eval_delay_list[combo_index],13)).ljust(10) + 
-			   "tfall=" + str(round(tfall_trise_list[combo_index][0],13)).ljust(10) + 
-			   "trise=" + str(round(tfall_trise_list[combo_index][1],13)).ljust(10)))
-	print("")
-	
-	# Write results to file
-	# TODO: Turning this off for now
-	#export_filename = (spice_filedir + 
-	#                   sizable_circuit.name + 
-	#                   "_o" + str(outer_iter) + 
-	#                   "_i" + str(inner_iter) + 
-	#                   "_b" + str(bunch_num) + ".csv")
-	#export_all_results(export_filename, 
-	#                   element_names, 
-	#                   sizing_combos, 
-	#                   cost_list, 
-	#                   area_list, 
-	#                   eval_delay_list, 
-	#                   tfall_trise_list)
+	print_top_sizing_combos(cost_list, area_list, eval_delay_list, tfall_trise_list)
 
-	# Re-ERF some of the top results
-	# This is the number of top results to re-ERF
-	re_erf_num = min(re_erf, len(cost_list))
-	best_results = []
-	for i in range(re_erf_num):
-		# Re-ERF i-th best combo
-		print(("Re-equalizing rise and fall times on combo #" + str(cost_list[i][1]) + 
-			   " (ranked #" + str(i+1) + ")\n"))
-		erf_ratios = erf_combo(fpga_inst, 
-							   sizable_circuit.top_spice_path, 
-							   element_names, 
-							   sizing_combos[cost_list[i][1]], 
-							   spice_interface)
+	if spice_interface.has_coarse_profile():
+		check_coarse_ranking(fpga_inst, opt_type, sizable_circuit, parameter_dict, cost_list, area_list, 
+							 area_opt_weight, delay_opt_weight, spice_interface, is_ram_component, is_cc_component)
 
-		# Measure delay for combo
-		trise, tfall = run_combo(fpga_inst, 
-								 sizable_circuit.top_spice_path, 
-								 element_names, 
-								 sizing_combos[cost_list[i][1]], 
-								 erf_ratios,
-								 spice_interface)
+	# Re-ERF the top results and update the FPGA to the best combo
+	return finish_sizing_search(fpga_inst, sizable_circuit, opt_type, element_names, sizing_combos, cost_list, re_erf, 
+								area_opt_weight, delay_opt_weight, spice_interface, is_ram_component, is_cc_component)
 
-		# Get final delay (we use final because ERFing is done for each combo)
-		delay = get_final_delay(fpga_inst, opt_type, sizable_circuit, tfall, trise, is_ram_component, is_cc_component)
-		# Get area (run_combo will have updated the area numbers for us so we can get it 
-		# directly)
-		area = get_final_area(fpga_inst, opt_type, sizable_circuit, is_ram_component, is_cc_component)
-		# Calculate cost
-		cost = cost_function(area, delay, area_opt_weight, delay_opt_weight)
-		# Add to best results (cost, combo_index, area, delay, tfall, trise, erf_ratios)
-		best_results.append((cost, cost_list[i][1], area, delay, tfall, trise, erf_ratios))
-		
-	# Sort the newly ERF results
-	best_results.sort()
-	
-	print("BEST COST RESULTS AFTER RE-BALANCING")
-	print("------------------------------------")
-	for result in best_results:
-		print(("Combo #" + str(result[1]).ljust(6) + 
-			   "cost=" + str(round(result[0],6)).ljust(9) + 
-			   "area=" + str(round(result[2]/1000000,3)).ljust(8) + 
-			   "delay=" + str(round(result[3],13)).ljust(10) + 
-			   "tfall=" + str(round(result[4],13)).ljust(10) + 
-			   "trise=" + str(round(result[5],13)).ljust(10)))
-	print("")
 
-	# Write post-erf results to file
-	# TODO: Turn this off for now
-	#erf_export_filename = (spice_filedir + 
-	#                       sizable_circuit.name + 
-	#                       "_o" + str(outer_iter) + 
-	#                       "_i" + str(inner_iter) + 
-	#                       "_b" + str(bunch_num) + "_erf.csv")
-	#export_erf_results(erf_export_filename, 
-	#                   element_names, 
-	#                   sizing_combos, 
-	#                   best_results)
-	
-	# Update transistor sizes file as well as area and wires to best combo
-	best_combo = sizing_combos[best_results[0][1]]
-	best_combo_erf_ratios = best_results[0][6]
-	# Update transistor sizes
-	fpga_inst._update_transistor_sizes(element_names, best_combo, fpga_inst.specs.use_finfet, best_combo_erf_ratios)
-	# Calculate area of everything
-	fpga_inst.update_area()
-	# Re-calculate wire lengths
-	fpga_inst.update_wires()
-	# Update wire resistance and capacitance
-	fpga_inst.update_wire_rc()
-	
-	# We want to return the best combo, this must contain all NMOS and PMOS values
-	best_combo_detailed = {}
-	best_combo_dict = {}
-	for i in range(len(element_names)):
-		name = element_names[i]
-		if "ptran_" in name:
-			best_combo_dict[name] = best_combo[i]
-			best_combo_detailed[name + "_nmos"] = best_combo[i]
-		elif "tgate_" in name:
-			best_combo_dict[name] = best_combo[i]
-			best_combo_detailed[name + "_nmos"] = best_combo[i]
-			best_combo_detailed[name + "_pmos"] = best_combo[i]
-		elif "rest_" in name:
-			best_combo_dict[name] = best_combo[i]
-			best_combo_detailed[name + "_pmos"] = best_combo[i]
-		elif "inv_" in name:
-			best_combo_dict[name] = best_combo[i]
-			# If the NMOS is bigger than the PMOS
-			if best_combo_erf_ratios[name] < 1:
-				best_combo_detailed[name + "_nmos"] = best_combo[i]/best_combo_erf_ratios[name]
-				best_combo_detailed[name + "_pmos"] = best_combo[i]
-			# If the PMOS is bigger than the NMOS
-			else:
-				best_combo_detailed[name + "_nmos"] = best_combo[i]
-				best_combo_detailed[name + "_pmos"] = best_combo[i]*best_combo_erf_ratios[name]
-		
-	return (best_combo_dict, best_combo_detailed, best_results[0])
-  
-	
 def format_transistor_names_to_basic_subcircuits(transistor_names):
 	""" The input is a list of transistor names with the '_nmos' and '_pmos' tags.
 		The output is a list of element names without tags. """
@@ -1671,7 +2530,7 @@ def _divide_problem_into_sets(transistor_names):
 	return tran_names_set_list
 			
 
-def _find_initial_sizing_ranges(transistor_names, transistor_sizes):
+def _find_initial_sizing_ranges(transistor_names, transistor_sizes, max_combinations=None):
 	""" This function finds the initial transistor sizing ranges.
 		The initial ranges are determined based on 'transistor_sizes'
 		I think it's a good idea for the initial transistor size ranges to be smaller
@@ -1681,6 +2540,8 @@ def _find_initial_sizing_ranges(transistor_names, transistor_sizes):
 		that we don't need to change these transistor sizes much, we didn't waste time exploring a 
 		larger range of sizes. If we find that transistor sizes do need to change a lot, we can make 
 		the next transistor size ranges larger.
+		With a simulation budget, the ranges are sized for about 'max_combinations' sizing 
+		combinations (but never larger than without a budget).
 	"""
   
 	# We have to figure out what ranges to use.
@@ -1691,6 +2552,13 @@ def _find_initial_sizing_ranges(transistor_names, transistor_sizes):
 		sizes_per_element = 6
 	else:
 		sizes_per_element = 8
+
+	if max_combinations is not None:
+		count = len([name for name in transistor_names if "rest_" not in name])
+		if count > 0 and int(math.pow(max_combinations, 1.0/count)) < sizes_per_element:
+			sizes_per_element = int(math.pow(max_combinations, 1.0/count))
+		if sizes_per_element < 2:
+			sizes_per_element = 2
 		
 	# Figure out sizing ranges
 	# If the transistor is a level-restorer, keep the size at 1.
@@ -1731,11 +2599,12 @@ def _find_initial_sizing_ranges(transistor_names, transistor_sizes):
 	return sizing_ranges
 	
 		
-def update_sizing_ranges(sizing_ranges, sizing_results):
+def update_sizing_ranges(sizing_ranges, sizing_results, max_combinations=None):
 	""" 
 		This function does two things. First, it checks whether the transistor sizing results are valid.
 		That is, if the results are on the boundaries of the ranges, they are not valid. In this case, 
-		the function will adjust 'sizing_ranges' around the 'sizing_results'.
+		the function will adjust 'sizing_ranges' around the 'sizing_results', for a target of 
+		about 'max_combinations' transistor sizing combinations.
 		
 		Returns: True if 'sizing_results' are valid, False otherwise.
 	"""
@@ -1770,7 +2639,8 @@ def update_sizing_ranges(sizing_ranges, sizing_results):
 	# Get a rough estimate on the number of sizes per element based on some target maximum number of transistor sizing combinations.
 	# The real number of transistor sizing combinations may end up being larger than this max due to some of the sizing range 
 	# adjustments we make below.
-	max_combinations = 4000
+	if max_combinations is None:
+		max_combinations = MAX_SIZING_COMBINATIONS
 	sizes_per_element = int(math.pow(max_combinations, 1.0/count))
 	
 	# Now, we need to have an upper limit on sizing ranges. For example, if we only have one transistor,
@@ -1830,6 +2700,193 @@ def update_sizing_ranges(sizing_ranges, sizing_results):
 	return valid
 	   
 
+def _get_critical_path_delays(fpga_inst):
+	""" Returns the weighted delay of every subcircuit of the representative critical path of get_eval_delay, {name: delay}. """
+
+	path_delays = {}
+	for subcircuit in [fpga_inst.sb_mux, fpga_inst.cb_mux, fpga_inst.logic_cluster.local_mux, fpga_inst.logic_cluster.ble.lut,
+					   fpga_inst.logic_cluster.ble.local_output, fpga_inst.logic_cluster.ble.general_output]:
+		path_delays[subcircuit.name] = subcircuit.delay*subcircuit.delay_weight
+	for lut_input_name, lut_input in fpga_inst.logic_cluster.ble.lut.input_drivers.items():
+		path_delays[lut_input.driver.name] = lut_input.driver.delay*lut_input.driver.delay_weight
+		path_delays[lut_input.not_driver.name] = lut_input.not_driver.delay*lut_input.not_driver.delay_weight
+	if fpga_inst.specs.use_fluts:
+		path_delays[fpga_inst.logic_cluster.ble.fmux.name] = fpga_inst.logic_cluster.ble.fmux.delay*fpga_inst.logic_cluster.ble.lut.delay_weight
+	if fpga_inst.specs.enable_carry_chain == 1:
+		path_delays[fpga_inst.carrychainmux.name] = fpga_inst.carrychainmux.delay*fpga_inst.logic_cluster.ble.lut.delay_weight
+
+	return path_delays
+
+
+class SimulationBudget(object):
+	""" 
+		Spreads a simulation budget (in seconds of simulator time or in simulations) over the sizing
+		of the subcircuits so that the transistor sizing finishes in a known time.
+		Every time a subcircuit is sized, it gets a share of the budget that is left in proportion to
+		its share of the representative critical path delay, counting the sizings that are left in 
+		this FPGA sizing iteration and in the iterations after it. The budget of a subcircuit is then 
+		split over its searches, and the number of sizing combos and of re-ERFs of every search are 
+		picked from the simulation cost per combo and per ERF learned from the earlier searches 
+		of that subcircuit (of any subcircuit until it has been sized once).
+		The budget only makes searches smaller than they are without it. Once a subcircuit has spent its
+		share, the sizes of its last search are kept even if they are on the boundaries of the sizing 
+		ranges. A search that has started always finishes, so the budget can be exceeded when it is
+		too small. The budget only applies to the grid search.
+	"""
+
+	def __init__(self, budget, unit, max_iterations, spice_interface):
+		self.budget = budget
+		self.unit = unit
+		self.max_iterations = max_iterations
+		# Budget used so far and the simulator reading it was last updated from (see measure)
+		self.used = 0.0
+		self.last_reading = self._read(spice_interface)
+		# Learned costs of every subcircuit, {subcircuit name: [budget used, count]}
+		self.combo_costs = {}
+		self.erf_costs = {}
+		self.searches_per_group = {}
+		# Sum of the critical path shares of the subcircuits sized in an iteration
+		self.iteration_shares = None
+		self.shares_sized = 0.0
+		self.iteration = 1
+		# Budget of the subcircuit that is being sized and its searches
+		self.sizing_budget = 0.0
+		self.sizing_start = 0.0
+		self.expected_searches = 1
+
+
+	def _read(self, spice_interface):
+		if self.unit == BUDGET_UNIT_SECONDS:
+			return spice_interface.get_simulation_time()
+		return spice_interface.get_num_simulations_performed()
+
+
+	def restart(self, spice_interface):
+		""" Continue with a new SpiceInterface (e.g. in a resumed run). """
+
+		self.last_reading = self._read(spice_interface)
+
+
+	def measure(self, spice_interface):
+		""" Add the simulations run since the last call to the used budget and return their cost. """
+
+		reading = self._read(spice_interface)
+		cost = reading - self.last_reading
+		self.last_reading = reading
+		self.used += cost
+
+		return cost
+
+
+	def add_combo_cost(self, subcircuit_name, cost, num_combos):
+		self.combo_costs.setdefault(subcircuit_name, [0.0, 0])
+		self.combo_costs[subcircuit_name][0] += cost
+		self.combo_costs[subcircuit_name][1] += num_combos
+
+
+	def add_erf_cost(self, subcircuit_name, cost, num_erfs):
+		self.erf_costs.setdefault(subcircuit_name, [0.0, 0])
+		self.erf_costs[subcircuit_name][0] += cost
+		self.erf_costs[subcircuit_name][1] += num_erfs
+
+
+	def _get_cost(self, costs, subcircuit_name):
+		""" Returns the learned cost of 'subcircuit_name' (the mean of all subcircuits if it has none yet). """
+
+		if subcircuit_name in costs:
+			cost, count = costs[subcircuit_name]
+		else:
+			cost = sum(subcircuit_cost[0] for subcircuit_cost in costs.values())
+			count = sum(subcircuit_cost[1] for subcircuit_cost in costs.values())
+		if count == 0:
+			return None
+
+		return float(cost)/count
+
+
+	def start_iteration(self, iteration):
+		""" Start an FPGA sizing iteration. """
+
+		if self.iteration != iteration and self.shares_sized > 0:
+			self.iteration_shares = self.shares_sized
+		self.iteration = iteration
+		self.shares_sized = 0.0
+
+
+	def start_sizing(self, fpga_inst, subcircuit, num_groups, is_ram_component, spice_interface):
+		""" Set the budget of the sizing of 'subcircuit' that has 'num_groups' transistor groups. """
+
+		self.measure(spice_interface)
+		
+		# Share of the representative critical path delay (of the memory block for RAM components).
+		# Subcircuits that aren't on it (e.g. hard blocks) get the smallest share.
+		path_delays = _get_critical_path_delays(fpga_inst)
+		share = 0.0
+		if is_ram_component:
+			share = subcircuit.delay/get_current_delay(fpga_inst, 1)
+		elif subcircuit.name in path_delays:
+			share = path_delays[subcircuit.name]/sum(path_delays.values())
+		share = min(max(share, BUDGET_MIN_SHARE), 1.0)
+
+		# Until an iteration is done, we expect each critical path to add up to a share of 1
+		iteration_shares = self.iteration_shares
+		if iteration_shares is None:
+			iteration_shares = 1.0 + fpga_inst.specs.enable_bram_block
+		shares_left = max(iteration_shares - self.shares_sized, share) + (self.max_iterations - self.iteration)*iteration_shares
+		self.shares_sized += share
+
+		budget_left = max(self.budget - self.used, 0.0)
+		self.sizing_budget = budget_left*share/shares_left
+		self.sizing_start = self.used
+		self.expected_searches = int(round(num_groups*self.searches_per_group.get(subcircuit.name, BUDGET_SEARCHES_PER_GROUP)))
+
+		print("Simulation budget: " + str(round(budget_left, 1)) + " of " + str(self.budget) + " " + self.unit + " left, " + 
+			  str(round(self.sizing_budget, 1)) + " for " + subcircuit.name + " (" + str(round(100*share, 1)) + "% of the critical path)\n")
+
+
+	def plan_search(self, subcircuit_name, re_erf, num_searches, num_groups_left, spice_interface):
+		""" 
+			Returns the target number of sizing combos (None for the sizing ranges we use without a budget)
+			and the number of combos to re-ERF for the next search of the subcircuit being sized. 'num_searches' searches 
+			of it are done and 'num_groups_left' of its transistor groups still have to be searched 
+			(including the current one).
+		"""
+
+		self.measure(spice_interface)
+		searches_left = max(self.expected_searches - num_searches, num_groups_left, 1)
+		search_budget = max(self.sizing_budget - (self.used - self.sizing_start), 0.0)/searches_left
+
+		combo_cost = self._get_cost(self.combo_costs, subcircuit_name)
+		erf_cost = self._get_cost(self.erf_costs, subcircuit_name)
+		# Nothing was simulated yet, search like we would without a budget
+		if combo_cost is None or erf_cost is None:
+			return None, re_erf
+
+		# Every search ERFs the middle combo and re-ERFs at least one combo. A search that spends less on 
+		# its combos than on these ERFs would save little and make the sizing take more searches.
+		search_re_erf = min(max(int(search_budget*BUDGET_RE_ERF_SHARE/max(erf_cost, 1e-12)), 1), re_erf)
+		erf_combinations = (1 + search_re_erf)*erf_cost/max(combo_cost, 1e-12)
+		max_combinations = max((search_budget/max(combo_cost, 1e-12)) - erf_combinations, erf_combinations)
+		# The budget only makes searches smaller than they are without a budget
+		if max_combinations >= MAX_SIZING_COMBINATIONS:
+			return None, search_re_erf
+
+		return max_combinations, search_re_erf
+
+
+	def is_spent(self, spice_interface):
+		""" Returns True if the subcircuit being sized used up its share of the budget. """
+
+		self.measure(spice_interface)
+		return self.used - self.sizing_start >= self.sizing_budget
+
+
+	def end_sizing(self, subcircuit_name, num_searches, num_groups):
+		""" Learn the number of searches per group of the subcircuit that was sized. """
+
+		self.searches_per_group[subcircuit_name] = float(num_searches)/num_groups
+
+
 def size_subcircuit_transistors(fpga_inst, 
 								subcircuit, 
 								opt_type, 
@@ -1870,6 +2927,10 @@ def size_subcircuit_transistors(fpga_inst,
 	# Get the SPICE file name and the directory name
 	spice_filename = os.path.basename(subcircuit.top_spice_path)
 	spice_filedir = os.path.dirname(subcircuit.top_spice_path)
+
+	sim_budget = fpga_inst.sim_budget
+	if sim_budget is not None:
+		sim_budget.start_sizing(fpga_inst, subcircuit, len(sizing_ranges_set_list), is_ram_component, spice_interface)
 	
 	# If there is more than one set to size, we should first ERF everything.
 	# Once that is done, we can work on individual sets.
@@ -1888,8 +2949,36 @@ def size_subcircuit_transistors(fpga_inst,
 	# Perform transistor sizing on each set of transistors
 	sizing_results = {}
 	sizing_results_detailed = {}
+	num_searches = 0
 	for set_num in range(len(sizing_ranges_set_list)):
 		sizing_ranges = sizing_ranges_set_list[set_num]
+
+		# With a simulation budget, the number of sizing combos and of re-ERFs of every search come from the budget
+		max_combinations = None
+		search_re_erf = re_erf
+		if sim_budget is not None:
+			max_combinations, search_re_erf = sim_budget.plan_search(subcircuit.name, re_erf, num_searches, len(sizing_ranges_set_list) - set_num, spice_interface)
+			sizing_ranges = _find_initial_sizing_ranges(tran_names_set_list[set_num], initial_transistor_sizes, max_combinations)
+
+		# The search strategies aren't limited to the sizing ranges, so they only search once
+		if fpga_inst.specs.search_strategy != SEARCH_GRID:
+			_print_sizing_ranges(subcircuit.name, [sizing_ranges])
+			search_results = search_with_strategy(fpga_inst.specs.search_strategy,
+												  sizing_ranges, 
+												  fpga_inst, 
+												  subcircuit, 
+												  opt_type, 
+												  search_re_erf, 
+												  area_opt_weight, 
+												  delay_opt_weight, 
+												  spice_interface,
+												  is_ram_component,
+												  is_cc_component)
+			print_sizing_results(subcircuit.name, [search_results[1]])
+			sizing_results.update(search_results[0])
+			sizing_results_detailed.update(search_results[1])
+			num_searches += 1
+			continue
 		
 		# Keep a list of the sizing ranges we tried.
 		sizing_ranges_list = []
@@ -1905,6 +2994,8 @@ def size_subcircuit_transistors(fpga_inst,
 		
 			# Print past and current sizing ranges to terminal
 			_print_sizing_ranges(subcircuit.name, sizing_ranges_list)
+			if max_combinations is not None:
+				print("Search budget: about " + str(int(max_combinations)) + " sizing combos and " + str(search_re_erf) + " re-ERFs\n")
 			
 			# Make a copy of the sizing ranges. size_ranges modifies the contents of the sizing_ranges dict.
 			# So we keep an unmodified copy up here (the original).
@@ -1915,7 +3006,7 @@ def size_subcircuit_transistors(fpga_inst,
 												 fpga_inst, 
 												 subcircuit, 
 												 opt_type, 
-												 re_erf, 
+												 search_re_erf, 
 												 area_opt_weight, 
 												 delay_opt_weight, 
 												 outer_iter, 
@@ -1937,17 +3028,30 @@ def size_subcircuit_transistors(fpga_inst,
 			# Update results so that we have results for all sets in one place
 			sizing_results.update(sizing_results_set)
 			sizing_results_detailed.update(sizing_results_set_detailed)
+			num_searches += 1
+
+			# The next search (if there is one) gets its share of the budget that is left
+			if sim_budget is not None:
+				max_combinations, search_re_erf = sim_budget.plan_search(subcircuit.name, re_erf, num_searches, len(sizing_ranges_set_list) - set_num, spice_interface)
 			
 			# Now we need to check if this is a valid sizing (is it on the boundaries or not).
 			# If it is on the boundaries, we need to adjust the boundaries and do the sizing again.
 			# If it isn't on the boundaries, its a valid sizing, we store the results and move on to the next subcircuit.
-			sizes_are_valid = update_sizing_ranges(sizing_ranges, sizing_results_set)
+			sizes_are_valid = update_sizing_ranges(sizing_ranges, sizing_results_set, max_combinations)
+
+			# Once its share of the budget is spent, we keep the sizes we found even if they are on the boundaries
+			if not sizes_are_valid and sim_budget is not None and sim_budget.is_spent(spice_interface):
+				print("Simulation budget of " + subcircuit.name + " is spent, keeping the sizes on the sizing range boundaries\n")
+				sizes_are_valid = True
 			
 			# Add a copy of sizing ranges to list
 			sizing_ranges_list.append(sizing_ranges.copy())
 			
 			inner_iter += 1
 
+	if sim_budget is not None:
+		sim_budget.end_sizing(subcircuit.name, num_searches, len(sizing_ranges_set_list))
+
 	sys.stdout.flush()
 	return sizing_results, sizing_results_detailed
 
@@ -2148,6 +3252,212 @@ def check_if_done(sizing_results_list, area_results_list, delay_results_list, ar
 
 	
 
+class _PendingSizingResult(object):
+	""" Stands for the sizing results (and detailed sizing results) of a subcircuit that is being
+		sized by a worker process in the parallel sizing mode. """
+
+	def __init__(self, async_result, log_path):
+		self.async_result = async_result
+		self.log_path = log_path
+
+
+class _SizingCheckpoint(object):
+	""" The state of size_fpga_transistors that a killed run needs to continue with the --resume option:
+		the iteration number, the results of the past iterations, the results of the subcircuits sized 
+		so far in this iteration and the quick mode state. The state of the FPGA (transistor sizes, ERF 
+		ratios, areas, wires and delays) is saved with it, so that a resumed run continues exactly where
+		the killed one stopped without sizing any subcircuit again. """
+
+	def __init__(self, path, params_digest):
+		self.path = path
+		# Digest of the architecture and of the sizing run options (see _get_checkpoint_digest)
+		self.params_digest = params_digest
+		self.iteration = 1
+		self.is_done = False
+		self.final_result_index = 0
+		self.sizing_results_list = []
+		self.sizing_results_detailed_list = []
+		self.area_results_list = []
+		self.delay_results_list = []
+		self.quick_mode_dict = {}
+		self.sizing_results_dict = {}
+		self.sizing_results_detailed_dict = {}
+		# Names of the subcircuits of this iteration that a resumed run takes the results of from 
+		# the checkpoint, until it sizes its first subcircuit.
+		self.resumed_names = set()
+
+
+	def write(self, fpga_inst):
+		""" Save the checkpoint and the state of 'fpga_inst'. The file is written to a temporary file
+			first and then renamed, so a run killed while writing it still leaves the last checkpoint. """
+
+		state = self.__dict__.copy()
+		del state["resumed_names"]
+		fpga_state = fpga_inst.__dict__.copy()
+		del fpga_state["spice_interface"]
+
+		tmp_path = self.path + ".tmp"
+		checkpoint_file = open(tmp_path, 'wb')
+		pickle.dump((state, fpga_state), checkpoint_file, pickle.HIGHEST_PROTOCOL)
+		checkpoint_file.flush()
+		os.fsync(checkpoint_file.fileno())
+		checkpoint_file.close()
+		os.replace(tmp_path, self.path)
+
+
+	def read(self, fpga_inst):
+		""" Load the checkpoint and put the saved FPGA state in 'fpga_inst'. """
+
+		if not os.path.isfile(self.path):
+			print("ERROR: Cannot resume transistor sizing, there is no checkpoint (" + os.path.abspath(self.path) + ")")
+			sys.exit()
+
+		checkpoint_file = open(self.path, 'rb')
+		state, fpga_state = pickle.load(checkpoint_file)
+		checkpoint_file.close()
+
+		if state.get("params_digest") != self.params_digest or set(fpga_state["transistor_sizes"].keys()) != set(fpga_inst.transistor_sizes.keys()):
+			print("ERROR: Cannot resume transistor sizing, the checkpoint (" + os.path.abspath(self.path) + ") is from a different architecture, " + 
+				  "process or sizing options (" + ", ".join(CHECKPOINT_RUN_OPTIONS) + ")")
+			sys.exit()
+
+		self.__dict__.update(state)
+		self.resumed_names = set(self.sizing_results_dict.keys())
+		fpga_inst.__dict__.update(fpga_state)
+
+
+	def is_resuming(self):
+		""" Returns True until a resumed run sizes its first subcircuit. """
+
+		return len(self.resumed_names) > 0
+
+
+	def next_iteration(self, fpga_inst, iteration, is_done, final_result_index):
+		""" Start a new sizing iteration and save the checkpoint. """
+
+		self.iteration = iteration
+		self.is_done = is_done
+		self.final_result_index = final_result_index
+		self.sizing_results_dict = {}
+		self.sizing_results_detailed_dict = {}
+		self.resumed_names = set()
+		self.write(fpga_inst)
+
+
+def _get_checkpoint_digest(fpga_inst, run_options):
+	""" Returns a digest of the architecture and process parameters of 'fpga_inst', of its hard blocks 
+		and of the run options in CHECKPOINT_RUN_OPTIONS. """
+
+	digest = hashlib.sha256()
+	digest.update(repr(sorted(fpga_inst.specs.__dict__.items())).encode())
+	for hardblock in fpga_inst.hardblocklist:
+		digest.update(repr(sorted(hardblock.parameters.items())).encode())
+	for option in CHECKPOINT_RUN_OPTIONS:
+		digest.update(repr((option, getattr(run_options, option))).encode())
+
+	return digest.hexdigest()
+
+
+def _size_subcircuit(sizing_pool, sizing_checkpoint, fpga_inst, subcircuit, opt_type, re_erf, area_opt_weight, delay_opt_weight, 
+					 outer_iter, initial_transistor_sizes, spice_interface, is_ram_component, is_cc_component):
+	""" Size the transistors of one subcircuit with size_subcircuit_transistors.
+		In the parallel (Jacobi-style) sizing mode, 'sizing_pool' is a process pool and the subcircuit
+		is sized by one of its workers, with a copy of the FPGA as it was at the start of the sizing
+		iteration. The results are then _PendingSizingResults, which _merge_parallel_sizing_results
+		collects at the end of the iteration. 
+		A resumed run takes the results of the subcircuits it had sized in this iteration from 
+		'sizing_checkpoint'. Otherwise, the checkpoint is saved before the subcircuit is sized. """
+
+	if subcircuit.name in sizing_checkpoint.resumed_names:
+		print("Taking the sizing results of " + subcircuit.name + " from the checkpoint\n")
+		return sizing_checkpoint.sizing_results_dict[subcircuit.name], sizing_checkpoint.sizing_results_detailed_dict[subcircuit.name]
+	sizing_checkpoint.resumed_names = set()
+
+	if sizing_pool is None:
+		# The pending results of the parallel sizing mode can't be saved, it only saves a checkpoint after every iteration
+		if len(sizing_checkpoint.sizing_results_dict) > 0:
+			sizing_checkpoint.write(fpga_inst)
+		return size_subcircuit_transistors(fpga_inst, subcircuit, opt_type, re_erf, area_opt_weight, delay_opt_weight, 
+										   outer_iter, initial_transistor_sizes, spice_interface, is_ram_component, is_cc_component)
+
+	print("Sizing " + subcircuit.name + " in a worker process")
+	sizing_job = (fpga_inst, subcircuit, opt_type, re_erf, area_opt_weight, delay_opt_weight, 
+				  outer_iter, initial_transistor_sizes, spice_interface, is_ram_component, is_cc_component)
+	async_result = sizing_pool.apply_async(_size_subcircuit_job, (sizing_job,))
+	log_path = _get_parallel_sizing_log_path(subcircuit.name, outer_iter)
+
+	pending_result = _PendingSizingResult(async_result, log_path)
+
+	return pending_result, pending_result
+
+
+def _size_subcircuit_job(sizing_job):
+	""" Size one subcircuit in a worker process of the parallel sizing mode.
+		Returns the sizing results, the detailed sizing results, the new transistor sizes of the subcircuit, the 
+		simulation statistics and the ERF ratio store. The new transistor sizes are the ones the sizing put in 
+		fpga_inst.transistor_sizes, which are rounded in FinFET mode unlike the detailed sizing results. """
+
+	(fpga_inst, subcircuit, opt_type, re_erf, area_opt_weight, delay_opt_weight, 
+	 outer_iter, initial_transistor_sizes, spice_interface, is_ram_component, is_cc_component) = sizing_job
+
+	spice_interface.set_up_worker(PARALLEL_SIZING_SCRATCH_PREFIX + subcircuit.name)
+	# Only count the ERFs of this job, the ERF ratio store is merged back at the end of the iteration
+	if fpga_inst.erf_ratio_store is not None:
+		fpga_inst.erf_ratio_store.reset_statistics()
+
+	# The workers run at the same time, so each one prints to a log file of its own
+	log_file = open(_get_parallel_sizing_log_path(subcircuit.name, outer_iter), 'w')
+	stdout = sys.stdout
+	sys.stdout = log_file
+	try:
+		sizing_results, sizing_results_detailed = size_subcircuit_transistors(fpga_inst, subcircuit, opt_type, re_erf, area_opt_weight, delay_opt_weight, 
+																			  outer_iter, initial_transistor_sizes, spice_interface, is_ram_component, is_cc_component)
+	finally:
+		sys.stdout = stdout
+		log_file.close()
+
+	transistor_sizes = {}
+	for name in sizing_results_detailed:
+		transistor_sizes[name] = fpga_inst.transistor_sizes[name]
+
+	return sizing_results, sizing_results_detailed, transistor_sizes, spice_interface.get_statistics(), fpga_inst.erf_ratio_store
+
+
+def _get_parallel_sizing_log_path(subcircuit_name, outer_iter):
+	""" Returns the path of the log file of a subcircuit sized in a worker process. """
+
+	return os.path.join("sizing_results", subcircuit_name + "_o" + str(outer_iter) + ".log")
+
+
+def _merge_parallel_sizing_results(fpga_inst, spice_interface, sizing_results_dict, sizing_results_detailed_dict):
+	""" Wait for the subcircuits sized by worker processes and put their results in the sizing 
+		results dictionaries. Then, update the FPGA with the new transistor sizes of all of them. """
+
+	new_transistor_sizes = {}
+	for name in sizing_results_dict:
+		pending_result = sizing_results_dict[name]
+		if not isinstance(pending_result, _PendingSizingResult):
+			continue
+		sizing_results, sizing_results_detailed, transistor_sizes, statistics, erf_ratio_store = pending_result.async_result.get()
+		sizing_results_dict[name] = sizing_results
+		sizing_results_detailed_dict[name] = sizing_results_detailed
+		new_transistor_sizes.update(transistor_sizes)
+		spice_interface.add_statistics(statistics)
+		if erf_ratio_store is not None:
+			fpga_inst.erf_ratio_store.update(erf_ratio_store)
+		print("Sized " + name + " (log in " + pending_result.log_path + ")")
+
+	# Update transistor sizes
+	fpga_inst.transistor_sizes.update(new_transistor_sizes)
+	# Calculate area of everything
+	fpga_inst.update_area()
+	# Re-calculate wire lengths
+	fpga_inst.update_wires()
+	# Update wire resistance and capacitance
+	fpga_inst.update_wire_rc()
+	print("")
+
+
 def size_fpga_transistors(fpga_inst, run_options, spice_interface):
 	""" Size FPGA transistors. 
 	
@@ -2158,6 +3468,10 @@ def size_fpga_transistors(fpga_inst, run_options, spice_interface):
 					max_iterations   - maximum number of 'FPGA sizing iterations' (see [1])
 					area_opt_weight  - the 'b' in (cost = area^b * delay^c)
 					delay_opt_weight - the 'c' in (cost = area^b * delay^c)
+					parallel_sizing  - number of worker processes that size subcircuits
+									   concurrently (0 sizes them one after another)
+					sim_budget       - simulation budget of the sizing in sim_budget_unit 
+									   (seconds or simulations, 0 for no budget)
 				spice_interface - an object that is used to run HSPICE and parse its outputs
 		
 		One 'FPGA sizing iteration' means sizing each subcircuits once.
@@ -2175,6 +3489,21 @@ def size_fpga_transistors(fpga_inst, run_options, spice_interface):
 		generally have very similar cost, and I think this suggests that we have a 
 		fairly minimal solution, but it's not necessarily globally minimal as we can't
 		guarantee that with this algorithm.
+
+		In the parallel sizing mode, all the subcircuits of a sizing iteration are 
+		sized at the same time (Jacobi-style rather than Gauss-Seidel-style): each 
+		one is sized by a worker process with a copy of the FPGA as it was at the
+		start of the iteration, and the new sizes of all of them are applied at the
+		end of the iteration. Since the delays of the other subcircuits are stale 
+		during sizing anyway, this gives similar results in the time it takes to 
+		size the slowest subcircuit.
+
+		The sizing state is saved to SIZING_CHECKPOINT_FILENAME before every subcircuit 
+		is sized and after every iteration. With the 'resume' run option, sizing continues
+		from the saved state instead of starting over.
+
+		With the 'optimize_height' run option, the floorplan of every iteration uses the
+		logic tile height with the lowest cost (see FPGA.determine_height).
 		
 		[1] C. Chiasson and V.Betz, "COFFE: Fully-Automated Transistor Sizing for FPGAs", FPT2013
 		
@@ -2186,30 +3515,50 @@ def size_fpga_transistors(fpga_inst, run_options, spice_interface):
 	area_opt_weight  = run_options.area_opt_weight 
 	delay_opt_weight = run_options.delay_opt_weight
 	size_hb_interfaces = run_options.size_hb_interfaces
+	parallel_sizing  = run_options.parallel_sizing
    
 	# Create results folder if it doesn't exist
 	if not os.path.exists("sizing_results"):
 		os.makedirs("sizing_results")
 	
-	# Initialize FPGA subcircuit delays
-	fpga_inst.update_delays(spice_interface)
+	sizing_checkpoint = _SizingCheckpoint(SIZING_CHECKPOINT_FILENAME, _get_checkpoint_digest(fpga_inst, run_options))
+	if run_options.resume:
+		# The checkpoint has the FPGA state (delays included) of the killed run
+		sizing_checkpoint.read(fpga_inst)
+		if fpga_inst.sim_budget is not None:
+			fpga_inst.sim_budget.restart(spice_interface)
+		print("Resuming transistor sizing at iteration #" + str(sizing_checkpoint.iteration) + 
+			  " (" + str(len(sizing_checkpoint.resumed_names)) + " subcircuits sized in this iteration)\n")
+	else:
+		# The simulation budget counts every simulation of the transistor sizing
+		if run_options.sim_budget > 0:
+			fpga_inst.sim_budget = SimulationBudget(run_options.sim_budget, run_options.sim_budget_unit, max_iterations, spice_interface)
+
+		# Initialize FPGA subcircuit delays
+		fpga_inst.update_delays(spice_interface)
+
+		# Keep the ERF ratios of all sizing searches and iterations to reuse them
+		if run_options.erf_reuse:
+			fpga_inst.erf_ratio_store = ErfRatioStore()
 	
 	print("Starting transistor sizing...\n")
 	
 	# These lists store transistor sizing, area and delay results for each FPGA sizing
 	# iteration. Each entry in the list represents an FPGA sizing iteration.
 	# For example, area_results_list[0] has area results for the first FPGA sizing iteration.
-	sizing_results_list = []
-	sizing_results_detailed_list = []
-	area_results_list = []
-	delay_results_list = []
-	quick_mode_dict = {}
+	# They are part of the sizing checkpoint.
+	sizing_results_list = sizing_checkpoint.sizing_results_list
+	sizing_results_detailed_list = sizing_checkpoint.sizing_results_detailed_list
+	area_results_list = sizing_checkpoint.area_results_list
+	delay_results_list = sizing_checkpoint.delay_results_list
+	quick_mode_dict = sizing_checkpoint.quick_mode_dict
 	# Keep performing FPGA sizing iterations until algorithm terminates
 	# Two conditions can make it terminate:
 	# 1 - Cost stops improving ('is_done')
 	# 2 - The max number of iterations of this while loop have been performed (max_iterations)
-	is_done = False
-	iteration = 1
+	is_done = sizing_checkpoint.is_done
+	final_result_index = sizing_checkpoint.final_result_index
+	iteration = sizing_checkpoint.iteration
 	while not is_done:
 	
 		if iteration > max_iterations:
@@ -2219,8 +3568,9 @@ def size_fpga_transistors(fpga_inst, run_options, spice_interface):
 	
 		print("FPGA TRANSISTOR SIZING ITERATION #" + str(iteration) + "\n")
 
-		sizing_results_dict = {}
-		sizing_results_detailed_dict = {}
+		# A resumed run already has the results of some subcircuits of this iteration
+		sizing_results_dict = sizing_checkpoint.sizing_results_dict
+		sizing_results_detailed_dict = sizing_checkpoint.sizing_results_detailed_dict
 
 		# Now we are going to size the transistors of each subcircuit.
 		# The order we do this has an importance due to rise-fall balancing. 
@@ -2229,24 +3579,34 @@ def size_fpga_transistors(fpga_inst, run_options, spice_interface):
 		# cluster, finally emerging back into the general routing when we reach the cluster 
 		# outputs. This code is all basically the same, just repeated for each subcircuit.
 
-		print("determining a floorplan for this sizing iteration")
-		
-		
-		fpga_inst.update_area()
-		if fpga_inst.lb_height == 0.0:
-			fpga_inst.lb_height = math.sqrt(fpga_inst.area_dict["tile"])
-			fpga_inst.update_area()
+		# The floorplan of an iteration that is resumed is part of the checkpoint
+		if not sizing_checkpoint.is_resuming():
+			if fpga_inst.sim_budget is not None:
+				fpga_inst.sim_budget.start_iteration(iteration)
 
-		fpga_inst.update_wires()
-		fpga_inst.update_wire_rc()
-		#fpga_inst.determine_height()
-		fpga_inst.update_area()
-		fpga_inst.compute_distance()
-		fpga_inst.update_wires()
-		fpga_inst.update_wire_rc()
-		fpga_inst.update_delays(spice_interface)
+			print("determining a floorplan for this sizing iteration")
+
+			fpga_inst.update_area()
+			if fpga_inst.lb_height == 0.0:
+				fpga_inst.lb_height = math.sqrt(fpga_inst.area_dict["tile"])
+				fpga_inst.update_area()
+
+			fpga_inst.update_wires()
+			fpga_inst.update_wire_rc()
+			if run_options.optimize_height:
+				fpga_inst.determine_height()
+			fpga_inst.update_area()
+			fpga_inst.compute_distance()
+			fpga_inst.update_wires()
+			fpga_inst.update_wire_rc()
+			fpga_inst.update_delays(spice_interface)
 		
 		
+		# In the parallel sizing mode, the subcircuits are sized by the workers of this pool
+		sizing_pool = None
+		if parallel_sizing > 0:
+			sizing_pool = mp.Pool(parallel_sizing)
+
 		print("Sizing will begin now.")
 		# Useful for debugging
 		# tmp_area = get_eval_area(fpga_inst, "global", fpga_inst.sb_mux, 0, 0)
@@ -2280,7 +3640,7 @@ def size_fpga_transistors(fpga_inst, run_options, spice_interface):
 				
 				# Size the transistors of this subcircuit
 				if quick_mode_dict[name] == 1:
-					sizing_results_dict[name], sizing_results_detailed_dict[name] = size_subcircuit_transistors(fpga_inst, hardblock.dedicated, opt_type, re_erf, area_opt_weight, delay_opt_weight, iteration, starting_transistor_sizes, spice_interface, 0, 0)
+					sizing_results_dict[name], sizing_results_detailed_dict[name] = _size_subcircuit(sizing_pool, sizing_checkpoint, fpga_inst, hardblock.dedicated, opt_type, re_erf, area_opt_weight, delay_opt_weight, iteration, starting_transistor_sizes, spice_interface, 0, 0)
 				else:
 					sizing_results_dict[name]= sizing_results_list[len(sizing_results_list)-1][name]
 					sizing_results_detailed_dict[name] = sizing_results_detailed_list[len(sizing_results_list)-1][name]   
@@ -2296,7 +3656,7 @@ def size_fpga_transistors(fpga_inst, run_options, spice_interface):
 			
 			# Size the transistors of this subcircuit
 			if quick_mode_dict[name] == 1:
-				sizing_results_dict[name], sizing_results_detailed_dict[name] = size_subcircuit_transistors(fpga_inst, hardblock.mux, opt_type, re_erf, area_opt_weight, delay_opt_weight, iteration, starting_transistor_sizes, spice_interface, 0, 0)
+				sizing_results_dict[name], sizing_results_detailed_dict[name] = _size_subcircuit(sizing_pool, sizing_checkpoint, fpga_inst, hardblock.mux, opt_type, re_erf, area_opt_weight, delay_opt_weight, iteration, starting_transistor_sizes, spice_interface, 0, 0)
 			else:
 				sizing_results_dict[name]= sizing_results_list[len(sizing_results_list)-1][name]
 				sizing_results_detailed_dict[name] = sizing_results_detailed_list[len(sizing_results_list)-1][name]   
@@ -2322,13 +3682,13 @@ def size_fpga_transistors(fpga_inst, run_options, spice_interface):
 
 			# Size the transistors of this subcircuit
 			if quick_mode_dict[name] == 1:
-				sizing_results_dict[name], sizing_results_detailed_dict[name] = size_subcircuit_transistors(fpga_inst, fpga_inst.sb_mux, opt_type, re_erf, area_opt_weight, delay_opt_weight, iteration, starting_transistor_sizes, spice_interface, 0, 0)
+				sizing_results_dict[name], sizing_results_detailed_dict[name] = _size_subcircuit(sizing_pool, sizing_checkpoint, fpga_inst, fpga_inst.sb_mux, opt_type, re_erf, area_opt_weight, delay_opt_weight, iteration, starting_transistor_sizes, spice_interface, 0, 0)
 			else:
 				sizing_results_dict[name]= sizing_results_list[len(sizing_results_list)-1][name]
 				sizing_results_detailed_dict[name] = sizing_results_detailed_list[len(sizing_results_list)-1][name]
 
 				# update quick mode status and display duration
-			if quick_mode_dict[name] == 1:
+			if quick_mode_dict[name] == 1 and not sizing_checkpoint.is_resuming():
 				time_after_sizing = time.time()
 				
 				past_cost = current_cost
@@ -2355,13 +3715,13 @@ def size_fpga_transistors(fpga_inst, run_options, spice_interface):
 				
 			# Size the transistors of this subcircuit
 			if quick_mode_dict[name] == 1:
-				sizing_results_dict[name], sizing_results_detailed_dict[name] = size_subcircuit_transistors(fpga_inst, fpga_inst.cb_mux, opt_type, re_erf, area_opt_weight, delay_opt_weight, iteration, starting_transistor_sizes, spice_interface, 0, 0)
+				sizing_results_dict[name], sizing_results_detailed_dict[name] = _size_subcircuit(sizing_pool, sizing_checkpoint, fpga_inst, fpga_inst.cb_mux, opt_type, re_erf, area_opt_weight, delay_opt_weight, iteration, starting_transistor_sizes, spice_interface, 0, 0)
 			else:
 				sizing_results_dict[name]= sizing_results_list[len(sizing_results_list)-1][name]
 				sizing_results_detailed_dict[name] = sizing_results_detailed_list[len(sizing_results_list)-1][name]
 		
 				# update quick mode status and display duration
-			if quick_mode_dict[name] == 1:
+			if quick_mode_dict[name] == 1 and not sizing_checkpoint.is_resuming():
 				time_after_sizing = time.time()
 				
 				past_cost = current_cost
@@ -2389,13 +3749,13 @@ def size_fpga_transistors(fpga_inst, run_options, spice_interface):
 			
 			# Size the transistors of this subcircuit
 			if quick_mode_dict[name] == 1:
-				sizing_results_dict[name], sizing_results_detailed_dict[name] = size_subcircuit_transistors(fpga_inst, fpga_inst.logic_cluster.local_mux, opt_type, re_erf, area_opt_weight, delay_opt_weight, iteration, starting_transistor_sizes, spice_interface, 0, 0)
+				sizing_results_dict[name], sizing_results_detailed_dict[name] = _size_subcircuit(sizing_pool, sizing_checkpoint, fpga_inst, fpga_inst.logic_cluster.local_mux, opt_type, re_erf, area_opt_weight, delay_opt_weight, iteration, starting_transistor_sizes, spice_interface, 0, 0)
 			else:
 				sizing_results_dict[name]= sizing_results_list[len(sizing_results_list)-1][name]
 				sizing_results_detailed_dict[name] = sizing_results_detailed_list[len(sizing_results_list)-1][name]        
 
 				# update quick mode status and display duration
-			if quick_mode_dict[name] == 1:
+			if quick_mode_dict[name] == 1 and not sizing_checkpoint.is_resuming():
 				time_after_sizing = time.time()
 				
 				past_cost = current_cost
@@ -2425,13 +3785,13 @@ def size_fpga_transistors(fpga_inst, run_options, spice_interface):
 			
 			# Size the transistors of this subcircuit
 			if quick_mode_dict[name] == 1:
-				sizing_results_dict[name], sizing_results_detailed_dict[name] = size_subcircuit_transistors(fpga_inst, fpga_inst.logic_cluster.ble.lut, opt_type, re_erf, area_opt_weight, delay_opt_weight, iteration, starting_transistor_sizes, spice_interface, 0, 0)
+				sizing_results_dict[name], sizing_results_detailed_dict[name] = _size_subcircuit(sizing_pool, sizing_checkpoint, fpga_inst, fpga_inst.logic_cluster.ble.lut, opt_type, re_erf, area_opt_weight, delay_opt_weight, iteration, starting_transistor_sizes, spice_interface, 0, 0)
 			else:
 				sizing_results_dict[name]= sizing_results_list[len(sizing_results_list)-1][name]
 				sizing_results_detailed_dict[name] = sizing_results_detailed_list[len(sizing_results_list)-1][name]      
 
 				# update quick mode status and display duration
-			if quick_mode_dict[name] == 1:
+			if quick_mode_dict[name] == 1 and not sizing_checkpoint.is_resuming():
 				time_after_sizing = time.time()
 				
 				past_cost = current_cost
@@ -2459,13 +3819,13 @@ def size_fpga_transistors(fpga_inst, run_options, spice_interface):
 				
 				# Size the transistors of this subcircuit
 				if quick_mode_dict[name] == 1:
-					sizing_results_dict[name], sizing_results_detailed_dict[name] = size_subcircuit_transistors(fpga_inst, fpga_inst.logic_cluster.ble.fmux, opt_type, re_erf, area_opt_weight, delay_opt_weight, iteration, starting_transistor_sizes, spice_interface, 0, 0)
+					sizing_results_dict[name], sizing_results_detailed_dict[name] = _size_subcircuit(sizing_pool, sizing_checkpoint, fpga_inst, fpga_inst.logic_cluster.ble.fmux, opt_type, re_erf, area_opt_weight, delay_opt_weight, iteration, starting_transistor_sizes, spice_interface, 0, 0)
 				else:
 					sizing_results_dict[name]= sizing_results_list[len(sizing_results_list)-1][name]
 					sizing_results_detailed_dict[name] = sizing_results_detailed_list[len(sizing_results_list)-1][name]      
 
 					# update quick mode status and display duration
-				if quick_mode_dict[name] == 1:
+				if quick_mode_dict[name] == 1 and not sizing_checkpoint.is_resuming():
 					time_after_sizing = time.time()
 					
 					past_cost = current_cost
@@ -2493,7 +3853,7 @@ def size_fpga_transistors(fpga_inst, run_options, spice_interface):
 				
 				# Size the transistors of this subcircuit
 				if quick_mode_dict["input_drivers"] == 1:
-					sizing_results_dict[input_driver.driver.name], sizing_results_detailed_dict[input_driver.driver.name] = size_subcircuit_transistors(fpga_inst, input_driver.driver, opt_type, re_erf, area_opt_weight, delay_opt_weight, iteration, starting_transistor_sizes, spice_interface, 0, 0)
+					sizing_results_dict[input_driver.driver.name], sizing_results_detailed_dict[input_driver.driver.name] = _size_subcircuit(sizing_pool, sizing_checkpoint, fpga_inst, input_driver.driver, opt_type, re_erf, area_opt_weight, delay_opt_weight, iteration, starting_transistor_sizes, spice_interface, 0, 0)
 				else:
 					sizing_results_dict[input_driver.driver.name]= sizing_results_list[len(sizing_results_list)-1][input_driver.driver.name]
 					sizing_results_detailed_dict[input_driver.driver.name] = sizing_results_detailed_list[len(sizing_results_list)-1][input_driver.driver.name]   
@@ -2508,12 +3868,12 @@ def size_fpga_transistors(fpga_inst, run_options, spice_interface):
 				
 				# Size the transistors of this subcircuit
 				if quick_mode_dict["input_drivers"] == 1:
-					sizing_results_dict[input_driver.not_driver.name], sizing_results_detailed_dict[input_driver.not_driver.name] = size_subcircuit_transistors(fpga_inst, input_driver.not_driver, opt_type, re_erf, area_opt_weight, delay_opt_weight, iteration, starting_transistor_sizes, spice_interface, 0, 0)
+					sizing_results_dict[input_driver.not_driver.name], sizing_results_detailed_dict[input_driver.not_driver.name] = _size_subcircuit(sizing_pool, sizing_checkpoint, fpga_inst, input_driver.not_driver, opt_type, re_erf, area_opt_weight, delay_opt_weight, iteration, starting_transistor_sizes, spice_interface, 0, 0)
 				else:
 					sizing_results_dict[input_driver.not_driver.name]= sizing_results_list[len(sizing_results_list)-1][input_driver.not_driver.name]
 					sizing_results_detailed_dict[input_driver.not_driver.name] = sizing_results_detailed_list[len(sizing_results_list)-1][input_driver.not_driver.name]      
 
-			if quick_mode_dict["input_drivers"] == 1:
+			if quick_mode_dict["input_drivers"] == 1 and not sizing_checkpoint.is_resuming():
 				time_after_sizing = time.time()
 				
 				past_cost = current_cost
@@ -2540,12 +3900,12 @@ def size_fpga_transistors(fpga_inst, run_options, spice_interface):
 			
 			# Size the transistors of this subcircuit
 			if quick_mode_dict[name] == 1:
-				sizing_results_dict[name], sizing_results_detailed_dict[name] = size_subcircuit_transistors(fpga_inst, fpga_inst.logic_cluster.ble.local_output, opt_type, re_erf, area_opt_weight, delay_opt_weight, iteration, starting_transistor_sizes, spice_interface, 0, 0)
+				sizing_results_dict[name], sizing_results_detailed_dict[name] = _size_subcircuit(sizing_pool, sizing_checkpoint, fpga_inst, fpga_inst.logic_cluster.ble.local_output, opt_type, re_erf, area_opt_weight, delay_opt_weight, iteration, starting_transistor_sizes, spice_interface, 0, 0)
 			else:
 				sizing_results_dict[name]= sizing_results_list[len(sizing_results_list)-1][name]
 				sizing_results_detailed_dict[name] = sizing_results_detailed_list[len(sizing_results_list)-1][name]   
 			
-			if quick_mode_dict[name] == 1:
+			if quick_mode_dict[name] == 1 and not sizing_checkpoint.is_resuming():
 				time_after_sizing = time.time()
 				
 				past_cost = current_cost
@@ -2572,12 +3932,12 @@ def size_fpga_transistors(fpga_inst, run_options, spice_interface):
 			
 			# Size the transistors of this subcircuit
 			if quick_mode_dict[name] == 1:
-				sizing_results_dict[name], sizing_results_detailed_dict[name] = size_subcircuit_transistors(fpga_inst, fpga_inst.logic_cluster.ble.general_output, opt_type, re_erf, area_opt_weight, delay_opt_weight, iteration, starting_transistor_sizes, spice_interface, 0, 0)
+				sizing_results_dict[name], sizing_results_detailed_dict[name] = _size_subcircuit(sizing_pool, sizing_checkpoint, fpga_inst, fpga_inst.logic_cluster.ble.general_output, opt_type, re_erf, area_opt_weight, delay_opt_weight, iteration, starting_transistor_sizes, spice_interface, 0, 0)
 			else:
 				sizing_results_dict[name]= sizing_results_list[len(sizing_results_list)-1][name]
 				sizing_results_detailed_dict[name] = sizing_results_detailed_list[len(sizing_results_list)-1][name]   
 
-			if quick_mode_dict[name] == 1:
+			if quick_mode_dict[name] == 1 and not sizing_checkpoint.is_resuming():
 				time_after_sizing = time.time()
 				
 				past_cost = current_cost
@@ -2608,12 +3968,12 @@ def size_fpga_transistors(fpga_inst, run_options, spice_interface):
 				
 				# Size the transistors of this subcircuit
 				if quick_mode_dict[name] == 1:
-					sizing_results_dict[name], sizing_results_detailed_dict[name] = size_subcircuit_transistors(fpga_inst, fpga_inst.carrychain, opt_type, re_erf, area_opt_weight, delay_opt_weight, iteration, starting_transistor_sizes, spice_interface, 0, 1)
+					sizing_results_dict[name], sizing_results_detailed_dict[name] = _size_subcircuit(sizing_pool, sizing_checkpoint, fpga_inst, fpga_inst.carrychain, opt_type, re_erf, area_opt_weight, delay_opt_weight, iteration, starting_transistor_sizes, spice_interface, 0, 1)
 				else:
 					sizing_results_dict[name]= sizing_results_list[len(sizing_results_list)-1][name]
 					sizing_results_detailed_dict[name] = sizing_results_detailed_list[len(sizing_results_list)-1][name]   
 
-				if quick_mode_dict[name] == 1:
+				if quick_mode_dict[name] == 1 and not sizing_checkpoint.is_resuming():
 					time_after_sizing = time.time()
 					
 					past_cost = current_cost
@@ -2643,12 +4003,12 @@ def size_fpga_transistors(fpga_inst, run_options, spice_interface):
 				
 				# Size the transistors of this subcircuit
 				if quick_mode_dict[name] == 1:
-					sizing_results_dict[name], sizing_results_detailed_dict[name] = size_subcircuit_transistors(fpga_inst, fpga_inst.carrychainperf, opt_type, re_erf, area_opt_weight, delay_opt_weight, iteration, starting_transistor_sizes, spice_interface, 0, 1)
+					sizing_results_dict[name], sizing_results_detailed_dict[name] = _size_subcircuit(sizing_pool, sizing_checkpoint, fpga_inst, fpga_inst.carrychainperf, opt_type, re_erf, area_opt_weight, delay_opt_weight, iteration, starting_transistor_sizes, spice_interface, 0, 1)
 				else:
 					sizing_results_dict[name]= sizing_results_list[len(sizing_results_list)-1][name]
 					sizing_results_detailed_dict[name] = sizing_results_detailed_list[len(sizing_results_list)-1][name]   
 
-				if quick_mode_dict[name] == 1:
+				if quick_mode_dict[name] == 1 and not sizing_checkpoint.is_resuming():
 					time_after_sizing = time.time()
 					
 					past_cost = current_cost
@@ -2678,12 +4038,12 @@ def size_fpga_transistors(fpga_inst, run_options, spice_interface):
 				
 				# Size the transistors of this subcircuit
 				if quick_mode_dict[name] == 1:
-					sizing_results_dict[name], sizing_results_detailed_dict[name] = size_subcircuit_transistors(fpga_inst, fpga_inst.carrychaininter, opt_type, re_erf, area_opt_weight, delay_opt_weight, iteration, starting_transistor_sizes, spice_interface, 0, 1)
+					sizing_results_dict[name], sizing_results_detailed_dict[name] = _size_subcircuit(sizing_pool, sizing_checkpoint, fpga_inst, fpga_inst.carrychaininter, opt_type, re_erf, area_opt_weight, delay_opt_weight, iteration, starting_transistor_sizes, spice_interface, 0, 1)
 				else:
 					sizing_results_dict[name]= sizing_results_list[len(sizing_results_list)-1][name]
 					sizing_results_detailed_dict[name] = sizing_results_detailed_list[len(sizing_results_list)-1][name]   
 
-				if quick_mode_dict[name] == 1:
+				if quick_mode_dict[name] == 1 and not sizing_checkpoint.is_resuming():
 					time_after_sizing = time.time()
 					
 					past_cost = current_cost
@@ -2714,12 +4074,12 @@ def size_fpga_transistors(fpga_inst, run_options, spice_interface):
 					
 					# Size the transistors of this subcircuit
 					if quick_mode_dict[name] == 1:
-						sizing_results_dict[name], sizing_results_detailed_dict[name] = size_subcircuit_transistors(fpga_inst, fpga_inst.carrychainand, opt_type, re_erf, area_opt_weight, delay_opt_weight, iteration, starting_transistor_sizes, spice_interface, 0, 1)
+						sizing_results_dict[name], sizing_results_detailed_dict[name] = _size_subcircuit(sizing_pool, sizing_checkpoint, fpga_inst, fpga_inst.carrychainand, opt_type, re_erf, area_opt_weight, delay_opt_weight, iteration, starting_transistor_sizes, spice_interface, 0, 1)
 					else:
 						sizing_results_dict[name]= sizing_results_list[len(sizing_results_list)-1][name]
 						sizing_results_detailed_dict[name] = sizing_results_detailed_list[len(sizing_results_list)-1][name]   
 
-					if quick_mode_dict[name] == 1:
+					if quick_mode_dict[name] == 1 and not sizing_checkpoint.is_resuming():
 						time_after_sizing = time.time()
 						
 						past_cost = current_cost
@@ -2746,12 +4106,12 @@ def size_fpga_transistors(fpga_inst, run_options, spice_interface):
 					
 					# Size the transistors of this subcircuit
 					if quick_mode_dict[name] == 1:
-						sizing_results_dict[name], sizing_results_detailed_dict[name] = size_subcircuit_transistors(fpga_inst, fpga_inst.carrychainskipmux, opt_type, re_erf, area_opt_weight, delay_opt_weight, iteration, starting_transistor_sizes, spice_interface, 0, 1)
+						sizing_results_dict[name], sizing_results_detailed_dict[name] = _size_subcircuit(sizing_pool, sizing_checkpoint, fpga_inst, fpga_inst.carrychainskipmux, opt_type, re_erf, area_opt_weight, delay_opt_weight, iteration, starting_transistor_sizes, spice_interface, 0, 1)
 					else:
 						sizing_results_dict[name]= sizing_results_list[len(sizing_results_list)-1][name]
 						sizing_results_detailed_dict[name] = sizing_results_detailed_list[len(sizing_results_list)-1][name]   
 
-					if quick_mode_dict[name] == 1:
+					if quick_mode_dict[name] == 1 and not sizing_checkpoint.is_resuming():
 						time_after_sizing = time.time()
 						
 						past_cost = current_cost
@@ -2781,12 +4141,12 @@ def size_fpga_transistors(fpga_inst, run_options, spice_interface):
 				
 				# Size the transistors of this subcircuit
 				if quick_mode_dict[name] == 1:
-					sizing_results_dict[name], sizing_results_detailed_dict[name] = size_subcircuit_transistors(fpga_inst, fpga_inst.carrychainmux, opt_type, re_erf, area_opt_weight, delay_opt_weight, iteration, starting_transistor_sizes, spice_interface, 0, 0)
+					sizing_results_dict[name], sizing_results_detailed_dict[name] = _size_subcircuit(sizing_pool, sizing_checkpoint, fpga_inst, fpga_inst.carrychainmux, opt_type, re_erf, area_opt_weight, delay_opt_weight, iteration, starting_transistor_sizes, spice_interface, 0, 0)
 				else:
 					sizing_results_dict[name]= sizing_results_list[len(sizing_results_list)-1][name]
 					sizing_results_detailed_dict[name] = sizing_results_detailed_list[len(sizing_results_list)-1][name]   
 
-				if quick_mode_dict[name] == 1:
+				if quick_mode_dict[name] == 1 and not sizing_checkpoint.is_resuming():
 					time_after_sizing = time.time()
 					
 					past_cost = current_cost
@@ -2820,12 +4180,12 @@ def size_fpga_transistors(fpga_inst, run_options, spice_interface):
 				
 				# Size the transistors of this subcircuit
 				if quick_mode_dict[name] == 1:
-					sizing_results_dict[name], sizing_results_detailed_dict[name] = size_subcircuit_transistors(fpga_inst, fpga_inst.RAM.pgateoutputcrossbar, opt_type, re_erf, area_opt_weight, delay_opt_weight, iteration, starting_transistor_sizes, spice_interface, 1, 0)
+					sizing_results_dict[name], sizing_results_detailed_dict[name] = _size_subcircuit(sizing_pool, sizing_checkpoint, fpga_inst, fpga_inst.RAM.pgateoutputcrossbar, opt_type, re_erf, area_opt_weight, delay_opt_weight, iteration, starting_transistor_sizes, spice_interface, 1, 0)
 				else:
 					sizing_results_dict[name]= sizing_results_list[len(sizing_results_list)-1][name]
 					sizing_results_detailed_dict[name] = sizing_results_detailed_list[len(sizing_results_list)-1][name]   
 
-				if quick_mode_dict[name] == 1:
+				if quick_mode_dict[name] == 1 and not sizing_checkpoint.is_resuming():
 					time_after_sizing = time.time()
 				
 					past_cost = current_cost
@@ -2853,12 +4213,12 @@ def size_fpga_transistors(fpga_inst, run_options, spice_interface):
 					
 				# Size the transistors of this subcircuit
 				if quick_mode_dict[name] == 1:
-					sizing_results_dict[name], sizing_results_detailed_dict[name] = size_subcircuit_transistors(fpga_inst, fpga_inst.RAM.wordlinedriver, opt_type, re_erf, area_opt_weight, delay_opt_weight, iteration, starting_transistor_sizes, spice_interface, 1, 0)
+					sizing_results_dict[name], sizing_results_detailed_dict[name] = _size_subcircuit(sizing_pool, sizing_checkpoint, fpga_inst, fpga_inst.RAM.wordlinedriver, opt_type, re_erf, area_opt_weight, delay_opt_weight, iteration, starting_transistor_sizes, spice_interface, 1, 0)
 				else:
 					sizing_results_dict[name]= sizing_results_list[len(sizing_results_list)-1][name]
 					sizing_results_detailed_dict[name] = sizing_results_detailed_list[len(sizing_results_list)-1][name]   
 
-				if quick_mode_dict[name] == 1:
+				if quick_mode_dict[name] == 1 and not sizing_checkpoint.is_resuming():
 					time_after_sizing = time.time()
 				
 					past_cost = current_cost
@@ -2888,7 +4248,7 @@ def size_fpga_transistors(fpga_inst, run_options, spice_interface):
 					
 					# Size the transistors of this subcircuit
 					if quick_mode_dict[name] == 1:
-						sizing_results_dict[name], sizing_results_detailed_dict[name] = size_subcircuit_transistors(fpga_inst, fpga_inst.RAM.precharge, opt_type, re_erf, area_opt_weight, delay_opt_weight, iteration, starting_transistor_sizes, spice_interface, 1, 0)
+						sizing_results_dict[name], sizing_results_detailed_dict[name] = _size_subcircuit(sizing_pool, sizing_checkpoint, fpga_inst, fpga_inst.RAM.precharge, opt_type, re_erf, area_opt_weight, delay_opt_weight, iteration, starting_transistor_sizes, spice_interface, 1, 0)
 					else:
 						sizing_results_dict[name]= sizing_results_list[len(sizing_results_list)-1][name]
 						sizing_results_detailed_dict[name] = sizing_results_detailed_list[len(sizing_results_list)-1][name]   
@@ -2905,12 +4265,12 @@ def size_fpga_transistors(fpga_inst, run_options, spice_interface):
 					
 					# Size the transistors of this subcircuit
 					if quick_mode_dict[name] == 1:
-						sizing_results_dict[name], sizing_results_detailed_dict[name] = size_subcircuit_transistors(fpga_inst, fpga_inst.RAM.bldischarging, opt_type, re_erf, area_opt_weight, delay_opt_weight, iteration, starting_transistor_sizes, spice_interface, 1, 0)
+						sizing_results_dict[name], sizing_results_detailed_dict[name] = _size_subcircuit(sizing_pool, sizing_checkpoint, fpga_inst, fpga_inst.RAM.bldischarging, opt_type, re_erf, area_opt_weight, delay_opt_weight, iteration, starting_transistor_sizes, spice_interface, 1, 0)
 					else:
 						sizing_results_dict[name]= sizing_results_list[len(sizing_results_list)-1][name]
 						sizing_results_detailed_dict[name] = sizing_results_detailed_list[len(sizing_results_list)-1][name]   
 
-				if quick_mode_dict[name] == 1:
+				if quick_mode_dict[name] == 1 and not sizing_checkpoint.is_resuming():
 					time_after_sizing = time.time()
 				
 					past_cost = current_cost
@@ -2938,7 +4298,7 @@ def size_fpga_transistors(fpga_inst, run_options, spice_interface):
 					
 				# Size the transistors of this subcircuit
 				if quick_mode_dict["rowdecoder"] == 1:
-					sizing_results_dict[name], sizing_results_detailed_dict[name] = size_subcircuit_transistors(fpga_inst, fpga_inst.RAM.rowdecoder_stage3, opt_type, re_erf, area_opt_weight, delay_opt_weight, iteration, starting_transistor_sizes, spice_interface, 1, 0)
+					sizing_results_dict[name], sizing_results_detailed_dict[name] = _size_subcircuit(sizing_pool, sizing_checkpoint, fpga_inst, fpga_inst.RAM.rowdecoder_stage3, opt_type, re_erf, area_opt_weight, delay_opt_weight, iteration, starting_transistor_sizes, spice_interface, 1, 0)
 				else:
 					sizing_results_dict[name]= sizing_results_list[len(sizing_results_list)-1][name]
 					sizing_results_detailed_dict[name] = sizing_results_detailed_list[len(sizing_results_list)-1][name]   
@@ -2954,7 +4314,7 @@ def size_fpga_transistors(fpga_inst, run_options, spice_interface):
 					
 					# Size the transistors of this subcircuit
 					if quick_mode_dict["rowdecoder"] == 1:
-						sizing_results_dict[name], sizing_results_detailed_dict[name] = size_subcircuit_transistors(fpga_inst, fpga_inst.RAM.rowdecoder_stage1_size3, opt_type, re_erf, area_opt_weight, delay_opt_weight, iteration, starting_transistor_sizes, spice_interface, 1, 0)
+						sizing_results_dict[name], sizing_results_detailed_dict[name] = _size_subcircuit(sizing_pool, sizing_checkpoint, fpga_inst, fpga_inst.RAM.rowdecoder_stage1_size3, opt_type, re_erf, area_opt_weight, delay_opt_weight, iteration, starting_transistor_sizes, spice_interface, 1, 0)
 					else:
 						sizing_results_dict[name]= sizing_results_list[len(sizing_results_list)-1][name]
 						sizing_results_detailed_dict[name] = sizing_results_detailed_list[len(sizing_results_list)-1][name]   
@@ -2970,7 +4330,7 @@ def size_fpga_transistors(fpga_inst, run_options, spice_interface):
 					
 					# Size the transistors of this subcircuit
 					if quick_mode_dict["rowdecoder"] == 1:
-						sizing_results_dict[name], sizing_results_detailed_dict[name] = size_subcircuit_transistors(fpga_inst, fpga_inst.RAM.rowdecoder_stage1_size2, opt_type, re_erf, area_opt_weight, delay_opt_weight, iteration, starting_transistor_sizes, spice_interface, 1, 0)
+						sizing_results_dict[name], sizing_results_detailed_dict[name] = _size_subcircuit(sizing_pool, sizing_checkpoint, fpga_inst, fpga_inst.RAM.rowdecoder_stage1_size2, opt_type, re_erf, area_opt_weight, delay_opt_weight, iteration, starting_transistor_sizes, spice_interface, 1, 0)
 					else:
 						sizing_results_dict[name]= sizing_results_list[len(sizing_results_list)-1][name]
 						sizing_results_detailed_dict[name] = sizing_results_detailed_list[len(sizing_results_list)-1][name]   
@@ -2985,14 +4345,14 @@ def size_fpga_transistors(fpga_inst, run_options, spice_interface):
 				
 				# Size the transistors of this subcircuit
 				if quick_mode_dict["rowdecoder"] == 1:
-					sizing_results_dict[name], sizing_results_detailed_dict[name] = size_subcircuit_transistors(fpga_inst, fpga_inst.RAM.rowdecoder_stage0, opt_type, re_erf, area_opt_weight, delay_opt_weight, iteration, starting_transistor_sizes, spice_interface, 1, 0)
+					sizing_results_dict[name], sizing_results_detailed_dict[name] = _size_subcircuit(sizing_pool, sizing_checkpoint, fpga_inst, fpga_inst.RAM.rowdecoder_stage0, opt_type, re_erf, area_opt_weight, delay_opt_weight, iteration, starting_transistor_sizes, spice_interface, 1, 0)
 				else:
 					sizing_results_dict[name]= sizing_results_list[len(sizing_results_list)-1][name]
 					sizing_results_detailed_dict[name] = sizing_results_detailed_list[len(sizing_results_list)-1][name]   
 
 
 
-				if quick_mode_dict["rowdecoder"] == 1:
+				if quick_mode_dict["rowdecoder"] == 1 and not sizing_checkpoint.is_resuming():
 					time_after_sizing = time.time()
 				
 					past_cost = current_cost
@@ -3037,12 +4397,12 @@ def size_fpga_transistors(fpga_inst, run_options, spice_interface):
 				
 				# Size the transistors of this subcircuit
 				if quick_mode_dict[name] == 1:
-					sizing_results_dict[name], sizing_results_detailed_dict[name] = size_subcircuit_transistors(fpga_inst, fpga_inst.RAM.RAM_local_mux, opt_type, re_erf, area_opt_weight, delay_opt_weight, iteration, starting_transistor_sizes, spice_interface, 1, 0)
+					sizing_results_dict[name], sizing_results_detailed_dict[name] = _size_subcircuit(sizing_pool, sizing_checkpoint, fpga_inst, fpga_inst.RAM.RAM_local_mux, opt_type, re_erf, area_opt_weight, delay_opt_weight, iteration, starting_transistor_sizes, spice_interface, 1, 0)
 				else:
 					sizing_results_dict[name]= sizing_results_list[len(sizing_results_list)-1][name]
 					sizing_results_detailed_dict[name] = sizing_results_detailed_list[len(sizing_results_list)-1][name] 
 
-				if quick_mode_dict[name] == 1:
+				if quick_mode_dict[name] == 1 and not sizing_checkpoint.is_resuming():
 					time_after_sizing = time.time()
 				
 					past_cost = current_cost
@@ -3070,7 +4430,7 @@ def size_fpga_transistors(fpga_inst, run_options, spice_interface):
 				
 				# Size the transistors of this subcircuit
 				if quick_mode_dict["confdec"] == 1:
-					sizing_results_dict[name], sizing_results_detailed_dict[name] = size_subcircuit_transistors(fpga_inst, fpga_inst.RAM.configurabledecoderiii, opt_type, re_erf, area_opt_weight, delay_opt_weight, iteration, starting_transistor_sizes, spice_interface, 1, 0)
+					sizing_results_dict[name], sizing_results_detailed_dict[name] = _size_subcircuit(sizing_pool, sizing_checkpoint, fpga_inst, fpga_inst.RAM.configurabledecoderiii, opt_type, re_erf, area_opt_weight, delay_opt_weight, iteration, starting_transistor_sizes, spice_interface, 1, 0)
 				else:
 					sizing_results_dict[name]= sizing_results_list[len(sizing_results_list)-1][name]
 					sizing_results_detailed_dict[name] = sizing_results_detailed_list[len(sizing_results_list)-1][name] 
@@ -3087,7 +4447,7 @@ def size_fpga_transistors(fpga_inst, run_options, spice_interface):
 				
 					# Size the transistors of this subcircuit
 					if quick_mode_dict["confdec"] == 1:
-						sizing_results_dict[name], sizing_results_detailed_dict[name] = size_subcircuit_transistors(fpga_inst, fpga_inst.RAM.configurabledecoder3ii, opt_type, re_erf, area_opt_weight, delay_opt_weight, iteration, starting_transistor_sizes, spice_interface, 1, 0)
+						sizing_results_dict[name], sizing_results_detailed_dict[name] = _size_subcircuit(sizing_pool, sizing_checkpoint, fpga_inst, fpga_inst.RAM.configurabledecoder3ii, opt_type, re_erf, area_opt_weight, delay_opt_weight, iteration, starting_transistor_sizes, spice_interface, 1, 0)
 					else:
 						sizing_results_dict[name]= sizing_results_list[len(sizing_results_list)-1][name]
 						sizing_results_detailed_dict[name] = sizing_results_detailed_list[len(sizing_results_list)-1][name] 
@@ -3103,7 +4463,7 @@ def size_fpga_transistors(fpga_inst, run_options, spice_interface):
 				
 					# Size the transistors of this subcircuit
 					if quick_mode_dict["confdec"] == 1:
-						sizing_results_dict[name], sizing_results_detailed_dict[name] = size_subcircuit_transistors(fpga_inst, fpga_inst.RAM.configurabledecoder2ii, opt_type, re_erf, area_opt_weight, delay_opt_weight, iteration, starting_transistor_sizes, spice_interface, 1, 0)
+						sizing_results_dict[name], sizing_results_detailed_dict[name] = _size_subcircuit(sizing_pool, sizing_checkpoint, fpga_inst, fpga_inst.RAM.configurabledecoder2ii, opt_type, re_erf, area_opt_weight, delay_opt_weight, iteration, starting_transistor_sizes, spice_interface, 1, 0)
 					else:
 						sizing_results_dict[name]= sizing_results_list[len(sizing_results_list)-1][name]
 						sizing_results_detailed_dict[name] = sizing_results_detailed_list[len(sizing_results_list)-1][name] 
@@ -3118,12 +4478,12 @@ def size_fpga_transistors(fpga_inst, run_options, spice_interface):
 				
 				# Size the transistors of this subcircuit
 				if quick_mode_dict["confdec"] == 1:
-					sizing_results_dict[name], sizing_results_detailed_dict[name] = size_subcircuit_transistors(fpga_inst, fpga_inst.RAM.configurabledecoderi, opt_type, re_erf, area_opt_weight, delay_opt_weight, iteration, starting_transistor_sizes, spice_interface, 1, 0)
+					sizing_results_dict[name], sizing_results_detailed_dict[name] = _size_subcircuit(sizing_pool, sizing_checkpoint, fpga_inst, fpga_inst.RAM.configurabledecoderi, opt_type, re_erf, area_opt_weight, delay_opt_weight, iteration, starting_transistor_sizes, spice_interface, 1, 0)
 				else:
 					sizing_results_dict[name]= sizing_results_list[len(sizing_results_list)-1][name]
 					sizing_results_detailed_dict[name] = sizing_results_detailed_list[len(sizing_results_list)-1][name] 
 
-				if quick_mode_dict["confdec"] == 1:
+				if quick_mode_dict["confdec"] == 1 and not sizing_checkpoint.is_resuming():
 					time_after_sizing = time.time()
 				
 					past_cost = current_cost
@@ -3150,12 +4510,12 @@ def size_fpga_transistors(fpga_inst, run_options, spice_interface):
 					starting_transistor_sizes = sizing_results_list[len(sizing_results_list)-1][name]
 				
 				if quick_mode_dict[name] == 1:
-					sizing_results_dict[name], sizing_results_detailed_dict[name] = size_subcircuit_transistors(fpga_inst, fpga_inst.RAM.columndecoder, opt_type, re_erf, area_opt_weight, delay_opt_weight, iteration, starting_transistor_sizes, spice_interface, 1, 0)
+					sizing_results_dict[name], sizing_results_detailed_dict[name] = _size_subcircuit(sizing_pool, sizing_checkpoint, fpga_inst, fpga_inst.RAM.columndecoder, opt_type, re_erf, area_opt_weight, delay_opt_weight, iteration, starting_transistor_sizes, spice_interface, 1, 0)
 				else:
 					sizing_results_dict[name]= sizing_results_list[len(sizing_results_list)-1][name]
 					sizing_results_detailed_dict[name] = sizing_results_detailed_list[len(sizing_results_list)-1][name] 
 
-				if quick_mode_dict[name] == 1:
+				if quick_mode_dict[name] == 1 and not sizing_checkpoint.is_resuming():
 					time_after_sizing = time.time()
 				
 					past_cost = current_cost
@@ -3172,6 +4532,11 @@ def size_fpga_transistors(fpga_inst, run_options, spice_interface):
 			## Done sizing, update results lists
 			############################################
 
+		if sizing_pool is not None:
+			sizing_pool.close()
+			_merge_parallel_sizing_results(fpga_inst, spice_interface, sizing_results_dict, sizing_results_detailed_dict)
+			sizing_pool.join()
+
 		print("FPGA transistor sizing iteration complete!\n")
 		
 		sizing_results_list.append(sizing_results_dict.copy())
@@ -3213,6 +4578,8 @@ def size_fpga_transistors(fpga_inst, run_options, spice_interface):
 		final_report_file.close()
 		iteration += 1
 
+		sizing_checkpoint.next_iteration(fpga_inst, iteration, is_done, final_result_index)
+
 
 	# There are two ways we can terminate the above while loop
 	# If the algorithm terminates by itself, is_done will be true and final_results_index are the final sizing results
@@ -1879,6 +1879,30 @@ def print_run_options(args, report_file_path):
     print_and_write(report_file, "  Area optimization weight: " + str(args.area_opt_weight))
     print_and_write(report_file, "  Delay optimization weight: " + str(args.delay_opt_weight))
     print_and_write(report_file, "  Maximum number of sizing iterations: " + str(args.max_iterations))
+    print_and_write(report_file, "  SPICE simulator: " + args.spice_backend)
+    print_and_write(report_file, "  Number of parallel SPICE processes: " + str(args.spice_workers))
+    if args.search_strategy != "grid":
+        print_and_write(report_file, "  Sizing search strategy: " + args.search_strategy)
+    if args.joint_erf:
+        print_and_write(report_file, "  Joint ERF of the inverters of a subcircuit: on")
+    if args.erf_reuse:
+        print_and_write(report_file, "  ERF ratio reuse: on")
+    if args.surrogate_pruning > 0:
+        print_and_write(report_file, "  Surrogate pruning band: " + str(args.surrogate_pruning) + " standard errors")
+    if args.optimize_height:
+        print_and_write(report_file, "  Logic tile height search: on")
+    if args.parallel_sizing > 0:
+        print_and_write(report_file, "  Parallel sizing processes: " + str(args.parallel_sizing))
+    if args.sim_budget > 0:
+        print_and_write(report_file, "  Simulation budget: " + str(args.sim_budget) + " " + args.sim_budget_unit)
+    if args.resume:
+        print_and_write(report_file, "  Resume transistor sizing from checkpoint: on")
+    if args.spice_cache:
+        print_and_write(report_file, "  Simulation cache: " + args.spice_cache)
+    if args.spice_listing != "keep":
+        print_and_write(report_file, "  Simulator listings: " + args.spice_listing)
+    if args.coarse_tran_step > 0 or args.coarse_tran_stop_scale != 1.0:
+        print_and_write(report_file, "  Coarse transient profile: step " + str(args.coarse_tran_step) + " s, stop time x" + str(args.coarse_tran_stop_scale))
     print_and_write(report_file, "")
     print_and_write(report_file, "")
 
@@ -2037,6 +2061,9 @@ def create_output_dir(arch_file_name, arch_out_folder):
     This function creates the architecture folder and returns its name.
     It also deletes the content of the folder in case it's already created
     to avoid any errors in case of multiple runs on the same architecture file.
+    The top-level SPICE decks (.sp) are kept, so that generating the same decks 
+    again leaves them untouched (see spice.NetlistBuilder). FPGA.generate() then
+    deletes the decks it didn't generate (see spice.NetlistFiles).
     If arch_out_folder is specified in the input params file, then that is
     used as the architecture folder, otherwise the folder containing the arch
     params file is used.
@@ -2058,7 +2085,12 @@ def create_output_dir(arch_file_name, arch_out_folder):
         dir_contents = os.listdir(arch_folder)
         for content in dir_contents:
             if os.path.isdir(arch_folder + "/" + content):
-                shutil.rmtree(arch_folder + "/" + content)
+                for sub_content in os.listdir(arch_folder + "/" + content):
+                    sub_content_path = arch_folder + "/" + content + "/" + sub_content
+                    if os.path.isdir(sub_content_path):
+                        shutil.rmtree(sub_content_path)
+                    elif not sub_content.endswith(".sp"):
+                        os.remove(sub_content_path)
 
     return arch_folder  
 
@@ -2110,6 +2142,27 @@ def print_summary(arch_folder, fpga_inst, start_time):
     total_seconds_elapsed = int(total_time_elapsed - 3600*total_hours_elapsed - 60*total_minutes_elapsed)
     
     print_and_write(report_file, "Number of HSPICE simulations performed: " + str(fpga_inst.spice_interface.get_num_simulations_performed()))
+    if fpga_inst.spice_interface.cache is not None:
+        print_and_write(report_file, "Simulation cache hits: " + str(fpga_inst.spice_interface.get_num_cache_hits()) + 
+                                     ", misses: " + str(fpga_inst.spice_interface.get_num_cache_misses()))
+    rank_correlations = fpga_inst.spice_interface.get_rank_correlations()
+    if len(rank_correlations) > 0:
+        print_and_write(report_file, "Rank correlation of coarse and fine sizing sweeps: mean " + str(round(sum(rank_correlations)/len(rank_correlations), 4)) + 
+                                     ", min " + str(round(min(rank_correlations), 4)) + " (" + str(len(rank_correlations)) + " sweeps)")
+    erf_ratio_store = fpga_inst.erf_ratio_store
+    if erf_ratio_store is not None and erf_ratio_store.num_erfs > 0:
+        print_and_write(report_file, "ERF ratio reuse: " + str(erf_ratio_store.num_skipped) + " of " + str(erf_ratio_store.num_erfs) + " ERFs skipped (" + 
+                                     str(round(100.0*erf_ratio_store.num_skipped/erf_ratio_store.num_erfs, 1)) + "%), " + str(erf_ratio_store.num_warm_starts) + " warm-started")
+    print_and_write(report_file, "Netlist files written: " + str(fpga_inst.num_netlists_written) + ", unchanged and left untouched: " + str(fpga_inst.num_netlists_unchanged))
+    deck_param_index = fpga_inst.deck_param_index
+    if deck_param_index is not None and deck_param_index.num_simulated + deck_param_index.num_reused > 0:
+        num_decks = deck_param_index.num_simulated + deck_param_index.num_reused
+        print_and_write(report_file, "Delay update decks reused: " + str(deck_param_index.num_reused) + " of " + str(num_decks) + " (" + 
+                                     str(round(100.0*deck_param_index.num_reused/num_decks, 1)) + "%), parameters unchanged")
+    sim_budget = fpga_inst.sim_budget
+    if sim_budget is not None:
+        sim_budget.measure(fpga_inst.spice_interface)
+        print_and_write(report_file, "Simulation budget: used " + str(round(sim_budget.used, 1)) + " of " + str(sim_budget.budget) + " " + sim_budget.unit)
     print_and_write(report_file, "Total time elapsed: " + str(total_hours_elapsed) + " hours " + str(total_minutes_elapsed) + " minutes " + str(total_seconds_elapsed) + " seconds\n") 
     
     report_file.write("\n")
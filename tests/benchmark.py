@@ -0,0 +1,179 @@
+import os
+import sys
+import glob
+import time
+import shutil
+import pstats
+import argparse
+import tempfile
+import subprocess
+
+import yaml
+
+'''
+Orchestration benchmark for COFFE.
+This runs the COFFE flow on a set of input files against the fake simulator in fake_spice.py, so that
+what we measure is COFFE's own Python overhead (netlist writing, area/wire updates, sweep assembly,
+parsing, etc.) rather than SPICE time. Each run is profiled with cProfile and the wall time spent in
+each phase of the flow is reported. Keep the reported numbers as a regression metric: the time
+spent in the simulator stand-in is listed separately and subtracted from the total.
+Note that cProfile adds overhead to every Python function call, so compare numbers from this script
+with each other, not with unprofiled runs.
+
+Example:
+    python3 tests/benchmark.py -i 1 unit_tests/input_files/custom_flow/flut0.yaml
+'''
+
+# Phases of the flow we report, as (description, file name, function name). The time of a phase is the
+# cumulative time of the outermost function with that name in that file.
+PHASES = [("Netlist generation", "fpga.py", "generate"),
+          ("Area update", "fpga.py", "update_area"),
+          ("Wire update", "fpga.py", "update_wires"),
+          ("Wire RC update", "fpga.py", "update_wire_rc"),
+          ("Delay update", "fpga.py", "update_delays"),
+          ("ERF", "tran_sizing.py", "erf"),
+          ("Sizing range search", "tran_sizing.py", "search_ranges"),
+          ("Sweep file writing", "spice.py", "_setup_data_sweep_file"),
+          ("Measurement parsing", "spice.py", "_read_mt0")]
+
+# Time spent waiting for the simulator stand-in (HSPICE streams its output to the listing and
+# is waited for, ngspice is read through communicate)
+SIMULATOR_PHASES = [("subprocess.py", "communicate"), ("subprocess.py", "wait"), ("base_events.py", "subprocess_exec")]
+
+DEFAULT_INPUT_FILES = "unit_tests/input_files/custom_flow/*.yaml"
+
+
+def create_simulator_shims(shim_dir):
+    """ Create 'hspice' and 'ngspice' executables in 'shim_dir' that run the fake simulator. """
+
+    fake_spice_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fake_spice.py")
+    for simulator in ["hspice", "ngspice"]:
+        shim_path = os.path.join(shim_dir, simulator)
+        shim_file = open(shim_path, 'w')
+        shim_file.write("#!/bin/sh\n")
+        shim_file.write("exec \"" + sys.executable + "\" \"" + fake_spice_path + "\" \"$@\"\n")
+        shim_file.close()
+        os.chmod(shim_path, 0o755)
+
+
+def prepare_input_file(input_path, coffe_top_level, run_dir):
+    """
+    Copy the input file to 'run_dir' with its output folder moved into 'run_dir' and its SPICE
+    model taken from the spice_models folder of this COFFE installation. Returns the new path.
+    """
+
+    with open(input_path, 'r') as input_file:
+        params = yaml.safe_load(input_file)
+
+    arch_params = params["fpga_arch_params"]
+    arch_params["arch_out_folder"] = os.path.join(run_dir, "arch_out_dir")
+    model_path = os.path.join(coffe_top_level, "spice_models", os.path.basename(arch_params["model_path"]))
+    if os.path.isfile(model_path):
+        arch_params["model_path"] = model_path
+
+    run_input_path = os.path.join(run_dir, os.path.basename(input_path))
+    with open(run_input_path, 'w') as run_input_file:
+        yaml.safe_dump(params, run_input_file)
+
+    return run_input_path
+
+
+def get_phase_times(profile_path):
+    """ Returns the cumulative time of every phase in the cProfile output at 'profile_path'. """
+
+    stats = pstats.Stats(profile_path).stats
+
+    def cumulative_time(filename, function_name):
+        times = [stat[3] for (path, line, name), stat in stats.items() if path.endswith(filename) and name == function_name]
+        return max(times) if len(times) > 0 else 0.0
+
+    phase_times = []
+    for description, filename, function_name in PHASES:
+        phase_times.append((description, cumulative_time(filename, function_name)))
+    simulator_time = sum(cumulative_time(filename, function_name) for filename, function_name in SIMULATOR_PHASES)
+
+    return phase_times, simulator_time
+
+
+def run_benchmark(input_path, coffe_top_level, shim_dir, max_iterations, coffe_args, keep):
+    """ Run COFFE on 'input_path' against the fake simulator and return the phase times. """
+
+    run_dir = tempfile.mkdtemp(prefix="coffe_benchmark_")
+    run_input_path = prepare_input_file(input_path, coffe_top_level, run_dir)
+    profile_path = os.path.join(run_dir, "coffe.prof")
+    log_path = os.path.join(run_dir, "coffe.log")
+
+    env = os.environ.copy()
+    env["PATH"] = shim_dir + os.pathsep + env["PATH"]
+    command = [sys.executable, "-m", "cProfile", "-o", profile_path, "coffe.py", "-i", str(max_iterations)] + coffe_args + [run_input_path]
+
+    print("Running COFFE on " + input_path + " (log in " + log_path + ")")
+    sys.stdout.flush()
+    start_time = time.time()
+    with open(log_path, 'w') as log_file:
+        return_code = subprocess.call(command, stdout=log_file, stderr=subprocess.STDOUT, cwd=coffe_top_level, env=env)
+    wall_time = time.time() - start_time
+
+    if return_code != 0 or not os.path.isfile(profile_path):
+        print("  COFFE failed, see " + log_path)
+        return None
+
+    phase_times, simulator_time = get_phase_times(profile_path)
+    if not keep:
+        shutil.rmtree(run_dir)
+
+    return wall_time, simulator_time, phase_times
+
+
+def print_report(results, report_file):
+    """ Print the phase times of every benchmark. """
+
+    lines = []
+    for input_path, (wall_time, simulator_time, phase_times) in results:
+        lines.append(input_path)
+        lines.append("  " + "Total wall time".ljust(40) + ("%.2f s" % wall_time).rjust(12))
+        lines.append("  " + "Simulator stand-in".ljust(40) + ("%.2f s" % simulator_time).rjust(12))
+        lines.append("  " + "COFFE overhead (total - simulator)".ljust(40) + ("%.2f s" % (wall_time - simulator_time)).rjust(12))
+        for description, phase_time in phase_times:
+            lines.append("    " + description.ljust(38) + ("%.2f s" % phase_time).rjust(12))
+        lines.append("")
+
+    for line in lines:
+        print(line)
+    if report_file is not None:
+        with open(report_file, 'w') as report:
+            report.write("\n".join(lines) + "\n")
+
+
+def main():
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('input_files', nargs='*', help="COFFE input files (default: " + DEFAULT_INPUT_FILES + ")")
+    parser.add_argument('-c', '--coffe_top_level', default=os.path.dirname(os.path.dirname(os.path.abspath(__file__))), help="top level of the COFFE installation")
+    parser.add_argument('-i', '--max_iterations', type=int, default=1, help="max FPGA sizing iterations of each run")
+    parser.add_argument('-a', '--coffe_args', default="", help="extra options passed to coffe.py (e.g. \"-n\")")
+    parser.add_argument('-o', '--report', default=None, help="also write the report to this file")
+    parser.add_argument('-k', '--keep', action='store_true', default=False, help="keep the COFFE output folders")
+    args = parser.parse_args()
+
+    coffe_top_level = os.path.abspath(os.path.expanduser(args.coffe_top_level))
+    input_files = args.input_files
+    if len(input_files) == 0:
+        input_files = sorted(glob.glob(os.path.join(coffe_top_level, DEFAULT_INPUT_FILES)))
+
+    shim_dir = tempfile.mkdtemp(prefix="coffe_fake_spice_")
+    create_simulator_shims(shim_dir)
+
+    results = []
+    for input_path in input_files:
+        result = run_benchmark(os.path.abspath(input_path), coffe_top_level, shim_dir, args.max_iterations, args.coffe_args.split(), args.keep)
+        if result is not None:
+            results.append((input_path, result))
+
+    shutil.rmtree(shim_dir)
+    print("")
+    print_report(results, args.report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import os
+import sys
+import math
+import argparse
+
+import pytest
+
+'''
+Fixtures of the COFFE unit tests. They build an FPGA from one of the example input files in
+unit_tests/input_files/custom_flow and run it against the fake simulator in fake_spice.py, so the
+tests run without HSPICE. Run the tests from the top level of COFFE with "python3 -m pytest tests".
+'''
+
+COFFE_TOP_LEVEL = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, COFFE_TOP_LEVEL)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import benchmark
+from coffe import fpga
+from coffe import spice
+from coffe import utils
+
+INPUT_FILES_DIR = os.path.join(COFFE_TOP_LEVEL, "unit_tests", "input_files", "custom_flow")
+
+# The defaults of the coffe.py options
+DEFAULT_RUN_OPTIONS = {"no_sizing": False, "opt_type": "global", "initial_sizes": "default", "re_erf": 1,
+                       "area_opt_weight": 1, "delay_opt_weight": 1, "max_iterations": 6, "size_hb_interfaces": 0.0,
+                       "hardblock_only": False, "gen_hb_scripts": False, "parallel_hb_flow": False, "parse_pll_hb_flow": False,
+                       "quick_mode": -1.0, "spice_backend": "hspice", "spice_workers": 1, "spice_cache": "",
+                       "spice_cache_entries": 1000000, "coarse_tran_step": 0.0, "coarse_tran_stop_scale": 1.0,
+                       "surrogate_pruning": 0.0, "search_strategy": "grid", "joint_erf": False, "erf_reuse": False,
+                       "sim_budget": 0.0, "sim_budget_unit": "seconds", "optimize_height": False, "parallel_sizing": 0,
+                       "resume": False, "spice_listing": "keep"}
+
+
+@pytest.fixture
+def make_fpga(tmp_path, monkeypatch):
+    """
+    Returns a function that builds an FPGA from an example input file and generates its netlists,
+    with the coffe.py options changed by its keyword arguments. The working directory is the
+    architecture folder, like during transistor sizing. Returns the FPGA and its SpiceInterface.
+    """
+
+    shim_dir = tmp_path / "shims"
+    shim_dir.mkdir()
+    benchmark.create_simulator_shims(str(shim_dir))
+    monkeypatch.setenv("PATH", str(shim_dir) + os.pathsep + os.environ["PATH"])
+
+    def _make_fpga(input_filename, **run_options):
+        options = dict(DEFAULT_RUN_OPTIONS)
+        options.update(run_options)
+        args = argparse.Namespace(**options)
+
+        run_dir = tmp_path / os.path.splitext(input_filename)[0]
+        run_dir.mkdir()
+        input_path = benchmark.prepare_input_file(os.path.join(INPUT_FILES_DIR, input_filename), COFFE_TOP_LEVEL, str(run_dir))
+        coffe_params = utils.load_params(input_path, args)
+        arch_folder = utils.create_output_dir(input_path, coffe_params["fpga_arch_params"]["arch_out_folder"])
+
+        spice_interface = spice.SpiceInterface(args.spice_workers, None, args.spice_cache_entries, args.spice_backend,
+                                               False, args.coarse_tran_step, args.coarse_tran_stop_scale, args.spice_listing)
+        fpga_inst = fpga.FPGA(coffe_params, args, spice_interface)
+        monkeypatch.chdir(arch_folder)
+        fpga_inst.generate(True, args.size_hb_interfaces)
+
+        return fpga_inst, spice_interface
+
+    return _make_fpga
+
+
+def prepare_sizing(fpga_inst, spice_interface):
+    """ Determine the floorplan and the delays of 'fpga_inst' like size_fpga_transistors does before it sizes anything. """
+
+    fpga_inst.update_area()
+    fpga_inst.lb_height = math.sqrt(fpga_inst.area_dict["tile"])
+    fpga_inst.update_area()
+    fpga_inst.update_wires()
+    fpga_inst.update_wire_rc()
+    fpga_inst.compute_distance()
+    fpga_inst.update_wires()
+    fpga_inst.update_wire_rc()
+    fpga_inst.update_delays(spice_interface)
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+import os
+import re
+import sys
+import zlib
+
+'''
+Fake SPICE simulator for profiling COFFE without HSPICE.
+It is a deterministic stand-in for the simulator executable: it reads the top-level .sp file it is
+given and the sweep_data.l sweep file next to "../includes.l", and produces syntactically valid
+results with synthetic delays computed from the swept parameters:
+    hspice <deck>.sp        writes <deck>.mt0 (and prints the measurements like an HSPICE .lis file)
+    ngspice -b <deck>.sp    prints "name = value" for every measurement of the single .PARAM setting
+The delays are a smooth function of the transistor sizes and wire RC: a larger NMOS (PMOS) makes
+the fall (rise) faster but loads the circuit more, so the sizing and ERF loops converge like they
+do with a real simulator. A transient step coarser than 1 ps adds a deterministic error of up to
+half the extra step to every delay. The numbers have nothing to do with real circuits.
+Use benchmark.py to run COFFE against it.
+'''
+
+# Transient step of the fine profile, coarser steps make the delays less accurate
+FINE_TRAN_STEP = 1e-12
+
+# Name and value of every statement we need from the decks and the sweep file
+MEASURE_RE = re.compile(r"^\s*\.MEAS(?:URE)?\s+\w+\s+(\w+)", re.IGNORECASE)
+PARAM_RE = re.compile(r"^\s*\.PARAM\s+(\w+)\s*=\s*(\S+)", re.IGNORECASE)
+
+
+def read_measurement_names(sp_path):
+    """ Returns the names of the .MEASURE statements of the deck, in lower case like HSPICE. """
+
+    meas_names = []
+    with open(sp_path, 'r') as sp_file:
+        for line in sp_file:
+            match = MEASURE_RE.match(line)
+            if match is not None:
+                meas_names.append(match.group(1).lower())
+
+    return meas_names
+
+
+def read_sweep(sweep_path):
+    """
+    Read the .PARAM statements and the .DATA block of a sweep file.
+    Returns a list with a {param_name: value} dictionary for each sweep setting.
+    """
+
+    constant_params = {}
+    data_names = []
+    data_values = []
+    in_data = False
+    parsing_names = False
+    with open(sweep_path, 'r') as sweep_file:
+        for line in sweep_file:
+            words = line.split()
+            if len(words) == 0:
+                continue
+            if words[0].upper() == ".DATA":
+                in_data = True
+                parsing_names = True
+                data_names.extend(words[2:])
+                continue
+            if words[0].upper() == ".ENDDATA":
+                in_data = False
+                continue
+            if in_data:
+                # The names of the .DATA block come first, then the values
+                if parsing_names and not re.match(r"^[-+]?[0-9.]", words[0]):
+                    data_names.extend(words)
+                    continue
+                parsing_names = False
+                data_values.extend(words)
+                continue
+            match = PARAM_RE.match(line)
+            if match is not None:
+                constant_params[match.group(1)] = match.group(2)
+
+    if len(data_names) == 0:
+        return [constant_params]
+
+    settings = []
+    for start in range(0, len(data_values), len(data_names)):
+        setting = dict(constant_params)
+        setting.update(zip(data_names, data_values[start:start + len(data_names)]))
+        settings.append(setting)
+
+    return settings
+
+
+def synthetic_measurements(meas_names, setting):
+    """ Returns the synthetic value of every measurement in 'meas_names' for one sweep setting. """
+
+    # Sum up the sizes of the NMOS, PMOS and other transistors relative to the smallest one,
+    # and the wire RC.
+    tran_sizes = {}
+    wire_res = 0.0
+    wire_cap = 0.0
+    tran_step = FINE_TRAN_STEP
+    for param_name, value in setting.items():
+        try:
+            value = float(value)
+        except ValueError:
+            continue
+        if param_name == "tran_step":
+            tran_step = value
+        elif param_name == "tran_stop_scale":
+            continue
+        elif param_name.endswith("_res"):
+            wire_res += value
+        elif param_name.endswith("_cap"):
+            wire_cap += value
+        elif value > 0:
+            tran_sizes[param_name] = value
+    min_size = min(tran_sizes.values()) if len(tran_sizes) > 0 else 1.0
+    nmos_drive = sum(size for name, size in tran_sizes.items() if "pmos" not in name) / min_size
+    pmos_drive = sum(size for name, size in tran_sizes.items() if "pmos" in name) / min_size
+    load = nmos_drive + pmos_drive
+    wire_delay = wire_res * wire_cap
+
+    tfall = 1e-11 * (1.0 + load / (nmos_drive + 1.0)) + wire_delay
+    trise = 1e-11 * (1.0 + 2.0 * load / (pmos_drive + 1.0)) + wire_delay
+
+    # Error of a coarse transient step, the same for the same setting
+    if tran_step > FINE_TRAN_STEP:
+        setting_id = zlib.crc32(" ".join(sorted(name + "=" + str(value) for name, value in setting.items())).encode())
+        step_error = (tran_step - FINE_TRAN_STEP) * ((setting_id % 1000) / 1000.0 - 0.5)
+        tfall += step_error
+        trise += step_error
+
+    values = []
+    for meas_name in meas_names:
+        # Every measurement gets a fixed share of the total delay, so sub-delays add up to less than it
+        share = 0.5 + (zlib.crc32(meas_name.encode()) % 50) / 100.0
+        if "total" in meas_name:
+            share = 1.0
+        if "low_voltage" in meas_name:
+            values.append(0.0)
+        elif "power" in meas_name:
+            values.append(1e-6 * load)
+        elif "current" in meas_name:
+            values.append(-1e-15 * load)
+        elif "outputtarget" in meas_name:
+            values.append(0.4)
+        elif "trise" in meas_name:
+            values.append(share * trise)
+        else:
+            values.append(share * tfall)
+
+    return values
+
+
+def main():
+
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("-")]
+    sp_filename = args[0]
+    ngspice_mode = os.path.basename(sys.argv[0]).startswith("ngspice") or "-b" in sys.argv[1:]
+
+    # Top-level decks include "../includes.l", and the sweep file is next to it
+    sweep_path = os.path.join("..", "sweep_data.l")
+    meas_names = read_measurement_names(sp_filename)
+    settings = read_sweep(sweep_path)
+    results = [synthetic_measurements(meas_names, setting) for setting in settings]
+
+    if ngspice_mode:
+        for meas_name, value in zip(meas_names, results[0]):
+            print(meas_name + " = " + "%.6e" % value)
+        return
+
+    # Print the measurements like HSPICE does in the .lis file
+    for values in results:
+        for meas_name, value in zip(meas_names, values):
+            print("   " + meas_name + "=  " + "%.4e" % value)
+
+    # Write the .mt0 file, 4 values per line like HSPICE
+    mt0_file = open(os.path.splitext(sp_filename)[0] + ".mt0", 'w')
+    mt0_file.write("$DATA1 SOURCE='HSPICE' VERSION='fake_spice'\n")
+    mt0_file.write(".TITLE '" + sp_filename + "'\n")
+    names = meas_names + ["temper", "alter#"]
+    for start in range(0, len(names), 4):
+        mt0_file.write(" " + " ".join(name.ljust(16) for name in names[start:start + 4]) + "\n")
+    for values in results:
+        row = ["%.4e" % value for value in values] + ["25.0000", "1"]
+        for start in range(0, len(row), 4):
+            mt0_file.write(" " + " ".join(value.ljust(16) for value in row[start:start + 4]) + "\n")
+    mt0_file.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,350 @@
+import os
+import math
+import asyncio
+
+from coffe import spice
+from coffe import top_level
+
+
+MT0_WITH_ODD_VALUES = """$DATA1 SOURCE='HSPICE' VERSION='fake'
+.TITLE '* test deck'
+ meas_total_tfall meas_total_trise temper alter#
+ 1.0e-10 failed 25.0000 1.0000
+ ** 3.0e-10 25.0000 1.0000
+ nan 4.0e-10 25.0000 1.0000
+"""
+
+
+class EchoBackend(spice.SimulatorBackend):
+    """ Measures the parameter 'x' of every sweep setting as 'meas_x', and the scratch folder the deck ran in as 'meas_folder'. """
+
+    name = "echo"
+
+    def run(self, sp_path, parameter_dict):
+
+        folder = os.path.basename(os.path.dirname(os.path.dirname(os.path.abspath(sp_path))))
+        return {"meas_x": [str(x) for x in parameter_dict["x"]], "meas_folder": [folder]*len(parameter_dict["x"])}
+
+
+class AsyncEchoBackend(EchoBackend):
+    """ EchoBackend whose runs take a while and run at the same time, it records the most runs that were running at once. """
+
+    def __init__(self):
+
+        super().__init__()
+        self.num_running = 0
+        self.max_running = 0
+
+
+    async def run_async(self, sp_path, parameter_dict):
+
+        self.num_running += 1
+        self.max_running = max(self.max_running, self.num_running)
+        await asyncio.sleep(0.01*parameter_dict["delay"][0])
+        self.num_running -= 1
+
+        return self.run(sp_path, parameter_dict)
+
+
+def make_deck(tmp_path, name="deck"):
+    """ Write a top-level deck in its own folder of the architecture folder, like generate() does, and return its path. """
+
+    arch_dir = tmp_path / "arch"
+    (arch_dir / name).mkdir(parents=True)
+    (arch_dir / "includes.l").write_text("* includes\n")
+    sp_path = arch_dir / name / (name + ".sp")
+    sp_path.write_text(".TITLE " + name + "\n.LIB \"../includes.l\" INCLUDES\n.END")
+
+    return str(sp_path)
+
+
+def test_parse_mt0_with_values_that_are_not_numbers(tmp_path):
+    """ .mt0 values other than numbers and "failed" are kept as they are, and are failed measurements in a MeasurementTable. """
+
+    mt0_path = tmp_path / "test.mt0"
+    mt0_path.write_text(MT0_WITH_ODD_VALUES)
+    spice_interface = spice.SpiceInterface()
+
+    spice_meas = spice_interface.parse_mt0(str(mt0_path))
+    assert spice_meas["meas_total_tfall"] == ["1.0e-10", "**", "nan"]
+    assert spice_meas["meas_total_trise"] == ["failed", "3.0e-10", "4.0e-10"]
+
+    spice_meas = spice_interface.parse_mt0(str(mt0_path), as_array=True)
+    assert len(spice_meas) == 3
+    assert spice_meas.is_failed("meas_total_tfall").tolist() == [False, True, True]
+    assert spice_meas.is_failed("meas_total_trise").tolist() == [True, False, False]
+    assert spice_meas.column("meas_total_tfall", 1).tolist() == [1.0e-10, 1, 1]
+    assert math.isnan(spice_meas["meas_total_tfall"][1])
+    assert math.isnan(spice_meas["meas_total_tfall"][2])
+    assert spice_meas.column("meas_total_trise", 2).tolist() == [2, 3.0e-10, 4.0e-10]
+
+
+def test_parse_mt0_nan_is_failed(tmp_path):
+    """ A NaN measurement is a failed measurement in a MeasurementTable, also when all the other values are numbers. """
+
+    mt0_path = tmp_path / "test.mt0"
+    mt0_path.write_text(MT0_WITH_ODD_VALUES.replace("**", "2.0e-10"))
+
+    spice_meas = spice.SpiceInterface().parse_mt0(str(mt0_path), as_array=True)
+    assert spice_meas.is_failed("meas_total_tfall").tolist() == [False, False, True]
+    assert spice_meas.column("meas_total_tfall", 1).tolist() == [1.0e-10, 2.0e-10, 1]
+
+
+def test_sharded_sweep_keeps_the_sweep_order(tmp_path):
+    """ A large sweep is split into contiguous shards, one per worker, and their measurements are merged back in the original order. """
+
+    sp_path = make_deck(tmp_path)
+    spice_interface = spice.SpiceInterface(num_workers=3)
+    spice_interface.backend = EchoBackend()
+    num_settings = 3*spice.MIN_ROWS_PER_SHARD + 1
+
+    spice_meas = spice_interface.run(sp_path, {"x": list(range(num_settings))})
+    assert spice_meas["meas_x"] == [str(x) for x in range(num_settings)]
+    assert spice_meas["meas_folder"] == ["shard_0"]*50 + ["shard_1"]*50 + ["shard_2"]*51
+    assert spice_interface.get_num_simulations_performed() == num_settings
+
+
+def test_small_sweep_is_not_sharded(tmp_path):
+    """ A sweep with less than MIN_ROWS_PER_SHARD settings per worker runs in the deck's own folder. """
+
+    sp_path = make_deck(tmp_path)
+    spice_interface = spice.SpiceInterface(num_workers=3)
+    spice_interface.backend = EchoBackend()
+
+    spice_meas = spice_interface.run(sp_path, {"x": list(range(spice.MIN_ROWS_PER_SHARD))})
+    assert spice_meas["meas_folder"] == ["arch"]*spice.MIN_ROWS_PER_SHARD
+
+
+def test_cache_hits_and_misses(tmp_path):
+    """ Only the settings that are not in the cache are simulated, and the result is the same as a full simulation. """
+
+    sp_path = make_deck(tmp_path)
+    spice_interface = spice.SpiceInterface(cache_path=str(tmp_path / "cache.db"))
+    spice_interface.backend = EchoBackend()
+
+    spice_interface.run(sp_path, {"x": [1, 2]})
+    spice_meas = spice_interface.run(sp_path, {"x": [2, 3, 1]})
+    assert spice_meas["meas_x"] == ["2", "3", "1"]
+    assert spice_interface.get_num_cache_hits() == 2
+    assert spice_interface.get_num_cache_misses() == 3
+    assert spice_interface.get_num_simulations_performed() == 3
+
+
+def test_cache_is_keyed_by_the_deck(tmp_path):
+    """ Changing a library the deck includes misses the cache. """
+
+    sp_path = make_deck(tmp_path)
+    spice_interface = spice.SpiceInterface(cache_path=str(tmp_path / "cache.db"))
+    spice_interface.backend = EchoBackend()
+
+    spice_interface.run(sp_path, {"x": [1]})
+    (tmp_path / "arch" / "includes.l").write_text("* other includes\n")
+    spice_interface.run(sp_path, {"x": [1]})
+    assert spice_interface.get_num_cache_hits() == 0
+    assert spice_interface.get_num_simulations_performed() == 2
+
+
+def test_cache_evicts_the_least_recently_used(tmp_path):
+    """ Above its max entries, the cache evicts the entries that were stored or looked up the longest ago. """
+
+    cache = spice.SimulationCache(str(tmp_path / "cache.db"), max_entries=2)
+    cache.store(["a", "b"], [{"meas": "1"}, {"meas": "2"}])
+    assert cache.lookup(["a", "c"]) == [{"meas": "1"}, None]
+    cache.store(["c"], [{"meas": "3"}])
+
+    cache.evict()
+    assert cache.lookup(["a", "b", "c"]) == [{"meas": "1"}, None, {"meas": "3"}]
+
+
+def test_ngspice_deck_translation(tmp_path):
+    """ The ngspice deck has no .DATA sweep and braces around the .TRAN expressions, the measurement names are collected in lower case. """
+
+    sp_path = tmp_path / "deck.sp"
+    sp_path.write_text(".TRAN 'tran_step' '8n * tran_stop_scale' SWEEP DATA=sweep_data\n" +
+                       ".MEASURE TRAN meas_Total_tfall TRIG V(n_in) VAL='supply_v/2' RISE=1\n" +
+                       "+    TARG V(n_out) VAL='supply_v/2' FALL=1\n")
+    ngspice_sp_path = tmp_path / "deck_ngspice.sp"
+
+    meas_names = spice.NgspiceBackend()._translate_deck(str(sp_path), str(ngspice_sp_path))
+    assert meas_names == ["meas_total_tfall"]
+    assert ngspice_sp_path.read_text().splitlines()[0] == ".TRAN {tran_step} {8n * tran_stop_scale}"
+
+
+def test_ngspice_measurements(tmp_path):
+    """ The printed results of every setting are appended, a measurement that isn't printed failed. """
+
+    backend = spice.NgspiceBackend()
+    spice_meas = {"meas_total_tfall": [], "meas_total_trise": []}
+    backend._collect_measurements(b"meas_total_tfall     =  1.5e-10 targ= 2e-09 trig= 1e-09\n", ["meas_total_tfall", "meas_total_trise"], spice_meas)
+    backend._collect_measurements(b"MEAS_TOTAL_TRISE = 2.5e-10\n", ["meas_total_tfall", "meas_total_trise"], spice_meas)
+    assert spice_meas == {"meas_total_tfall": ["1.5e-10", "failed"], "meas_total_trise": ["failed", "2.5e-10"]}
+
+
+def test_constant_parameters_are_hoisted(tmp_path):
+    """ Parameters with the same value in every setting are .PARAM statements, only the others are .DATA columns. """
+
+    sweep_path = tmp_path / "sweep_data.l"
+    spice.HspiceBackend()._setup_data_sweep_file({"a": [1, 1], "b": [2, 3], "c": [4, 4]}, str(sweep_path), str(tmp_path / "data.txt"))
+
+    assert sweep_path.read_text().splitlines() == [".PARAM a=1", ".PARAM c=4", ".DATA sweep_data b", "2 ", "3 ", ".ENDDATA"]
+    assert not (tmp_path / "data.txt").exists()
+
+
+def test_constant_sweep_keeps_a_data_column(tmp_path):
+    """ A sweep whose parameters are all constant keeps its first parameter in the .DATA statement, which sets the number of settings. """
+
+    sweep_path = tmp_path / "sweep_data.l"
+    spice.HspiceBackend()._setup_data_sweep_file({"a": [1, 1], "b": [2, 2]}, str(sweep_path), str(tmp_path / "data.txt"))
+
+    assert sweep_path.read_text().splitlines() == [".PARAM b=2", ".DATA sweep_data a", "1 ", "1 ", ".ENDDATA"]
+
+
+FAKE_HSPICE_FAILING_ONCE = """#!/bin/sh
+# The first run finds no license and writes no .mt0 file
+if [ -f attempts.txt ]; then
+  printf ' meas_x alter#\\n 1.0e-10 1.0000\\n' > deck.mt0
+fi
+echo attempt >> attempts.txt
+"""
+
+
+def test_run_async_retries_a_run_without_results(tmp_path, monkeypatch):
+    """ A run that writes no .mt0 file (e.g. no HSPICE license was free) is run again. """
+
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    (bin_dir / "hspice").write_text(FAKE_HSPICE_FAILING_ONCE)
+    os.chmod(str(bin_dir / "hspice"), 0o755)
+    monkeypatch.setenv("PATH", str(bin_dir) + os.pathsep + os.environ["PATH"])
+    monkeypatch.setattr(spice, "RETRY_BASE_DELAY", 0.0)
+    sp_path = make_deck(tmp_path)
+
+    spice_meas = asyncio.run(spice.HspiceBackend().run_async(sp_path, {"x": [1]}))
+    assert spice_meas["meas_x"] == ["1.0e-10"]
+    assert (tmp_path / "arch" / "deck" / "attempts.txt").read_text().split() == ["attempt", "attempt"]
+
+
+def test_run_async_runs_at_most_num_workers_decks_at_once(tmp_path):
+    """ Gathered run_async calls share 'num_workers' scratch slots. """
+
+    sp_paths = [make_deck(tmp_path, "deck_" + str(i)) for i in range(5)]
+    spice_interface = spice.SpiceInterface(num_workers=2)
+    spice_interface.backend = AsyncEchoBackend()
+
+    async def run_decks():
+        return await asyncio.gather(*[spice_interface.run_async(sp_path, {"x": [i], "delay": [1]}) for i, sp_path in enumerate(sp_paths)])
+
+    all_spice_meas = asyncio.run(run_decks())
+    assert [spice_meas["meas_x"] for spice_meas in all_spice_meas] == [["0"], ["1"], ["2"], ["3"], ["4"]]
+    assert set(spice_meas["meas_folder"][0] for spice_meas in all_spice_meas) == {"slot_0", "slot_1"}
+    assert spice_interface.backend.max_running == 2
+
+
+def test_top_level_deck_is_written_to_its_folder(tmp_path, monkeypatch):
+    """ A top-level deck is written to a folder of its own without changing the working directory. """
+
+    monkeypatch.chdir(tmp_path)
+
+    sp_path = top_level.generate_switch_block_top("sb_mux_uid0")
+    assert sp_path == "sb_mux_uid0/sb_mux_uid0.sp"
+    assert os.getcwd() == str(tmp_path)
+    assert '.LIB "../includes.l" INCLUDES' in (tmp_path / sp_path).read_text()
+
+
+def test_run_all_simulates_the_decks_at_once(tmp_path):
+    """ run_all returns the measurements in the order of the decks. With more than one worker, the decks run at the same time. """
+
+    sp_paths = [make_deck(tmp_path, "deck_" + str(i)) for i in range(3)]
+    for num_workers, max_running in [(1, 0), (3, 3)]:
+        spice_interface = spice.SpiceInterface(num_workers=num_workers)
+        spice_interface.backend = AsyncEchoBackend()
+
+        all_spice_meas = spice_interface.run_all(sp_paths, {"x": [1, 2], "delay": [1, 1]})
+        assert [spice_meas["meas_x"] for spice_meas in all_spice_meas] == [["1", "2"]]*3
+        assert spice_interface.backend.max_running == max_running
+
+
+DECK_LIBRARY = """.SUBCKT inv n_in n_out
+MN n_out n_in gnd gnd nmos W='inv_nmos*min_width'
+.ENDS
+.PARAM wire_cap = 'wire_cap_per_um*wire_length'
+"""
+
+
+def test_deck_parameter_index_reuses_unchanged_decks(tmp_path):
+    """ A deck is simulated again only when a parameter it depends on (through the subcircuits and .PARAM statements it uses) changes. """
+
+    inv_sp_path = make_deck(tmp_path, "inv")
+    wire_sp_path = make_deck(tmp_path, "wire")
+    (tmp_path / "arch" / "includes.l").write_text(DECK_LIBRARY)
+    with open(inv_sp_path, "a") as sp_file:
+        sp_file.write("\nXinv n_1 n_2 inv\n")
+    with open(wire_sp_path, "a") as sp_file:
+        sp_file.write("\nC1 n_1 gnd 'wire_cap'\n")
+    deck_param_index = spice.DeckParameterIndex([inv_sp_path, wire_sp_path], ["inv_nmos", "wire_length", "unused"])
+    assert deck_param_index.deck_params == {inv_sp_path: ["inv_nmos"], wire_sp_path: ["wire_length"]}
+
+    spice_interface = spice.SpiceInterface()
+    spice_interface.backend = EchoBackend()
+    parameter_dict = {"x": [1], "inv_nmos": [2], "wire_length": [10], "unused": [0]}
+    deck_param_index.run_all(spice_interface, [inv_sp_path, wire_sp_path], parameter_dict)
+    deck_param_index.run_all(spice_interface, [inv_sp_path, wire_sp_path], dict(parameter_dict, unused=[1]))
+    assert (deck_param_index.num_simulated, deck_param_index.num_reused) == (2, 2)
+
+    all_spice_meas = deck_param_index.run_all(spice_interface, [inv_sp_path, wire_sp_path], dict(parameter_dict, x=[3], wire_length=[20]))
+    assert [spice_meas["meas_x"] for spice_meas in all_spice_meas] == [["1"], ["3"]]
+    assert (deck_param_index.num_simulated, deck_param_index.num_reused) == (3, 3)
+
+
+def test_netlist_builder_writes_the_file_at_once(tmp_path):
+    """ The contents are collected in memory and only written by write_file(). """
+
+    netlist_path = tmp_path / "subcircuits.l"
+    netlist = spice.NetlistBuilder(str(netlist_path))
+    netlist.write(".LIB SUBCIRCUITS\n")
+    netlist.write(".ENDL SUBCIRCUITS")
+    assert not netlist_path.exists()
+
+    assert netlist.write_file()
+    assert netlist_path.read_text() == ".LIB SUBCIRCUITS\n.ENDL SUBCIRCUITS"
+    assert os.listdir(str(tmp_path)) == ["subcircuits.l"]
+
+
+def test_unchanged_netlist_is_left_untouched(tmp_path):
+    """ write_file() doesn't rewrite a file whose contents didn't change, so it keeps its time stamp. """
+
+    netlist_path = tmp_path / "includes.l"
+    netlist_path.write_text("* includes\n")
+    os.utime(str(netlist_path), (1000000000, 1000000000))
+
+    netlist_files = spice.NetlistFiles()
+    netlist_files.start()
+    netlist = spice.NetlistBuilder(str(netlist_path))
+    netlist.write("* includes\n")
+    assert not netlist.write_file()
+    assert os.stat(str(netlist_path)).st_mtime == 1000000000
+
+    netlist.write("* more includes\n")
+    assert netlist.write_file()
+    netlist_files.stop()
+    assert netlist_path.read_text() == "* includes\n* more includes\n"
+    assert (netlist_files.written_paths, netlist_files.unchanged_paths) == ([str(netlist_path)], [str(netlist_path)])
+
+
+def test_stale_decks_are_removed(tmp_path):
+    """ The decks in the subfolders that the current run didn't generate are deleted. """
+
+    sp_path = make_deck(tmp_path)
+    stale_sp_path = tmp_path / "arch" / "deck" / "old_deck.sp"
+    stale_sp_path.write_text(".END")
+    netlist_files = spice.NetlistFiles()
+    netlist_files.start()
+    netlist = spice.NetlistBuilder(sp_path)
+    netlist.write(open(sp_path).read())
+    netlist.write_file()
+    netlist_files.stop()
+
+    assert netlist_files.remove_stale_decks(str(tmp_path / "arch")) == 1
+    assert os.path.isfile(sp_path)
+    assert not stale_sp_path.exists()
+    assert (tmp_path / "arch" / "includes.l").exists()
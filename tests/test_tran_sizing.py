@@ -0,0 +1,316 @@
+import os
+import copy
+import types
+import itertools
+import multiprocessing as mp
+
+import pytest
+
+from conftest import prepare_sizing
+from coffe import fpga
+from coffe import tran_sizing
+
+
+def _get_initial_sizes(subcircuit):
+    return tran_sizing.format_transistor_sizes_to_basic_subciruits(subcircuit.initial_transistor_sizes)
+
+
+def test_parallel_sizing_matches_serial_finfet(make_fpga, monkeypatch):
+    """ A subcircuit sized by a worker of the parallel sizing mode gets the same (rounded) FinFET sizes as the serial path. """
+
+    # The fake simulator balances the inverters at whole-number P/N ratios, a real one doesn't. With
+    # fractional ratios, the FinFET sizes are only whole numbers of fins after rounding.
+    erf_combo = tran_sizing.erf_combo
+    def fractional_erf_combo(*args):
+        erf_ratios = erf_combo(*args)
+        return {name: ratio*1.3 for name, ratio in erf_ratios.items()}
+    monkeypatch.setattr(tran_sizing, "erf_combo", fractional_erf_combo)
+
+    fpga_inst, spice_interface = make_fpga("finfet_example.yaml")
+    assert fpga_inst.specs.use_finfet
+    prepare_sizing(fpga_inst, spice_interface)
+    os.makedirs("sizing_results")
+
+    serial_fpga = copy.deepcopy(fpga_inst)
+    tran_sizing.size_subcircuit_transistors(serial_fpga, serial_fpga.sb_mux, "global", 1, 1, 1, 1,
+                                            _get_initial_sizes(serial_fpga.sb_mux), spice_interface, 0, 0)
+
+    parallel_fpga = copy.deepcopy(fpga_inst)
+    sizing_job = (parallel_fpga, parallel_fpga.sb_mux, "global", 1, 1, 1, 1,
+                  _get_initial_sizes(parallel_fpga.sb_mux), spice_interface, 0, 0)
+    sizing_pool = mp.Pool(1)
+    try:
+        async_result = sizing_pool.apply_async(tran_sizing._size_subcircuit_job, (sizing_job,))
+        pending_result = tran_sizing._PendingSizingResult(async_result, "")
+        sizing_results_dict = {"sb_mux": pending_result}
+        sizing_results_detailed_dict = {"sb_mux": pending_result}
+        tran_sizing._merge_parallel_sizing_results(parallel_fpga, spice_interface, sizing_results_dict, sizing_results_detailed_dict)
+    finally:
+        sizing_pool.close()
+        sizing_pool.join()
+
+    assert parallel_fpga.transistor_sizes == serial_fpga.transistor_sizes
+    for name in sizing_results_detailed_dict["sb_mux"]:
+        assert float(parallel_fpga.transistor_sizes[name]).is_integer()
+
+
+def test_erf_warm_start_matches_cold_start(make_fpga, monkeypatch):
+    """ An ERF warm-started from stored ratios on the wrong side of the balanced ratios finds the same ratios as a cold ERF. """
+
+    # Only the first ERF iteration is warm-started, the ratios are those it finds
+    monkeypatch.setattr(tran_sizing, "ERF_MAX_ITERATIONS", 1)
+    fpga_inst, spice_interface = make_fpga("flut0.yaml")
+    prepare_sizing(fpga_inst, spice_interface)
+    initial_sizes = _get_initial_sizes(fpga_inst.sb_mux)
+    element_names = sorted(name for name in initial_sizes if "sb_mux" in name)
+    element_sizes = [initial_sizes[name] for name in element_names]
+    sp_path = fpga_inst.sb_mux.top_spice_path
+
+    cold_fpga = copy.deepcopy(fpga_inst)
+    cold_fpga.erf_ratio_store = None
+    cold_ratios = tran_sizing.erf(sp_path, element_names, element_sizes, cold_fpga, spice_interface)
+    assert any(ratio != 1 for ratio in cold_ratios.values())
+
+    # Stored ratios that make the other transistor bigger than the cold ERF does
+    warm_fpga = copy.deepcopy(fpga_inst)
+    warm_fpga.erf_ratio_store = tran_sizing.ErfRatioStore()
+    warm_fpga.erf_ratio_store.add(sp_path, dict(zip(element_names, element_sizes)),
+                                  {name: 1.0/ratio if ratio != 1 else 2.0 for name, ratio in cold_ratios.items()})
+    warm_ratios = tran_sizing.erf(sp_path, element_names, element_sizes, warm_fpga, spice_interface)
+
+    assert warm_fpga.erf_ratio_store.num_warm_starts == 1
+    assert warm_ratios == cold_ratios
+
+
+
+def test_joint_erf_warm_start(make_fpga, monkeypatch):
+    """ The joint ERF sweeps the P/N ratios around the stored ratios and finds the ratios of a cold joint ERF. """
+
+    fpga_inst, spice_interface = make_fpga("flut0.yaml", joint_erf=True)
+    prepare_sizing(fpga_inst, spice_interface)
+    initial_sizes = _get_initial_sizes(fpga_inst.sb_mux)
+    element_names = sorted(name for name in initial_sizes if "sb_mux" in name)
+    element_sizes = [initial_sizes[name] for name in element_names]
+    sp_path = fpga_inst.sb_mux.top_spice_path
+
+    cold_fpga = copy.deepcopy(fpga_inst)
+    cold_fpga.erf_ratio_store = None
+    cold_ratios = tran_sizing.erf(sp_path, element_names, element_sizes, cold_fpga, spice_interface)
+    assert any(ratio != 1 for ratio in cold_ratios.values())
+
+    # Don't skip the ERF with the stored ratios, and keep the parameters of the joint ERF sweeps
+    monkeypatch.setattr(tran_sizing, "erf_stored_ratios", lambda *args: None)
+    sweep_parameter_dicts = []
+    run = spice_interface.run
+    def recording_run(sp_path, parameter_dict, *args, **kwargs):
+        if len(next(iter(parameter_dict.values()))) > 1:
+            sweep_parameter_dicts.append(parameter_dict)
+        return run(sp_path, parameter_dict, *args, **kwargs)
+    monkeypatch.setattr(spice_interface, "run", recording_run)
+
+    warm_fpga = copy.deepcopy(fpga_inst)
+    warm_fpga.erf_ratio_store = tran_sizing.ErfRatioStore()
+    warm_fpga.erf_ratio_store.add(sp_path, dict(zip(element_names, element_sizes)), cold_ratios)
+    warm_ratios = tran_sizing.erf(sp_path, element_names, element_sizes, warm_fpga, spice_interface)
+
+    assert warm_fpga.erf_ratio_store.num_warm_starts == 1
+    assert warm_ratios == cold_ratios
+    # The middle row of the first sweep has the stored ratios
+    middle_row = tran_sizing.ERF_JOINT_NUM_RATIOS//2
+    for inv_name, ratio in cold_ratios.items():
+        nmos_size = sweep_parameter_dicts[0][inv_name + "_nmos"][middle_row]
+        pmos_size = sweep_parameter_dicts[0][inv_name + "_pmos"][middle_row]
+        assert abs(pmos_size/nmos_size - ratio) < 1e-6
+
+
+def _convex_cost(points):
+    """ A convex cost of two transistor sizes with its minimum at sizes (7, 3). """
+
+    return [(x - 7)**2 + 2*(y - 3)**2 + 0.5*(x - 7)*(y - 3) for x, y in points]
+
+
+def test_poll_points_stay_at_least_size_1():
+    """ The poll points are one step away along each element, sizes below 1 are clipped and the point itself is left out. """
+
+    assert tran_sizing._get_poll_points((1, 3), 2) == [(3, 3), (1, 1), (1, 5)]
+    assert tran_sizing._get_poll_points((1, 1), 1) == [(2, 1), (1, 2)]
+
+
+def test_search_strategies_find_the_minimum_of_a_convex_cost():
+    """ Every search strategy finds the best sizes of a convex cost from far away, in less than SEARCH_MAX_STEPS sweeps. """
+
+    for search_strategy, search in tran_sizing.SEARCH_STRATEGIES.items():
+        num_sweeps = [0]
+        def evaluate(points):
+            num_sweeps[0] += 1
+            return _convex_cost(points)
+
+        assert search(evaluate, (20, 12)) == (7, 3), search_strategy
+        assert num_sweeps[0] < tran_sizing.SEARCH_MAX_STEPS, search_strategy
+
+
+def test_surrogate_pruning_keeps_the_best_combo(monkeypatch):
+    """ Surrogate pruning simulates the best combo of a sweep, but much fewer combos than the whole sweep. """
+
+    sizing_combos = list(itertools.product(range(1, 7), repeat=3))
+    area_list = [10 + sum(combo) for combo in sizing_combos]
+    def get_delay(combo):
+        return 1e-10*(1 + 8.0/combo[0] + 4.0/combo[1] + 2.0/combo[2])
+
+    simulated_combos = []
+    def simulate_sizing_combos(fpga_inst, opt_type, sizable_circuit, parameter_dict, combo_indices, tfall_trise_list,
+                               eval_delay_list, spice_interface, is_ram_component, is_cc_component):
+        simulated_combos.extend(combo_indices)
+        for i in combo_indices:
+            eval_delay_list[i] = get_delay(sizing_combos[i])
+    monkeypatch.setattr(tran_sizing, "simulate_sizing_combos", simulate_sizing_combos)
+
+    num_combos = len(sizing_combos)
+    eval_delay_list = [None]*num_combos
+    fpga_inst = types.SimpleNamespace(specs=types.SimpleNamespace(surrogate_band=2.0))
+    pruned_combos = tran_sizing.prune_sizing_combos(fpga_inst, "global", None, sizing_combos, {}, area_list, [None]*num_combos,
+                                                    eval_delay_list, 1, 1, None, False, False)
+
+    costs = [tran_sizing.cost_function(area_list[i], get_delay(sizing_combos[i]), 1, 1) for i in range(num_combos)]
+    assert costs.index(min(costs)) in pruned_combos
+    assert sorted(pruned_combos) == sorted(simulated_combos)
+    assert len(pruned_combos) < num_combos/2
+
+
+def test_erf_candidate_sizes():
+    """ The candidate sizes go up by the inverter size for bulk and by one fin for FinFETs, up to the first one above ERF_MAX_SIZE_RATIO. """
+
+    assert tran_sizing._get_erf_candidate_sizes(100, False) == [100, 200, 300, 400, 500]
+    assert tran_sizing._get_erf_candidate_sizes(2, True) == [2, 3, 4, 5, 6, 7, 8, 9]
+
+
+def test_interpolate_erf_size():
+    """ The balanced size is interpolated between the sizes around the sign change of tfall-trise. """
+
+    assert tran_sizing._interpolate_erf_size([100, 200, 300], [-2.0, -1.0, 1.0], True) == (250, 200, 300)
+    assert tran_sizing._interpolate_erf_size([100, 200, 300], [3.0, 1.0, -3.0], False) == (225, 200, 300)
+
+
+class _ErfSpiceInterface(object):
+    """ Measures an inverter whose PMOS balances it at 'balanced_size' nm, and records the sizes of every sweep. """
+
+    def __init__(self, balanced_size):
+
+        self.balanced_size = balanced_size
+        self.sweeps = []
+
+
+    def run(self, sp_path, parameter_dict):
+
+        sizes = [round(size*1e9) for size in parameter_dict["inv_test_1_pmos"]]
+        self.sweeps.append(sizes)
+        return {"meas_inv_test_1_tfall": [str(1e-10 + 1e-14*(size - self.balanced_size)) for size in sizes],
+                "meas_inv_test_1_trise": [str(1e-10 - 1e-14*(size - self.balanced_size)) for size in sizes]}
+
+
+def test_erf_upper_bound_search_doubles_its_sweeps(monkeypatch):
+    """ The upper bound search simulates 2, 2, 4, 8, etc. candidate sizes per sweep, then one sweep refines the balanced size. """
+
+    monkeypatch.setattr(tran_sizing, "ERF_MAX_SIZE_RATIO", 16)
+    fpga_inst = types.SimpleNamespace(specs=types.SimpleNamespace(use_finfet=False))
+    spice_interface = _ErfSpiceInterface(1030)
+
+    pmos_size = tran_sizing.erf_inverter_balance_trise_tfall("inv_test.sp", "inv_test_1", 100, "inv_test_1_pmos", {},
+                                                             fpga_inst, spice_interface)
+    assert pmos_size == 1030
+    assert [len(sizes) for sizes in spice_interface.sweeps] == [2, 2, 4, 8, tran_sizing.ERF_REFINE_NUM_SIZES]
+    assert spice_interface.sweeps[3] == [900, 1000, 1100, 1200, 1300, 1400, 1500, 1600]
+    assert all(1000 < size < 1100 for size in spice_interface.sweeps[4])
+
+
+def test_checkpoint_write_and_read(tmp_path):
+    """ A checkpoint restores the sizing state and the FPGA state, but not the SpiceInterface of the run that resumes. """
+
+    checkpoint_path = str(tmp_path / "sizing_checkpoint.pkl")
+    checkpoint = tran_sizing._SizingCheckpoint(checkpoint_path, "digest")
+    checkpoint.iteration = 3
+    checkpoint.sizing_results_dict = {"sb_mux": {"inv_sb_mux_1": 4}}
+    checkpoint.write(types.SimpleNamespace(transistor_sizes={"inv_sb_mux_1_nmos": 4}, spice_interface="killed run"))
+    assert os.listdir(str(tmp_path)) == ["sizing_checkpoint.pkl"]
+
+    fpga_inst = types.SimpleNamespace(transistor_sizes={"inv_sb_mux_1_nmos": 1}, spice_interface="resumed run")
+    resumed_checkpoint = tran_sizing._SizingCheckpoint(checkpoint_path, "digest")
+    resumed_checkpoint.read(fpga_inst)
+    assert resumed_checkpoint.iteration == 3
+    assert resumed_checkpoint.is_resuming()
+    assert resumed_checkpoint.resumed_names == {"sb_mux"}
+    assert fpga_inst.transistor_sizes == {"inv_sb_mux_1_nmos": 4}
+    assert fpga_inst.spice_interface == "resumed run"
+
+
+def test_checkpoint_of_other_parameters_is_rejected(tmp_path):
+    """ A checkpoint of another architecture or other sizing options can't be resumed. """
+
+    checkpoint_path = str(tmp_path / "sizing_checkpoint.pkl")
+    tran_sizing._SizingCheckpoint(checkpoint_path, "digest").write(types.SimpleNamespace(transistor_sizes={"inv_sb_mux_1_nmos": 4}, spice_interface=None))
+
+    fpga_inst = types.SimpleNamespace(transistor_sizes={"inv_sb_mux_1_nmos": 1}, spice_interface=None)
+    with pytest.raises(SystemExit):
+        tran_sizing._SizingCheckpoint(checkpoint_path, "other digest").read(fpga_inst)
+    with pytest.raises(SystemExit):
+        tran_sizing._SizingCheckpoint(str(tmp_path / "missing.pkl"), "digest").read(fpga_inst)
+    assert fpga_inst.transistor_sizes == {"inv_sb_mux_1_nmos": 1}
+
+
+class _CountingSpiceInterface(object):
+    """ Only counts simulations, like a SpiceInterface that some sweeps ran on. """
+
+    def __init__(self):
+
+        self.num_simulations = 0
+
+
+    def get_num_simulations_performed(self):
+
+        return self.num_simulations
+
+
+def test_simulation_budget_plans_smaller_searches():
+    """ A search gets the budget left of its subcircuit divided by the searches left, in combos and re-ERFs at the learned costs. """
+
+    spice_interface = _CountingSpiceInterface()
+    sim_budget = tran_sizing.SimulationBudget(1000, tran_sizing.BUDGET_UNIT_SIMULATIONS, 1, spice_interface)
+    sim_budget.sizing_budget = 200
+    sim_budget.expected_searches = 2
+
+    # Nothing was learned yet
+    assert sim_budget.plan_search("sb_mux", 5, 0, 2, spice_interface) == (None, 5)
+
+    # One simulation per combo and 10 per ERF. 100 simulations per search: 2 re-ERFs, 30 combos of ERFs and 70 sizing combos
+    sim_budget.add_combo_cost("sb_mux", 100, 100)
+    sim_budget.add_erf_cost("sb_mux", 40, 4)
+    assert sim_budget.plan_search("sb_mux", 5, 0, 2, spice_interface) == (70, 2)
+    # Subcircuits that weren't sized yet use the costs of the others
+    assert sim_budget.plan_search("cb_mux", 5, 0, 2, spice_interface) == (70, 2)
+
+    # 50 simulations are left for the last search
+    spice_interface.num_simulations = 150
+    assert sim_budget.plan_search("sb_mux", 5, 1, 1, spice_interface) == (30, 1)
+    assert not sim_budget.is_spent(spice_interface)
+    spice_interface.num_simulations = 200
+    assert sim_budget.is_spent(spice_interface)
+
+    # The budget never makes a search larger than it is without it
+    sim_budget.sizing_budget = 1e6
+    assert sim_budget.plan_search("sb_mux", 5, 0, 2, spice_interface) == (None, 5)
+
+
+def test_determine_height_brackets_the_cheapest_height():
+    """ The height search moves its bracket to the cheapest height outside the first one and narrows it down to HEIGHT_SEARCH_TOLERANCE. """
+
+    batches = []
+    def get_height_costs(heights):
+        batches.append(heights)
+        return [(height - 137)**2 + 0.001*(height - 137)**4 for height in heights]
+    fpga_inst = types.SimpleNamespace(lb_height=100.0, area_dict={"tile": 10000.0}, _get_height_costs=get_height_costs)
+
+    fpga.FPGA.determine_height(fpga_inst)
+    assert abs(fpga_inst.lb_height - 137) < fpga.HEIGHT_SEARCH_TOLERANCE*100
+    assert batches[0] == [90.0, 100.0, 110.0]
+    assert batches[1] == [120.0, 130.0]
+    assert sum(len(heights) for heights in batches) < 15
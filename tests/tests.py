@@ -1,6 +1,7 @@
 import os
 import re
 import math
+import gzip
 
 '''
 Test flow guide:
@@ -9,8 +10,18 @@ Its objective is making sure that:
 	1) Different features in COFFE are not broken after code changes.
 	2) All spice simulations are completed without error.
 	3) delay values of individual components are within reasonable range of reference.
+The spice output files can be plain (.lis) or compressed (.lis.gz, see the --spice_listing option of COFFE).
+Run COFFE with "--spice_listing keep" or "--spice_listing gzip" to test its results: "failure" only keeps
+the output of failed simulations.
 '''
 
+def open_listing(path):
+	""" Open a spice output file for reading, compressed or not. """
+
+	if path.endswith(".gz"):
+		return gzip.open(path, 'rt')
+	return open(path)
+
 def test_flow(ref_file, test_dir, err_margin):
 
 	# the difference allowed between reference and target
@@ -33,23 +44,23 @@ def test_flow(ref_file, test_dir, err_margin):
 	#get all the lis files underneath the test directory. These are the final spice output files from a COFFE run.
 	for directory in list_directory:
 		for file in os.listdir(directory):
-			if file.endswith(".lis"):
+			if file.endswith(".lis") or file.endswith(".lis.gz"):
 				target_file_list.append(test_directory+'/' +directory +'/'+ file)
-				target_file_names.append(file)
+				target_file_names.append(file.replace(".lis.gz", ".lis"))
 
 	# dictionary used to store rise and fall delays			
 	rise_and_fall_time_dictionary = {}
 
 	for index, item in enumerate(target_file_list):
 	# Look for delay values in the file, store them in a dictionary
-		with open(item) as search_target:
+		with open_listing(item) as search_target:
 
 			# look for rise and fall time delays in the file, add to the dictionary if found
 			for line in search_target:
 				if 'meas_total_tfall' in line:
-					rise_and_fall_time_dictionary[target_file_names[index]+"tfall"] = re.findall("\d+\.\d+", line)
+					rise_and_fall_time_dictionary[target_file_names[index]+"tfall"] = re.findall(r"\d+\.\d+", line)
 				if 'meas_total_trise' in line:
-					rise_and_fall_time_dictionary[target_file_names[index]+"trise"] = re.findall("\d+\.\d+", line)
+					rise_and_fall_time_dictionary[target_file_names[index]+"trise"] = re.findall(r"\d+\.\d+", line)
 				
 	# Open the reference file
 	with open(referencefile) as search_target:
@@ -67,12 +78,12 @@ def test_flow(ref_file, test_dir, err_margin):
 			observed = float(rise_and_fall_time_dictionary[i][0])
 			diff_pct = round(abs(expected - observed) / expected,4)
 			if (abs(expected - observed)/ expected) > margin:
-				print "**FAIL in: " + str(i) + ". " \
+				print("**FAIL in: " + str(i) + ". " \
 					+ "Expected = " + str(expected) + ", Observed = " + str(observed) + ". " \
-					+ "Percentage difference from reference: " + str(diff_pct*100) + '%' 
+					+ "Percentage difference from reference: " + str(diff_pct*100) + '%')
 			else:
 				# print and let the user know that this component passed the test
-				print "Passed test: "+ str(i) 
+				print("Passed test: "+ str(i))
 
 # Function to print a new reference file to screen. test_dir is the directory in which COFFE put its output. All SPICE output files
 # test_dir will be parsed, rise and fall delays are extracted, and printed to the screen (pipe to a file to store) in the format
@@ -95,24 +106,24 @@ def generate_reference(test_dir):
 	#get all the lis files in the test directory
 	for directory in list_directory:
 		for file in os.listdir(directory):
-			if file.endswith(".lis"):
+			if file.endswith(".lis") or file.endswith(".lis.gz"):
 				target_file_list.append(test_directory+'/' +directory +'/'+ file)
-				target_file_names.append(file)
+				target_file_names.append(file.replace(".lis.gz", ".lis"))
 
 	# directionary used to store rise and fall delays			
 	rise_and_fall_time_dictionary = {}
 
 	for index, item in enumerate(target_file_list):
 	# Look for delay values in the file, store them in a dictionary
-		with open(item) as search_target:
+		with open_listing(item) as search_target:
 
 			# look for rise and fall time delays in the file, add to the dictionary if found
 			for line in search_target:
 				if 'meas_total_tfall' in line:
-					rise_and_fall_time_dictionary[target_file_names[index]+"tfall"] = re.findall("\d+\.\d+", line)
+					rise_and_fall_time_dictionary[target_file_names[index]+"tfall"] = re.findall(r"\d+\.\d+", line)
 				if 'meas_total_trise' in line:
-					rise_and_fall_time_dictionary[target_file_names[index]+"trise"] = re.findall("\d+\.\d+", line)
+					rise_and_fall_time_dictionary[target_file_names[index]+"trise"] = re.findall(r"\d+\.\d+", line)
 			
 	for item in rise_and_fall_time_dictionary:
-		print item + ".." + rise_and_fall_time_dictionary[item][0]
+		print(item + ".." + rise_and_fall_time_dictionary[item][0])
 	